@@ -58,6 +58,11 @@ const DEFAULT_INTERSECTION_COLOR = "#7f7f7f";
 const PLOT_ZOOM_LIMITS = { minScale: 0.5, maxScale: 20 };
 const EXTERNAL_SIGNAL_TYPE = "SignalExternalFlag";
 const EXTERNAL_SIGNAL_PREFIX = "external:";
+const COMPUTE_SERVICE_DEFAULT_URL = "http://127.0.0.1:8765";
+const COMPUTE_SERVICE_MIN_ROWS = 50000;
+const COMPUTE_SERVICE_PROBE_TIMEOUT_MS = 1500;
+const COMPUTE_SERVICE_TIMESTAMP_KEY = "__htf_ts";
+const COLUMN_FRAME_MAGIC = "HTFC";
 
 const SIGNAL_DEFS = [
   {
@@ -381,6 +386,11 @@ const state = {
     seriesId: "",
     rootId: "",
   },
+  computeService: {
+    url: getComputeServiceUrl(),
+    available: false,
+    probe: null,
+  },
 };
 
 const plotZoomState = {
@@ -865,6 +875,7 @@ function createSeries() {
     role: "LTF",
     source: null,
     data: [],
+    remote: null,
     externalSignals: [],
     externalSignalErrors: [],
     signals: { items: [], downwardSignalId: "", activeId: "" },
@@ -1338,7 +1349,7 @@ function collectExportFrames(series, nodes, options) {
       hierarConstraintSeries = resolvedOptions.hierarConstraintSeries;
     } else {
       const timeframes = [...state.series].sort((a, b) => scaleWeight(b) - scaleWeight(a));
-      const signalCache = new Map();
+      const signalCache = createSignalCache(timeframes);
       hierarConstraintSeries = buildHierarConstraintSeries(timeframes, signalCache);
     }
     if (resolvedOptions.timeframeSeries) {
@@ -2374,7 +2385,7 @@ function handleFileChange(event) {
         showSourceError(t("source.error.insufficientTimeColumns", { units: requiredUnits }));
         return;
       }
-      series.source = {
+      const source = {
         fileName: file.name,
         fileType: getFileType(file.name),
         rows,
@@ -2383,10 +2394,14 @@ function handleFileChange(event) {
         mapping,
         valueColumn,
       };
-      applySourceMapping(series, series.source.mapping);
-      hideSourceError();
-      updateSeriesSource(series);
-      hydrateWizardForm();
+      // large files wait for the compute service check so they are not aggregated in the browser first
+      return (isLargeSource(source) ? probeComputeService() : Promise.resolve(false)).then(() => {
+        series.source = source;
+        applySourceMapping(series, series.source.mapping);
+        hideSourceError();
+        updateSeriesSource(series);
+        hydrateWizardForm();
+      });
     })
     .catch(() => {
       showSourceError(t("source.error.readFailed"));
@@ -2655,6 +2670,10 @@ function buildAggregatedData(series) {
   if (!series.source || !series.scaleValue || !series.scaleUnit) {
     return [];
   }
+  const remoteData = getRemoteAggregatedData(series);
+  if (remoteData) {
+    return remoteData;
+  }
   const baseData = buildBaseData(series.source);
   return aggregateData(
     baseData,
@@ -2817,6 +2836,354 @@ function isFiniteNumber(value) {
   return typeof value === "number" && Number.isFinite(value);
 }
 
+// Local compute service (python -m htf.service): series with at least
+// COMPUTE_SERVICE_MIN_ROWS source rows are uploaded once as columns, and their
+// aggregation and signal graph outputs are computed by the service instead of
+// on the main thread. Results are applied when they arrive; any failure falls
+// back to the in-browser computation. Graphs with external signals always run
+// in the browser (their values are not uploaded).
+
+function getComputeServiceUrl() {
+  let url = "";
+  try {
+    url = new URLSearchParams(window.location.search).get("service") || "";
+  } catch (_err) {
+    url = "";
+  }
+  if (!url && document.documentElement && document.documentElement.dataset) {
+    url = document.documentElement.dataset.htfService || "";
+  }
+  url = normalizeHtfBase(url);
+  if (url === "off") {
+    return "";
+  }
+  return url || COMPUTE_SERVICE_DEFAULT_URL;
+}
+
+function probeComputeService() {
+  const service = state.computeService;
+  if (!service.url) {
+    return Promise.resolve(false);
+  }
+  if (service.available) {
+    return Promise.resolve(true);
+  }
+  if (!service.probe) {
+    const controller = typeof AbortController === "function" ? new AbortController() : null;
+    const timer = controller ? setTimeout(() => controller.abort(), COMPUTE_SERVICE_PROBE_TIMEOUT_MS) : null;
+    service.probe = fetch(`${service.url}/health`, { signal: controller ? controller.signal : undefined })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((payload) => Boolean(payload && payload.status === "ok"))
+      .catch(() => false)
+      .then((available) => {
+        if (timer) {
+          clearTimeout(timer);
+        }
+        service.available = available;
+        service.probe = null;
+        return available;
+      });
+  }
+  return service.probe;
+}
+
+function isLargeSource(source) {
+  return Boolean(source && Array.isArray(source.rows) && source.rows.length >= COMPUTE_SERVICE_MIN_ROWS);
+}
+
+function shouldOffloadSeries(series) {
+  return Boolean(state.computeService.available && series && isLargeSource(series.source));
+}
+
+function getRemoteState(series) {
+  if (!series.remote) {
+    series.remote = {
+      dataKey: "",
+      data: null,
+      pendingDataKey: "",
+      failedDataKey: "",
+      signalsKey: "",
+      signals: null,
+      pendingSignalsKey: "",
+      failedSignalsKey: "",
+    };
+  }
+  return series.remote;
+}
+
+function handleComputeServiceFailure(err) {
+  // a rejected fetch means the service is gone; HTTP errors only affect that request
+  if (!(err && err.status)) {
+    state.computeService.available = false;
+  }
+  showToast(t("service.toast.fallback"), "error");
+}
+
+function computeServiceRequest(path, options) {
+  return fetch(`${state.computeService.url}${path}`, options).then((response) => {
+    if (response.ok) {
+      return response;
+    }
+    return response
+      .json()
+      .catch(() => ({}))
+      .then((payload) => {
+        const err = new Error(payload.error || `HTTP ${response.status}`);
+        err.status = response.status;
+        throw err;
+      });
+  });
+}
+
+function computeServicePostJson(path, payload) {
+  return computeServiceRequest(path, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+}
+
+function buildSourceDatasetKey(source) {
+  return JSON.stringify([
+    source.fileName,
+    source.rows.length,
+    source.mapping,
+    source.valueColumn,
+    source.numericColumns,
+  ]);
+}
+
+function buildServiceUploadColumns(source) {
+  // same rows and values as buildBaseData, as columns
+  const mapping = source.mapping;
+  const valueCol = source.valueColumn;
+  const numericCols = source.numericColumns || [];
+  const columns = { [COMPUTE_SERVICE_TIMESTAMP_KEY]: [] };
+  numericCols.forEach((col) => {
+    columns[col] = [];
+  });
+  if (!numericCols.includes(valueCol)) {
+    return columns;
+  }
+  const rowValues = new Array(numericCols.length);
+  source.rows.forEach((row) => {
+    const ts = buildTimestamp(row, mapping);
+    if (!ts || !Number.isFinite(ts.getTime())) {
+      return;
+    }
+    let valid = false;
+    numericCols.forEach((col, idx) => {
+      const num = Number(row[col]);
+      rowValues[idx] = Number.isFinite(num) ? num : null;
+      if (col === valueCol) {
+        valid = rowValues[idx] !== null;
+      }
+    });
+    if (!valid) {
+      return;
+    }
+    columns[COMPUTE_SERVICE_TIMESTAMP_KEY].push(ts.getTime());
+    numericCols.forEach((col, idx) => {
+      columns[col].push(rowValues[idx]);
+    });
+  });
+  return columns;
+}
+
+function uploadSourceDataset(source) {
+  const key = buildSourceDatasetKey(source);
+  if (source.serviceDataset && source.serviceDataset.key === key) {
+    return source.serviceDataset.promise;
+  }
+  const query = `timestamp_key=${encodeURIComponent(COMPUTE_SERVICE_TIMESTAMP_KEY)}`;
+  const promise = computeServicePostJson(`/datasets?${query}`, buildServiceUploadColumns(source))
+    .then((response) => response.json())
+    .then((payload) => payload.dataset);
+  source.serviceDataset = { key, promise };
+  promise.catch(() => {
+    if (source.serviceDataset && source.serviceDataset.promise === promise) {
+      source.serviceDataset = null;
+    }
+  });
+  return promise;
+}
+
+function buildServiceAggregateRequest(series) {
+  return {
+    scale_value: Number(series.scaleValue),
+    scale_unit: series.scaleUnit,
+    method: series.aggregateMethod || "mean",
+    percentile: Number(series.aggregatePercentile ?? 50),
+    value_key: series.source.valueColumn,
+  };
+}
+
+function buildRemoteDataKey(series) {
+  return JSON.stringify([buildSourceDatasetKey(series.source), buildServiceAggregateRequest(series)]);
+}
+
+function decodeColumnFrame(buffer) {
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== COLUMN_FRAME_MAGIC) {
+    throw new Error("not an htf columnar frame");
+  }
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+  const base = 8 + headerLength;
+  const columns = {};
+  header.columns.forEach((col) => {
+    const ArrayType = col.dtype === "uint8" ? Uint8Array : Float64Array;
+    columns[col.name] = new ArrayType(buffer, base + col.offset, col.length);
+  });
+  return { header, columns };
+}
+
+function columnFrameToSeriesData(frame, valueKey) {
+  // same point shape as aggregateData: columns without a value in a bucket are left out
+  const { header, columns } = frame;
+  const names = header.columns.map((col) => col.name).filter((name) => name !== "ts" && name !== "value");
+  const data = [];
+  for (let i = 0; i < header.rows; i += 1) {
+    const value = columns.value[i];
+    if (!Number.isFinite(value)) {
+      continue;
+    }
+    const values = {};
+    names.forEach((name) => {
+      const val = columns[name][i];
+      if (Number.isFinite(val)) {
+        values[name] = val;
+      }
+    });
+    values[valueKey] = value;
+    data.push({ ts: new Date(columns.ts[i]), value, values });
+  }
+  return data;
+}
+
+function getRemoteAggregatedData(series) {
+  if (!shouldOffloadSeries(series)) {
+    return null;
+  }
+  const remote = getRemoteState(series);
+  const key = buildRemoteDataKey(series);
+  if (remote.failedDataKey === key) {
+    return null;
+  }
+  if (remote.dataKey === key && remote.data) {
+    return remote.data;
+  }
+  if (remote.pendingDataKey !== key) {
+    remote.pendingDataKey = key;
+    const request = buildServiceAggregateRequest(series);
+    uploadSourceDataset(series.source)
+      .then((dataset) => computeServicePostJson("/aggregate", { ...request, dataset }))
+      .then((response) => response.arrayBuffer())
+      .then((buffer) => {
+        if (remote.pendingDataKey !== key) {
+          return;
+        }
+        remote.pendingDataKey = "";
+        remote.dataKey = key;
+        remote.data = columnFrameToSeriesData(decodeColumnFrame(buffer), request.value_key);
+        refreshRemoteSeries(series);
+      })
+      .catch((err) => {
+        if (remote.pendingDataKey !== key) {
+          return;
+        }
+        remote.pendingDataKey = "";
+        remote.failedDataKey = key;
+        handleComputeServiceFailure(err);
+        refreshRemoteSeries(series);
+      });
+  }
+  return [];
+}
+
+function refreshRemoteSeries(series) {
+  if (!state.series.includes(series)) {
+    return;
+  }
+  if (series.status.scale) {
+    updateSeriesSource(series);
+  } else {
+    renderPlot();
+  }
+}
+
+function serializeSignalNodeForService(node) {
+  const children = {};
+  Object.entries(node.children || {}).forEach(([key, list]) => {
+    if (Array.isArray(list) && list.length) {
+      children[key] = list.map((child) => serializeSignalNodeForService(child));
+    }
+  });
+  return { id: node.id, type: node.type, alias: node.alias || "", params: { ...(node.params || {}) }, children };
+}
+
+function getRemoteSignalOutputs(series, waitForService) {
+  const remote = series ? series.remote : null;
+  if (!remote || !remote.data || series.data !== remote.data || !shouldOffloadSeries(series)) {
+    return null;
+  }
+  const items = series.signals && Array.isArray(series.signals.items) ? series.signals.items : [];
+  if (!items.length || items.some((node) => signalTreeHasExternal(node))) {
+    return null;
+  }
+  const graph = items.map((node) => serializeSignalNodeForService(node));
+  const key = JSON.stringify([remote.dataKey, graph]);
+  if (remote.failedSignalsKey === key) {
+    return null;
+  }
+  if (remote.signalsKey === key && remote.signals) {
+    return remote.signals;
+  }
+  if (remote.pendingSignalsKey !== key) {
+    remote.pendingSignalsKey = key;
+    const request = { ...buildServiceAggregateRequest(series), signal_graph: graph, signal_defs: SIGNAL_DEFS };
+    uploadSourceDataset(series.source)
+      .then((dataset) => computeServicePostJson("/signals", { ...request, dataset }))
+      .then((response) => response.arrayBuffer())
+      .then((buffer) => {
+        if (remote.pendingSignalsKey !== key) {
+          return;
+        }
+        const frame = decodeColumnFrame(buffer);
+        const outputs = new Map();
+        Object.keys(frame.header.nodes || {}).forEach((nodeId) => {
+          outputs.set(nodeId, Array.from(frame.columns[nodeId]));
+        });
+        remote.pendingSignalsKey = "";
+        remote.signalsKey = key;
+        remote.signals = outputs;
+        refreshRemoteSeries(series);
+      })
+      .catch((err) => {
+        if (remote.pendingSignalsKey !== key) {
+          return;
+        }
+        remote.pendingSignalsKey = "";
+        remote.failedSignalsKey = key;
+        handleComputeServiceFailure(err);
+        refreshRemoteSeries(series);
+      });
+  }
+  // while the service computes, plot without signals rather than blocking on the browser graph
+  return waitForService ? new Map() : null;
+}
+
+function createSignalCache(seriesList, options = {}) {
+  const cache = new Map();
+  (seriesList || []).forEach((series) => {
+    const outputs = getRemoteSignalOutputs(series, Boolean(options.waitForService));
+    if (outputs) {
+      cache.set(series.id, outputs);
+    }
+  });
+  return cache;
+}
+
 function toAxisNumber(value) {
   if (typeof value === "number" && Number.isFinite(value)) {
     return value;
@@ -6604,7 +6971,7 @@ async function handleIntersectionExportSave() {
       .map((id) => state.intersectionExportState.signalMap.get(id))
       .filter(Boolean);
     const timeframes = [...state.series].sort((a, b) => scaleWeight(b) - scaleWeight(a));
-    const signalCache = new Map();
+    const signalCache = createSignalCache(timeframes);
     const { selectedIds } = getIntersectionSelection(timeframes);
     const hierarConstraintSeries = buildIntersectionHierarConstraintSeries(timeframes, signalCache, selectedIds);
     const timeframeSeries = buildIntersectionTimeframeSeries(timeframes, selectedIds);
@@ -6943,7 +7310,7 @@ function renderPlot() {
   const sorted = [...state.series].sort((a, b) => scaleWeight(a) - scaleWeight(b));
   const timeframes = [...sorted].sort((a, b) => scaleWeight(b) - scaleWeight(a));
   const parallelOrder = timeframes;
-  const signalCache = new Map();
+  const signalCache = createSignalCache(timeframes, { waitForService: true });
   const gateMasks = buildGateMasks(timeframes, signalCache);
   const plotOptions = gateMasks ? { gateMasks } : null;
   let result = { traces: [], layout: {} };
@@ -7080,7 +7447,8 @@ document.addEventListener("DOMContentLoaded", () => {
     .catch((err) => {
       console.error(err);
       init();
-    });
+    })
+    .then(() => probeComputeService());
 });
 
 window.addEventListener("i18n:changed", () => {
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Column fan-out: one graph template over many value columns.
+
+Compares fanout_signal_graph (per-column state in numpy arrays, one pass)
+with running the graph once per column through the scalar graph runner.
+Two templates: a light one (EMA crossover, run length, value vs previous)
+and a percentile-heavy one (rolling percentile and EMA-diff percentile with
+window 100). The per-column baseline is timed on a sample of columns and
+extrapolated.
+
+    python benchmarks/bench_fanout.py --columns 300 --records 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", type=int, default=300)
+    parser.add_argument("--records", type=int, default=2_000)
+    parser.add_argument("--sample", type=int, default=20, help="columns timed for the per-column baseline")
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.fanout import fanout_signal_graph
+    from htf.timeframe import _compute_graph_outputs
+
+    rng = random.Random(0)
+    columns = [f"sensor_{i}" for i in range(args.columns)]
+    records = [{"values": {col: rng.gauss(0.0, 1.0) for col in columns}} for _ in range(args.records)]
+
+    fast_slow = {
+        "id": "fs",
+        "type": "SignalEMAFastSlowComparison",
+        "params": {"value_key": "value", "ema_period_1": "5", "ema_period_2": "20"},
+    }
+    light = [
+        {
+            "id": "run",
+            "alias": "run",
+            "type": "SignalRunLengthReached",
+            "params": {"min_run_length": "3"},
+            "children": {"signal_key": [fast_slow]},
+        },
+        {"id": "prev", "alias": "prev", "type": "SignalValueVsPrevious", "params": {"value_key": "value"}},
+    ]
+    heavy = [
+        {
+            "id": "pct",
+            "alias": "pct",
+            "type": "ValueVsRollingPercentile",
+            "params": {"value_key": "value", "window_size": "100", "percentile": "90"},
+        },
+        {
+            "id": "diff",
+            "alias": "diff",
+            "type": "SignalEMADiffVsHistoryPercentile",
+            "params": {"value_key": "value", "ema_period_1": "5", "ema_period_2": "20", "history_window": "100"},
+        },
+    ]
+    sample = columns[: max(1, min(args.sample, len(columns)))]
+    for name, graph in (("light", light), ("percentile", heavy)):
+        t0 = time.perf_counter()
+        frame = fanout_signal_graph(records, graph, columns)
+        t_fanout = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for col in sample:
+            single = [{"values": {"value": rec["values"][col]}} for rec in records]
+            outputs = _compute_graph_outputs(single, graph, {})[0]
+            for node in graph:
+                assert frame[f"{col}:{node['id']}"].tolist() == outputs[node["id"]]
+        t_columns = (time.perf_counter() - t0) * len(columns) / len(sample)
+
+        print(f"{name} template: {len(columns)} columns x {len(records)} records")
+        print(f"  fan-out (one pass):        {t_fanout:8.3f}s")
+        print(f"  per-column (extrapolated): {t_columns:8.3f}s  ({t_columns / t_fanout:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Gated compute vs evaluating every view on every record.
+
+Builds a three-level hierarchy under HierarConstraintCoordinator: an HTF
+gate (rolling percentile of a window mean, open about (100 - percentile)%
+of the time), an MTF rolling percentile (exact state horizon, so catching
+up replays only its last window_size records) and an LTF EMA-difference
+signal (approximate horizon, so "replay" replays every suspended record).
+Runs the records with gated_compute off, on with the default catch-up
+("replay", outputs checked identical) and on with catch_up="skip" for the
+LTF signal. Reports wall time and the feature/signal evaluations done per
+gated view.
+
+    python benchmarks/bench_gated.py --records 100000 --htf-percentile 90
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--htf-percentile", type=float, default=90.0)
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.coordinator import HierarConstraintCoordinator
+    from htf.features import SingleFieldStatsFeature
+    from htf.framework import HTFFramework
+    from htf.signals import SignalEMADiffVsHistoryPercentile, ValueVsRollingPercentile
+    from htf.timeframe import TimeframeConfig, TimeframeView
+
+    def build(gated: bool, ltf_catch_up: str = "replay") -> HTFFramework:
+        htf = TimeframeView(
+            config=TimeframeConfig(name="htf", window_size=10, role="HTF"),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=100, percentile=args.htf_percentile),
+        )
+        mtf = TimeframeView(
+            config=TimeframeConfig(name="mtf", window_size=60),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ValueVsRollingPercentile(value_key="x_max", window_size=50, percentile=50),
+        )
+        ltf_signal = SignalEMADiffVsHistoryPercentile(
+            value_key="x_mean", ema_period_1=5, ema_period_2=20, history_window=200, percentile=70
+        )
+        ltf_signal.catch_up = ltf_catch_up
+        ltf = TimeframeView(
+            config=TimeframeConfig(name="ltf", window_size=60),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ltf_signal,
+        )
+        coordinator = HierarConstraintCoordinator(["htf", "mtf", "ltf"])
+        timeframes = {"htf": htf, "mtf": mtf, "ltf": ltf}
+        return HTFFramework(timeframes=timeframes, coordinator=coordinator, gated_compute=gated)
+
+    rng = random.Random(0)
+    level = 0.0
+    records = []
+    for i in range(args.records):
+        level += rng.gauss(0.0, 1.0)
+        records.append({"ts": i, "x": level})
+
+    def run(framework: HTFFramework) -> tuple[float, list[dict]]:
+        t0 = time.perf_counter()
+        outputs = [framework.on_new_record(rec)["coordination"]["gated_map"] for rec in records]
+        return time.perf_counter() - t0, outputs
+
+    baseline = build(False)
+    t_base, expected = run(baseline)
+    open_share = sum(1 for out in expected if out["htf"]) / len(records)
+    print(f"records={len(records)} htf gate open {open_share:.1%} of the time")
+    print(f"  {'mode':<16} {'time':>9} {'speed-up':>9}   evaluations per view (mtf / ltf)")
+    print(f"  {'ungated':<16} {t_base:8.3f}s {'1.00x':>9}   {len(records)} / {len(records)}")
+    for label, catch_up in (("gated replay", "replay"), ("gated ltf skip", "skip")):
+        framework = build(True, catch_up)
+        elapsed, outputs = run(framework)
+        views = framework.timeframes
+        evaluations = [
+            len(records) - views[name].skipped_records - views[name].suspended_records for name in ("mtf", "ltf")
+        ]
+        same = "identical outputs" if outputs == expected else "outputs differ (skip semantics)"
+        print(f"  {label:<16} {elapsed:8.3f}s {t_base / elapsed:8.2f}x   {evaluations[0]} / {evaluations[1]}   {same}")
+
+
+if __name__ == "__main__":
+    main()
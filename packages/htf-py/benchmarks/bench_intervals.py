@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Benchmark the interval engine used by the plotting helpers.
+
+Compares the linear merge walk (htf.intervals) with the per-timestamp scan the
+plotting helpers used previously, on a million-point LTF series.
+
+    python benchmarks/bench_intervals.py --points 1000000 --windows 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect_right
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--windows", type=int, default=5_000)
+    parser.add_argument("--htf-every", type=int, default=60)
+    parser.add_argument("--naive-sample", type=int, default=20_000, help="LTF points used for the naive baseline")
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.intervals import all_windows_mask, asof_values, truthy_windows
+
+    rng = random.Random(0)
+    ltf_ts = list(range(args.points))
+    htf_ts = ltf_ts[:: args.htf_every]
+    p_flip = min(1.0, 2.0 * args.windows / max(1, len(htf_ts)))
+    flags: list[bool] = []
+    state = False
+    for _ in htf_ts:
+        if rng.random() < p_flip:
+            state = not state
+        flags.append(state)
+    windows = truthy_windows(flags, htf_ts)
+
+    mask, t_mask = _timed(all_windows_mask, [windows], ltf_ts)
+    _, t_asof = _timed(asof_values, htf_ts, flags, ltf_ts, False)
+
+    sample = ltf_ts[: args.naive_sample]
+    naive, t_naive = _timed(lambda: [any(s <= ts <= e for s, e in windows) for ts in sample])
+    _, t_bisect = _timed(lambda: [flags[bisect_right(htf_ts, ts) - 1] for ts in ltf_ts])
+    assert naive == mask[: len(sample)]
+
+    scale = len(ltf_ts) / max(1, len(sample))
+    print(f"points={len(ltf_ts)} htf_points={len(htf_ts)} windows={len(windows)}")
+    print(f"all_windows_mask (merge walk): {t_mask:8.3f}s")
+    print(f"naive any() scan (extrapolated): {t_naive * scale:8.3f}s")
+    print(f"asof_values (merge walk):      {t_asof:8.3f}s")
+    print(f"bisect per timestamp:          {t_bisect:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
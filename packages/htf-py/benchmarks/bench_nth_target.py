@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Stress benchmark for SignalNthTargetWithinWindowAfterTrigger with dense triggers.
+
+Compares the deque-based signal with the previous design that scanned every
+open window dict on each step. With a trigger on most steps and a long
+window_length, thousands of windows overlap; the scan cost grows with them
+while the deque stays amortized O(1) per step.
+
+    python benchmarks/bench_nth_target.py --steps 200000 --window-length 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any
+
+
+class _WindowScan:
+    """Previous implementation: one dict per open window, all scanned each step."""
+
+    def __init__(self, trigger_key: str, target_key: str, window_length: int, target_index: int) -> None:
+        self.trigger_key = trigger_key
+        self.target_key = target_key
+        self.window_length = window_length
+        self.target_index = target_index
+        self.active_windows: list[dict[str, int]] = []
+        self.last_search_success: bool | None = None
+
+    def __call__(self, features: dict[str, Any]) -> int:
+        signal = 0
+        target_active = bool(features.get(self.target_key))
+        kept: list[dict[str, int]] = []
+        for window in self.active_windows:
+            if target_active:
+                window["seen_targets"] += 1
+                if window["seen_targets"] == self.target_index:
+                    signal = 1
+                    self.last_search_success = True
+                    continue
+            window["remaining_steps"] -= 1
+            if window["remaining_steps"] <= 0:
+                self.last_search_success = False
+                continue
+            kept.append(window)
+        self.active_windows = kept
+        if bool(features.get(self.trigger_key)):
+            self.active_windows.append({"remaining_steps": self.window_length, "seen_targets": 0})
+        return signal
+
+
+def _run(signal: Any, stream: list[dict[str, int]]) -> tuple[list[int], list[bool | None], float]:
+    outputs: list[int] = []
+    success: list[bool | None] = []
+    t0 = time.perf_counter()
+    for features in stream:
+        outputs.append(signal(features))
+        success.append(signal.last_search_success)
+    return outputs, success, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=200_000)
+    parser.add_argument("--window-length", type=int, default=5_000)
+    parser.add_argument("--target-index", type=int, default=50)
+    parser.add_argument("--trigger-rate", type=float, default=0.9)
+    parser.add_argument("--target-rate", type=float, default=0.005)
+    parser.add_argument("--scan-sample", type=int, default=20_000, help="steps used for the window-scan baseline")
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.signals import SignalNthTargetWithinWindowAfterTrigger
+
+    rng = random.Random(0)
+    stream = [
+        {"trigger": int(rng.random() < args.trigger_rate), "target": int(rng.random() < args.target_rate)}
+        for _ in range(args.steps)
+    ]
+
+    signal = SignalNthTargetWithinWindowAfterTrigger(
+        trigger_signal_key="trigger",
+        target_signal_key="target",
+        window_length=args.window_length,
+        target_index=args.target_index,
+    )
+    out_deque, success_deque, t_deque = _run(signal, stream)
+
+    sample = stream[: args.scan_sample]
+    baseline = _WindowScan("trigger", "target", args.window_length, args.target_index)
+    out_scan, success_scan, t_scan = _run(baseline, sample)
+    assert out_scan == out_deque[: len(sample)]
+    assert success_scan == success_deque[: len(sample)]
+
+    scale = len(stream) / max(1, len(sample))
+    print(
+        f"steps={len(stream)} window_length={args.window_length} target_index={args.target_index} "
+        f"open_windows_at_end={len(signal.windows)}"
+    )
+    print(f"deque (amortized O(1)):          {t_deque:8.3f}s")
+    print(f"window scan (extrapolated):      {t_scan * scale:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
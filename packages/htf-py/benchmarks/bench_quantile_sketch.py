@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Accuracy / memory / speed of the approximate percentile mode.
+
+For each window size, streams values (a slowly drifting noisy signal) through
+WindowedQuantileSketch and through the exact paths:
+- sorted window (RollingOrderStatistics, what shared histories use),
+- deque + compute_percentile per step (what the signals do without sharing;
+  timed on a sample and extrapolated).
+Reports the rank error of the sketch relative to the window, the documented
+bound, floats kept in memory and time per step.
+
+    python benchmarks/bench_quantile_sketch.py --windows 100000 1000000 --steps 1500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--steps", type=int, default=1_500_000)
+    parser.add_argument("--percentile", type=float, default=90.0)
+    parser.add_argument("--buckets", type=int, default=128)
+    parser.add_argument("--points", type=int, default=128)
+    parser.add_argument("--check-every", type=int, default=5_000, help="steps between accuracy checks")
+    parser.add_argument("--deque-sample", type=int, default=200, help="steps timed for the deque baseline")
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.quantiles import WindowedQuantileSketch
+    from htf.signals import RollingOrderStatistics, compute_percentile
+
+    rng = random.Random(0)
+    data = [rng.gauss(0.0, 1.0) + i / 200_000.0 for i in range(args.steps)]
+    q = args.percentile
+
+    for window in args.windows:
+        sketch = WindowedQuantileSketch(window, args.buckets, args.points)
+        exact = RollingOrderStatistics(window)
+        rank_errors: list[float] = []
+        t_sketch = 0.0
+        t_exact = 0.0
+        for i, value in enumerate(data):
+            t0 = time.perf_counter()
+            approx = sketch.quantile(q)
+            sketch.add(value)
+            t1 = time.perf_counter()
+            exact.percentile(q)
+            exact.push(value)
+            t_exact += time.perf_counter() - t1
+            t_sketch += t1 - t0
+            if approx is not None and i % args.check_every == 0 and i >= window:
+                n = len(exact)
+                target = (n - 1) * q / 100.0
+                lo = bisect_left(exact.sorted_values, approx)
+                hi = bisect_right(exact.sorted_values, approx)
+                err = 0.0 if lo <= target <= hi else min(abs(lo - target), abs(hi - target))
+                rank_errors.append(err / window)
+
+        history = deque(data[-window:], maxlen=window)
+        sample = data[: args.deque_sample]
+        t0 = time.perf_counter()
+        for value in sample:
+            compute_percentile(history, q)
+            history.append(value)
+        t_deque = (time.perf_counter() - t0) / max(1, len(sample))
+
+        bound = (window / (2 * args.points) + sketch.buckets + sketch.block_size) / window
+        steps = len(data)
+        max_err = max(rank_errors) if rank_errors else 0.0
+        mean_err = sum(rank_errors) / len(rank_errors) if rank_errors else 0.0
+        print(f"window={window} steps={steps} percentile={q}")
+        print(f"  sketch rank error: max {max_err:.4%} mean {mean_err:.4%} (bound {bound:.4%})")
+        print(f"  floats kept: sketch {sketch.stored_points} vs exact {window} ({sketch.stored_points / window:.2%})")
+        print(f"  sketch:                  {t_sketch / steps * 1e6:9.2f} us/step")
+        print(f"  sorted window (exact):   {t_exact / steps * 1e6:9.2f} us/step")
+        print(f"  deque + sort (exact):    {t_deque * 1e6:9.2f} us/step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Parameter sweep: one shared pass vs one full pass per combination.
+
+Sweeps ValueVsRollingPercentile (window_size x percentile),
+SignalEMADiffVsHistoryPercentile (ema periods x percentile) and
+SignalRunLengthVsHistoryPercentile (percentile x min_history_runs) over a
+random walk. The baseline re-runs the series once per combination with an
+unbound signal, which is what tuning scripts did before htf.sweep.
+
+    python benchmarks/bench_sweep.py --steps 20000 --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=20_000)
+    parser.add_argument("--processes", type=int, default=1, help="also time sweep(..., processes=N) when > 1")
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.signals import (
+        SignalEMADiffVsHistoryPercentile,
+        SignalRunLengthVsHistoryPercentile,
+        ValueVsRollingPercentile,
+    )
+    from htf.sweep import parameter_grid, sweep
+
+    rng = random.Random(0)
+    level = 0.0
+    records = []
+    for _ in range(args.steps):
+        level += rng.gauss(0.0, 1.0)
+        records.append({"value": level, "flag": int(rng.random() < 0.6)})
+
+    cases = [
+        (
+            ValueVsRollingPercentile,
+            {"value_key": "value"},
+            {"window_size": [200, 500], "percentile": [5.0, 10.0, 25.0, 50.0, 75.0, 90.0, 95.0]},
+        ),
+        (
+            SignalEMADiffVsHistoryPercentile,
+            {"value_key": "value", "history_window": 300},
+            {"ema_period_1": [5, 10, 20], "ema_period_2": [50, 100], "percentile": [80.0, 90.0, 95.0]},
+        ),
+        (
+            SignalRunLengthVsHistoryPercentile,
+            {"signal_key": "flag", "history_window": 200},
+            {"percentile": [50.0, 75.0, 90.0, 95.0], "min_history_runs": [5, 20]},
+        ),
+    ]
+    for cls, params, grid in cases:
+        combos = parameter_grid(grid)
+        t0 = time.perf_counter()
+        baseline = []
+        for combo in combos:
+            signal = cls(**params, **combo)
+            baseline.append([1 if signal(rec) else 0 for rec in records])
+        t_separate = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        frame = sweep(cls, records, grid, params=params, output="signals")
+        t_sweep = time.perf_counter() - t0
+        assert [sig.tolist() for sig in frame["signal"]] == baseline
+
+        print(f"{cls.__name__}: {len(combos)} combinations x {len(records)} records")
+        print(f"  separate passes:         {t_separate:8.3f}s")
+        print(f"  sweep (shared pass):     {t_sweep:8.3f}s")
+        if args.processes > 1:
+            t0 = time.perf_counter()
+            pooled = sweep(cls, records, grid, params=params, output="signals", processes=args.processes)
+            t_pool = time.perf_counter() - t0
+            assert [sig.tolist() for sig in pooled["signal"]] == baseline
+            print(f"  sweep processes={args.processes}:     {t_pool:8.3f}s")
+        shared = frame.attrs["sweep_report"]["shared"][0]
+        print(f"  shared nodes: ema {shared['ema']} history {shared['history']} run {shared['run']}")
+
+
+if __name__ == "__main__":
+    main()
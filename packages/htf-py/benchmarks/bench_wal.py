@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+"""
+Write-ahead log: ingestion overhead and recovery time.
+
+Ingestion: feeds the same records to a two-view framework without a log and
+through DurableFramework with several group-commit / fsync settings, and
+reports time per record and fsync count.
+
+Recovery: for each WAL tail length (records written after the last
+checkpoint), times DurableFramework.recover (checkpoint load + replay) and
+compares it with re-ingesting the whole history from scratch.
+
+    python benchmarks/bench_wal.py --records 50000 --tails 1000 10000 40000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--tails", type=int, nargs="+", default=[1_000, 10_000, 40_000])
+    args = parser.parse_args()
+
+    htf_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if htf_root not in sys.path:
+        sys.path.insert(0, htf_root)
+
+    from htf.coordinator import HierarConstraintCoordinator
+    from htf.features import SingleFieldStatsFeature
+    from htf.framework import HTFFramework
+    from htf.signals import SignalEMAFastSlowComparison, ValueVsRollingPercentile
+    from htf.timeframe import TimeframeConfig, TimeframeView
+    from htf.wal import DurableFramework
+
+    def build() -> HTFFramework:
+        htf = TimeframeView(
+            config=TimeframeConfig(name="htf", window_size=60, role="HTF"),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=200, percentile=40),
+        )
+        ltf = TimeframeView(
+            config=TimeframeConfig(name="ltf", window_size=5),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=SignalEMAFastSlowComparison(value_key="x_max", ema_period_1=5, ema_period_2=20),
+        )
+        coordinator = HierarConstraintCoordinator(["htf", "ltf"])
+        return HTFFramework(timeframes={"htf": htf, "ltf": ltf}, coordinator=coordinator)
+
+    rng = random.Random(0)
+    level = 0.0
+    records = []
+    for i in range(args.records):
+        level += rng.gauss(0.0, 1.0)
+        records.append({"ts": i, "x": level, "source": "bench"})
+    n = len(records)
+
+    framework = build()
+    t0 = time.perf_counter()
+    for rec in records:
+        framework.on_new_record(rec)
+    t_plain = time.perf_counter() - t0
+    print(f"ingestion: {n} records")
+    print(f"  no log:                          {t_plain / n * 1e6:8.2f} us/record")
+
+    settings = [
+        ("fsync every record", {"group_records": 1, "fsync_groups": 1}),
+        ("group 64, fsync every group", {"group_records": 64, "fsync_groups": 1}),
+        ("group 256, fsync every 8 groups", {"group_records": 256, "fsync_groups": 8}),
+        ("group 256, fsync every 0.5s", {"group_records": 256, "fsync_groups": 0, "fsync_interval": 0.5}),
+        ("group 256, no fsync", {"group_records": 256, "fsync_groups": 0}),
+    ]
+    for label, options in settings:
+        directory = tempfile.mkdtemp(prefix="htf-wal-")
+        try:
+            sample = records if options["group_records"] > 1 else records[: max(1, n // 10)]
+            durable = DurableFramework(build(), directory, wal_options=options)
+            t0 = time.perf_counter()
+            for rec in sample:
+                durable.on_new_record(rec)
+            durable.wal.sync()
+            elapsed = time.perf_counter() - t0
+            fsyncs = durable.wal.stats["fsyncs"]
+            durable.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        per_record = elapsed / len(sample)
+        overhead = per_record / (t_plain / n) - 1.0
+        print(f"  {label + ':':32s} {per_record * 1e6:8.2f} us/record  (+{overhead:.1%}, {fsyncs} fsyncs)")
+
+    print("recovery (checkpoint + WAL tail replay vs re-ingesting the history)")
+    for tail in args.tails:
+        tail = min(tail, n)
+        directory = tempfile.mkdtemp(prefix="htf-wal-")
+        try:
+            durable = DurableFramework(build(), directory, wal_options={"group_records": 256, "fsync_groups": 0})
+            for i, rec in enumerate(records):
+                if i == n - tail:
+                    durable.checkpoint()
+                durable.on_new_record(rec)
+            durable.close()
+            _, report = DurableFramework.recover(directory, build())
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        total = report.load_seconds + report.replay_seconds
+        print(
+            f"  tail {tail:7d}: load {report.load_seconds:6.3f}s + replay {report.replay_seconds:6.3f}s"
+            f" = {total:6.3f}s  (full re-ingest {t_plain:6.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
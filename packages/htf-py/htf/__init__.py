@@ -2,10 +2,28 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
-from .coordinator import HierarConstraintCoordinator, MultiScaleCoordinator, SimpleHTFCoordinator, TimeframeState
+from .aggregation import aggregate_frame, aggregate_records, aggregate_scales
+from .batch import BatchReport, load_templates, run_batch
+from .coordinator import (
+    GateMaskStream,
+    HierarConstraintCoordinator,
+    MultiScaleCoordinator,
+    SimpleHTFCoordinator,
+    TimeframeState,
+)
+from .export_cursor import ExportCursor
+from .fanout import fanout_signal_graph
 from .features import LastRecordEchoFeature, SingleFieldStatsFeature
 from .framework import HTFFramework
+from .intervals import all_windows_mask, asof_indices, asof_values, truthy_windows, windows_to_mask
+from .mapped_buffer import MappedRecordBuffer
+from .partition import PartitionedRun, framework_state_horizon, run_partitioned
+from .quantiles import WindowedQuantileSketch
+from .schema import RecordSchema, SchemaStats
+from .service import ComputeServer, ComputeService
 from .signals import (
+    RollingOrderStatistics,
+    SharedComputations,
     SignalEMADiffVsHistoryPercentile,
     SignalEMAFastSlowComparison,
     SignalExternalFlag,
@@ -20,14 +38,22 @@ from .signals import (
     SignalValueVsLastTargetForBase,
     SignalValueVsLastTrueReference,
     SignalValueVsPrevious,
+    TraceBuffer,
     ValueVsRollingPercentile,
     ValueVsRollingPercentileWithThreshold,
 )
+from .sweep import parameter_grid, sweep
+from .time_index import RecordSlice, TimestampIndex, from_epoch_ns, to_epoch_ns
 from .timeframe import FeatureModule, TimeframeConfig, TimeframeView
+from .wal import DurableFramework, RecoveryReport, WriteAheadLog
 
 __all__ = [
     "TimeframeConfig",
     "TimeframeView",
+    "TimestampIndex",
+    "RecordSlice",
+    "to_epoch_ns",
+    "from_epoch_ns",
     "FeatureModule",
     "SingleFieldStatsFeature",
     "LastRecordEchoFeature",
@@ -47,9 +73,40 @@ __all__ = [
     "SignalNthTargetWithinWindowAfterTrigger",
     "SignalIntersection",
     "SignalExternalFlag",
+    "TraceBuffer",
+    "MappedRecordBuffer",
+    "SharedComputations",
+    "RollingOrderStatistics",
+    "WindowedQuantileSketch",
     "MultiScaleCoordinator",
     "SimpleHTFCoordinator",
     "HierarConstraintCoordinator",
+    "GateMaskStream",
     "TimeframeState",
     "HTFFramework",
+    "DurableFramework",
+    "RecoveryReport",
+    "WriteAheadLog",
+    "RecordSchema",
+    "SchemaStats",
+    "ComputeService",
+    "ComputeServer",
+    "truthy_windows",
+    "windows_to_mask",
+    "all_windows_mask",
+    "asof_indices",
+    "asof_values",
+    "aggregate_frame",
+    "aggregate_records",
+    "aggregate_scales",
+    "ExportCursor",
+    "BatchReport",
+    "load_templates",
+    "run_batch",
+    "fanout_signal_graph",
+    "parameter_grid",
+    "PartitionedRun",
+    "framework_state_horizon",
+    "run_partitioned",
+    "sweep",
 ]
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from .aggregation import AGGREGATE_METHODS, SCALE_UNITS
+from .batch import OUTPUT_FORMATS, load_templates, run_batch
+
+# Command line entry point:
+#   python -m htf run    apply signal templates to CSV/XLSX files (htf.batch)
+#   python -m htf serve  start the local compute service (htf.service)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m htf", description="Hierarchical timeframe toolkit.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser(
+        "run",
+        help="apply signal templates to CSV/XLSX files",
+        description="Apply console signal templates to CSV/XLSX files and write one output per file and template.",
+        epilog='example: python -m htf run -t apps/templates/ema-diff-high.json -i "data/*.csv" '
+        "--scale 5 minute --value-column price -o out",
+    )
+    run.add_argument("-t", "--template", action="append", required=True, help="template JSON file (repeatable)")
+    run.add_argument("-i", "--input", action="append", required=True, help="input file or glob (repeatable)")
+    run.add_argument("-o", "--output", default="htf-output", help="output directory (default: htf-output)")
+    run.add_argument(
+        "--scale", nargs=2, metavar=("VALUE", "UNIT"), required=True, help=f"bucket size, unit in {SCALE_UNITS}"
+    )
+    run.add_argument("--method", default="mean", choices=AGGREGATE_METHODS, help="aggregation (default: mean)")
+    run.add_argument("--percentile", type=float, default=50.0, help="percentile for --method percentile")
+    run.add_argument("--value-column", required=True, help="input column to aggregate and evaluate")
+    run.add_argument("--timestamp-column", default="ts", help="timestamp column (default: ts, then timestamp)")
+    run.add_argument("--format", default="csv", choices=OUTPUT_FORMATS, help="output format (default: csv)")
+    run.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    run.add_argument("--chunk-rows", type=int, default=1 << 20, help="CSV rows read per chunk")
+
+    sub.add_parser("serve", help="start the local compute service (see: python -m htf serve --help)", add_help=False)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "serve":
+        from .service import main as serve_main
+
+        return serve_main(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    try:
+        templates = load_templates(args.template)
+        report = run_batch(
+            templates,
+            args.input,
+            args.output,
+            scale_value=args.scale[0],
+            scale_unit=args.scale[1],
+            method=args.method,
+            percentile=args.percentile,
+            value_key=args.value_column,
+            timestamp_key=args.timestamp_column,
+            output_format=args.format,
+            processes=args.processes,
+            chunk_rows=args.chunk_rows,
+        )
+    except (OSError, ValueError, RuntimeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,432 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+# Multi-scale aggregation matching the browser console's bucketing
+# (aggregateData / getBucketTimestamp / aggregateValues in apps/ui-static/app.js):
+# UTC epoch-ms buckets, sequential sums for mean and the same linear
+# interpolation for median/percentile, so output is identical bucket for bucket.
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+AGGREGATE_METHODS = ("mean", "min", "max", "median", "percentile")
+SCALE_UNITS = ("second", "minute", "hour", "day", "month", "year")
+
+_UNIT_MS = {
+    "second": 1000,
+    "minute": 60 * 1000,
+    "hour": 60 * 60 * 1000,
+    "day": 24 * 60 * 60 * 1000,
+}
+_DAY_MS = _UNIT_MS["day"]
+# methods whose coarse aggregate can be rebuilt exactly from nested finer aggregates
+_CASCADABLE = ("min", "max")
+_SMALL_SEGMENT = 64  # longer mean segments are summed with one np.cumsum each
+
+
+def _require_pandas():
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for htf.aggregation") from exc
+    return np, pd
+
+
+def _check_scale(scale_value: Any, scale_unit: str) -> tuple[int, str]:
+    unit = str(scale_unit).lower()
+    if unit not in SCALE_UNITS:
+        raise ValueError(f"scale_unit must be one of {SCALE_UNITS}")
+    try:
+        value = int(scale_value)
+    except (TypeError, ValueError):
+        value = 0
+    if value <= 0:
+        raise ValueError("scale_value must be > 0")
+    return value, unit
+
+
+def _check_method(method: str | None) -> str:
+    name = (method or "mean").lower()
+    if name not in AGGREGATE_METHODS:
+        raise ValueError(f"method must be one of {AGGREGATE_METHODS}")
+    return name
+
+
+def to_epoch_ms(timestamps: Iterable[Any]):
+    """
+    Convert timestamps (datetimes, strings, pandas/numpy timestamps, or epoch
+    milliseconds as numbers) to an int64 array of UTC epoch milliseconds.
+    Naive datetimes are taken as UTC, like the console's Date.UTC. Unparseable
+    entries become the int64 minimum and are dropped by the aggregators.
+    """
+    np, pd = _require_pandas()
+    values = list(timestamps)
+    if values and all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in values):
+        arr = np.asarray(values, dtype="float64")
+        out = np.full(len(arr), np.iinfo(np.int64).min, dtype=np.int64)
+        finite = np.isfinite(arr)
+        out[finite] = np.floor(arr[finite]).astype(np.int64)
+        return out
+    dt = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", utc=True)
+    # stay in ns (non-ns tz-aware dtypes need pandas 2): NaT maps to the int64 minimum
+    ns = dt.dt.tz_convert(None).to_numpy().astype("datetime64[ns]").view(np.int64)
+    out = np.full(len(values), np.iinfo(np.int64).min, dtype=np.int64)
+    valid = dt.notna().to_numpy()
+    out[valid] = np.floor_divide(ns[valid], 1_000_000)
+    return out
+
+
+def bucket_start_ms(ts_ms, scale_value: int, scale_unit: str):
+    """
+    Vectorized getBucketTimestamp: map epoch-ms timestamps to the epoch-ms
+    start of their bucket.
+    """
+    np, _ = _require_pandas()
+    value, unit = _check_scale(scale_value, scale_unit)
+    ts = np.asarray(ts_ms, dtype=np.int64)
+    if unit in _UNIT_MS:
+        step = value * _UNIT_MS[unit]
+        return np.floor_divide(ts, step) * step
+    dt = ts.astype("datetime64[ms]")
+    if unit == "month":
+        idx = dt.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+        start = np.floor_divide(idx, value) * value
+        return (start - 1970 * 12).astype("datetime64[M]").astype("datetime64[ms]").astype(np.int64)
+    year = dt.astype("datetime64[Y]").astype(np.int64) + 1970
+    start_year = np.floor_divide(year, value) * value
+    return (start_year - 1970).astype("datetime64[Y]").astype("datetime64[ms]").astype(np.int64)
+
+
+def _segment_bounds(np, keys):
+    """keys must be sorted; returns (unique keys, segment starts, segment sizes)."""
+    if len(keys) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return keys[:0], empty, empty
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    return keys[starts], starts, sizes
+
+
+def _sequential_sum(np, vals, starts, sizes):
+    """
+    Per-segment sum accumulated left to right from 0.0 (same rounding as the
+    console's Array.reduce). Work is O(N): segments longer than
+    _SMALL_SEGMENT take one np.cumsum each (which is sequential), the rest
+    are summed column by column across segments.
+    """
+    out = np.zeros(len(starts), dtype="float64")
+    if not len(starts):
+        return out
+    large = sizes > _SMALL_SEGMENT
+    for idx in np.flatnonzero(large):
+        start = int(starts[idx])
+        # + 0.0: reduce starts from 0.0, so an all -0.0 segment sums to 0.0
+        out[idx] = np.cumsum(vals[start : start + int(sizes[idx])])[-1] + 0.0
+    small = np.flatnonzero(~large)
+    if not len(small):
+        return out
+    order = small[np.argsort(-sizes[small], kind="stable")]
+    sizes_desc = sizes[order]
+    starts_desc = starts[order]
+    neg_sizes = -sizes_desc
+    for k in range(int(sizes_desc[0])):
+        m = int(np.searchsorted(neg_sizes, -k, side="left"))
+        out[order[:m]] += vals[starts_desc[:m] + k]
+    return out
+
+
+def _aggregate_segments(np, vals, starts, sizes, method: str, percentile: float):
+    if method == "mean":
+        return _sequential_sum(np, vals, starts, sizes) / sizes
+    if method == "min":
+        return np.minimum.reduceat(vals, starts) if len(starts) else vals[:0]
+    if method == "max":
+        return np.maximum.reduceat(vals, starts) if len(starts) else vals[:0]
+    q = 50.0 if method == "median" else float(percentile)
+    # values are sorted within each segment
+    pos = (sizes - 1) * (q / 100.0)
+    lower = np.floor(pos).astype(np.int64)
+    upper = np.ceil(pos).astype(np.int64)
+    lo_val = vals[starts + lower]
+    hi_val = vals[starts + upper]
+    weight = pos - lower
+    interp = lo_val * (1 - weight) + hi_val * weight
+    return np.where(lower == upper, lo_val, interp)
+
+
+def _aggregate_column(np, bucket_keys, col_vals, method: str, percentile: float):
+    """
+    Aggregate one column given per-row bucket keys (rows in input order).
+    Returns (bucket keys present, aggregates) for buckets with finite values.
+    """
+    finite = np.isfinite(col_vals)
+    keys = bucket_keys[finite]
+    vals = col_vals[finite]
+    # percentiles need values sorted inside a bucket; everything else keeps
+    # input order (a stable sort), which mean needs to round like the console
+    sort_values = method in ("median", "percentile")
+    order = np.lexsort((vals, keys)) if sort_values else np.argsort(keys, kind="stable")
+    keys = keys[order]
+    vals = vals[order]
+    uniq, starts, sizes = _segment_bounds(np, keys)
+    aggs = _aggregate_segments(np, vals, starts, sizes, method, percentile)
+    return uniq, aggs
+
+
+def _prepare(data: Any, timestamp_key: str, columns: Sequence[str] | None):
+    np, pd = _require_pandas()
+    if isinstance(data, pd.DataFrame):
+        frame = data
+    else:
+        rows = []
+        for rec in data or []:
+            if not isinstance(rec, Mapping):
+                continue
+            row = dict(rec)
+            nested = row.pop("values", None)
+            if isinstance(nested, Mapping):
+                row.update(nested)
+            rows.append(row)
+        frame = pd.DataFrame(rows)
+    if timestamp_key not in frame.columns:
+        for fallback in ("ts", "timestamp"):
+            if fallback in frame.columns:
+                timestamp_key = fallback
+                break
+        else:
+            raise ValueError(f"timestamp column {timestamp_key!r} not found")
+    if columns is None:
+        columns = [
+            str(col)
+            for col in frame.columns
+            if col != timestamp_key
+            and pd.api.types.is_numeric_dtype(frame[col])
+            and not pd.api.types.is_bool_dtype(frame[col])
+        ]
+    ts_ms = to_epoch_ms(frame[timestamp_key].tolist())
+    cols: dict[str, Any] = {}
+    for col in columns:
+        if col in frame.columns:
+            cols[str(col)] = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return ts_ms, cols
+
+
+def aggregate_columns(
+    ts_ms,
+    columns: Mapping[str, Any],
+    *,
+    scale_value: int,
+    scale_unit: str,
+    method: str = "mean",
+    percentile: float | None = 50.0,
+    value_key: str = "value",
+    drop_invalid_rows: bool = True,
+):
+    """
+    Columnar core: aggregate float columns over epoch-ms timestamps.
+
+    Returns (bucket_ts_ms, {column: float array}) sorted by bucket, with NaN
+    where a bucket has no finite value for a column. With drop_invalid_rows
+    (the console's buildBaseData behaviour), rows whose value_key is not
+    finite are ignored for every column.
+    """
+    np, _ = _require_pandas()
+    scale_value, scale_unit = _check_scale(scale_value, scale_unit)
+    method = _check_method(method)
+    q = 50.0 if percentile is None else float(percentile)
+    if not 0.0 <= q <= 100.0:
+        raise ValueError("percentile must be within [0, 100]")
+    if value_key not in columns:
+        raise ValueError(f"value_key {value_key!r} is not one of the aggregated columns")
+
+    ts = np.asarray(ts_ms, dtype=np.int64)
+    keep = ts != np.iinfo(np.int64).min
+    if drop_invalid_rows:
+        keep &= np.isfinite(np.asarray(columns[value_key], dtype="float64"))
+    ts = ts[keep]
+    bucket_keys = bucket_start_ms(ts, scale_value, scale_unit)
+
+    per_col: dict[str, tuple[Any, Any]] = {}
+    for col, vals in columns.items():
+        per_col[col] = _aggregate_column(np, bucket_keys, np.asarray(vals, dtype="float64")[keep], method, q)
+
+    value_keys, value_aggs = per_col[value_key]
+    valid = np.isfinite(value_aggs)
+    buckets = value_keys[valid]
+    out: dict[str, Any] = {}
+    for col, (keys, aggs) in per_col.items():
+        full = np.full(len(buckets), np.nan)
+        if len(buckets):
+            pos = np.minimum(np.searchsorted(buckets, keys), len(buckets) - 1)
+            hit = buckets[pos] == keys
+            full[pos[hit]] = aggs[hit]
+        full[~np.isfinite(full)] = np.nan
+        out[col] = full
+    return buckets, out
+
+
+def aggregate_frame(
+    data: Any,
+    *,
+    scale_value: int,
+    scale_unit: str,
+    method: str = "mean",
+    percentile: float | None = 50.0,
+    value_key: str = "value",
+    timestamp_key: str = "ts",
+    columns: Sequence[str] | None = None,
+):
+    """
+    Aggregate a DataFrame or a sequence of records (flat, or console-shaped
+    with a nested "values" mapping) and return a DataFrame with a UTC "ts"
+    column, a "value" column (the aggregated value_key) and one column per
+    aggregated numeric column. Numeric columns are detected when columns is None.
+    """
+    np, pd = _require_pandas()
+    ts_ms, cols = _prepare(data, timestamp_key, columns)
+    if value_key not in cols:
+        raise ValueError(f"value_key {value_key!r} is not a numeric column")
+    buckets, out = aggregate_columns(
+        ts_ms,
+        cols,
+        scale_value=scale_value,
+        scale_unit=scale_unit,
+        method=method,
+        percentile=percentile,
+        value_key=value_key,
+    )
+    return _to_frame(np, pd, buckets, out, value_key)
+
+
+def _to_frame(np, pd, buckets, out: Mapping[str, Any], value_key: str):
+    frame: dict[str, Any] = {
+        "ts": pd.to_datetime(np.asarray(buckets, dtype=np.int64), unit="ms", utc=True),
+        "value": out[value_key],
+    }
+    for col, vals in out.items():
+        if col in ("ts", "value"):
+            continue
+        frame[col] = vals
+    return pd.DataFrame(frame)
+
+
+def aggregate_records(
+    data: Any,
+    *,
+    scale_value: int,
+    scale_unit: str,
+    method: str = "mean",
+    percentile: float | None = 50.0,
+    value_key: str = "value",
+    timestamp_key: str = "ts",
+    columns: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Same as aggregate_frame but returns console-shaped records:
+    {"ts": UTC datetime, "value": float, "values": {column: float}} where
+    "values" only lists columns with at least one finite value in the bucket.
+    """
+    frame = aggregate_frame(
+        data,
+        scale_value=scale_value,
+        scale_unit=scale_unit,
+        method=method,
+        percentile=percentile,
+        value_key=value_key,
+        timestamp_key=timestamp_key,
+        columns=columns,
+    )
+    return _frame_to_records(frame)
+
+
+def _frame_to_records(frame) -> list[dict[str, Any]]:
+    value_cols = [col for col in frame.columns if col not in ("ts", "value")]
+    out: list[dict[str, Any]] = []
+    ts_list = frame["ts"].dt.to_pydatetime() if len(frame) else []
+    col_data = {col: frame[col].tolist() for col in value_cols}
+    for i, value in enumerate(frame["value"].tolist()):
+        values = {col: col_data[col][i] for col in value_cols if col_data[col][i] == col_data[col][i]}
+        out.append({"ts": ts_list[i], "value": value, "values": values})
+    return out
+
+
+def scales_nest(fine: tuple[int, str], coarse: tuple[int, str]) -> bool:
+    """
+    True when every bucket of the fine scale lies entirely inside one bucket
+    of the coarse scale, so coarse min/max can be built from fine aggregates.
+    """
+    f_val, f_unit = _check_scale(*fine)
+    c_val, c_unit = _check_scale(*coarse)
+    if f_unit in _UNIT_MS:
+        f_step = f_val * _UNIT_MS[f_unit]
+        if c_unit in _UNIT_MS:
+            return (c_val * _UNIT_MS[c_unit]) % f_step == 0
+        return _DAY_MS % f_step == 0
+    if c_unit in _UNIT_MS:
+        return False
+    if f_unit == "month":
+        if c_unit == "month":
+            return c_val % f_val == 0
+        return 12 % f_val == 0
+    return c_unit == "year" and c_val % f_val == 0
+
+
+def _scale_span_ms(scale: tuple[int, str]) -> float:
+    value, unit = _check_scale(*scale)
+    if unit in _UNIT_MS:
+        return float(value * _UNIT_MS[unit])
+    return value * (31 * _DAY_MS if unit == "month" else 366 * _DAY_MS)
+
+
+def aggregate_scales(
+    data: Any,
+    scales: Sequence[tuple[int, str]],
+    *,
+    method: str = "mean",
+    percentile: float | None = 50.0,
+    value_key: str = "value",
+    timestamp_key: str = "ts",
+    columns: Sequence[str] | None = None,
+    cascade: bool = True,
+) -> dict[tuple[int, str], Any]:
+    """
+    Aggregate the same data to several scales and return {(value, unit): DataFrame}.
+
+    Timestamps and columns are parsed once. With cascade=True and a method
+    whose result is exact under re-aggregation (min, max), each scale is built
+    from the finest already-computed scale that nests inside it instead of
+    from the raw rows. Mean, median and percentile always read the raw rows so
+    results stay identical to the console.
+    """
+    np, pd = _require_pandas()
+    method = _check_method(method)
+    ts_ms, cols = _prepare(data, timestamp_key, columns)
+    if value_key not in cols:
+        raise ValueError(f"value_key {value_key!r} is not a numeric column")
+
+    ordered = sorted({_check_scale(*scale) for scale in scales}, key=_scale_span_ms)
+    computed: dict[tuple[int, str], tuple[Any, dict[str, Any]]] = {}
+    for scale in ordered:
+        source_ts, source_cols, drop_rows = ts_ms, cols, True
+        if cascade and method in _CASCADABLE:
+            finer = [done for done in computed if scales_nest(done, scale)]
+            if finer:
+                # the closest nested scale has the fewest rows
+                base = max(finer, key=_scale_span_ms)
+                source_ts, source_cols = computed[base]
+                drop_rows = False
+        buckets, out = aggregate_columns(
+            source_ts,
+            source_cols,
+            scale_value=scale[0],
+            scale_unit=scale[1],
+            method=method,
+            percentile=percentile,
+            value_key=value_key,
+            drop_invalid_rows=drop_rows,
+        )
+        computed[scale] = (buckets, out)
+
+    return {(value, unit): _to_frame(np, pd, *computed[_check_scale(value, unit)], value_key) for value, unit in scales}
@@ -0,0 +1,392 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .aggregation import _check_method, _check_scale, aggregate_columns, to_epoch_ms
+from .timeframe import _GraphRunner, _node_alias
+
+# Batch runner behind `python -m htf run`: apply console signal templates
+# (apps/templates/*.json) to many CSV/XLSX files. Each file is handled by
+# one worker process: the timestamp and value columns are read in chunks
+# (only those two columns are kept, as int64 epoch ms and float64), the
+# series is aggregated like the console (htf.aggregation), and every
+# template graph is evaluated over the aggregated records. One output file
+# is written per input file and template, named <input stem>.<template>.<ext>
+# in output_dir under the input's directory relative to the deepest
+# directory common to all inputs (so data/a/x.csv and data/b/x.csv give
+# a/x.* and b/x.*); inputs or templates that would still write the same
+# file (x.csv and x.xlsx side by side) are rejected before anything runs.
+# Each output holds the bucket timestamp, the aggregated value and one 0/1
+# column per signal node (named by alias, the template root last). Errors
+# are reported per file and do not stop the batch.
+
+OUTPUT_FORMATS = ("csv", "parquet")
+_EXCEL_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+
+
+def _require_pandas():
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for htf.batch") from exc
+    return np, pd
+
+
+def _require_parquet() -> None:
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+            return
+        except ImportError:
+            continue
+    raise RuntimeError("parquet output requires pyarrow or fastparquet")
+
+
+def load_templates(paths: Iterable[str | os.PathLike[str]]) -> list[dict[str, Any]]:
+    """
+    Templates ({"name", "root", ...}) from console template files: the
+    console export ({"templates": [...]}), a list of templates, or a single
+    template. Names must be unique across files.
+    """
+    templates: list[dict[str, Any]] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, Mapping) and "templates" in data:
+            data = data["templates"]
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if not isinstance(item, Mapping) or not isinstance(item.get("root"), Mapping):
+                raise ValueError(f"{os.fspath(path)}: template without a root signal")
+            template = dict(item)
+            template["name"] = str(template.get("name") or _node_alias(template["root"]))
+            templates.append(template)
+    names = [template["name"] for template in templates]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate template names: {duplicates}")
+    return templates
+
+
+def template_graph(template: Mapping[str, Any], value_key: str) -> list[dict[str, Any]]:
+    """
+    Signal graph roots of a template, as the console builds them when a
+    template is applied: node ids are assigned (depth-first, "n0", "n1", ...)
+    and the column parameter value_key, which templates do not store, is
+    set to value_key.
+    """
+    counter = itertools.count()
+
+    def build(node: Mapping[str, Any]) -> dict[str, Any]:
+        params = dict(node.get("params") or {})
+        if "value_key" not in params or params["value_key"] in (None, ""):
+            params["value_key"] = value_key
+        out = {
+            "id": f"n{next(counter)}",
+            "type": str(node.get("type")),
+            "alias": _node_alias(node),
+            "params": params,
+            "children": {},
+        }
+        for name, children in (node.get("children") or {}).items():
+            if isinstance(children, Mapping):
+                children = [children]
+            out["children"][name] = [build(child) for child in children or [] if isinstance(child, Mapping)]
+        return out
+
+    return [build(template["root"])]
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[str]:
+    """Files matching the glob patterns (recursive "**" allowed), sorted, without duplicates."""
+    files: list[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern), recursive=True))
+        files.extend(path for path in matches if os.path.isfile(path))
+    files = list(dict.fromkeys(files))
+    if not files:
+        raise ValueError(f"no input files match {list(patterns)}")
+    return files
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "signal"
+
+
+def _output_stems(files: Sequence[str]) -> list[str]:
+    """<relative dir>/<input stem> of each file under the directory common to all of them."""
+    dirs = [os.path.dirname(os.path.abspath(path)) for path in files]
+    root = os.path.commonpath(dirs)
+    stems = []
+    for path, directory in zip(files, dirs):
+        stem = os.path.basename(path)
+        for suffix in (".gz", ".bz2", ".zip", ".xz"):
+            stem = stem[: -len(suffix)] if stem.lower().endswith(suffix) else stem
+        stem = os.path.splitext(stem)[0]
+        stems.append(os.path.normpath(os.path.join(os.path.relpath(directory, root), stem)))
+    return stems
+
+
+@dataclass
+class FileResult:
+    """
+    Outcome of one input file: rows read, aggregated buckets, seconds spent
+    reading, aggregating and per template (evaluation + write), and the
+    written paths; error is set (and the rest partial) when the file failed.
+    """
+
+    path: str
+    rows: int = 0
+    buckets: int = 0
+    read_seconds: float = 0.0
+    aggregate_seconds: float = 0.0
+    signal_seconds: dict[str, float] = field(default_factory=dict)
+    outputs: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def total_seconds(self) -> float:
+        return self.read_seconds + self.aggregate_seconds + sum(self.signal_seconds.values())
+
+
+@dataclass
+class BatchReport:
+    """Per-file results of run_batch, in input order, with the wall time and process count."""
+
+    files: list[FileResult]
+    processes: int
+    wall_seconds: float
+
+    @property
+    def failed(self) -> list[FileResult]:
+        return [result for result in self.files if result.error is not None]
+
+    def signal_totals(self) -> dict[str, dict[str, float]]:
+        """Per template: files, buckets and seconds summed over the successful files."""
+        totals: dict[str, dict[str, float]] = {}
+        for result in self.files:
+            if result.error is not None:
+                continue
+            for name, seconds in result.signal_seconds.items():
+                entry = totals.setdefault(name, {"files": 0, "buckets": 0, "seconds": 0.0})
+                entry["files"] += 1
+                entry["buckets"] += result.buckets
+                entry["seconds"] += seconds
+        return totals
+
+    def summary(self) -> str:
+        """Throughput and latency table per file and per signal template."""
+
+        def rate(count: float, seconds: float) -> str:
+            return f"{count / seconds:,.0f}" if seconds > 0 else "-"
+
+        width = max([len("file")] + [len(result.path) for result in self.files])
+        lines = [
+            f"{'file':<{width}}  {'rows':>10}  {'buckets':>8}  {'read s':>7}  {'agg s':>7}  "
+            f"{'signals s':>9}  {'total s':>7}  {'rows/s':>11}"
+        ]
+        for result in self.files:
+            if result.error is not None:
+                lines.append(f"{result.path:<{width}}  error: {result.error}")
+                continue
+            lines.append(
+                f"{result.path:<{width}}  {result.rows:>10,}  {result.buckets:>8,}  {result.read_seconds:>7.3f}  "
+                f"{result.aggregate_seconds:>7.3f}  {sum(result.signal_seconds.values()):>9.3f}  "
+                f"{result.total_seconds:>7.3f}  {rate(result.rows, result.total_seconds):>11}"
+            )
+        totals = self.signal_totals()
+        if totals:
+            width = max([len("signal")] + [len(name) for name in totals])
+            lines.append("")
+            lines.append(
+                f"{'signal':<{width}}  {'files':>5}  {'buckets':>10}  {'total s':>8}  {'ms/file':>8}  {'buckets/s':>11}"
+            )
+            for name, entry in totals.items():
+                lines.append(
+                    f"{name:<{width}}  {entry['files']:>5}  {entry['buckets']:>10,}  {entry['seconds']:>8.3f}  "
+                    f"{1000 * entry['seconds'] / entry['files']:>8.1f}  {rate(entry['buckets'], entry['seconds']):>11}"
+                )
+        ok = [result for result in self.files if result.error is None]
+        rows = sum(result.rows for result in ok)
+        lines.append("")
+        lines.append(
+            f"{len(ok)}/{len(self.files)} files, {rows:,} rows in {self.wall_seconds:.2f} s wall "
+            f"({self.processes} process{'es' if self.processes > 1 else ''}): {rate(rows, self.wall_seconds)} rows/s"
+        )
+        return "\n".join(lines)
+
+
+def _resolve_column(columns: Sequence[str], key: str, fallbacks: Sequence[str] = ()) -> str:
+    for name in (key, *fallbacks):
+        if name in columns:
+            return name
+    raise ValueError(f"column {key!r} not found")
+
+
+def _read_columns(path: str, timestamp_key: str, value_key: str, chunk_rows: int):
+    """(epoch-ms int64, float64 values) of the timestamp and value columns, read chunk by chunk for CSV."""
+    np, pd = _require_pandas()
+    if path.lower().endswith(_EXCEL_SUFFIXES):
+        head = pd.read_excel(path, nrows=0)
+        ts_col = _resolve_column(list(head.columns), timestamp_key, ("ts", "timestamp"))
+        val_col = _resolve_column(list(head.columns), value_key)
+        chunks: Iterable[Any] = [pd.read_excel(path, usecols=[ts_col, val_col])]
+    else:
+        head = pd.read_csv(path, nrows=0)
+        ts_col = _resolve_column(list(head.columns), timestamp_key, ("ts", "timestamp"))
+        val_col = _resolve_column(list(head.columns), value_key)
+        chunks = pd.read_csv(path, usecols=[ts_col, val_col], chunksize=chunk_rows)
+    ts_parts = []
+    value_parts = []
+    for chunk in chunks:
+        ts_parts.append(to_epoch_ms(chunk[ts_col].tolist()))
+        value_parts.append(pd.to_numeric(chunk[val_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan))
+    if not ts_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype="float64")
+    return np.concatenate(ts_parts), np.concatenate(value_parts)
+
+
+def _signal_frame(pd, graph: Sequence[Mapping[str, Any]], records, ts, values):
+    runner = _GraphRunner(graph, {})
+    outputs, _ = runner.run(records)
+    columns: dict[str, Any] = {"ts": ts, "value": values}
+    for node in runner.ordered:
+        name = _node_alias(node)
+        if name in columns:
+            name = f"{name}#{node['id']}"
+        columns[name] = outputs[str(node["id"])]
+    return pd.DataFrame(columns)
+
+
+def _run_file(job: tuple[str, str, list[dict[str, Any]], dict[str, Any]]) -> FileResult:
+    path, stem, templates, settings = job
+    result = FileResult(path)
+    try:
+        np, pd = _require_pandas()
+        started = time.perf_counter()
+        ts_ms, values = _read_columns(path, settings["timestamp_key"], settings["value_key"], settings["chunk_rows"])
+        result.rows = len(ts_ms)
+        result.read_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        buckets, out = aggregate_columns(
+            ts_ms,
+            {"value": values},
+            scale_value=settings["scale_value"],
+            scale_unit=settings["scale_unit"],
+            method=settings["method"],
+            percentile=settings["percentile"],
+        )
+        aggregated = out["value"]
+        value_key = settings["value_key"]
+        records = [{"value": value, "values": {value_key: value}} for value in aggregated.tolist()]
+        ts = pd.to_datetime(np.asarray(buckets, dtype=np.int64), unit="ms", utc=True)
+        result.buckets = len(records)
+        result.aggregate_seconds = time.perf_counter() - started
+
+        fmt = settings["output_format"]
+        os.makedirs(os.path.dirname(os.path.join(settings["output_dir"], stem)), exist_ok=True)
+        for template in templates:
+            started = time.perf_counter()
+            frame = _signal_frame(pd, template_graph(template, value_key), records, ts, aggregated)
+            target = os.path.join(settings["output_dir"], f"{stem}.{_slug(template['name'])}.{fmt}")
+            if fmt == "parquet":
+                frame.to_parquet(target, index=False)
+            else:
+                frame.to_csv(target, index=False)
+            result.outputs.append(target)
+            result.signal_seconds[template["name"]] = time.perf_counter() - started
+    except Exception as exc:  # reported per file, the batch goes on
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def run_batch(
+    templates: Sequence[Mapping[str, Any]],
+    inputs: Sequence[str],
+    output_dir: str | os.PathLike[str],
+    *,
+    scale_value: int,
+    scale_unit: str,
+    method: str = "mean",
+    percentile: float | None = 50.0,
+    value_key: str = "value",
+    timestamp_key: str = "ts",
+    output_format: str = "csv",
+    processes: int | None = None,
+    chunk_rows: int = 1 << 20,
+) -> BatchReport:
+    """
+    Apply templates (see load_templates) to every input file (paths or glob
+    patterns) and write the signal outputs to output_dir; see the module
+    comment for the output layout.
+
+    - value_key / timestamp_key: input columns aggregated and used as bucket
+      time (timestamp_key falls back to "ts" / "timestamp").
+    - processes: worker processes (default: CPU count, at most one per
+      file); 1 runs in this process.
+    - chunk_rows: CSV rows parsed per chunk.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+    if not templates:
+        raise ValueError("no templates given")
+    _require_pandas()
+    if output_format == "parquet":
+        _require_parquet()
+    scale_value, scale_unit = _check_scale(scale_value, scale_unit)
+    files = expand_inputs(inputs)
+    stems = _output_stems(files)
+    seen: dict[str, str] = {}
+    for path, stem in zip(files, stems):
+        key = os.path.normcase(stem)
+        if key in seen:
+            raise ValueError(f"inputs {seen[key]} and {path} would write the same outputs ({stem}.*)")
+        seen[key] = path
+    slugs: dict[str, str] = {}
+    for template in templates:
+        slug = os.path.normcase(_slug(template["name"]))
+        if slug in slugs:
+            raise ValueError(f"templates {slugs[slug]!r} and {template['name']!r} would write the same outputs")
+        slugs[slug] = template["name"]
+    os.makedirs(output_dir, exist_ok=True)
+    settings = {
+        "scale_value": scale_value,
+        "scale_unit": scale_unit,
+        "method": _check_method(method),
+        "percentile": percentile,
+        "value_key": value_key,
+        "timestamp_key": timestamp_key,
+        "output_format": output_format,
+        "output_dir": os.fspath(output_dir),
+        "chunk_rows": int(chunk_rows),
+    }
+    template_list = [dict(template) for template in templates]
+    jobs = [(path, stem, template_list, settings) for path, stem in zip(files, stems)]
+    n_proc = max(1, min(int(processes or os.cpu_count() or 1), len(files)))
+
+    started = time.perf_counter()
+    if n_proc == 1:
+        results = [_run_file(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(max_workers=n_proc, mp_context=context) as pool:
+            results = list(pool.map(_run_file, jobs))
+    return BatchReport(results, n_proc, time.perf_counter() - started)
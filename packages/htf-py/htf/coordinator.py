@@ -2,10 +2,13 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
+from collections import deque
 from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
+from .time_index import to_epoch_ns
+
 
 @dataclass
 class TimeframeState:
@@ -23,6 +26,14 @@ class MultiScaleCoordinator:
     ) -> dict[str, Any]:
         raise NotImplementedError
 
+    def state_horizon(self) -> int | None:
+        """
+        Past records (beyond the current states) that update() depends on. The
+        built-in coordinators are stateless; subclasses that keep memory
+        return its length, or None if unbounded.
+        """
+        return 0
+
 
 class SimpleHTFCoordinator(MultiScaleCoordinator):
     def update(
@@ -117,7 +128,9 @@ class HierarConstraintCoordinator(MultiScaleCoordinator):
         gated_map = {name: (raw_map[name] if allow_map.get(name, True) else 0) for name in raw_map}
         return {"allow_map": allow_map, "raw_map": raw_map, "gated_map": gated_map}
 
-    def build_gate_masks_from_series(self, series_list: Sequence[Mapping[str, Any]]) -> dict[str, list[bool]]:
+    def build_gate_masks_from_series(
+        self, series_list: Sequence[Mapping[str, Any]], *, epoch_ns: bool = False
+    ) -> dict[str, list[bool]]:
         """
         Build per-series hierarchy constraint masks using downward flags from coarser series.
         Each series entry should provide:
@@ -125,6 +138,9 @@ class HierarConstraintCoordinator(MultiScaleCoordinator):
           - timestamps or data (list of records with "ts")
           - downward_flags (optional list of bool/int flags)
         If downward_flags is missing, the series is treated as unconstrained.
+        With epoch_ns, timestamps are converted once to int epoch nanoseconds
+        (htf.time_index.to_epoch_ns) so series with different timestamp
+        types compare as ints.
         """
         if not series_list:
             return {}
@@ -135,6 +151,8 @@ class HierarConstraintCoordinator(MultiScaleCoordinator):
             if not timestamps:
                 data = series.get("data") or []
                 timestamps = [rec.get("ts") for rec in data if isinstance(rec, Mapping) and "ts" in rec]
+            if epoch_ns:
+                timestamps = [to_epoch_ns(ts) for ts in timestamps]
             flags = series.get("downward_flags")
             windows = None
             if flags is not None:
@@ -157,3 +175,154 @@ class HierarConstraintCoordinator(MultiScaleCoordinator):
                 mask = [mask[i] and parent_mask[i] for i in range(len(mask))]
             masks[entry["id"]] = mask
         return masks
+
+    def gate_mask_stream(self, series_ids: Sequence[str] | None = None, *, epoch_ns: bool = False) -> GateMaskStream:
+        """
+        Incremental counterpart of build_gate_masks_from_series for growing
+        series; series_ids (coarsest first) defaults to the coordinator order.
+        """
+        return GateMaskStream(series_ids if series_ids is not None else self.order, epoch_ns=epoch_ns)
+
+
+class _GateSeries:
+    def __init__(self) -> None:
+        self.flagged: bool | None = None  # unknown until the first append
+        self.timestamps: list[Any] = []
+        self.flags: list[bool] = []
+        self.base = 0  # absolute index of timestamps[0] after trimming
+        self.pending: deque[Any] = deque()  # own timestamps whose mask is not final yet
+        self.cursors: dict[str, int] = {}  # parent id -> absolute index of its first timestamp >= pending[0]
+
+
+class GateMaskStream:
+    """
+    Streaming build_gate_masks_from_series: append(series_id, timestamps,
+    flags) takes the points added to one series and returns the mask
+    entries that became final, per series. Concatenated, each series'
+    entries equal the batch mask over the same points; an append costs
+    O(new points) instead of recomputing every window.
+
+    A child timestamp t is final once every flagged coarser series reaches
+    t: it then lies in a window iff the coarser point at t is truthy, or
+    the points just before and after t are both truthy (same run). Until
+    then it stays pending. A series appended with flags=None is
+    unconstrained, as a series without downward_flags in the batch call.
+    Timestamps must be strictly ascending per series.
+    """
+
+    _TRIM = 4096
+
+    def __init__(self, series_ids: Sequence[str], *, epoch_ns: bool = False) -> None:
+        if not series_ids:
+            raise ValueError("series_ids must not be empty")
+        self.order = [str(series_id) for series_id in series_ids]
+        if len(set(self.order)) != len(self.order):
+            raise ValueError("series_ids must be unique")
+        self.epoch_ns = epoch_ns
+        self._series = {series_id: _GateSeries() for series_id in self.order}
+        self._position = {series_id: idx for idx, series_id in enumerate(self.order)}
+
+    def pending(self, series_id: str) -> int:
+        """Points of series_id whose mask entry is not final yet."""
+        return len(self._series[series_id].pending)
+
+    def append(
+        self, series_id: str, timestamps: Sequence[Any], flags: Sequence[Any] | None = None
+    ) -> dict[str, list[bool]]:
+        """
+        Add points to series_id (with their downward flags, or None for an
+        unconstrained series) and return the new final mask entries of every
+        series they settle.
+        """
+        if series_id not in self._series:
+            raise ValueError(f"unknown series {series_id!r}")
+        state = self._series[series_id]
+        flagged = flags is not None
+        if state.flagged is not None and state.flagged != flagged:
+            raise ValueError(f"series {series_id!r} mixes flagged and unflagged appends")
+        if flagged and len(flags) != len(timestamps):
+            raise ValueError("flags and timestamps must have the same length")
+        new_ts = [to_epoch_ns(ts) for ts in timestamps] if self.epoch_ns else list(timestamps)
+        last = state.timestamps[-1] if state.timestamps else None
+        for ts in new_ts:
+            if last is not None and not ts > last:
+                raise ValueError(f"series {series_id!r}: timestamp {ts!r} is not after {last!r}")
+            last = ts
+        state.flagged = flagged
+        state.timestamps.extend(new_ts)
+        if flagged:
+            state.flags.extend(bool(flag) for flag in flags)
+        state.pending.extend(new_ts)
+
+        out: dict[str, list[bool]] = {}
+        for child_id in self.order[self._position[series_id] :]:
+            entries = self._settle(child_id)
+            if entries:
+                out[child_id] = entries
+        self._trim()
+        return out
+
+    def flush(self) -> dict[str, list[bool]]:
+        """
+        Finalize all pending entries as build_gate_masks_from_series would on
+        the points appended so far (timestamps beyond a coarser series are
+        outside its windows); call at the end of a stream.
+        """
+        out: dict[str, list[bool]] = {}
+        for child_id in self.order:
+            entries = self._settle(child_id, final=True)
+            if entries:
+                out[child_id] = entries
+        return out
+
+    def _settle(self, child_id: str, final: bool = False) -> list[bool]:
+        child = self._series[child_id]
+        parents = [(pid, self._series[pid]) for pid in self.order[: self._position[child_id]]]
+        entries: list[bool] = []
+        pending = child.pending
+        while pending:
+            ts = pending[0]
+            allowed = True
+            for parent_id, parent in parents:
+                if parent.flagged is None:
+                    if final:
+                        continue
+                    return entries
+                if not parent.flagged:
+                    continue
+                p_ts = parent.timestamps
+                if not p_ts or ts > p_ts[-1]:
+                    if final:
+                        allowed = False
+                        continue
+                    return entries
+                base = parent.base
+                pos = max(child.cursors.get(parent_id, base), base) - base
+                while p_ts[pos] < ts:
+                    pos += 1
+                child.cursors[parent_id] = pos + base
+                if p_ts[pos] == ts:
+                    inside = parent.flags[pos]
+                else:
+                    inside = pos > 0 and parent.flags[pos - 1] and parent.flags[pos]
+                allowed = allowed and inside
+            entries.append(allowed)
+            pending.popleft()
+        return entries
+
+    def _trim(self) -> None:
+        # drop coarser points every child cursor has moved past (the point
+        # just before a cursor is still needed for the run check)
+        for idx, series_id in enumerate(self.order):
+            state = self._series[series_id]
+            if len(state.timestamps) < self._TRIM:
+                continue
+            keep = state.base + len(state.timestamps) - 1
+            if state.flagged:
+                for child_id in self.order[idx + 1 :]:
+                    keep = min(keep, self._series[child_id].cursors.get(series_id, state.base) - 1)
+            drop = keep - state.base
+            if drop >= len(state.timestamps) // 2:
+                del state.timestamps[:drop]
+                del state.flags[:drop]
+                state.base += drop
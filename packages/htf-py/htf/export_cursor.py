@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .timeframe import (
+    TimeframeView,
+    _build_evaluation_order,
+    _build_signal_defs_map,
+    _build_timestamp_columns,
+    _detect_time_columns,
+    _find_target_node,
+    _GraphRunner,
+    _node_alias,
+    _resolve_graph_roots,
+)
+
+# Incremental export: an ExportCursor remembers the absolute position of the
+# last exported record of a TimeframeView (records_seen counts every record
+# ever buffered, so positions survive max_buffer trimming) and keeps the
+# signal graph runner alive between exports. Each export() evaluates only the
+# records appended since the previous one, so a periodic exporter costs time
+# proportional to the new rows. Concatenating the frames gives the same
+# columns and values as one export_signal_dataframe over the same records.
+
+
+def _require_pandas():
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for htf.export_cursor") from exc
+    return pd
+
+
+@dataclass
+class ExportCursor:
+    """
+    Cursor over the records of view, exporting the columns of
+    export_signal_dataframe for new records only (hierarchy constraint
+    series are not supported). Create it with TimeframeView.export_cursor.
+
+    - The cursor starts at the oldest buffered record, or after the newest
+      one with skip_existing (the buffered records then only warm up the
+      signal state).
+    - Time columns and the timestamp key are detected on the first
+      non-empty export and kept for the following ones.
+    - Records trimmed from the buffer (max_buffer) before they were
+      exported cannot be recovered: they are counted in missed_rows and the
+      signal state continues without them.
+    - Frames are indexed by absolute record position (0 = first record the
+      view buffered since its last reset). A view.reset() between exports
+      restarts the cursor from the new records with fresh signal state.
+    """
+
+    view: TimeframeView
+    signal_type: str
+    signal_alias: str
+    include_dependencies: bool = False
+    include_values: bool = False
+    signal_graph: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None
+    signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None
+    timestamp_key: str = "timestamp"
+    share_computations: bool = True
+    skip_existing: bool = False
+
+    position: int = field(default=0, init=False)
+    missed_rows: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        if (self.include_dependencies or self.include_values) and not self.signal_graph:
+            raise ValueError("signal_graph is required when include_dependencies or include_values is True")
+        roots = _resolve_graph_roots(self.signal_graph)
+        self._target_node = _find_target_node(roots, self.signal_type, self.signal_alias)
+        self._defs_map = _build_signal_defs_map(self.signal_defs)
+        self._dep_nodes: list[Mapping[str, Any]] = []
+        if self._target_node is not None:
+            self._dep_nodes = _build_evaluation_order([self._target_node])[:-1]
+        self.reset(skip_existing=self.skip_existing)
+
+    def reset(self, *, skip_existing: bool = False) -> None:
+        """Restart from the oldest buffered record (or after the newest) with fresh signal state."""
+        self._runner: _GraphRunner | None = None
+        if self._target_node is not None:
+            self._runner = _GraphRunner(
+                [self._target_node],
+                self._defs_map,
+                include_values=self.include_values,
+                share_computations=self.share_computations,
+            )
+        self._record_time_cols: list[str] = []
+        self._time_cols: list[str] | None = None
+        self._ts_key: str | None = None
+        self.missed_rows = 0
+        self._view_resets = self.view.reset_count
+        self.position = self.view.records_seen - len(self.view.buffer)
+        if skip_existing:
+            if self._runner is not None:
+                self._runner.run(self.view.buffer)
+            self.position = self.view.records_seen
+
+    @property
+    def pending(self) -> int:
+        """Records appended to the view since the last export."""
+        return max(0, self.view.records_seen - self.position)
+
+    def _new_records(self) -> list[Mapping[str, Any]]:
+        view = self.view
+        if view.reset_count != self._view_resets:
+            # the view was reset under the cursor (possibly refilled past position since)
+            self.reset()
+        buffer_start = view.records_seen - len(view.buffer)
+        if self.position < buffer_start:
+            self.missed_rows += buffer_start - self.position
+            self.position = buffer_start
+        return view.buffer[self.position - buffer_start :]
+
+    def export(self):
+        """
+        DataFrame of the records appended since the last export (all
+        buffered records on the first call) and advance the cursor.
+        frame.attrs["export_cursor"] holds the start position, row count and
+        missed_rows; frame.attrs["signal_graph_report"] the cumulative graph
+        report when a signal graph is evaluated.
+        """
+        pd = _require_pandas()
+        records = self._new_records()
+        start = self.position
+        n = len(records)
+        if self._time_cols is None and not records:
+            frame = pd.DataFrame()
+        else:
+            frame = pd.DataFrame(self._columns(records), index=pd.RangeIndex(start, start + n))
+        self.position = start + n
+        frame.attrs["export_cursor"] = {"start": start, "rows": n, "missed_rows": self.missed_rows}
+        if self._runner is not None:
+            frame.attrs["signal_graph_report"] = self._runner.report()
+        return frame
+
+    def _columns(self, records: Sequence[Mapping[str, Any]]) -> dict[str, list[Any]]:
+        if self._time_cols is None:
+            self._record_time_cols = _detect_time_columns(records)
+            self._time_cols = self._record_time_cols
+            ts_key_candidates = [self.timestamp_key] if self.timestamp_key else []
+            ts_key_candidates.extend(["timestamp", "ts"])
+            self._ts_key = next((key for key in ts_key_candidates if any(key in rec for rec in records)), None)
+
+        computed_time_cols: dict[str, list[Any]] = {}
+        if self._ts_key and records:
+            timestamps = [rec.get(self._ts_key) for rec in records]
+            self._time_cols, computed_time_cols = _build_timestamp_columns(timestamps, self._record_time_cols)
+
+        column_data: dict[str, list[Any]] = {}
+        for col in self._time_cols:
+            if col in computed_time_cols:
+                column_data[col] = computed_time_cols[col]
+            else:
+                column_data[col] = [rec.get(col) for rec in records]
+
+        if self._runner is None:
+            column_data[self.signal_type] = [
+                1 if bool(rec.get(self.signal_alias, rec.get(self.signal_type, 0))) else 0 for rec in records
+            ]
+            return column_data
+
+        outputs, value_data = self._runner.run(records)
+        if self.include_dependencies:
+            for node in self._dep_nodes:
+                column_data[_node_alias(node)] = outputs[str(node.get("id"))]
+        column_data[self.signal_type] = outputs[str(self._target_node.get("id"))]
+        for col in self._runner.value_order:
+            column_data[col] = value_data[col]
+        return column_data
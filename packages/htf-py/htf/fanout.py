@@ -0,0 +1,465 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .timeframe import (
+    _build_evaluation_order,
+    _build_node_dependencies,
+    _build_signal_defs_map,
+    _graph_options,
+    _node_alias,
+    _signal_class_map,
+)
+
+# Column fan-out: evaluate one signal graph template over many value columns
+# in a single pass. The feature named fan_key (default "value") takes the
+# value of each column in turn; every other feature is shared by all columns.
+# Node types in FANOUT_VECTOR_TYPES keep their per-column state in numpy
+# arrays (one row of work per record, whatever the number of columns); other
+# types fall back to one signal instance per column in the same pass.
+#
+# Column values are read as numbers: non-numeric values (None, strings,
+# booleans) and NaN count as missing, like None for the scalar signals.
+
+FANOUT_VECTOR_TYPES = (
+    "ValueVsRollingPercentile",
+    "ValueVsRollingPercentileWithThreshold",
+    "SignalEMAFastSlowComparison",
+    "SignalEMADiffVsHistoryPercentile",
+    "SignalRunLengthReached",
+    "SignalRunInterrupted",
+    "SignalValueVsPrevious",
+    "SignalIntersection",
+    "SignalExternalFlag",
+)
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("numpy is required for htf.fanout") from exc
+    return np
+
+
+def _num(raw: Any) -> float:
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return float(raw)
+    return math.nan
+
+
+class _RollingSorted:
+    """
+    Last `length` values of each column, kept sorted per column in a
+    (length + 1, n) array padded with NaN, plus a ring of arrival order for
+    expiry. Insert and delete are masked shifts, O(length * n) per step.
+    """
+
+    def __init__(self, np: Any, length: int, n: int) -> None:
+        self.np = np
+        self.length = length
+        self.sorted = np.full((length + 1, n), np.nan)
+        self.ring = np.full((length, n), np.nan)
+        self.pos = np.zeros(n, dtype=np.int64)
+        self.count = np.zeros(n, dtype=np.int64)
+        self._rows = np.arange(length + 1)[:, None]
+        self._cols = np.arange(n)
+
+    def _insert(self, vals: Any, mask: Any) -> Any:
+        np = self.np
+        s = self.sorted
+        k = np.where(mask, (s <= vals).sum(axis=0), len(s))
+        out = np.where(self._rows <= k, s, np.roll(s, 1, axis=0))
+        out[k[mask], self._cols[mask]] = vals[mask]
+        return out
+
+    def push(self, vals: Any, mask: Any) -> None:
+        np = self.np
+        self.sorted = self._insert(vals, mask)
+        full = mask & (self.count == self.length)
+        if full.any():
+            old = self.ring[self.pos, self._cols]
+            j = np.where(full, (self.sorted < old).sum(axis=0), len(self.sorted))
+            up = np.roll(self.sorted, -1, axis=0)
+            up[-1] = np.nan
+            self.sorted = np.where(self._rows < j, self.sorted, up)
+        cols = self._cols[mask]
+        self.ring[self.pos[mask], cols] = vals[mask]
+        self.pos[mask] = (self.pos[mask] + 1) % self.length
+        self.count = np.where(mask, np.minimum(self.count + 1, self.length), self.count)
+
+    def percentile(self, q: float, extra: Any = None) -> Any:
+        """Per-column percentile (compute_percentile interpolation); NaN where empty."""
+        np = self.np
+        if extra is None:
+            s, n = self.sorted, self.count
+        else:
+            has_extra = ~np.isnan(extra)
+            s = self._insert(extra, has_extra)
+            n = self.count + has_extra
+        idx_max = np.maximum(n - 1, 0)
+        if q <= 0:
+            lower = upper = np.zeros_like(n)
+            w = np.zeros(len(n))
+        elif q >= 100:
+            lower = upper = idx_max
+            w = np.zeros(len(n))
+        else:
+            pos = (n - 1) * (q / 100.0)
+            lower = np.floor(pos).astype(np.int64)
+            upper = np.ceil(pos).astype(np.int64)
+            w = pos - lower
+        lo = s[np.clip(lower, 0, None), self._cols]
+        up = s[np.clip(upper, 0, None), self._cols]
+        out = np.where(lower == upper, lo, lo * (1.0 - w) + up * w)
+        return np.where(n > 0, out, np.nan)
+
+
+class _Context:
+    """Feature access for one step, shared by all kernels."""
+
+    def __init__(self, np: Any, fan_key: str, n: int) -> None:
+        self.np = np
+        self.fan_key = fan_key
+        self.n = n
+        self.step = -1
+        self.row: Any = None
+        self.base: Mapping[str, Any] = {}
+        self.outputs: dict[str, Any] = {}
+        self._emas: dict[tuple[str, int], list[Any]] = {}
+
+    def numeric(self, key: str) -> Any:
+        if key in self.outputs:
+            return self.outputs[key].astype(float)
+        if key == self.fan_key:
+            return self.row
+        return self.np.full(self.n, _num(self.base.get(key)))
+
+    def equals(self, key: str, target: Any) -> Any:
+        np = self.np
+        if key in self.outputs or key == self.fan_key:
+            if isinstance(target, (int, float)):
+                return self.numeric(key) == target
+            return np.zeros(self.n, dtype=bool)
+        return np.full(self.n, self.base.get(key) == target)
+
+    def truthy(self, key: str) -> Any:
+        np = self.np
+        if key in self.outputs:
+            return self.outputs[key] != 0
+        if key == self.fan_key:
+            return ~np.isnan(self.row) & (self.row != 0)
+        return np.full(self.n, bool(self.base.get(key)))
+
+    def ema(self, value_key: str, period: int) -> Any:
+        """EMA(value_key, period) per column, advanced once per step (NaN until the first value)."""
+        np = self.np
+        state = self._emas.get((value_key, period))
+        if state is None:
+            state = self._emas[(value_key, period)] = [np.full(self.n, np.nan), -1]
+        if state[1] != self.step:
+            vals = self.numeric(value_key)
+            alpha = 2.0 / (period + 1.0)
+            cur = state[0]
+            new = np.where(np.isnan(cur), vals, vals * alpha + cur * (1.0 - alpha))
+            state[0] = np.where(np.isnan(vals), cur, new)
+            state[1] = self.step
+        return state[0]
+
+
+def _compare(np: Any, comparison: str, val: Any, threshold: Any) -> Any:
+    with np.errstate(invalid="ignore"):
+        return val > threshold if comparison == "gt" else val < threshold
+
+
+class _PercentileKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+        self.hist = _RollingSorted(np, inst.window_size, n)
+
+    def __call__(self, ctx: _Context) -> Any:
+        np, inst = ctx.np, self.inst
+        vals = ctx.numeric(inst.value_key)
+        valid = ~np.isnan(vals)
+        ready = valid & (self.hist.count >= inst.min_history)
+        threshold = self.hist.percentile(inst.percentile, vals if inst.include_current else None)
+        threshold = np.where(ready, threshold, np.nan)
+        out = _compare(np, inst.comparison, vals, threshold)
+        self.hist.push(vals, valid)
+        return out
+
+
+class _EMACompareKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+
+    def __call__(self, ctx: _Context) -> Any:
+        np, inst = ctx.np, self.inst
+        vals = ctx.numeric(inst.value_key)
+        ema_1 = ctx.ema(inst.value_key, inst.ema_period_1)
+        ema_2 = ctx.ema(inst.value_key, inst.ema_period_2)
+        fast, slow = (ema_1, ema_2) if inst.ema_period_1 < inst.ema_period_2 else (ema_2, ema_1)
+        cmp = fast > slow if inst.prefer == "fast" else slow > fast
+        return ~np.isnan(vals) & cmp
+
+
+class _EMADiffKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+        self.hist = _RollingSorted(np, inst.history_window, n)
+
+    def __call__(self, ctx: _Context) -> Any:
+        np, inst = ctx.np, self.inst
+        vals = ctx.numeric(inst.value_key)
+        valid = ~np.isnan(vals)
+        abs_diff = np.abs(ctx.ema(inst.value_key, inst.ema_period_1) - ctx.ema(inst.value_key, inst.ema_period_2))
+        ready = valid & (self.hist.count >= inst.min_history)
+        threshold = np.where(ready, self.hist.percentile(inst.percentile), np.nan)
+        out = _compare(np, inst.comparison, abs_diff, threshold)
+        self.hist.push(abs_diff, valid)
+        return out
+
+
+class _RunKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+        self.interrupted = type(inst).__name__ == "SignalRunInterrupted"
+        self.current_run = np.zeros(n, dtype=np.int64)
+        self.active = np.zeros(n, dtype=bool)
+        self.tail = np.zeros(n, dtype=np.int64)
+
+    def __call__(self, ctx: _Context) -> Any:
+        np, inst = ctx.np, self.inst
+        hit = ctx.equals(inst.signal_key, inst.target_value)
+        miss = ~hit
+        ended = np.where(hit, 0, self.current_run)
+        self.current_run = np.where(hit, self.current_run + 1, 0)
+        ext = inst.post_run_extension
+        if self.interrupted:
+            fire = miss & (ended >= inst.min_run_length)
+            if ext > 0:
+                self.tail = np.where(fire, ext, self.tail)
+            in_tail = miss & ~fire & (self.tail > 0)
+            self.tail = np.where(in_tail, self.tail - 1, np.where(hit, 0, self.tail))
+            return fire | in_tail
+        if ext > 0:
+            self.tail = np.where(miss & (ended > 0) & self.active, ext, self.tail)
+        in_tail = miss & (self.tail > 0)
+        self.tail = np.where(in_tail, self.tail - 1, np.where(hit, 0, self.tail))
+        self.active = hit & (self.active | (self.current_run >= inst.min_run_length))
+        return in_tail | self.active
+
+
+class _ValueVsPreviousKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+        self.previous = np.full(n, np.nan)
+
+    def __call__(self, ctx: _Context) -> Any:
+        vals = ctx.numeric(self.inst.value_key)
+        out = _compare(ctx.np, self.inst.comparison, vals, self.previous)
+        self.previous = vals
+        return out
+
+
+class _IntersectionKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+
+    def __call__(self, ctx: _Context) -> Any:
+        out = ctx.truthy(self.inst.signal_keys[0])
+        for key in self.inst.signal_keys[1:]:
+            out = out & ctx.truthy(key)
+        return out
+
+
+class _ExternalFlagKernel:
+    def __init__(self, np: Any, inst: Any, n: int) -> None:
+        self.inst = inst
+
+    def __call__(self, ctx: _Context) -> Any:
+        return ctx.equals(self.inst.signal_key, self.inst.true_value)
+
+
+class _ScalarKernel:
+    """Fallback: one signal instance per column, fed per-column feature dicts."""
+
+    def __init__(self, np: Any, instances: list[Any], deps: tuple[dict[str, str | None], dict[str, list[str]]]) -> None:
+        self.instances = instances
+        self.dep_ids = [dep_id for dep_id in deps[0].values() if dep_id]
+        self.dep_ids.extend(dep_id for dep_ids in deps[1].values() for dep_id in dep_ids)
+
+    def __call__(self, ctx: _Context) -> Any:
+        np = ctx.np
+        out = np.zeros(ctx.n, dtype=bool)
+        dep_rows = {dep_id: ctx.outputs[dep_id].tolist() for dep_id in self.dep_ids if dep_id in ctx.outputs}
+        row = ctx.row.tolist()
+        for col, instance in enumerate(self.instances):
+            features = dict(ctx.base)
+            value = row[col]
+            features[ctx.fan_key] = None if value != value else value
+            for dep_id, values in dep_rows.items():
+                features[dep_id] = values[col]
+            out[col] = bool(instance(features))
+        return out
+
+
+_KERNELS = {
+    "ValueVsRollingPercentile": _PercentileKernel,
+    "ValueVsRollingPercentileWithThreshold": _PercentileKernel,
+    "SignalEMAFastSlowComparison": _EMACompareKernel,
+    "SignalEMADiffVsHistoryPercentile": _EMADiffKernel,
+    "SignalRunLengthReached": _RunKernel,
+    "SignalRunInterrupted": _RunKernel,
+    "SignalValueVsPrevious": _ValueVsPreviousKernel,
+    "SignalIntersection": _IntersectionKernel,
+    "SignalExternalFlag": _ExternalFlagKernel,
+}
+
+
+def _resolve_roots(graph: Mapping[str, Any] | Sequence[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+    if isinstance(graph, Mapping) and "type" in graph:
+        roots = [graph]
+    elif isinstance(graph, Mapping):
+        roots = graph.get("items") or graph.get("roots") or graph.get("signals") or []
+    else:
+        roots = graph
+    return [root for root in roots if isinstance(root, Mapping)]
+
+
+def _column_matrix(np: Any, pd: Any, records: Sequence[Mapping[str, Any]], columns: list[str]) -> Any:
+    """(records, columns) float matrix of column values; NaN where missing or non-numeric."""
+    sources = []
+    for rec in records:
+        values = rec.get("values")
+        sources.append(values if isinstance(values, Mapping) else rec)
+    frame = pd.DataFrame.from_records(sources, columns=columns) if sources else pd.DataFrame(columns=columns)
+    matrix = np.full((len(records), len(columns)), np.nan)
+    for idx, col in enumerate(columns):
+        series = frame[col]
+        if series.dtype.kind in "iuf":
+            matrix[:, idx] = series.to_numpy(dtype=float)
+        elif series.dtype.kind == "O":
+            matrix[:, idx] = [_num(v) for v in series.tolist()]
+    return matrix
+
+
+def fanout_signal_graph(
+    records: Sequence[Mapping[str, Any]],
+    signal_graph: Mapping[str, Any] | Sequence[Mapping[str, Any]],
+    columns: Sequence[str],
+    *,
+    signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
+    fan_key: str = "value",
+    include_dependencies: bool = False,
+    timestamp_key: str | None = "timestamp",
+):
+    """
+    Apply one signal graph to every column in columns and return a wide
+    DataFrame with one "<column>:<alias>" output column per column and root
+    (every node with include_dependencies), preceded by timestamp_key when the
+    records carry it.
+
+    Signals see the same features as in the graph runner (the nested
+    "values" mapping plus "value"), except that fan_key is replaced by each
+    column's value (read from "values" when the record has that mapping,
+    otherwise from the record itself). Outputs
+    equal running the graph once per column with that column copied into
+    fan_key, except that NaN column values count as missing. frame.attrs["fanout_report"]
+    lists vectorized and per-column (fallback) nodes.
+    """
+    np = _require_numpy()
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for fanout_signal_graph") from exc
+
+    columns = [str(col) for col in columns]
+    if not columns:
+        raise ValueError("columns must not be empty")
+    if len(set(columns)) != len(columns):
+        raise ValueError("columns must be unique")
+    roots = _resolve_roots(signal_graph)
+    if not roots:
+        raise ValueError("signal_graph has no signals")
+
+    n = len(columns)
+    defs_map = _build_signal_defs_map(signal_defs)
+    class_map = _signal_class_map()
+    ordered = _build_evaluation_order(roots)
+    root_ids = {str(root.get("id")) for root in roots}
+    kernels: list[tuple[str, Any]] = []
+    vector_nodes: list[str] = []
+    scalar_nodes: list[str] = []
+    for node in ordered:
+        node_id = str(node.get("id"))
+        node_type = str(node.get("type"))
+        deps = _build_node_dependencies(node, defs_map)
+        params = node.get("params") or {}
+        options = _graph_options(params)
+        for name, dep_id in deps[0].items():
+            if dep_id:
+                options[name] = dep_id
+        for name, dep_ids in deps[1].items():
+            options[name] = dep_ids
+
+        SignalClass = class_map.get(node_type)
+        try:
+            instance = SignalClass(**options) if SignalClass else None
+        except Exception:
+            instance = None
+        kernel_cls = _KERNELS.get(node_type)
+        if instance is None:
+            kernel = None
+        elif kernel_cls is not None and not getattr(instance, "approximate", False):
+            kernel = kernel_cls(np, instance, n)
+            vector_nodes.append(node_id)
+        else:
+            instances = [instance] + [SignalClass(**options) for _ in range(n - 1)]
+            kernel = _ScalarKernel(np, instances, deps)
+            scalar_nodes.append(node_id)
+        kernels.append((node_id, kernel))
+
+    T = len(records)
+    matrix = _column_matrix(np, pd, records, columns)
+    keep = [node_id for node_id, _ in kernels if include_dependencies or node_id in root_ids]
+    results = {node_id: np.zeros((T, n), dtype=np.int8) for node_id in keep}
+
+    ctx = _Context(np, fan_key, n)
+    zeros = np.zeros(n, dtype=np.int8)
+    for t, rec in enumerate(records):
+        ctx.step = t
+        ctx.row = matrix[t]
+        base: dict[str, Any] = {}
+        values = rec.get("values")
+        if isinstance(values, Mapping):
+            base.update(values)
+        if "value" in rec:
+            base["value"] = rec.get("value")
+        ctx.base = base
+        ctx.outputs = {}
+        for node_id, kernel in kernels:
+            out = zeros if kernel is None else kernel(ctx).astype(np.int8)
+            ctx.outputs[node_id] = out
+            if node_id in results:
+                results[node_id][t] = out
+
+    aliases = {str(node.get("id")): _node_alias(node) for node in ordered}
+    column_data: dict[str, Any] = {}
+    if timestamp_key and any(timestamp_key in rec for rec in records):
+        column_data[timestamp_key] = [rec.get(timestamp_key) for rec in records]
+    for col_idx, col in enumerate(columns):
+        for node_id in keep:
+            column_data[f"{col}:{aliases[node_id]}"] = results[node_id][:, col_idx]
+    frame = pd.DataFrame(column_data)
+    frame.attrs["fanout_report"] = {
+        "columns": n,
+        "records": T,
+        "vectorized_nodes": vector_nodes,
+        "per_column_nodes": scalar_nodes,
+    }
+    return frame
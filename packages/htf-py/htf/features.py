@@ -16,7 +16,9 @@ def _is_number(x: Any) -> bool:
 def _to_float_list(seq: Sequence[Any]) -> list[float]:
     out: list[float] = []
     for v in seq:
-        if _is_number(v):
+        if type(v) is float:  # coerced by a RecordSchema
+            out.append(v)
+        elif _is_number(v):
             out.append(float(v))
     return out
 
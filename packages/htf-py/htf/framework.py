@@ -2,29 +2,106 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
-from .coordinator import MultiScaleCoordinator, TimeframeState
+from .coordinator import HierarConstraintCoordinator, MultiScaleCoordinator, TimeframeState
+from .schema import RecordSchema, SchemaStats
 from .timeframe import TimeframeView
 
+OutputListener = Callable[[Mapping[str, Any], dict[str, Any]], None]
+
+# Gated compute (gated_compute=True, HierarConstraintCoordinator only): the
+# views are updated in the coordinator's order and, once a view's signal is
+# falsy, every later (finer) view is gated anyway, so it only buffers the
+# record (TimeframeView.on_gated_record) instead of computing features and
+# signal. When its gate opens again the view catches up the buffered records
+# per its signal's catch_up policy before evaluating the new record. With
+# "replay" the gated outputs are the same as without gated_compute; raw_map
+# and the states of suspended views hold their last evaluated values.
+
 
 @dataclass
 class HTFFramework:
     timeframes: dict[str, TimeframeView]
     coordinator: MultiScaleCoordinator
+    schema: RecordSchema | None = None
+    gated_compute: bool = False
 
     last_output: dict[str, Any] = field(default_factory=dict, init=False)
+    listeners: list[OutputListener] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        if self.gated_compute and not isinstance(self.coordinator, HierarConstraintCoordinator):
+            raise ValueError("gated_compute requires a HierarConstraintCoordinator")
 
     def reset(self) -> None:
         for tf in self.timeframes.values():
             tf.reset()
         self.last_output = {}
+        if self.schema is not None:
+            self.schema.reset()
+
+    @property
+    def ingest_stats(self) -> SchemaStats | None:
+        """
+        Malformed-record counters of the framework schema, which coerces each
+        record once before it reaches the timeframes (None without a schema).
+        """
+        return self.schema.stats if self.schema is not None else None
+
+    def subscribe(self, listener: OutputListener) -> OutputListener:
+        """
+        Register listener(record, output), called after every on_new_record with
+        the same output dict that is returned to the caller.
+        """
+        self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: OutputListener) -> None:
+        if listener in self.listeners:
+            self.listeners.remove(listener)
 
     def on_new_record(self, record: Mapping[str, Any]) -> dict[str, Any]:
-        for tf in self.timeframes.values():
-            tf.on_new_record(record)
+        """
+        Push record to every timeframe, coordinate and notify listeners.
+        A record dropped by the schema (on_error="drop") returns the previous
+        output unchanged and is not passed to the listeners.
+        """
+        if self.schema is not None:
+            coerced = self.schema.coerce(record)
+            if coerced is None:
+                return self.last_output
+            record = coerced
+        self._ingest(record)
+        for listener in self.listeners:
+            listener(record, self.last_output)
+        return self.last_output
+
+    def replay(self, records: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+        """
+        Batch ingestion: push records in order like on_new_record but without
+        notifying listeners, and return the output of the last one. Used to
+        rebuild state, e.g. when recovering from a write-ahead log (htf.wal).
+        """
+        schema = self.schema
+        ingest = self._ingest
+        for record in records:
+            if schema is not None:
+                coerced = schema.coerce(record)
+                if coerced is None:
+                    continue
+                record = coerced
+            ingest(record)
+        return self.last_output
+
+    def _ingest(self, record: Mapping[str, Any]) -> None:
+        if self.gated_compute:
+            self._push_gated(record)
+        else:
+            for tf in self.timeframes.values():
+                tf.on_new_record(record)
 
         states: dict[str, TimeframeState] = {
             name: TimeframeState(
@@ -38,4 +115,18 @@ class HTFFramework:
 
         coord = self.coordinator.update(states, record)
         self.last_output = {"states": states, "coordination": coord}
-        return self.last_output
+
+    def _push_gated(self, record: Mapping[str, Any]) -> None:
+        timeframes = self.timeframes
+        order = [name for name in (self.coordinator.order or timeframes) if name in timeframes]
+        for name, tf in timeframes.items():
+            if name not in order:
+                tf.on_new_record(record)
+        gate_open = True
+        for name in order:
+            tf = timeframes[name]
+            if gate_open:
+                tf.on_new_record(record)
+                gate_open = bool(tf.signal)
+            else:
+                tf.on_gated_record(record)
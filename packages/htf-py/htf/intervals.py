@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Any
+
+
+def truthy_windows(flags: Sequence[bool], timestamps: Sequence[Any]) -> list[tuple[Any, Any]]:
+    """
+    Collapse consecutive truthy flags into inclusive (start, end) timestamp windows.
+    """
+    windows: list[tuple[Any, Any]] = []
+    start = None
+    for idx, flag in enumerate(flags):
+        if bool(flag):
+            if start is None:
+                start = timestamps[idx]
+        else:
+            if start is not None:
+                end_val = timestamps[idx - 1] if idx > 0 else start
+                windows.append((start, end_val))
+                start = None
+    if start is not None and timestamps:
+        windows.append((start, timestamps[-1]))
+    return windows
+
+
+def windows_to_mask(windows: Sequence[tuple[Any, Any]], timestamps: Sequence[Any]) -> list[bool]:
+    """
+    Flag each timestamp that falls inside one of the sorted, disjoint windows
+    (inclusive bounds).
+
+    Ascending timestamps are handled with a single merge walk, O(N + W). When a
+    timestamp steps backwards the window cursor is re-positioned by bisection,
+    so unsorted input stays correct at O(log W) per step back.
+    """
+    n = len(timestamps)
+    if not n:
+        return []
+    if not windows:
+        return [False] * n
+    ends: list[Any] | None = None
+    n_win = len(windows)
+    mask = [False] * n
+    win_idx = 0
+    start, end = windows[0]
+    prev = None
+    for idx, ts in enumerate(timestamps):
+        if prev is not None and ts < prev:
+            if ends is None:
+                ends = [w[1] for w in windows]
+            win_idx = bisect_left(ends, ts)
+            if win_idx < n_win:
+                start, end = windows[win_idx]
+        prev = ts
+        while win_idx < n_win and ts > end:
+            win_idx += 1
+            if win_idx < n_win:
+                start, end = windows[win_idx]
+        if win_idx < n_win and start <= ts:
+            mask[idx] = True
+    return mask
+
+
+def all_windows_mask(window_lists: Sequence[Sequence[tuple[Any, Any]]], timestamps: Sequence[Any]) -> list[bool]:
+    """
+    Flag timestamps covered by a window of every list. An empty list of window
+    lists allows everything; any empty window list blocks everything.
+    """
+    mask = [True] * len(timestamps)
+    for windows in window_lists:
+        if not windows:
+            return [False] * len(timestamps)
+        other = windows_to_mask(windows, timestamps)
+        mask = [a and b for a, b in zip(mask, other)]
+    return mask
+
+
+def asof_indices(ref_timestamps: Sequence[Any], query_timestamps: Sequence[Any]) -> list[int]:
+    """
+    For each query timestamp, return the index of the latest reference
+    timestamp <= query (or -1 when none exists). Reference timestamps must be
+    ascending. Ascending queries use one merge walk, O(N + M); a query that
+    steps backwards re-positions the cursor by bisection.
+    """
+    n_ref = len(ref_timestamps)
+    out: list[int] = []
+    j = 0
+    prev = None
+    for ts in query_timestamps:
+        if prev is not None and ts < prev:
+            j = bisect_right(ref_timestamps, ts)
+        prev = ts
+        while j < n_ref and ref_timestamps[j] <= ts:
+            j += 1
+        out.append(j - 1)
+    return out
+
+
+def asof_values(
+    ref_timestamps: Sequence[Any],
+    values: Sequence[Any],
+    query_timestamps: Sequence[Any],
+    default: Any = None,
+) -> list[Any]:
+    """
+    Carry values forward onto query timestamps (latest value at or before each
+    query); default is used before the first reference timestamp.
+    """
+    n_vals = len(values)
+    return [values[pos] if 0 <= pos < n_vals else default for pos in asof_indices(ref_timestamps, query_timestamps)]
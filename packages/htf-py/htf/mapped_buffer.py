@@ -0,0 +1,397 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Mapping, Sequence
+from itertools import islice
+from typing import Any
+
+# Disk-backed record buffer for TimeframeView: an append-only columnar store
+# whose columns are fixed-size segment files mapped with mmap. Only the open
+# segments (the tail one plus a small LRU) are mapped and the page cache
+# decides what stays in RAM, so the history is bounded by disk, not memory.
+# The newest hot_rows decoded records are also kept in memory so feature
+# windows at the tail of the buffer are served without decoding.
+#
+# Directory layout:
+#   buffer.json                 field names/kinds and segment size
+#   rows.bin                    two int64: absolute index of the first kept
+#                               row and of the next row to write
+#   <segment>.c<column>.col     segment_rows values of one column
+#
+# Missing values are stored as NaN (float), INT64_MIN (int) or -1 (bool) and
+# read back as None. A dotted field name ("values.x") reads and writes a
+# nested mapping (record["values"]["x"]).
+
+_KIND_TYPECODES = {"float": "d", "int": "q", "bool": "b"}
+_NUMPY_DTYPES = {"d": "float64", "q": "int64", "b": "int8"}
+_ITEMSIZES = {"d": 8, "q": 8, "b": 1}
+_MISSING_INT = -(2**63)
+_MISSING_BOOL = -1
+_META_FILE = "buffer.json"
+_ROWS_FILE = "rows.bin"
+
+
+def _encode(kind: str, value: Any) -> tuple[Any, Any]:
+    """(stored value, value read back) for one field."""
+    if kind == "float":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            number = float(value)
+            return number, (None if number != number else number)
+        return math.nan, None
+    if kind == "int":
+        if isinstance(value, int) and not isinstance(value, bool) and _MISSING_INT < value < 2**63:
+            return int(value), int(value)
+        if isinstance(value, float) and value.is_integer() and _MISSING_INT < value < 2**63:
+            return int(value), int(value)
+        return _MISSING_INT, None
+    if isinstance(value, bool) or value in (0, 1):
+        return int(bool(value)), bool(value)
+    return _MISSING_BOOL, None
+
+
+def _map_file(path: str, size: int) -> mmap.mmap:
+    """Map size bytes of path read-write, creating or extending the file (sparse) as needed."""
+    with open(path, "r+b" if os.path.exists(path) else "w+b") as handle:
+        if os.fstat(handle.fileno()).st_size < size:
+            handle.truncate(size)
+        return mmap.mmap(handle.fileno(), size)
+
+
+class _Segment:
+    """Memory-mapped column files of one segment."""
+
+    def __init__(self, directory: str, index: int, typecodes: Sequence[str], rows: int, create: bool) -> None:
+        self.maps = []
+        self.views = []
+        for col, code in enumerate(typecodes):
+            path = os.path.join(directory, f"{index:010d}.c{col}.col")
+            size = rows * _ITEMSIZES[code]
+            if not create and not os.path.exists(path):
+                raise FileNotFoundError(path)
+            mapped = _map_file(path, size)
+            self.maps.append(mapped)
+            self.views.append(memoryview(mapped).cast(code))
+
+    def flush(self) -> None:
+        for mapped in self.maps:
+            mapped.flush()
+
+    def close(self) -> None:
+        for view in self.views:
+            view.release()
+        for mapped in self.maps:
+            mapped.close()
+        self.views = []
+        self.maps = []
+
+
+class MappedRecordBuffer(Sequence):
+    """
+    Append-only, memory-mapped columnar record buffer, usable as
+    TimeframeView(buffer_backend=...) in place of the in-memory list.
+
+    - fields: field name -> "float", "int" or "bool"; other record fields are
+      not stored. Opening an existing directory requires the same fields.
+    - segment_rows: rows per segment file; hot_rows: newest records kept
+      decoded in memory (keep it >= the view window_size).
+    - max_open_segments: segments kept mapped besides the tail one.
+
+    The view still trims the buffer to config.max_buffer rows, so set it to
+    the history to keep on disk.
+
+    Indexing and iteration return one dict per row, like the list of dicts
+    it replaces. Deleting rows is only supported from the front (the view's
+    max_buffer trimming); whole segments before the first kept row are
+    removed from disk. column / to_numpy / to_dataframe read the mapped
+    columns directly, without building per-row dicts.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        fields: Mapping[str, str],
+        *,
+        segment_rows: int = 1 << 16,
+        hot_rows: int = 4096,
+        max_open_segments: int = 8,
+    ) -> None:
+        if segment_rows <= 0:
+            raise ValueError("segment_rows must be > 0")
+        if hot_rows < 0:
+            raise ValueError("hot_rows must be >= 0")
+        if max_open_segments <= 0:
+            raise ValueError("max_open_segments must be > 0")
+        kinds = {str(name): kind for name, kind in fields.items()}
+        if not kinds:
+            raise ValueError("fields must not be empty")
+        unknown = {name: kind for name, kind in kinds.items() if kind not in _KIND_TYPECODES}
+        if unknown:
+            raise ValueError(f"unsupported field kinds {unknown}; expected one of {tuple(_KIND_TYPECODES)}")
+
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path = os.path.join(self.directory, _META_FILE)
+        meta = {"fields": kinds, "segment_rows": segment_rows}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as fh:
+                stored = json.load(fh)
+            if stored["fields"] != kinds or list(stored["fields"]) != list(kinds):
+                raise ValueError(f"{self.directory} holds a buffer with fields {stored['fields']}")
+            segment_rows = int(stored["segment_rows"])
+        else:
+            with open(meta_path, "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+
+        self._kinds = kinds
+        self._names = tuple(kinds)
+        self._paths = [tuple(name.split(".")) for name in self._names]
+        self._typecodes = [_KIND_TYPECODES[kind] for kind in kinds.values()]
+        self.segment_rows = segment_rows
+        self.hot_rows = hot_rows
+        self.max_open_segments = max_open_segments
+        self._segments: OrderedDict[int, _Segment] = OrderedDict()
+
+        self._rows_map = _map_file(os.path.join(self.directory, _ROWS_FILE), 16)
+        self._bounds = memoryview(self._rows_map).cast("q")
+        self._hot: deque[dict[str, Any]] = deque(maxlen=hot_rows)
+        if hot_rows:
+            self._hot.extend(self._decode_range(max(self._start, self._end - hot_rows), self._end))
+
+    # -- bookkeeping -------------------------------------------------------
+
+    @property
+    def _start(self) -> int:
+        return self._bounds[0]
+
+    @property
+    def _end(self) -> int:
+        return self._bounds[1]
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._names
+
+    @property
+    def first_position(self) -> int:
+        """Absolute index of the first kept row (rows appended since the last clear)."""
+        return self._start
+
+    def _segment(self, index: int, create: bool = False) -> _Segment:
+        segment = self._segments.get(index)
+        if segment is not None:
+            self._segments.move_to_end(index)
+            return segment
+        segment = _Segment(self.directory, index, self._typecodes, self.segment_rows, create)
+        self._segments[index] = segment
+        tail = (self._end - 1) // self.segment_rows if self._end else index
+        while len(self._segments) > self.max_open_segments + 1:
+            victim = next(key for key in self._segments if key != tail and key != index)
+            self._segments.pop(victim).close()
+        return segment
+
+    def _segment_files(self, index: int) -> list[str]:
+        return [os.path.join(self.directory, f"{index:010d}.c{col}.col") for col in range(len(self._names))]
+
+    def _drop_segment(self, index: int) -> None:
+        segment = self._segments.pop(index, None)
+        if segment is not None:
+            segment.close()
+        for path in self._segment_files(index):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        pos = self._end
+        segment = self._segment(pos // self.segment_rows, create=True)
+        offset = pos % self.segment_rows
+        row: dict[str, Any] = {}
+        for col, (name, path) in enumerate(zip(self._names, self._paths)):
+            value: Any = record
+            for part in path:
+                value = value.get(part) if isinstance(value, Mapping) else None
+            stored, read_back = _encode(self._kinds[name], value)
+            segment.views[col][offset] = stored
+            if len(path) == 1:
+                row[name] = read_back
+            else:
+                target = row
+                for part in path[:-1]:
+                    target = target.setdefault(part, {})
+                target[path[-1]] = read_back
+        self._bounds[1] = pos + 1
+        self._hot.append(row)
+
+    def __delitem__(self, index) -> None:  # type: ignore[override]
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("MappedRecordBuffer only supports deleting a leading slice")
+        lo, hi, _ = index.indices(len(self))
+        if lo != 0:
+            raise TypeError("MappedRecordBuffer only supports deleting a leading slice")
+        if hi <= 0:
+            return
+        old_first_segment = self._start // self.segment_rows
+        self._bounds[0] = self._start + hi
+        for seg in range(old_first_segment, self._start // self.segment_rows):
+            self._drop_segment(seg)
+        keep = len(self)
+        while len(self._hot) > keep:
+            self._hot.popleft()
+
+    def clear(self) -> None:
+        first, last = self._start // self.segment_rows, (self._end - 1) // self.segment_rows
+        for seg in range(first, last + 1):
+            self._drop_segment(seg)
+        self._bounds[0] = 0
+        self._bounds[1] = 0
+        self._hot.clear()
+
+    def flush(self) -> None:
+        """Write dirty pages of the open segments and the row bounds to disk."""
+        for segment in self._segments.values():
+            segment.flush()
+        self._rows_map.flush()
+
+    def close(self) -> None:
+        self.flush()
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        self._bounds.release()
+        self._rows_map.close()
+
+    def __enter__(self) -> MappedRecordBuffer:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- reading -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _decode_range(self, lo: int, hi: int) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        pos = lo
+        while pos < hi:
+            seg_index = pos // self.segment_rows
+            seg_end = min(hi, (seg_index + 1) * self.segment_rows)
+            segment = self._segment(seg_index)
+            base = seg_index * self.segment_rows
+            columns = [view[pos - base : seg_end - base].tolist() for view in segment.views]
+            for values in zip(*columns):
+                row: dict[str, Any] = {}
+                for name, path, value in zip(self._names, self._paths, values):
+                    kind = self._kinds[name]
+                    if kind == "float":
+                        value = None if value != value else value
+                    elif kind == "int":
+                        value = None if value == _MISSING_INT else value
+                    else:
+                        value = None if value == _MISSING_BOOL else bool(value)
+                    if len(path) == 1:
+                        row[name] = value
+                    else:
+                        target = row
+                        for part in path[:-1]:
+                            target = target.setdefault(part, {})
+                        target[path[-1]] = value
+                rows.append(row)
+            pos = seg_end
+        return rows
+
+    def _rows(self, lo: int, hi: int) -> list[dict[str, Any]]:
+        """Rows at absolute positions [lo, hi), from the hot tail when possible."""
+        hot_start = self._end - len(self._hot)
+        if lo >= hot_start:
+            tail = list(islice(reversed(self._hot), self._end - hi, self._end - lo))
+            tail.reverse()
+            return tail
+        return self._decode_range(lo, hi)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        n = len(self)
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(n)
+            if step != 1:
+                return [self[i] for i in range(lo, hi, step)]
+            return self._rows(self._start + lo, self._start + max(lo, hi))
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("buffer index out of range")
+        return self._rows(self._start + index, self._start + index + 1)[0]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        step = self.segment_rows
+        for lo in range(self._start, self._end, step):
+            yield from self._rows(lo, min(self._end, lo + step))
+
+    def __repr__(self) -> str:
+        return f"MappedRecordBuffer(directory={self.directory!r}, columns={list(self._names)}, len={len(self)})"
+
+    def column(self, name: str, start: int | None = None, stop: int | None = None) -> Any:
+        """
+        numpy array (a copy) of one column over rows [start, stop) (relative
+        positions, as in slicing), read from the mapped segments. Missing
+        values keep their stored sentinel (NaN, INT64_MIN, -1).
+        """
+        try:
+            import numpy as np
+        except ImportError as exc:  # pragma: no cover - optional dependency path
+            raise RuntimeError("numpy is required for MappedRecordBuffer.column") from exc
+
+        col = self._names.index(name)
+        code = self._typecodes[col]
+        lo, hi, _ = slice(start, stop).indices(len(self))
+        lo, hi = self._start + lo, self._start + max(lo, hi)
+        parts = []
+        pos = lo
+        while pos < hi:
+            seg_index = pos // self.segment_rows
+            seg_end = min(hi, (seg_index + 1) * self.segment_rows)
+            base = seg_index * self.segment_rows
+            view = self._segment(seg_index).views[col]
+            parts.append(np.frombuffer(view, dtype=_NUMPY_DTYPES[code])[pos - base : seg_end - base].copy())
+            pos = seg_end
+        if not parts:
+            return np.empty(0, dtype=_NUMPY_DTYPES[code])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def to_numpy(self, start: int | None = None, stop: int | None = None) -> dict[str, Any]:
+        """Return {field: numpy array} over rows [start, stop); see column."""
+        return {name: self.column(name, start, stop) for name in self._names}
+
+    def to_dataframe(self, start: int | None = None, stop: int | None = None):
+        """
+        Return rows [start, stop) as a pandas.DataFrame with one column per
+        field (dotted names for nested fields), indexed by absolute position.
+        Missing values are NaN (float), <NA> (int, as Int64) or <NA> (bool,
+        as boolean).
+        """
+        try:
+            import pandas as pd
+        except ImportError as exc:  # pragma: no cover - optional dependency path
+            raise RuntimeError("pandas is required for MappedRecordBuffer.to_dataframe") from exc
+
+        arrays = self.to_numpy(start, stop)
+        lo, hi, _ = slice(start, stop).indices(len(self))
+        data: dict[str, Any] = {}
+        for name, values in arrays.items():
+            kind = self._kinds[name]
+            if kind == "int":
+                data[name] = pd.arrays.IntegerArray(values, values == _MISSING_INT)
+            elif kind == "bool":
+                data[name] = pd.arrays.BooleanArray(values == 1, values == _MISSING_BOOL)
+            else:
+                data[name] = values
+        index = pd.RangeIndex(self._start + lo, self._start + max(lo, hi))
+        return pd.DataFrame(data, index=index)
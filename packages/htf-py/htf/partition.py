@@ -0,0 +1,217 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import copy
+import multiprocessing
+import os
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .framework import HTFFramework
+
+# Time-partitioned backtests: the records are cut into contiguous chunks and
+# each chunk is replayed on a fresh copy of the framework, preceded by a
+# warm-up span of the records just before it whose outputs are discarded.
+# The warm-up is sized from the declared state horizons:
+#   view horizon      = (window_size - 1) + signal_fn.state_horizon()
+#   framework horizon = max(view horizons) + coordinator.state_horizon()
+# A signal_fn without state_horizon() (e.g. a plain function) or returning
+# None makes the horizon unbounded and the run falls back to sequential,
+# unless warmup is given explicitly. Horizons that are only approximate
+# (exact_partition = False, e.g. EMA convergence or histories that skip
+# missing values) or given explicitly are checked at every chunk boundary:
+# each chunk runs verify_steps records past its end and those outputs must
+# equal the first outputs of the next chunk; a mismatch falls back to
+# sequential.
+
+Collector = Callable[[Mapping[str, Any], dict[str, Any]], Any]
+
+
+@dataclass
+class PartitionedRun:
+    """
+    Result of run_partitioned: one collected output per record (the
+    framework output dict unless collect is given) and how it was produced.
+    mode is "partitioned" or "sequential"; reason explains a sequential run.
+    """
+
+    outputs: list[Any]
+    mode: str
+    warmup: int | None
+    chunks: list[tuple[int, int]] = field(default_factory=list)
+    verified: bool | None = None
+    reason: str | None = None
+
+
+def _callable_horizon(obj: Any) -> tuple[int | None, bool]:
+    if obj is None:
+        return 0, True
+    horizon_fn = getattr(obj, "state_horizon", None)
+    if horizon_fn is None:
+        return None, False
+    horizon = horizon_fn()
+    return horizon, bool(getattr(obj, "exact_partition", True))
+
+
+def framework_state_horizon(framework: HTFFramework) -> tuple[int | None, bool, list[str]]:
+    """
+    Warm-up (in records) after which a fresh copy of framework reproduces the
+    outputs of a sequential run, whether that horizon is exact, and the names
+    of the views (or "coordinator") whose state is unbounded or undeclared.
+    """
+    horizon = 0
+    exact = True
+    unbounded: list[str] = []
+    for name, view in framework.timeframes.items():
+        signal_horizon, signal_exact = _callable_horizon(view.signal_fn)
+        if signal_horizon is None:
+            unbounded.append(name)
+            continue
+        horizon = max(horizon, view.config.window_size - 1 + signal_horizon)
+        exact = exact and signal_exact
+    coord_horizon, coord_exact = _callable_horizon(framework.coordinator)
+    if coord_horizon is None:
+        unbounded.append("coordinator")
+    else:
+        horizon += coord_horizon
+        exact = exact and coord_exact
+    return (None if unbounded else horizon), exact, unbounded
+
+
+def _fresh_copy(framework: HTFFramework) -> HTFFramework:
+    listeners = framework.listeners
+    framework.listeners = []
+    try:
+        fresh = copy.deepcopy(framework)
+    finally:
+        framework.listeners = listeners
+    fresh.reset()
+    for view in fresh.timeframes.values():
+        reset = getattr(view.signal_fn, "reset", None)
+        if callable(reset):
+            reset()
+    return fresh
+
+
+def _replay(
+    framework: HTFFramework,
+    records: Sequence[Mapping[str, Any]],
+    collect: Collector | None,
+    lo: int,
+    start: int,
+    end: int,
+) -> list[Any]:
+    """Run records[lo:end] on a fresh copy and return outputs for [start, end)."""
+    fresh = _fresh_copy(framework)
+    outputs = []
+    for idx in range(lo, end):
+        rec = records[idx]
+        output = fresh.on_new_record(rec)
+        if idx >= start:
+            outputs.append(output if collect is None else collect(rec, output))
+    return outputs
+
+
+_WORKER: tuple[Any, ...] = ()
+
+
+def _init_worker(framework: HTFFramework, records: Sequence[Mapping[str, Any]], collect: Collector | None) -> None:
+    global _WORKER
+    _WORKER = (framework, records, collect)
+
+
+def _replay_task(bounds: tuple[int, int, int]) -> list[Any]:
+    framework, records, collect = _WORKER
+    return _replay(framework, records, collect, *bounds)
+
+
+def run_partitioned(
+    framework: HTFFramework,
+    records: Sequence[Mapping[str, Any]],
+    *,
+    processes: int | None = None,
+    chunks: int | None = None,
+    warmup: int | None = None,
+    verify: bool | None = None,
+    verify_steps: int = 256,
+    collect: Collector | None = None,
+) -> PartitionedRun:
+    """
+    Backtest records through copies of framework, split into chunks (default
+    one per process) that run in parallel, and stitch the outputs.
+
+    framework is used as a template and is not modified: pass it before it
+    has seen records. Listeners are not called; use collect(record, output)
+    to keep only what is needed from each output (outputs and collected
+    values are sent back from worker processes).
+
+    - processes: worker processes (default os.cpu_count()); 1 runs the
+      chunks in this process.
+    - warmup: records replayed before each chunk; defaults to the declared
+      state horizon (see framework_state_horizon).
+    - verify: at every chunk boundary, compare the first verify_steps
+      outputs of a chunk with the previous chunk continued over them;
+      defaults to True when the horizon is approximate or warmup was given.
+
+    Worker processes are forked where the platform supports it, so the
+    framework and collect do not need to be picklable there.
+    """
+    if verify_steps <= 0:
+        raise ValueError("verify_steps must be > 0")
+    records = list(records)
+    n = len(records)
+    n_proc = max(1, int(processes or os.cpu_count() or 1))
+    n_chunks = max(1, min(int(chunks or n_proc), n))
+
+    declared, exact, unbounded = framework_state_horizon(framework)
+    if warmup is not None:
+        if warmup < 0:
+            raise ValueError("warmup must be >= 0")
+        horizon, exact = int(warmup), False
+    else:
+        horizon = declared
+
+    def sequential(reason: str, verified: bool | None = None) -> PartitionedRun:
+        outputs = _replay(framework, records, collect, 0, 0, n)
+        return PartitionedRun(outputs, "sequential", horizon, [(0, n)], verified, reason)
+
+    if horizon is None:
+        return sequential(f"unbounded state: {', '.join(unbounded)}")
+    if n_chunks == 1:
+        return sequential("single chunk")
+
+    edges = [n * i // n_chunks for i in range(n_chunks + 1)]
+    bounds = [(edges[i], edges[i + 1]) for i in range(n_chunks)]
+    do_verify = (not exact) if verify is None else bool(verify)
+    overlap = verify_steps if do_verify else 0
+    tasks = [(max(0, start - horizon), start, min(n, end + overlap)) for start, end in bounds]
+
+    if n_proc == 1:
+        results = [_replay(framework, records, collect, *task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(
+            max_workers=min(n_proc, len(tasks)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(framework, records, collect),
+        ) as pool:
+            results = list(pool.map(_replay_task, tasks))
+
+    verified = None
+    if do_verify:
+        for idx in range(1, n_chunks):
+            start, end = bounds[idx - 1]
+            reference = results[idx - 1][end - start :]
+            mismatch = next((i for i, (a, b) in enumerate(zip(reference, results[idx])) if a != b), None)
+            if mismatch is not None:
+                return sequential(f"verification mismatch at record {end + mismatch}", verified=False)
+        verified = True
+
+    outputs = [out for (start, end), chunk in zip(bounds, results) for out in chunk[: end - start]]
+    return PartitionedRun(outputs, "partitioned", horizon, bounds, verified, None)
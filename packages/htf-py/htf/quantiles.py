@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import math
+from bisect import bisect_right, insort
+from collections import deque
+from itertools import accumulate
+
+DEFAULT_SKETCH_BUCKETS = 128
+DEFAULT_SKETCH_POINTS = 128
+
+
+class WindowedQuantileSketch:
+    """
+    Bounded-memory approximate quantiles over the last `window` values.
+
+    The window is cut into `buckets` consecutive blocks of m = ceil(window / buckets)
+    values. The newest block is kept exactly (sorted); once full it is sealed
+    into `points` weighted representatives (the middle value of each of `points`
+    equal rank groups). A sealed block is dropped as a whole once the blocks
+    after it hold `window` values, so between window and window + m - 1 values
+    are covered. Memory is O(window / buckets + buckets * points) floats.
+
+    Error bound: the returned value has a rank (among the covered values) within
+        window / (2 * points) + buckets + window / buckets
+    of the requested rank (compression error of each block, plus the expiry
+    slack of the oldest block). With the defaults (128 / 128) that is about
+    1.2% of the window plus 128 ranks. While fewer than m values have been
+    added the result is exact (same as compute_percentile).
+    """
+
+    __slots__ = (
+        "window",
+        "buckets",
+        "points",
+        "block_size",
+        "open_values",
+        "sealed",
+        "_count",
+        "_merged_values",
+        "_merged_cum",
+    )
+
+    def __init__(self, window: int, buckets: int = DEFAULT_SKETCH_BUCKETS, points: int = DEFAULT_SKETCH_POINTS) -> None:
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        if buckets <= 0 or points <= 0:
+            raise ValueError("buckets and points must be > 0")
+        self.window = int(window)
+        self.buckets = min(int(buckets), self.window)
+        self.points = int(points)
+        self.block_size = math.ceil(self.window / self.buckets)
+        self.open_values: list[float] = []
+        # sealed blocks, oldest first: (count, sorted representatives, weights)
+        self.sealed: deque[tuple[int, list[float], list[int]]] = deque()
+        self._count = 0
+        self._merged_values: list[float] = []
+        self._merged_cum: list[int] = []
+
+    def __len__(self) -> int:
+        """Number of values currently covered (at most window + block_size - 1)."""
+        return self._count
+
+    @property
+    def stored_points(self) -> int:
+        """Floats held in memory, for sizing comparisons."""
+        return len(self.open_values) + sum(len(rep) for _, rep, _ in self.sealed)
+
+    def clear(self) -> None:
+        self.open_values.clear()
+        self.sealed.clear()
+        self._count = 0
+        self._merged_values = []
+        self._merged_cum = []
+
+    def _compress(self, values: list[float]) -> tuple[list[float], list[int]]:
+        n = len(values)
+        if n <= self.points:
+            return list(values), [1] * n
+        reps: list[float] = []
+        weights: list[int] = []
+        for j in range(self.points):
+            lo = j * n // self.points
+            hi = (j + 1) * n // self.points
+            reps.append(values[(lo + hi - 1) // 2])
+            weights.append(hi - lo)
+        return reps, weights
+
+    def _rebuild(self) -> None:
+        values = [v for _, reps, _ in self.sealed for v in reps]
+        weights = [w for _, _, block_weights in self.sealed for w in block_weights]
+        # blocks are sorted runs, which the sort merges cheaply
+        order = sorted(range(len(values)), key=values.__getitem__)
+        self._merged_values = [values[i] for i in order]
+        self._merged_cum = list(accumulate(weights[i] for i in order))
+
+    def add(self, value: float) -> None:
+        insort(self.open_values, value)
+        self._count += 1
+        changed = False
+        if len(self.open_values) >= self.block_size:
+            reps, weights = self._compress(self.open_values)
+            self.sealed.append((len(self.open_values), reps, weights))
+            self.open_values = []
+            changed = True
+        while self.sealed and self._count - self.sealed[0][0] >= self.window:
+            self._count -= self.sealed.popleft()[0]
+            changed = True
+        if changed:
+            self._rebuild()
+
+    def _count_le(self, x: float, extra: float | None) -> int:
+        idx = bisect_right(self._merged_values, x)
+        total = self._merged_cum[idx - 1] if idx else 0
+        total += bisect_right(self.open_values, x)
+        if extra is not None and extra <= x:
+            total += 1
+        return total
+
+    def _select(self, rank: int, extra: float | None) -> float:
+        """Smallest covered value whose cumulative weight exceeds rank (0-based)."""
+        best: float | None = None
+        for source in (self._merged_values, self.open_values):
+            lo, hi = 0, len(source)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._count_le(source[mid], extra) > rank:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            if lo < len(source) and (best is None or source[lo] < best):
+                best = source[lo]
+        if extra is not None and self._count_le(extra, extra) > rank and (best is None or extra < best):
+            best = extra
+        return best  # type: ignore[return-value]
+
+    def quantile(self, q: float, extra: float | None = None) -> float | None:
+        """
+        Approximate q-th percentile (0-100) of the covered values, optionally
+        including `extra` without adding it. Interpolates between neighbouring
+        ranks like compute_percentile. Empty sketch -> None.
+        """
+        n = self._count + (0 if extra is None else 1)
+        if n == 0:
+            return None
+        if q <= 0:
+            return self._select(0, extra)
+        if q >= 100:
+            return self._select(n - 1, extra)
+        pos = (n - 1) * (q / 100.0)
+        lower = math.floor(pos)
+        upper = math.ceil(pos)
+        lo_val = self._select(lower, extra)
+        if lower == upper:
+            return lo_val
+        w = pos - lower
+        return lo_val * (1.0 - w) + self._select(upper, extra) * w
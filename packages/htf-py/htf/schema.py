@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .time_index import to_epoch_ns
+
+# Ingestion-time record schema: each declared field is validated and coerced
+# once when a record enters HTFFramework / TimeframeView, so the buffered
+# record holds typed values (float fields are exact floats, or None when
+# missing/invalid). Feature modules and signals then take their fast path
+# (a single type check) instead of re-validating the same field per signal
+# per record. Malformed fields and records are counted in SchemaStats
+# rather than silently turning into None further down.
+
+FIELD_TYPES = ("float", "int", "bool", "str", "timestamp", "any")
+ON_ERROR = ("null", "drop", "raise")
+
+_TRUE_STRINGS = {"1", "true", "yes", "on"}
+_FALSE_STRINGS = {"0", "false", "no", "off", ""}
+
+
+class _Invalid(Exception):
+    pass
+
+
+def _to_float(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if isinstance(value, bool):
+        raise _Invalid
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            raise _Invalid from None
+    raise _Invalid
+
+
+def _to_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        raise _Invalid
+    if isinstance(value, int):
+        return int(value)
+    number = _to_float(value)
+    if not number.is_integer():
+        raise _Invalid
+    return int(number)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    raise _Invalid
+
+
+def _to_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_timestamp(value: Any) -> int:
+    try:
+        return to_epoch_ns(value)
+    except (ValueError, TypeError):
+        raise _Invalid from None
+
+
+def _to_any(value: Any) -> Any:
+    return value
+
+
+_COERCERS: dict[str, Callable[[Any], Any]] = {
+    "float": _to_float,
+    "int": _to_int,
+    "bool": _to_bool,
+    "str": _to_str,
+    "timestamp": _to_timestamp,
+    "any": _to_any,
+}
+
+
+@dataclass
+class SchemaStats:
+    """
+    Ingestion counters of a RecordSchema.
+
+    - records: records seen; malformed_records: records with at least one
+      invalid field or missing required field; dropped_records: malformed
+      records discarded (on_error="drop").
+    - invalid / missing: per-field counts of values that could not be
+      coerced / were absent or None.
+    """
+
+    records: int = 0
+    malformed_records: int = 0
+    dropped_records: int = 0
+    invalid: dict[str, int] = field(default_factory=dict)
+    missing: dict[str, int] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        self.records = 0
+        self.malformed_records = 0
+        self.dropped_records = 0
+        self.invalid.clear()
+        self.missing.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "records": self.records,
+            "malformed_records": self.malformed_records,
+            "dropped_records": self.dropped_records,
+            "invalid": dict(self.invalid),
+            "missing": dict(self.missing),
+        }
+
+
+@dataclass
+class RecordSchema:
+    """
+    Declared record fields and their types, coerced once at ingestion.
+
+    - fields: field name -> one of FIELD_TYPES. "float"/"int" accept numbers
+      and numeric strings (not bools), "bool" accepts bools, 0/1 and
+      true/false strings, "str" formats any value, "timestamp" converts
+      datetimes, dates, ISO strings and ints to int epoch nanoseconds (see
+      htf.time_index.to_epoch_ns), "any" keeps it as-is.
+    - required: fields whose absence (missing or None) makes a record
+      malformed; other declared fields may be missing (they are set to None).
+    - on_error: what to do with a malformed record: "null" keeps it with the
+      offending fields set to None, "drop" discards it, "raise" raises
+      ValueError.
+    - keep_extra: keep undeclared fields (unchecked) in the coerced record.
+    """
+
+    fields: Mapping[str, str]
+    required: Sequence[str] = ()
+    on_error: str = "null"
+    keep_extra: bool = True
+
+    stats: SchemaStats = field(default_factory=SchemaStats, init=False)
+
+    def __post_init__(self) -> None:
+        unknown = {name: kind for name, kind in self.fields.items() if kind not in _COERCERS}
+        if unknown:
+            raise ValueError(f"unknown field types {unknown}; expected one of {FIELD_TYPES}")
+        undeclared = [name for name in self.required if name not in self.fields]
+        if undeclared:
+            raise ValueError(f"required fields are not declared: {undeclared}")
+        if self.on_error not in ON_ERROR:
+            raise ValueError(f"on_error must be one of {ON_ERROR}")
+        self.fields = dict(self.fields)
+        self.required = tuple(self.required)
+        self._slots = [(name, _COERCERS[kind], name in self.required) for name, kind in self.fields.items()]
+
+    def reset(self) -> None:
+        self.stats.reset()
+
+    def coerce(self, record: Mapping[str, Any]) -> dict[str, Any] | None:
+        """
+        Return a new dict with the declared fields coerced (and the other
+        fields kept when keep_extra), or None when the record is malformed
+        and on_error="drop".
+        """
+        stats = self.stats
+        stats.records += 1
+        out = dict(record) if self.keep_extra else {}
+        malformed = False
+        for name, coerce, required in self._slots:
+            value = record.get(name)
+            if value is None:
+                out[name] = None
+                stats.missing[name] = stats.missing.get(name, 0) + 1
+                malformed = malformed or required
+                continue
+            try:
+                out[name] = coerce(value)
+            except (_Invalid, OverflowError):
+                out[name] = None
+                stats.invalid[name] = stats.invalid.get(name, 0) + 1
+                malformed = True
+                if self.on_error == "raise":
+                    stats.malformed_records += 1
+                    raise ValueError(f"field {name!r}: cannot coerce {value!r} to {self.fields[name]}") from None
+        if malformed:
+            stats.malformed_records += 1
+            if self.on_error == "raise":
+                missing = [name for name in self.required if out.get(name) is None]
+                raise ValueError(f"missing required fields: {missing}")
+            if self.on_error == "drop":
+                stats.dropped_records += 1
+                return None
+        return out
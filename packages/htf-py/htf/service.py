@@ -0,0 +1,574 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .aggregation import _prepare, aggregate_columns
+from .timeframe import _build_signal_defs_map, _GraphRunner, _node_alias, _resolve_graph_roots
+
+# Local compute service for the browser console: the console uploads a file
+# once, then asks for aggregated series and signal graph outputs, which are
+# computed here with htf instead of on the browser's main thread. Only the
+# Python standard library is used for HTTP; the server binds to localhost
+# and works offline.
+#
+#   GET    /health                  status, datasets and cache counters
+#   GET    /datasets                uploaded datasets
+#   POST   /datasets?timestamp_key= upload CSV (text/csv) or JSON records;
+#                                   returns {"dataset": id, "rows", "columns"}
+#   DELETE /datasets/<id>           forget a dataset and its cached results
+#   POST   /aggregate               JSON {dataset, scale_value, scale_unit,
+#                                   method, percentile, value_key, columns}
+#   POST   /signals                 same fields plus signal_graph,
+#                                   signal_defs, include_values
+#
+# Uploads are parsed once (timestamps to epoch ms, numeric columns to
+# float64) and identified by a hash of their content, so uploading the same
+# file again is free. /aggregate and /signals return a binary columnar frame
+# (see encode_columns) that JavaScript maps onto typed arrays without
+# parsing; responses are cached per dataset and request body (X-HTF-Cache:
+# hit/miss). Errors are JSON {"error": message} with status 400 (invalid
+# request), 403 (Host not local), 404 (unknown dataset or path) or 413
+# (upload too large).
+#
+# The uploaded data stays private to the machine: requests whose Host header
+# is not localhost, 127.0.0.1 or [::1] with the server port are refused (so
+# DNS rebinding cannot reach the service), and CORS is only granted to
+# localhost origins and allowed_origins. The console opened from a file
+# sends Origin "null", which any sandboxed iframe can send too; it is only
+# accepted with allow_file_origin (--allow-file-origin).
+#
+# Binary frame layout (little-endian):
+#   b"HTFC" | uint32 header length H | header JSON (UTF-8, space padded so
+#   H is a multiple of 8) | column data, each column padded to 8 bytes
+# The header is {"rows": n, "columns": [{"name", "dtype", "offset",
+# "length"}], ...} with offsets counted from the end of the header (byte
+# 8 + H), so a column is new Float64Array(buffer, 8 + H + offset, length)
+# (dtype "float64") or new Uint8Array(...) (dtype "uint8"). Timestamps are
+# the float64 "ts" column in epoch milliseconds; missing values are NaN.
+
+_MAGIC = b"HTFC"
+_HEADER_LEN = struct.Struct("<I")
+_LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+_LOCAL_HOST_HEADERS = ("localhost", "127.0.0.1", "[::1]")
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("numpy is required for htf.service") from exc
+    return np
+
+
+def _require_pandas():
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for htf.service") from exc
+    return pd
+
+
+def _pad8(size: int) -> int:
+    return -size % 8
+
+
+def encode_columns(columns: Mapping[str, Any], meta: Mapping[str, Any] | None = None) -> bytes:
+    """
+    Encode equal-length columns as a binary columnar frame (see the module
+    comment). Boolean and integer 0/1 columns can be passed as uint8 arrays;
+    everything else is stored as float64. meta is merged into the header.
+    """
+    np = _require_numpy()
+    arrays: list[tuple[str, Any]] = []
+    rows: int | None = None
+    for name, values in columns.items():
+        arr = np.asarray(values)
+        arr = arr.astype("<u1") if arr.dtype in (np.uint8, np.bool_) else arr.astype("<f8")
+        if rows is None:
+            rows = len(arr)
+        elif len(arr) != rows:
+            raise ValueError(f"column {name!r} has {len(arr)} rows, expected {rows}")
+        arrays.append((str(name), arr))
+    rows = rows or 0
+
+    offsets = []
+    pos = 0
+    for _, arr in arrays:
+        offsets.append(pos)
+        pos += arr.nbytes + _pad8(arr.nbytes)
+    header = dict(meta or {})
+    header["rows"] = rows
+    header["columns"] = [
+        {"name": name, "dtype": "uint8" if arr.dtype.itemsize == 1 else "float64", "offset": off, "length": rows}
+        for (name, arr), off in zip(arrays, offsets)
+    ]
+    raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    raw += b" " * _pad8(len(raw))
+
+    out = bytearray(_MAGIC)
+    out += _HEADER_LEN.pack(len(raw))
+    out += raw
+    for _, arr in arrays:
+        out += arr.tobytes()
+        out += b"\0" * _pad8(arr.nbytes)
+    return bytes(out)
+
+
+def decode_columns(data: bytes) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Decode a frame from encode_columns into (header, {name: numpy array}); arrays share data's memory."""
+    np = _require_numpy()
+    if data[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("not an htf columnar frame")
+    (size,) = _HEADER_LEN.unpack_from(data, len(_MAGIC))
+    start = len(_MAGIC) + _HEADER_LEN.size
+    header = json.loads(bytes(data[start : start + size]).decode("utf-8"))
+    base = start + size
+    columns = {}
+    for col in header["columns"]:
+        dtype = "<u1" if col["dtype"] == "uint8" else "<f8"
+        columns[col["name"]] = np.frombuffer(data, dtype=dtype, count=col["length"], offset=base + col["offset"])
+    return header, columns
+
+
+class _Dataset:
+    __slots__ = ("id", "ts_ms", "columns", "rows")
+
+    def __init__(self, dataset_id: str, ts_ms: Any, columns: dict[str, Any]) -> None:
+        self.id = dataset_id
+        self.ts_ms = ts_ms
+        self.columns = columns
+        self.rows = len(ts_ms)
+
+    def describe(self) -> dict[str, Any]:
+        return {"dataset": self.id, "rows": self.rows, "columns": list(self.columns)}
+
+
+class ComputeService:
+    """
+    Datasets and result cache behind the HTTP server; usable directly
+    (upload / aggregate / signals) without a server.
+
+    - max_datasets: uploaded datasets kept in memory; the least recently used
+      one is dropped (with its cached results) beyond that.
+    - cache_entries: encoded responses kept in the LRU result cache.
+    """
+
+    def __init__(self, *, max_datasets: int = 8, cache_entries: int = 64) -> None:
+        if max_datasets <= 0:
+            raise ValueError("max_datasets must be > 0")
+        if cache_entries < 0:
+            raise ValueError("cache_entries must be >= 0")
+        self.max_datasets = max_datasets
+        self.cache_entries = cache_entries
+        self._datasets: OrderedDict[str, _Dataset] = OrderedDict()
+        self._cache: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+        self._lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def upload(self, body: bytes, content_type: str = "text/csv", *, timestamp_key: str = "ts") -> dict[str, Any]:
+        """Parse an uploaded CSV or JSON body once and return its description ("cached" if already loaded)."""
+        dataset_id = hashlib.sha256(timestamp_key.encode("utf-8") + b"\0" + body).hexdigest()[:16]
+        with self._lock:
+            existing = self._datasets.get(dataset_id)
+            if existing is not None:
+                self._datasets.move_to_end(dataset_id)
+                return {**existing.describe(), "cached": True}
+        data = self._parse_body(body, content_type)
+        ts_ms, columns = _prepare(data, timestamp_key, None)
+        dataset = _Dataset(dataset_id, ts_ms, columns)
+        with self._lock:
+            self._datasets[dataset_id] = dataset
+            while len(self._datasets) > self.max_datasets:
+                old_id, _ = self._datasets.popitem(last=False)
+                self._drop_cached(old_id)
+        return {**dataset.describe(), "cached": False}
+
+    @staticmethod
+    def _parse_body(body: bytes, content_type: str) -> Any:
+        pd = _require_pandas()
+        kind = content_type.split(";")[0].strip().lower()
+        if kind in ("application/json", "text/json"):
+            try:
+                data = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+                raise ValueError(f"invalid JSON upload: {exc}") from None
+            if isinstance(data, Mapping) and "records" in data:
+                data = data["records"]
+            if isinstance(data, Mapping):
+                return pd.DataFrame(data)
+            if not isinstance(data, list):
+                raise ValueError("JSON upload must be a list of records or a mapping of columns")
+            return data
+        try:
+            return pd.read_csv(io.BytesIO(body))
+        except (ValueError, pd.errors.ParserError) as exc:
+            raise ValueError(f"invalid CSV upload: {exc}") from None
+
+    def datasets(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dataset.describe() for dataset in self._datasets.values()]
+
+    def delete(self, dataset_id: str) -> None:
+        """Forget a dataset and its cached results; KeyError when unknown."""
+        with self._lock:
+            del self._datasets[dataset_id]
+            self._drop_cached(dataset_id)
+
+    def _dataset(self, dataset_id: Any) -> _Dataset:
+        with self._lock:
+            dataset = self._datasets.get(str(dataset_id))
+            if dataset is None:
+                raise KeyError(f"unknown dataset {dataset_id!r}")
+            self._datasets.move_to_end(dataset.id)
+            return dataset
+
+    def _drop_cached(self, dataset_id: str) -> None:
+        for key in [key for key in self._cache if key[0] == dataset_id]:
+            del self._cache[key]
+
+    def _cached(self, kind: str, request: Mapping[str, Any], compute) -> tuple[bytes, bool]:
+        dataset = self._dataset(request.get("dataset"))
+        body = {k: v for k, v in request.items() if k != "dataset"}
+        key = (dataset.id, kind, json.dumps(body, sort_keys=True, default=str))
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return hit, True
+            self.cache_misses += 1
+        out = compute(dataset, request)
+        with self._lock:
+            if self.cache_entries and dataset.id in self._datasets:
+                self._cache[key] = out
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return out, False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "datasets": len(self._datasets),
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+    def _aggregate(self, dataset: _Dataset, request: Mapping[str, Any]) -> tuple[Any, dict[str, Any], str]:
+        value_key = str(request.get("value_key") or "value")
+        wanted = request.get("columns")
+        if wanted is None:
+            columns = dataset.columns
+        else:
+            names = list(dict.fromkeys([*wanted, value_key]))
+            missing = [name for name in names if name not in dataset.columns]
+            if missing:
+                raise ValueError(f"unknown columns {missing}")
+            columns = {name: dataset.columns[name] for name in names}
+        if value_key not in columns:
+            raise ValueError(f"value_key {value_key!r} is not a numeric column")
+        if "scale_value" not in request or "scale_unit" not in request:
+            raise ValueError("scale_value and scale_unit are required")
+        buckets, out = aggregate_columns(
+            dataset.ts_ms,
+            columns,
+            scale_value=request["scale_value"],
+            scale_unit=request["scale_unit"],
+            method=request.get("method") or "mean",
+            percentile=request.get("percentile", 50.0),
+            value_key=value_key,
+        )
+        return buckets, out, value_key
+
+    def aggregate(self, request: Mapping[str, Any]) -> bytes:
+        """
+        Aggregated series of a dataset as a columnar frame: "ts" (bucket
+        start, epoch ms), "value" (aggregated value_key) and one column per
+        aggregated column, like htf.aggregation.aggregate_frame.
+        """
+        return self.aggregate_cached(request)[0]
+
+    def aggregate_cached(self, request: Mapping[str, Any]) -> tuple[bytes, bool]:
+        def compute(dataset: _Dataset, req: Mapping[str, Any]) -> bytes:
+            buckets, out, value_key = self._aggregate(dataset, req)
+            columns = {"ts": buckets, "value": out[value_key]}
+            columns.update((col, vals) for col, vals in out.items() if col not in columns)
+            return encode_columns(columns, {"kind": "aggregate"})
+
+        return self._cached("aggregate", request, compute)
+
+    def signals(self, request: Mapping[str, Any]) -> bytes:
+        """
+        Signal graph outputs over the aggregated series as a columnar frame:
+        "ts" plus one uint8 column per graph node (named by node id; the
+        header "nodes" maps ids to aliases) and, with include_values, the
+        float64 value columns of export_signal_dataframe.
+        """
+        return self.signals_cached(request)[0]
+
+    def signals_cached(self, request: Mapping[str, Any]) -> tuple[bytes, bool]:
+        def compute(dataset: _Dataset, req: Mapping[str, Any]) -> bytes:
+            np = _require_numpy()
+            roots = _resolve_graph_roots(req.get("signal_graph"))
+            if not roots:
+                raise ValueError("signal_graph has no signals")
+            buckets, out, value_key = self._aggregate(dataset, req)
+            records = _console_records(np, out, value_key)
+            runner = _GraphRunner(
+                roots,
+                _build_signal_defs_map(req.get("signal_defs")),
+                include_values=bool(req.get("include_values")),
+            )
+            outputs, value_data = runner.run(records)
+            columns: dict[str, Any] = {"ts": buckets}
+            for node_id, flags in outputs.items():
+                columns[node_id] = np.asarray(flags, dtype=np.uint8)
+            for col in runner.value_order:
+                columns[col] = np.array([np.nan if v is None else v for v in value_data[col]], dtype="float64")
+            nodes = {node_id: _node_alias(runner.runners[node_id]["node"]) for node_id in outputs}
+            return encode_columns(columns, {"kind": "signals", "nodes": nodes, "report": runner.report()})
+
+        return self._cached("signals", request, compute)
+
+
+def _console_records(np, out: Mapping[str, Any], value_key: str) -> list[dict[str, Any]]:
+    """Console-shaped records ({"value", "values"}) from aggregated columns; NaN values are left out of "values"."""
+    names = list(out)
+    lists = [out[name].tolist() for name in names]
+    values = out[value_key].tolist()
+    records = []
+    for i, value in enumerate(values):
+        row = {name: col[i] for name, col in zip(names, lists) if col[i] == col[i]}
+        records.append({"value": value, "values": row})
+    return records
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ComputeServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _cors_headers(self) -> None:
+        origin = self.headers.get("Origin")
+        if origin and self.server.host_allowed(self.headers.get("Host")) and self.server.origin_allowed(origin):
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.send_header("Access-Control-Expose-Headers", "X-HTF-Cache")
+            self.send_header("Vary", "Origin")
+
+    def _send(self, status: int, body: bytes, content_type: str, extra: Mapping[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.max_upload_bytes:
+            raise _TooLarge(f"request body exceeds {self.server.max_upload_bytes} bytes")
+        return self.rfile.read(length)
+
+    def _read_json(self) -> dict[str, Any]:
+        try:
+            payload = json.loads(self._read_body().decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ValueError(f"invalid JSON request: {exc}") from None
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        return payload
+
+    def _reject_host(self) -> bool:
+        if self.server.host_allowed(self.headers.get("Host")):
+            return False
+        self.close_connection = True
+        self._send_json(HTTPStatus.FORBIDDEN, {"error": "Host header is not a local address of this service"})
+        return True
+
+    def _dispatch(self, method: str) -> None:
+        if self._reject_host():
+            return
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        service = self.server.service
+        try:
+            if method == "GET" and parts == ["health"]:
+                self._send_json(HTTPStatus.OK, {"status": "ok", **service.stats()})
+            elif method == "GET" and parts == ["datasets"]:
+                self._send_json(HTTPStatus.OK, service.datasets())
+            elif method == "POST" and parts == ["datasets"]:
+                query = parse_qs(url.query)
+                timestamp_key = query.get("timestamp_key", ["ts"])[0]
+                body = self._read_body()
+                info = service.upload(body, self.headers.get("Content-Type") or "text/csv", timestamp_key=timestamp_key)
+                self._send_json(HTTPStatus.OK, info)
+            elif method == "DELETE" and len(parts) == 2 and parts[0] == "datasets":
+                service.delete(parts[1])
+                self._send_json(HTTPStatus.OK, {"deleted": parts[1]})
+            elif method == "POST" and parts in (["aggregate"], ["signals"]):
+                request = self._read_json()
+                run = service.aggregate_cached if parts[0] == "aggregate" else service.signals_cached
+                body, hit = run(request)
+                self._send(HTTPStatus.OK, body, "application/octet-stream", {"X-HTF-Cache": "hit" if hit else "miss"})
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {url.path}"})
+        except _TooLarge as exc:
+            self.close_connection = True
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": str(exc)})
+        except KeyError as exc:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": str(exc.args[0]) if exc.args else "not found"})
+        except (ValueError, TypeError) as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_OPTIONS(self) -> None:
+        if self._reject_host():
+            return
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.send_header("Content-Length", "0")
+        self._cors_headers()
+        self.end_headers()
+
+
+class _TooLarge(Exception):
+    pass
+
+
+class ComputeServer(ThreadingHTTPServer):
+    """
+    HTTP server around a ComputeService (see the module comment for routes).
+
+    Requests must carry a local Host (localhost, 127.0.0.1 or [::1] with
+    the server port, plus allowed_hosts). Cross-origin requests are answered
+    for localhost origins and allowed_origins, and for the console opened
+    from a file (origin "null") only with allow_file_origin.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: ComputeService | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        *,
+        allowed_origins: Sequence[str] = (),
+        allow_file_origin: bool = False,
+        allowed_hosts: Sequence[str] = (),
+        max_upload_bytes: int = 1 << 30,
+        verbose: bool = False,
+    ) -> None:
+        self.service = service or ComputeService()
+        self.allowed_origins = tuple(allowed_origins)
+        self.allow_file_origin = allow_file_origin
+        self.allowed_hosts = tuple(host.lower() for host in allowed_hosts)
+        self.max_upload_bytes = max_upload_bytes
+        self.verbose = verbose
+        super().__init__((host, port), _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def host_allowed(self, host: str | None) -> bool:
+        """Whether a Host header names this service on a local address (or allowed_hosts)."""
+        if not host:
+            return False
+        host = host.strip().lower()
+        if host.startswith("["):
+            name, _, rest = host.partition("]")
+            name += "]"
+            port = rest[1:] if rest.startswith(":") else None
+        else:
+            name, sep, port_text = host.rpartition(":")
+            if not sep:
+                name, port_text = host, ""
+            port = port_text or None
+        if name not in _LOCAL_HOST_HEADERS and name not in self.allowed_hosts:
+            return False
+        server_port = self.server_address[1]
+        return port == str(server_port) if port is not None else server_port == 80
+
+    def origin_allowed(self, origin: str) -> bool:
+        if origin == "null":
+            return self.allow_file_origin
+        if origin in self.allowed_origins:
+            return True
+        try:
+            return urlsplit(origin).hostname in _LOCAL_HOSTS
+        except ValueError:
+            return False
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m htf.service", description="Local htf compute service.")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port (default: 8765)")
+    parser.add_argument("--max-datasets", type=int, default=8, help="datasets kept in memory")
+    parser.add_argument("--cache-entries", type=int, default=64, help="cached responses")
+    parser.add_argument("--allow-origin", action="append", default=[], help="extra allowed CORS origin")
+    parser.add_argument(
+        "--allow-file-origin",
+        action="store_true",
+        help='answer CORS for the console opened from a file (Origin "null"; any sandboxed page can send it)',
+    )
+    parser.add_argument("--allow-host", action="append", default=[], help="extra accepted Host name")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    service = ComputeService(max_datasets=args.max_datasets, cache_entries=args.cache_entries)
+    server = ComputeServer(
+        service,
+        args.host,
+        args.port,
+        allowed_origins=args.allow_origin,
+        allow_file_origin=args.allow_file_origin,
+        allowed_hosts=args.allow_host,
+        verbose=args.verbose,
+    )
+    print(f"htf compute service listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import math
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from collections import deque
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, ClassVar
+
+from .quantiles import WindowedQuantileSketch
 
 
 def compute_percentile(values: Iterable[float], q: float) -> float | None:
@@ -35,6 +39,20 @@ def compute_percentile(values: Iterable[float], q: float) -> float | None:
     return vals[lower] * (1.0 - w) + vals[upper] * w
 
 
+def _numeric_feature(features: Mapping[str, Any], key: str) -> float | None:
+    """
+    features[key] as a float, or None when missing or not a number (bools
+    are not numbers). Values coerced by a RecordSchema are already floats
+    and are returned as-is.
+    """
+    raw_val = features.get(key)
+    if type(raw_val) is float:
+        return raw_val
+    if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
+        return float(raw_val)
+    return None
+
+
 _DEFAULT_TRACE_LIMIT = 1000
 _UNSET = object()
 
@@ -53,22 +71,534 @@ def _resolve_limit(value: Any, fallback: int) -> int | None:
     return num
 
 
+_TRACE_TYPECODES = {"float": "d", "int": "q", "bool": "b"}
+_NUMPY_DTYPES = {"d": "float64", "q": "int64", "b": "bool"}
+_TRACE_MIN_ALLOC = 64
+
+
+class TraceBuffer(Sequence):
+    """
+    Columnar, optionally bounded storage for per-step or per-run traces.
+
+    Each column is backed by a typed ``array.array`` ("float", "int", "bool")
+    or, for "object" columns, a plain list. Appends are O(1) amortized: when a
+    limit is set, rows are written into a region twice the limit and the live
+    rows are compacted into a fresh allocation once that region is full, so the
+    oldest rows are dropped without shifting the buffer on every append.
+
+    Indexing and iteration return one dict per row, so the buffer can be used
+    where a list of dicts was expected. Float columns store None as NaN and
+    report NaN back as None in the row view.
+
+    ``to_numpy`` returns zero-copy numpy views of the live rows. Views are never
+    written to after export (compaction allocates new storage), so they remain
+    valid snapshots.
+    """
+
+    def __init__(self, columns: Mapping[str, str], limit: int | None = None) -> None:
+        self._kinds: dict[str, str] = {}
+        for name, kind in columns.items():
+            if kind not in _TRACE_TYPECODES and kind != "object":
+                raise ValueError(f"unsupported trace column kind: {kind}")
+            self._kinds[str(name)] = kind
+        self._names = tuple(self._kinds)
+        self.limit = limit
+        self._alloc = 2 * limit if limit is not None else _TRACE_MIN_ALLOC
+        self._start = 0
+        self._end = 0
+        self._cols: dict[str, Any] = {name: self._empty(name, self._alloc) for name in self._names}
+
+    def _empty(self, name: str, size: int) -> Any:
+        kind = self._kinds[name]
+        if kind == "object":
+            return [None] * size
+        typecode = _TRACE_TYPECODES[kind]
+        return array(typecode, bytes(size * array(typecode).itemsize))
+
+    def _reallocate(self) -> None:
+        keep = self._end - self._start
+        if self.limit is None:
+            self._alloc = max(_TRACE_MIN_ALLOC, 2 * self._alloc)
+        for name in self._names:
+            fresh = self._empty(name, self._alloc)
+            fresh[0:keep] = self._cols[name][self._start : self._end]
+            self._cols[name] = fresh
+        self._start = 0
+        self._end = keep
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._names
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self.push(*(row.get(name) for name in self._names))
+
+    def push(self, *values: Any) -> None:
+        """Append one row given positionally in column order."""
+        if self._end == self._alloc:
+            self._reallocate()
+        pos = self._end
+        for name, value in zip(self._names, values):
+            if value is None and self._kinds[name] == "float":
+                value = math.nan
+            self._cols[name][pos] = value
+        self._end = pos + 1
+        if self.limit is not None and self._end - self._start > self.limit:
+            self._start += 1
+
+    def clear(self) -> None:
+        if self.limit is None:
+            self._alloc = _TRACE_MIN_ALLOC
+        self._start = 0
+        self._end = 0
+        self._cols = {name: self._empty(name, self._alloc) for name in self._names}
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _row(self, pos: int) -> dict[str, Any]:
+        row: dict[str, Any] = {}
+        for name in self._names:
+            value = self._cols[name][pos]
+            kind = self._kinds[name]
+            if kind == "float" and value != value:
+                value = None
+            elif kind == "bool":
+                value = bool(value)
+            row[name] = value
+        return row
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self._row(self._start + i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("trace index out of range")
+        return self._row(self._start + index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for pos in range(self._start, self._end):
+            yield self._row(pos)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TraceBuffer, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TraceBuffer(columns={list(self._names)}, limit={self.limit}, len={len(self)})"
+
+    def column(self, name: str) -> Any:
+        """
+        Return the live rows of one column. Typed columns are returned as a
+        zero-copy memoryview; object columns as a list copy.
+        """
+        data = self._cols[name]
+        if self._kinds[name] == "object":
+            return data[self._start : self._end]
+        return memoryview(data)[self._start : self._end]
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Return {column: numpy array} over the live rows. Typed columns are
+        zero-copy views; object columns are materialized as object arrays.
+        """
+        try:
+            import numpy as np
+        except ImportError as exc:  # pragma: no cover - optional dependency path
+            raise RuntimeError("numpy is required for TraceBuffer.to_numpy") from exc
+
+        out: dict[str, Any] = {}
+        for name in self._names:
+            data = self._cols[name]
+            if self._kinds[name] == "object":
+                out[name] = np.array(data[self._start : self._end], dtype=object)
+            else:
+                dtype = _NUMPY_DTYPES[data.typecode]
+                out[name] = np.frombuffer(data, dtype=dtype)[self._start : self._end]
+        return out
+
+    def to_dataframe(self):
+        """
+        Return the live rows as a pandas.DataFrame (float NaN marks missing values).
+        """
+        try:
+            import pandas as pd
+        except ImportError as exc:  # pragma: no cover - optional dependency path
+            raise RuntimeError("pandas is required for TraceBuffer.to_dataframe") from exc
+
+        return pd.DataFrame(self.to_numpy(), columns=list(self._names))
+
+
+def _ema_step(value: float, current: float | None, period: int) -> float:
+    alpha = 2.0 / (period + 1.0)
+    if current is None:
+        return value
+    return value * alpha + current * (1.0 - alpha)
+
+
+_EMA_CONVERGENCE = 1e-9
+
+
+def _ema_horizon(period: int) -> int:
+    """Steps after which the weight of older values in an EMA is below _EMA_CONVERGENCE."""
+    alpha = 2.0 / (period + 1.0)
+    if alpha >= 1.0:
+        return 1
+    return math.ceil(math.log(_EMA_CONVERGENCE) / math.log(1.0 - alpha))
+
+
+class SharedEMA:
+    """
+    EMA(value_key, period) owned by a SharedComputations registry. Every
+    consumer calls update() each step; the EMA advances on the first call of
+    a step and later calls return the cached value.
+    """
+
+    __slots__ = ("registry", "value_key", "period", "value", "_step", "consumers")
+
+    def __init__(self, registry: SharedComputations, value_key: str, period: int) -> None:
+        self.registry = registry
+        self.value_key = value_key
+        self.period = period
+        self.value: float | None = None
+        self._step = -1
+        self.consumers = 0
+
+    def reset(self) -> None:
+        self.value = None
+        self._step = -1
+
+    def update(self, val: float) -> float:
+        step = self.registry.step
+        if self._step != step:
+            self._step = step
+            self.value = _ema_step(val, self.value, self.period)
+            self.registry._count("ema", computed=True)
+        else:
+            self.registry._count("ema", computed=False)
+        return self.value  # type: ignore[return-value]
+
+
+class RollingOrderStatistics:
+    """
+    The last `length` values kept both in arrival order and sorted, so
+    percentiles (same interpolation as compute_percentile) are read by index
+    instead of sorting a copy. push() is a binary search plus a list shift.
+    """
+
+    __slots__ = ("length", "values", "sorted_values")
+
+    def __init__(self, length: int) -> None:
+        if length <= 0:
+            raise ValueError("length must be > 0")
+        self.length = length
+        self.values: deque[float] = deque()
+        self.sorted_values: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.sorted_values.clear()
+
+    def push(self, value: float) -> None:
+        self.values.append(value)
+        insort(self.sorted_values, value)
+        if len(self.values) > self.length:
+            old = self.values.popleft()
+            idx = bisect_left(self.sorted_values, old)
+            if idx < len(self.sorted_values) and self.sorted_values[idx] == old:
+                del self.sorted_values[idx]
+            else:  # unordered values such as NaN
+                self.sorted_values.remove(old)
+
+    def percentile(self, q: float, extra: float | None = None) -> float | None:
+        """
+        Percentile of the window, or of the window plus `extra` when given
+        (without inserting it).
+        """
+        vals = self.sorted_values
+        n = len(vals) + (0 if extra is None else 1)
+        if n == 0:
+            return None
+        if extra is None:
+            at = vals.__getitem__
+        else:
+            split = bisect_right(vals, extra)
+
+            def at(i: int) -> float:
+                if i < split:
+                    return vals[i]
+                return extra if i == split else vals[i - 1]
+
+        if q <= 0:
+            return at(0)
+        if q >= 100:
+            return at(n - 1)
+        pos = (n - 1) * (q / 100.0)
+        lower = math.floor(pos)
+        upper = math.ceil(pos)
+        if lower == upper:
+            return at(lower)
+        w = pos - lower
+        return at(lower) * (1.0 - w) + at(upper) * w
+
+
+class SharedHistory:
+    """
+    Rolling history of the last `length` values of one sub-computation, shared
+    by several consumers through a RollingOrderStatistics window. Consumers
+    query the values before the current step (previous_count(), percentile()),
+    then append() the current value; only the first append of a step is kept
+    and it enters the window when the next step starts. Percentiles are cached
+    per step, so several bands over the same history cost one lookup each.
+    """
+
+    __slots__ = (
+        "registry",
+        "key",
+        "length",
+        "stats",
+        "_pending",
+        "_pending_step",
+        "_cache_step",
+        "_cache",
+        "consumers",
+    )
+
+    def __init__(self, registry: SharedComputations, key: tuple[Any, ...], length: int) -> None:
+        self.registry = registry
+        self.key = key
+        self.length = length
+        self.stats = RollingOrderStatistics(length)
+        self._pending: float | None = None
+        self._pending_step = -1
+        self._cache_step = -1
+        self._cache: dict[tuple[float, float | None], float | None] = {}
+        self.consumers = 0
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self._pending = None
+        self._pending_step = -1
+        self._cache_step = -1
+        self._cache.clear()
+
+    def _sync(self) -> None:
+        step = self.registry.step
+        if self._pending_step not in (-1, step):
+            self.stats.push(self._pending)  # type: ignore[arg-type]
+            self._pending = None
+            self._pending_step = -1
+        if self._cache_step != step:
+            self._cache_step = step
+            self._cache.clear()
+
+    @property
+    def values(self) -> list[float]:
+        """All recorded values, oldest first, including the current step's."""
+        self._sync()
+        out = list(self.stats.values)
+        if self._pending_step != -1:
+            out.append(self._pending)  # type: ignore[arg-type]
+        return out[-self.length :]
+
+    def previous(self) -> list[float]:
+        """Values before the current step, oldest first (at most `length`)."""
+        self._sync()
+        return list(self.stats.values)
+
+    def previous_count(self) -> int:
+        self._sync()
+        return len(self.stats)
+
+    def percentile(self, q: float, extra: float | None = None) -> float | None:
+        """Percentile of the values before the current step (plus `extra` if given)."""
+        self._sync()
+        key = (q, extra)
+        if key in self._cache:
+            self.registry._count("percentile", computed=False)
+            return self._cache[key]
+        self.registry._count("percentile", computed=True)
+        threshold = self.stats.percentile(q, extra)
+        self._cache[key] = threshold
+        return threshold
+
+    def append(self, value: float) -> None:
+        self._sync()
+        if self._pending_step == self.registry.step:
+            self.registry._count("history", computed=False)
+            return
+        self._pending = value
+        self._pending_step = self.registry.step
+        self.registry._count("history", computed=True)
+
+
+class SharedRun:
+    """
+    Run detection of target_value in signal_key owned by a SharedComputations
+    registry. Every consumer calls update() each step; the first call of a
+    step advances the run and later calls return the cached
+    (current_run, ended_run), where ended_run is the length of the run that
+    ended at this step (0 if none).
+    """
+
+    __slots__ = ("registry", "signal_key", "target_value", "current_run", "ended_run", "_step", "consumers")
+
+    def __init__(self, registry: SharedComputations, signal_key: str, target_value: Any) -> None:
+        self.registry = registry
+        self.signal_key = signal_key
+        self.target_value = target_value
+        self.current_run = 0
+        self.ended_run = 0
+        self._step = -1
+        self.consumers = 0
+
+    def reset(self) -> None:
+        self.current_run = 0
+        self.ended_run = 0
+        self._step = -1
+
+    def update(self, v: Any) -> tuple[int, int]:
+        step = self.registry.step
+        if self._step != step:
+            self._step = step
+            if v == self.target_value:
+                self.current_run += 1
+                self.ended_run = 0
+            else:
+                self.ended_run = self.current_run
+                self.current_run = 0
+            self.registry._count("run", computed=True)
+        else:
+            self.registry._count("run", computed=False)
+        return self.current_run, self.ended_run
+
+
+def _advance_run(signal: Any, v: Any) -> int:
+    """
+    Advance signal.current_run for the base value v (through its SharedRun
+    when bound) and return the length of the run that ended at this step.
+    """
+    if signal.shared_run is not None:
+        signal.current_run, ended = signal.shared_run.update(v)
+        return ended
+    if v == signal.target_value:
+        signal.current_run += 1
+        return 0
+    ended = signal.current_run
+    signal.current_run = 0
+    return ended
+
+
+class SharedComputations:
+    """
+    Registry of sub-computations shared between signal nodes of one timeframe:
+    EMAs keyed by (value_key, period), run detection keyed by (signal_key,
+    target_value) and rolling histories keyed by what they record and their
+    length (e.g. ("value", value_key) and window_size for the rolling-percentile
+    signals). Signals opt in with bind_shared(registry); the driver calls
+    next_step() once before evaluating the signals of each record.
+
+    report() summarizes the deduplication: how many nodes were requested, how
+    many distinct ones exist, and how many updates were computed vs reused.
+    """
+
+    def __init__(self) -> None:
+        self.step = 0
+        self._emas: dict[tuple[str, int], SharedEMA] = {}
+        self._histories: dict[tuple[Any, ...], SharedHistory] = {}
+        self._runs: dict[tuple[str, str], SharedRun] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def next_step(self) -> None:
+        self.step += 1
+
+    def reset(self) -> None:
+        self.step = 0
+        for node in self._emas.values():
+            node.reset()
+        for node in self._histories.values():
+            node.reset()
+        for node in self._runs.values():
+            node.reset()
+        self._stats.clear()
+
+    def _count(self, kind: str, *, computed: bool) -> None:
+        stats = self._stats.setdefault(kind, {"computed": 0, "reused": 0})
+        stats["computed" if computed else "reused"] += 1
+
+    def ema(self, value_key: str, period: int) -> SharedEMA:
+        key = (value_key, int(period))
+        node = self._emas.get(key)
+        if node is None:
+            node = self._emas[key] = SharedEMA(self, value_key, int(period))
+        node.consumers += 1
+        return node
+
+    def run(self, signal_key: str, target_value: Any) -> SharedRun:
+        key = (signal_key, repr(target_value))
+        node = self._runs.get(key)
+        if node is None:
+            node = self._runs[key] = SharedRun(self, signal_key, target_value)
+        node.consumers += 1
+        return node
+
+    def history(self, key: tuple[Any, ...], length: int) -> SharedHistory:
+        full_key = (*key, int(length))
+        node = self._histories.get(full_key)
+        if node is None:
+            node = self._histories[full_key] = SharedHistory(self, key, int(length))
+        node.consumers += 1
+        return node
+
+    def report(self) -> dict[str, Any]:
+        def nodes(table: Mapping[Any, Any]) -> dict[str, int]:
+            requested = sum(node.consumers for node in table.values())
+            return {"requested": requested, "unique": len(table), "shared": requested - len(table)}
+
+        updates = {kind: dict(stats) for kind, stats in self._stats.items()}
+        return {
+            "steps": self.step,
+            "ema": nodes(self._emas),
+            "history": nodes(self._histories),
+            "run": nodes(self._runs),
+            "updates": updates,
+        }
+
+
 @dataclass
 class ValueVsRollingPercentile:
     """
     Signal that compares the current value against a percentile of previous
     window_size values. comparison='gt' (default) emits 1 when current > percentile;
     comparison='lt' emits 1 when current < percentile.
+
+    approximate=True keeps the history in a bounded-memory
+    WindowedQuantileSketch instead of a deque (for very long windows); see its
+    docstring for the error bound. history stays empty in that mode.
+    approximate is a Python-only constructor argument: signal graphs and
+    templates ignore it, so they evaluate like the console.
     """
 
+    exact_partition: ClassVar[bool] = False
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     window_size: int
     percentile: float = 50.0
     include_current: bool = False
     min_history: int = 1
     comparison: str = "gt"
+    approximate: bool = False
 
     history: deque[float] = field(default_factory=deque, init=False)
+    shared_history: SharedHistory | None = field(default=None, init=False, repr=False)
+    sketch: WindowedQuantileSketch | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         cmp_lower = self.comparison.lower()
@@ -76,16 +606,42 @@ class ValueVsRollingPercentile:
             raise ValueError("comparison must be 'gt' or 'lt'")
         self.comparison = cmp_lower
         self.last_threshold = None
+        if self.approximate:
+            self.sketch = WindowedQuantileSketch(self.window_size)
 
     def reset(self) -> None:
         self.history.clear()
+        if self.sketch is not None:
+            self.sketch.clear()
         self.last_threshold = None
 
+    def state_horizon(self) -> int | None:
+        """
+        Number of past steps that fully determine the output, or None when the
+        state reaches back without bound. Partitioned runs (htf.partition) use
+        it to size the warm-up replayed before each chunk; signals whose
+        horizon is only approximate set exact_partition = False.
+
+        The history holds the last window_size numeric values, and steps
+        without one (None, non-numeric) are skipped, so window_size steps
+        are only enough when every step carries a value: the horizon is
+        approximate.
+        """
+        return None if self.sketch is not None else self.window_size
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """
+        Keep the value history in a SharedComputations registry: signals on
+        the same value_key and window_size (e.g. p10/p90 bands) share one
+        order-statistic window instead of each sorting its own deque.
+        history is not filled while bound. Approximate signals keep their sketch.
+        """
+        if self.sketch is not None:
+            return
+        self.shared_history = registry.history(("value", self.value_key), self.window_size)
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def _is_trigger(self, val: float, threshold: float) -> bool:
         if self.comparison == "gt":
@@ -100,7 +656,20 @@ class ValueVsRollingPercentile:
         signal = 0
         threshold: float | None = None
 
-        if val is not None:
+        if val is not None and self.sketch is not None:
+            if min(len(self.sketch), self.window_size) >= self.min_history:
+                threshold = self.sketch.quantile(self.percentile, val if self.include_current else None)
+                if threshold is not None and self._is_trigger(val, threshold):
+                    signal = 1
+            self.sketch.add(val)
+        elif val is not None and self.shared_history is not None:
+            if self.shared_history.previous_count() >= self.min_history:
+                extra = val if self.include_current else None
+                threshold = self.shared_history.percentile(self.percentile, extra)
+                if threshold is not None and self._is_trigger(val, threshold):
+                    signal = 1
+            self.shared_history.append(val)
+        elif val is not None:
             if len(self.history) >= self.min_history:
                 seq = list(self.history)
                 if self.include_current:
@@ -147,6 +716,8 @@ class SignalRunLengthReached:
     stay 1 for post_run_extension extra steps.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     signal_key: str
     target_value: Any = 1
     min_run_length: int = 3
@@ -155,21 +726,30 @@ class SignalRunLengthReached:
     current_run: int = 0
     active: bool = False
     tail_remaining: int = 0
+    shared_run: SharedRun | None = field(default=None, init=False, repr=False)
 
     def reset(self) -> None:
         self.current_run = 0
         self.active = False
         self.tail_remaining = 0
 
+    def state_horizon(self) -> int | None:
+        # a run seen for min_run_length steps is active; its tail lasts post_run_extension
+        return self.min_run_length + self.post_run_extension
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """Read run lengths from a SharedRun shared with other run signals on the same base."""
+        self.shared_run = registry.run(self.signal_key, self.target_value)
+
     def __call__(self, features: dict[str, Any]) -> int:
         v = features.get(self.signal_key)
+        ended = _advance_run(self, v)
 
         # run interrupted
-        if v != self.target_value:
-            if self.current_run > 0 and self.active and self.post_run_extension > 0:
+        if self.current_run == 0:
+            if ended > 0 and self.active and self.post_run_extension > 0:
                 self.tail_remaining = self.post_run_extension
 
-            self.current_run = 0
             self.active = False
 
             if self.tail_remaining > 0:
@@ -179,7 +759,6 @@ class SignalRunLengthReached:
             return 0
 
         # still in the run
-        self.current_run += 1
         self.tail_remaining = 0
 
         if self.active:
@@ -205,8 +784,13 @@ class SignalRunLengthReachedHistoryPercentile:
       activates, stays active until the run ends, and can optionally extend for
       post_run_extension extra steps.
     - Per-run thresholds and run lengths are recorded in run_trace.
+    - approximate=True keeps run lengths in a WindowedQuantileSketch instead of
+      history_runs (bounded memory for very long history_window); Python-only,
+      ignored in signal graphs and templates.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     signal_key: str
     target_value: Any = 1
     history_window: int = 100
@@ -214,14 +798,18 @@ class SignalRunLengthReachedHistoryPercentile:
     min_history_runs: int = 1
     post_run_extension: int = 0
     run_trace_limit: Any = _UNSET
+    approximate: bool = False
 
     current_run: int = 0
     history_runs: deque[int] = field(default_factory=deque, init=False)
+    sketch: WindowedQuantileSketch | None = field(default=None, init=False, repr=False)
+    shared_run: SharedRun | None = field(default=None, init=False, repr=False)
+    shared_history: SharedHistory | None = field(default=None, init=False, repr=False)
     current_threshold: float | None = field(default=None, init=False)
     last_threshold: float | None = field(default=None, init=False)
     active: bool = False
     tail_remaining: int = 0
-    run_trace: list[dict[str, Any]] = field(default_factory=list, init=False)
+    run_trace: TraceBuffer = field(init=False)
 
     def __post_init__(self) -> None:
         if self.history_window <= 0:
@@ -234,47 +822,76 @@ class SignalRunLengthReachedHistoryPercentile:
             raise ValueError("min_history_runs cannot exceed history_window")
 
         self.run_trace_limit = _resolve_limit(self.run_trace_limit, max(self.history_window, _DEFAULT_TRACE_LIMIT))
+        self.run_trace = TraceBuffer(
+            {"run_length": "int", "threshold": "float", "activated": "bool"},
+            self.run_trace_limit,
+        )
+        if self.approximate:
+            self.sketch = WindowedQuantileSketch(self.history_window)
 
     def reset(self) -> None:
         self.current_run = 0
         self.history_runs.clear()
+        if self.sketch is not None:
+            self.sketch.clear()
         self.current_threshold = None
         self.last_threshold = None
         self.active = False
         self.tail_remaining = 0
         self.run_trace.clear()
 
+    def state_horizon(self) -> int | None:
+        return None  # history_window completed runs of any length
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """
+        Share run detection and the completed run-length history (per
+        history_window) with other run signals on the same base, so several
+        percentiles read one sorted history. history_runs is not filled while
+        bound; approximate signals keep their sketch.
+        """
+        self.shared_run = registry.run(self.signal_key, self.target_value)
+        if self.sketch is None:
+            key = ("run_length", self.signal_key, repr(self.target_value))
+            self.shared_history = registry.history(key, self.history_window)
+
     def _compute_threshold(self) -> float | None:
+        if self.shared_history is not None:
+            if self.shared_history.previous_count() < self.min_history_runs:
+                return None
+            return self.shared_history.percentile(self.percentile)
+        if self.sketch is not None:
+            if min(len(self.sketch), self.history_window) < self.min_history_runs:
+                return None
+            return self.sketch.quantile(self.percentile)
         if len(self.history_runs) < self.min_history_runs:
             return None
         return compute_percentile(self.history_runs, self.percentile)
 
-    def _finalize_run(self) -> None:
-        if self.current_run > 0:
-            self.run_trace.append(
-                {
-                    "run_length": self.current_run,
-                    "threshold": self.current_threshold,
-                    "activated": self.active,
-                }
-            )
-            if self.run_trace_limit is not None and len(self.run_trace) > self.run_trace_limit:
-                del self.run_trace[: len(self.run_trace) - self.run_trace_limit]
-            self.history_runs.append(self.current_run)
+    def _finalize_run(self, run_length: int) -> None:
+        if run_length <= 0:
+            return
+        self.run_trace.push(run_length, self.current_threshold, self.active)
+        if self.shared_history is not None:
+            self.shared_history.append(run_length)
+        elif self.sketch is not None:
+            self.sketch.add(run_length)
+        else:
+            self.history_runs.append(run_length)
             if len(self.history_runs) > self.history_window:
                 self.history_runs.popleft()
 
     def __call__(self, features: dict[str, Any]) -> int:
         v = features.get(self.signal_key)
+        ended = _advance_run(self, v)
 
-        if v != self.target_value:
-            prev_threshold = self.current_threshold if self.current_run > 0 else self.last_threshold
-            self._finalize_run()
+        if self.current_run == 0:
+            prev_threshold = self.current_threshold if ended > 0 else self.last_threshold
+            self._finalize_run(ended)
 
             if self.active and self.post_run_extension > 0:
                 self.tail_remaining = self.post_run_extension
 
-            self.current_run = 0
             self.current_threshold = None
             self.active = False
 
@@ -286,10 +903,9 @@ class SignalRunLengthReachedHistoryPercentile:
             return 0
 
         # Start of a new run
-        if self.current_run == 0:
+        if self.current_run == 1:
             self.current_threshold = self._compute_threshold()
 
-        self.current_run += 1
         self.tail_remaining = 0
 
         if not self.active and self.current_threshold is not None and self.current_run >= self.current_threshold:
@@ -308,6 +924,8 @@ class SignalRunInterrupted:
     post_run_extension extra steps.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     signal_key: str
     target_value: Any = 1
     min_run_length: int = 3
@@ -315,29 +933,35 @@ class SignalRunInterrupted:
 
     current_run: int = 0
     tail_remaining: int = 0
+    shared_run: SharedRun | None = field(default=None, init=False, repr=False)
 
     def reset(self) -> None:
         self.current_run = 0
         self.tail_remaining = 0
 
+    def state_horizon(self) -> int | None:
+        return self.min_run_length + self.post_run_extension + 1
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """Read run lengths from a SharedRun shared with other run signals on the same base."""
+        self.shared_run = registry.run(self.signal_key, self.target_value)
+
     def __call__(self, features: dict[str, Any]) -> int:
         v = features.get(self.signal_key)
+        ended = _advance_run(self, v)
 
         # inside a run
-        if v == self.target_value:
-            self.current_run += 1
+        if self.current_run > 0:
             self.tail_remaining = 0
             return 0
 
         # possible interruption
-        if self.current_run >= self.min_run_length:
-            self.current_run = 0
+        if ended >= self.min_run_length:
             if self.post_run_extension > 0:
                 self.tail_remaining = self.post_run_extension
             return 1
 
         # no valid run ended, maybe in tail phase
-        self.current_run = 0
         if self.tail_remaining > 0:
             self.tail_remaining -= 1
             return 1
@@ -357,40 +981,73 @@ class SignalRunLengthVsHistoryPercentile:
         * when current_run first exceeds this threshold, activate the signal;
         * the signal stays 1 for the rest of this run;
         * after the run ends, it can remain 1 for post_run_extension extra steps.
+    - approximate=True keeps run lengths in a WindowedQuantileSketch instead of
+      history_runs (bounded memory for very long history_window); Python-only,
+      ignored in signal graphs and templates.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     signal_key: str
     target_value: Any = 1
     history_window: int = 100
     percentile: float = 90.0
     min_history_runs: int = 5
     post_run_extension: int = 0
+    approximate: bool = False
 
     current_run: int = 0
     history_runs: deque[int] = field(default_factory=deque, init=False)
     active: bool = False
     tail_remaining: int = 0
+    sketch: WindowedQuantileSketch | None = field(default=None, init=False, repr=False)
+    shared_run: SharedRun | None = field(default=None, init=False, repr=False)
+    shared_history: SharedHistory | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.approximate:
+            self.sketch = WindowedQuantileSketch(self.history_window)
 
     def reset(self) -> None:
         self.current_run = 0
         self.history_runs.clear()
+        if self.sketch is not None:
+            self.sketch.clear()
         self.active = False
         self.tail_remaining = 0
 
+    def state_horizon(self) -> int | None:
+        return None  # history_window completed runs of any length
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """
+        Share run detection and the completed run-length history (per
+        history_window) with other run signals on the same base. history_runs
+        is not filled while bound; approximate signals keep their sketch.
+        """
+        self.shared_run = registry.run(self.signal_key, self.target_value)
+        if self.sketch is None:
+            key = ("run_length", self.signal_key, repr(self.target_value))
+            self.shared_history = registry.history(key, self.history_window)
+
     def __call__(self, features: dict[str, Any]) -> int:
         v = features.get(self.signal_key)
+        ended = _advance_run(self, v)
 
         # run interrupted
-        if v != self.target_value:
-            if self.current_run > 0:
-                self.history_runs.append(self.current_run)
+        if self.current_run == 0:
+            if ended > 0 and self.shared_history is not None:
+                self.shared_history.append(ended)
+            elif ended > 0 and self.sketch is not None:
+                self.sketch.add(ended)
+            elif ended > 0:
+                self.history_runs.append(ended)
                 if len(self.history_runs) > self.history_window:
                     self.history_runs.popleft()
 
             if self.active and self.post_run_extension > 0:
                 self.tail_remaining = self.post_run_extension
 
-            self.current_run = 0
             self.active = False
 
             if self.tail_remaining > 0:
@@ -400,16 +1057,23 @@ class SignalRunLengthVsHistoryPercentile:
             return 0
 
         # still in run
-        self.current_run += 1
         self.tail_remaining = 0
 
         if self.active:
             return 1
 
-        if len(self.history_runs) < self.min_history_runs:
+        if self.shared_history is not None:
+            if self.shared_history.previous_count() < self.min_history_runs:
+                return 0
+            thr = self.shared_history.percentile(self.percentile)
+        elif self.sketch is not None:
+            if min(len(self.sketch), self.history_window) < self.min_history_runs:
+                return 0
+            thr = self.sketch.quantile(self.percentile)
+        elif len(self.history_runs) < self.min_history_runs:
             return 0
-
-        thr = compute_percentile(self.history_runs, self.percentile)
+        else:
+            thr = compute_percentile(self.history_runs, self.percentile)
         if thr is None:
             return 0
 
@@ -432,6 +1096,8 @@ class SignalValueVsLastTrueReference:
     - Emits 1 only after at least one reference point has been stored.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     reference_signal_key: str
     comparison: str = "lt"
@@ -447,11 +1113,11 @@ class SignalValueVsLastTrueReference:
     def reset(self) -> None:
         self.last_reference_value = None
 
+    def state_horizon(self) -> int | None:
+        return None  # the reference can be arbitrarily old
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def __call__(self, features: dict[str, Any]) -> int:
         val = self._get_numeric_value(features)
@@ -486,6 +1152,8 @@ class SignalValueVsLastTargetForBase:
       no signal is emitted for that step.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     base_signal_key: str
     target_signal_key: str
@@ -502,11 +1170,11 @@ class SignalValueVsLastTargetForBase:
     def reset(self) -> None:
         self.last_target_value = None
 
+    def state_horizon(self) -> int | None:
+        return None  # the last target value can be arbitrarily old
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def __call__(self, features: dict[str, Any]) -> int:
         val = self._get_numeric_value(features)
@@ -536,6 +1204,8 @@ class SignalValueVsPrevious:
       "lt" emits 1 when current < previous.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     comparison: str = "gt"
 
@@ -550,11 +1220,11 @@ class SignalValueVsPrevious:
     def reset(self) -> None:
         self.previous_value = None
 
+    def state_horizon(self) -> int | None:
+        return 1
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def __call__(self, features: dict[str, Any]) -> int:
         val = self._get_numeric_value(features)
@@ -587,6 +1257,8 @@ class SignalValueVsLastSignalRunStatistic:
     latest run has no numeric values, the signal stays 0.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     signal_key: str
     statistic: str = "mean"
@@ -616,11 +1288,11 @@ class SignalValueVsLastSignalRunStatistic:
         self.in_run = False
         self.last_statistic = None
 
+    def state_horizon(self) -> int | None:
+        return None  # the last run can be arbitrarily old
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def _compute_statistic(self, values: list[float]) -> float | None:
         if not values:
@@ -670,6 +1342,9 @@ class SignalEMAFastSlowComparison:
     - prefer: "fast" or "slow" to choose which EMA should be larger to emit 1.
     """
 
+    exact_partition: ClassVar[bool] = False
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     ema_period_1: int
     ema_period_2: int
@@ -679,6 +1354,7 @@ class SignalEMAFastSlowComparison:
     ema_2: float | None = field(default=None, init=False)
     fast_period: int = field(default=0, init=False)
     slow_period: int = field(default=0, init=False)
+    shared_emas: tuple[SharedEMA, SharedEMA] | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.ema_period_1 <= 0 or self.ema_period_2 <= 0:
@@ -701,17 +1377,21 @@ class SignalEMAFastSlowComparison:
         self.ema_1 = None
         self.ema_2 = None
 
+    def state_horizon(self) -> int | None:
+        return _ema_horizon(max(self.ema_period_1, self.ema_period_2))
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """Read both EMAs from a SharedComputations registry instead of private state."""
+        self.shared_emas = (
+            registry.ema(self.value_key, self.ema_period_1),
+            registry.ema(self.value_key, self.ema_period_2),
+        )
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def _update_ema(self, value: float, current: float | None, period: int) -> float:
-        alpha = 2.0 / (period + 1.0)
-        if current is None:
-            return value
-        return value * alpha + current * (1.0 - alpha)
+        return _ema_step(value, current, period)
 
     def _get_fast_slow_ema(self) -> tuple[float | None, float | None]:
         if self.ema_period_1 < self.ema_period_2:
@@ -723,8 +1403,12 @@ class SignalEMAFastSlowComparison:
         if val is None:
             return 0
 
-        self.ema_1 = self._update_ema(val, self.ema_1, self.ema_period_1)
-        self.ema_2 = self._update_ema(val, self.ema_2, self.ema_period_2)
+        if self.shared_emas is not None:
+            self.ema_1 = self.shared_emas[0].update(val)
+            self.ema_2 = self.shared_emas[1].update(val)
+        else:
+            self.ema_1 = self._update_ema(val, self.ema_1, self.ema_period_1)
+            self.ema_2 = self._update_ema(val, self.ema_2, self.ema_period_2)
 
         fast_ema, slow_ema = self._get_fast_slow_ema()
         if fast_ema is None or slow_ema is None:
@@ -752,9 +1436,16 @@ class SignalEMADiffVsHistoryPercentile:
       "lt" compares current abs diff < percentile.
 
     The signal also records per-step EMA values, absolute differences, and the
-    percentile threshold used for that step in the `trace` list.
+    percentile threshold used for that step in the columnar `trace` buffer.
+
+    approximate=True keeps the abs-diff history in a bounded-memory
+    WindowedQuantileSketch instead of abs_diff_history (Python-only: signal
+    graphs and templates ignore it).
     """
 
+    exact_partition: ClassVar[bool] = False
+    catch_up: ClassVar[str] = "replay"
+
     value_key: str
     ema_period_1: int
     ema_period_2: int
@@ -763,13 +1454,17 @@ class SignalEMADiffVsHistoryPercentile:
     min_history: int = 1
     comparison: str = "gt"
     trace_limit: Any = _UNSET
+    approximate: bool = False
 
     ema_1: float | None = field(default=None, init=False)
     ema_2: float | None = field(default=None, init=False)
     last_abs_diff: float | None = field(default=None, init=False)
     last_threshold: float | None = field(default=None, init=False)
     abs_diff_history: deque[float] = field(default_factory=deque, init=False)
-    trace: list[dict[str, float | None]] = field(default_factory=list, init=False)
+    trace: TraceBuffer = field(init=False)
+    shared_emas: tuple[SharedEMA, SharedEMA] | None = field(default=None, init=False, repr=False)
+    shared_history: SharedHistory | None = field(default=None, init=False, repr=False)
+    sketch: WindowedQuantileSketch | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.ema_period_1 <= 0 or self.ema_period_2 <= 0:
@@ -788,6 +1483,12 @@ class SignalEMADiffVsHistoryPercentile:
         self.comparison = cmp_lower
 
         self.trace_limit = _resolve_limit(self.trace_limit, max(self.history_window, _DEFAULT_TRACE_LIMIT))
+        self.trace = TraceBuffer(
+            {"ema_1": "float", "ema_2": "float", "abs_diff": "float", "threshold": "float"},
+            self.trace_limit,
+        )
+        if self.approximate:
+            self.sketch = WindowedQuantileSketch(self.history_window)
 
     def reset(self) -> None:
         self.ema_1 = None
@@ -795,19 +1496,49 @@ class SignalEMADiffVsHistoryPercentile:
         self.last_abs_diff = None
         self.last_threshold = None
         self.abs_diff_history.clear()
+        if self.sketch is not None:
+            self.sketch.clear()
         self.trace.clear()
 
+    def state_horizon(self) -> int | None:
+        if self.sketch is not None:
+            return None
+        return _ema_horizon(max(self.ema_period_1, self.ema_period_2)) + self.history_window
+
+    def bind_shared(self, registry: SharedComputations) -> None:
+        """
+        Read both EMAs and the abs-diff history from a SharedComputations
+        registry, so nodes with the same value_key/periods/history_window
+        compute them once per step. abs_diff_history is not filled while bound.
+        Approximate signals share the EMAs but keep their own sketch.
+        """
+        self.shared_emas = (
+            registry.ema(self.value_key, self.ema_period_1),
+            registry.ema(self.value_key, self.ema_period_2),
+        )
+        if self.sketch is not None:
+            return
+        low, high = sorted((self.ema_period_1, self.ema_period_2))
+        self.shared_history = registry.history(("ema_abs_diff", self.value_key, low, high), self.history_window)
+
     def _get_numeric_value(self, features: dict[str, Any]) -> float | None:
-        raw_val = features.get(self.value_key)
-        if isinstance(raw_val, (int, float)) and not isinstance(raw_val, bool):
-            return float(raw_val)
-        return None
+        return _numeric_feature(features, self.value_key)
 
     def _update_ema(self, value: float, current: float | None, period: int) -> float:
-        alpha = 2.0 / (period + 1.0)
-        if current is None:
-            return value
-        return value * alpha + current * (1.0 - alpha)
+        return _ema_step(value, current, period)
+
+    def _threshold(self) -> float | None:
+        if self.sketch is not None:
+            if min(len(self.sketch), self.history_window) < self.min_history:
+                return None
+            return self.sketch.quantile(self.percentile)
+        if self.shared_history is not None:
+            if self.shared_history.previous_count() < self.min_history:
+                return None
+            return self.shared_history.percentile(self.percentile)
+        if len(self.abs_diff_history) < self.min_history:
+            return None
+        return compute_percentile(self.abs_diff_history, self.percentile)
 
     def __call__(self, features: dict[str, Any]) -> int:
         val = self._get_numeric_value(features)
@@ -816,36 +1547,32 @@ class SignalEMADiffVsHistoryPercentile:
         abs_diff: float | None = None
 
         if val is not None:
-            self.ema_1 = self._update_ema(val, self.ema_1, self.ema_period_1)
-            self.ema_2 = self._update_ema(val, self.ema_2, self.ema_period_2)
+            if self.shared_emas is not None:
+                self.ema_1 = self.shared_emas[0].update(val)
+                self.ema_2 = self.shared_emas[1].update(val)
+            else:
+                self.ema_1 = self._update_ema(val, self.ema_1, self.ema_period_1)
+                self.ema_2 = self._update_ema(val, self.ema_2, self.ema_period_2)
             abs_diff = abs(self.ema_1 - self.ema_2)
 
-            if (
-                len(self.abs_diff_history) >= self.min_history
-                and (threshold := compute_percentile(self.abs_diff_history, self.percentile)) is not None
-                and (
-                    (self.comparison == "gt" and abs_diff > threshold)
-                    or (self.comparison == "lt" and abs_diff < threshold)
-                )
+            threshold = self._threshold()
+            if threshold is not None and (
+                (self.comparison == "gt" and abs_diff > threshold) or (self.comparison == "lt" and abs_diff < threshold)
             ):
                 signal = 1
 
-            self.abs_diff_history.append(abs_diff)
-            if len(self.abs_diff_history) > self.history_window:
-                self.abs_diff_history.popleft()
+            if self.sketch is not None:
+                self.sketch.add(abs_diff)
+            elif self.shared_history is not None:
+                self.shared_history.append(abs_diff)
+            else:
+                self.abs_diff_history.append(abs_diff)
+                if len(self.abs_diff_history) > self.history_window:
+                    self.abs_diff_history.popleft()
 
         self.last_abs_diff = abs_diff
         self.last_threshold = threshold
-        self.trace.append(
-            {
-                "ema_1": self.ema_1,
-                "ema_2": self.ema_2,
-                "abs_diff": abs_diff,
-                "threshold": threshold,
-            }
-        )
-        if self.trace_limit is not None and len(self.trace) > self.trace_limit:
-            del self.trace[: len(self.trace) - self.trace_limit]
+        self.trace.push(self.ema_1, self.ema_2, abs_diff, threshold)
 
         return signal
 
@@ -867,6 +1594,8 @@ class SignalIntervalBetweenMarkers:
     `last_interval_closed_by`.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     start_signal_key: str
     end_signal_key: str
     max_length: int | None = None
@@ -877,13 +1606,17 @@ class SignalIntervalBetweenMarkers:
     current_start_index: int | None = None
     last_interval_length: int | None = None
     last_interval_closed_by: str | None = None
-    intervals: list[dict[str, Any]] = field(default_factory=list, init=False)
+    intervals: TraceBuffer = field(init=False)
     step_index: int = 0
 
     def __post_init__(self) -> None:
         if self.max_length is not None and self.max_length <= 0:
             raise ValueError("max_length must be > 0 when provided")
         self.intervals_limit = _resolve_limit(self.intervals_limit, _DEFAULT_TRACE_LIMIT)
+        self.intervals = TraceBuffer(
+            {"start_index": "int", "end_index": "int", "length": "int", "closed_by": "object"},
+            self.intervals_limit,
+        )
 
     def reset(self) -> None:
         self.active = False
@@ -894,18 +1627,13 @@ class SignalIntervalBetweenMarkers:
         self.intervals.clear()
         self.step_index = 0
 
+    def state_horizon(self) -> int | None:
+        return None  # an open interval without max_length can be arbitrarily long
+
     def _close_interval(self, reason: str) -> None:
-        interval = {
-            "start_index": self.current_start_index,
-            "end_index": self.step_index,
-            "length": self.current_length,
-            "closed_by": reason,
-        }
         self.last_interval_length = self.current_length
         self.last_interval_closed_by = reason
-        self.intervals.append(interval)
-        if self.intervals_limit is not None and len(self.intervals) > self.intervals_limit:
-            del self.intervals[: len(self.intervals) - self.intervals_limit]
+        self.intervals.push(self.current_start_index, self.step_index, self.current_length, reason)
 
         self.active = False
         self.current_length = 0
@@ -951,16 +1679,25 @@ class SignalNthTargetWithinWindowAfterTrigger:
     found before the window expires, last_search_success is set to False; if it
     is found, last_search_success is set to True. Overlapping windows from
     multiple triggers are supported.
+
+    All windows observe the same B stream, so each one only stores its start
+    step and the global B count at that step. Windows are kept in a deque
+    ordered by start (and therefore by count): the windows that reach their
+    target_index-th B and the window that expires are always at the front, so
+    a step costs amortized O(1) however many windows overlap.
     """
 
+    catch_up: ClassVar[str] = "replay"
+
     trigger_signal_key: str
     target_signal_key: str
     window_length: int
     target_index: int
 
-    active_windows: list[dict[str, int]] = field(default_factory=list, init=False)
     last_search_success: bool | None = field(default=None, init=False)
     step_index: int = 0
+    target_count: int = field(default=0, init=False)
+    windows: deque[tuple[int, int]] = field(default_factory=deque, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.window_length <= 0:
@@ -969,40 +1706,50 @@ class SignalNthTargetWithinWindowAfterTrigger:
             raise ValueError("target_index must be >= 1")
 
     def reset(self) -> None:
-        self.active_windows.clear()
+        self.windows.clear()
         self.last_search_success = None
         self.step_index = 0
+        self.target_count = 0
 
-    def __call__(self, features: dict[str, Any]) -> int:
-        signal = 0
-        target_active = bool(features.get(self.target_signal_key))
-        new_active_windows: list[dict[str, int]] = []
-
-        for window in self.active_windows:
-            if target_active:
-                window["seen_targets"] = window.get("seen_targets", 0) + 1
-                if window["seen_targets"] == self.target_index:
-                    signal = 1
-                    self.last_search_success = True
-                    continue
+    def state_horizon(self) -> int | None:
+        # every open window started less than window_length steps ago
+        return self.window_length
 
-            window["remaining_steps"] = window.get("remaining_steps", 0) - 1
-            if window["remaining_steps"] <= 0:
-                self.last_search_success = False
-                continue
+    @property
+    def active_windows(self) -> list[dict[str, int]]:
+        """Open windows as dicts (remaining_steps, seen_targets, start_step), oldest first."""
+        last_step = self.step_index - 1
+        return [
+            {
+                "remaining_steps": self.window_length - (last_step - start),
+                "seen_targets": self.target_count - base,
+                "start_step": start,
+            }
+            for start, base in self.windows
+        ]
 
-            new_active_windows.append(window)
+    def __call__(self, features: dict[str, Any]) -> int:
+        signal = 0
+        windows = self.windows
+        step = self.step_index
+
+        if bool(features.get(self.target_signal_key)):
+            self.target_count += 1
+            # windows opened with this base count just saw their target_index-th B
+            found_base = self.target_count - self.target_index
+            while windows and windows[0][1] == found_base:
+                windows.popleft()
+                signal = 1
+            if signal:
+                self.last_search_success = True
 
-        self.active_windows = new_active_windows
+        # only the oldest window can expire, and it did not find B this step
+        if windows and windows[0][0] <= step - self.window_length:
+            windows.popleft()
+            self.last_search_success = False
 
         if bool(features.get(self.trigger_signal_key)):
-            self.active_windows.append(
-                {
-                    "remaining_steps": self.window_length,
-                    "seen_targets": 0,
-                    "start_step": self.step_index,
-                }
-            )
+            windows.append((step, self.target_count))
 
         self.step_index += 1
         return signal
@@ -1014,6 +1761,8 @@ class SignalIntersection:
     Intersection signal: returns 1 only when all listed signal keys are truthy.
     """
 
+    catch_up: ClassVar[str] = "skip"
+
     signal_keys: list[str]
 
     def __post_init__(self) -> None:
@@ -1025,6 +1774,9 @@ class SignalIntersection:
     def reset(self) -> None:
         pass
 
+    def state_horizon(self) -> int | None:
+        return 0
+
     def __call__(self, features: dict[str, Any]) -> int:
         for key in self.signal_keys:
             if not bool(features.get(key)):
@@ -1038,11 +1790,16 @@ class SignalExternalFlag:
     External flag signal: returns 1 when the external feature equals true_value.
     """
 
+    catch_up: ClassVar[str] = "skip"
+
     signal_key: str
     true_value: Any = 1
 
     def reset(self) -> None:
         pass
 
+    def state_horizon(self) -> int | None:
+        return 0
+
     def __call__(self, features: dict[str, Any]) -> int:
         return 1 if features.get(self.signal_key) == self.true_value else 0
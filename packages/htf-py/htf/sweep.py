@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import itertools
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+# Parameter sweeps: evaluate one signal class for every combination of a
+# parameter grid in a single pass over the records. All instances of a pass
+# are bound to one SharedComputations registry, so EMAs are shared across
+# periods, sorted histories across percentiles and run detection across
+# thresholds. With processes > 1 the combinations are split into contiguous
+# chunks (grid order keeps the last parameters, usually the cheap ones,
+# together) and each chunk runs its own pass in a worker process.
+
+SWEEP_OUTPUTS = ("summary", "signals")
+
+
+def _require_pandas():
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for htf.sweep") from exc
+    return np, pd
+
+
+def parameter_grid(grid: Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """
+    All combinations of grid values, in itertools.product order (the last
+    parameter varies fastest). A scalar value is treated as a single choice.
+    """
+    names = list(grid)
+    choices = []
+    for name in names:
+        values = grid[name]
+        if isinstance(values, (str, bytes)) or not isinstance(values, Sequence):
+            values = [values]
+        if len(values) == 0:
+            raise ValueError(f"grid parameter {name!r} has no values")
+        choices.append(list(values))
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def _record_features(rec: Mapping[str, Any]) -> dict[str, Any]:
+    """Features seen by a signal for one record (same flattening as the graph runner)."""
+    features = dict(rec)
+    values = rec.get("values")
+    if isinstance(values, Mapping):
+        features.update(values)
+    return features
+
+
+def _resolve_signal(signal: Any) -> Any:
+    if isinstance(signal, str):
+        from .timeframe import _signal_class_map
+
+        signal_cls = _signal_class_map().get(signal)
+        if signal_cls is None:
+            raise ValueError(f"unknown signal type {signal!r}")
+        return signal_cls
+    if not callable(signal):
+        raise ValueError("signal must be a signal class or a signal type name")
+    return signal
+
+
+def _run_combinations(
+    signal_cls: Any,
+    features: Sequence[Mapping[str, Any]],
+    combos: Sequence[Mapping[str, Any]],
+    share_computations: bool,
+) -> tuple[list[bytearray], dict[str, Any] | None]:
+    """One pass over features evaluating every combination; returns 0/1 bytes per combination."""
+    from .signals import SharedComputations
+
+    shared = SharedComputations() if share_computations else None
+    instances = [signal_cls(**combo) for combo in combos]
+    if shared is not None:
+        for instance in instances:
+            if hasattr(instance, "bind_shared"):
+                instance.bind_shared(shared)
+
+    n = len(features)
+    outputs = [bytearray(n) for _ in instances]
+    pairs = list(zip(instances, outputs))
+    for i, feats in enumerate(features):
+        if shared is not None:
+            shared.next_step()
+        for instance, out in pairs:
+            if instance(feats):
+                out[i] = 1
+    return outputs, (shared.report() if shared is not None else None)
+
+
+def _run_chunk(args: tuple[Any, ...]) -> tuple[list[bytearray], dict[str, Any] | None]:
+    return _run_combinations(*args)
+
+
+def _summarize(np: Any, signal: Any) -> dict[str, Any]:
+    n = len(signal)
+    active = signal.astype(bool)
+    padded = np.concatenate(([False], active, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    runs = ends - starts
+    return {
+        "active_steps": int(active.sum()),
+        "active_ratio": float(active.mean()) if n else 0.0,
+        "activations": len(starts),
+        "mean_active_run": float(runs.mean()) if len(runs) else 0.0,
+        "max_active_run": int(runs.max()) if len(runs) else 0,
+        "first_active": int(starts[0]) if len(starts) else None,
+    }
+
+
+def sweep(
+    signal: Any,
+    records: Any,
+    grid: Mapping[str, Sequence[Any]],
+    *,
+    params: Mapping[str, Any] | None = None,
+    output: str = "summary",
+    processes: int | None = None,
+    share_computations: bool = True,
+):
+    """
+    Evaluate signal for every combination of grid over records and return a
+    tidy DataFrame with one row per combination (one column per grid
+    parameter).
+
+    - signal: a signal class, or a type name from the graph templates (then
+      params and grid values are coerced like template params).
+    - records: a sequence of feature mappings (a nested "values" mapping is
+      flattened like the graph runner does) or a pandas DataFrame.
+    - params: fixed parameters shared by every combination.
+    - output="summary" adds active_steps, active_ratio, activations,
+      mean_active_run, max_active_run and first_active; output="signals"
+      adds a "signal" column holding each int8 output array.
+    - processes > 1 splits the combinations over a process pool (the signal
+      class and records must be picklable); each worker shares computations
+      within its own chunk.
+
+    frame.attrs["sweep_report"] holds the combination count, chunk count and
+    the SharedComputations report of each chunk.
+    """
+    np, pd = _require_pandas()
+    if output not in SWEEP_OUTPUTS:
+        raise ValueError(f"output must be one of {SWEEP_OUTPUTS}")
+    named = isinstance(signal, str)
+    signal_cls = _resolve_signal(signal)
+
+    combos = parameter_grid(grid)
+    fixed = dict(params or {})
+    overlap = set(fixed) & set(grid)
+    if overlap:
+        raise ValueError(f"parameters given both in params and grid: {sorted(overlap)}")
+    if named:
+        from .timeframe import _coerce_param
+
+        fixed = {name: _coerce_param(name, value) for name, value in fixed.items()}
+        combos = [{name: _coerce_param(name, value) for name, value in combo.items()} for combo in combos]
+    full_combos = [{**fixed, **combo} for combo in combos]
+
+    if isinstance(records, pd.DataFrame):
+        features = records.to_dict("records")
+    else:
+        features = [_record_features(rec) for rec in records]
+
+    n_chunks = max(1, min(int(processes or 1), len(full_combos)))
+    if n_chunks == 1:
+        results = [_run_combinations(signal_cls, features, full_combos, share_computations)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        bounds = np.linspace(0, len(full_combos), n_chunks + 1).astype(int)
+        chunks = [full_combos[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=n_chunks) as pool:
+            results = list(
+                pool.map(_run_chunk, [(signal_cls, features, chunk, share_computations) for chunk in chunks])
+            )
+
+    signals = [np.frombuffer(out, dtype=np.int8) for chunk_outputs, _ in results for out in chunk_outputs]
+    rows = []
+    for combo, out in zip(combos, signals):
+        row = dict(combo)
+        if output == "summary":
+            row.update(_summarize(np, out))
+        else:
+            row["signal"] = out
+        rows.append(row)
+    frame = pd.DataFrame(rows)
+    frame.attrs["sweep_report"] = {
+        "combinations": len(full_combos),
+        "records": len(features),
+        "chunks": n_chunks,
+        "shared": [report for _, report in results],
+    }
+    return frame
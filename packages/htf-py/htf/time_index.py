@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+# Timestamp index of a TimeframeView (TimeframeConfig.timestamp_key): the
+# timestamps of the buffered records, kept ascending and aligned with the
+# buffer, so range and as-of queries are a bisection instead of a scan.
+# Records whose timestamp is older than the newest one (or missing) are
+# handled by the out_of_order policy:
+#   "raise"   ValueError, the record is not ingested (default)
+#   "drop"    the record is ignored and counted
+#   "insert"  the record is inserted at its sorted position (after records
+#             with the same timestamp); O(n) list insert, and the feature
+#             window / export positions then follow timestamp order rather
+#             than arrival order
+# Query results are RecordSlice views over the buffer: no records are
+# copied, and a slice refuses access once buffered records have moved.
+#
+# With epoch_ns (TimeframeConfig.timestamp_ns) each timestamp is converted
+# once, when its record is buffered, to int epoch nanoseconds (the pandas
+# datetime64[ns] value) and the buffered record holds that int; bisection,
+# window and mask comparisons are then int comparisons. Query bounds are
+# converted the same way, so they may still be datetimes or strings.
+# to_epoch_ns follows pandas: naive datetimes are UTC and plain numbers are
+# already nanoseconds.
+
+OUT_OF_ORDER_POLICIES = ("raise", "drop", "insert")
+CLOSED_OPTIONS = ("both", "left", "right", "neither")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NS_PER_SECOND = 1_000_000_000
+_SUBMICRO_FRACTION = re.compile(r"(\.\d{6})(\d{1,3})(?!\d)")
+
+
+def to_epoch_ns(value: Any) -> int:
+    """
+    Epoch nanoseconds of a timestamp: an int (already ns), datetime or
+    pandas Timestamp (naive = UTC), date, numpy datetime64 or a string
+    (ISO 8601 fast path, else parsed by pd.Timestamp). Raises ValueError
+    for anything else.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"cannot convert {value!r} to epoch nanoseconds")
+    if isinstance(value, datetime):
+        ns = getattr(value, "value", None)  # pandas Timestamp keeps nanoseconds
+        if type(ns) is int and hasattr(value, "nanosecond"):
+            return ns
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - _EPOCH
+        return (delta.days * 86_400 + delta.seconds) * _NS_PER_SECOND + delta.microseconds * 1_000
+    if isinstance(value, date):
+        return to_epoch_ns(datetime(value.year, value.month, value.day))
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        extra_ns = 0
+        match = _SUBMICRO_FRACTION.search(text)
+        if match:
+            extra_ns = int(match.group(2).ljust(3, "0"))
+            text = text[: match.end(1)] + text[match.end() :]
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return _parse_timestamp_text(value)
+        return to_epoch_ns(parsed) + extra_ns
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and getattr(dtype, "kind", None) == "M":
+        return int(value.astype("datetime64[ns]").astype("int64"))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if hasattr(value, "__index__"):
+        return value.__index__()
+    raise ValueError(f"cannot convert {value!r} to epoch nanoseconds")
+
+
+def _parse_timestamp_text(value: str) -> int:
+    # formats fromisoformat rejects ("2024/01/02 10:00", "...Z" before 3.11)
+    import pandas as pd
+
+    try:
+        parsed = pd.Timestamp(value.strip())
+    except (ValueError, TypeError, OverflowError):
+        raise ValueError(f"cannot parse timestamp {value!r}") from None
+    if parsed is pd.NaT:
+        raise ValueError(f"cannot parse timestamp {value!r}")
+    return int(parsed.value)  # naive = UTC, aware = converted to UTC
+
+
+def from_epoch_ns(ns: int) -> datetime:
+    """UTC datetime of epoch nanoseconds (truncated to microseconds)."""
+    return _EPOCH + timedelta(microseconds=ns // 1_000)
+
+
+class TimestampIndex:
+    """Ascending timestamps aligned with a view buffer; see the module comment."""
+
+    def __init__(self, key: str, out_of_order: str = "raise", *, epoch_ns: bool = False) -> None:
+        if out_of_order not in OUT_OF_ORDER_POLICIES:
+            raise ValueError(f"out_of_order must be one of {OUT_OF_ORDER_POLICIES}")
+        self.key = key
+        self.out_of_order = out_of_order
+        self.epoch_ns = epoch_ns
+        self.timestamps: list[Any] = []
+        self.out_of_order_records = 0
+        self.dropped_records = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def clear(self) -> None:
+        self.timestamps.clear()
+        self.out_of_order_records = 0
+        self.dropped_records = 0
+
+    def normalize(self, ts: Any) -> Any:
+        """ts as stored in the index: epoch nanoseconds with epoch_ns, else unchanged (None stays None)."""
+        if ts is None or not self.epoch_ns or type(ts) is int:
+            return ts
+        return to_epoch_ns(ts)
+
+    def placement(self, ts: Any) -> int | None:
+        """
+        Buffer position for a new record with timestamp ts: len(self) to
+        append, a smaller position to insert, None to drop it.
+        """
+        timestamps = self.timestamps
+        if ts is not None and (not timestamps or not ts < timestamps[-1]):
+            return len(timestamps)
+        self.out_of_order_records += 1
+        if self.out_of_order == "drop":
+            self.dropped_records += 1
+            return None
+        if ts is None:
+            raise ValueError(f"record has no {self.key!r} timestamp")
+        if self.out_of_order == "raise":
+            raise ValueError(f"timestamp {ts!r} is older than the newest indexed timestamp {timestamps[-1]!r}")
+        return bisect_right(timestamps, ts)
+
+    def bounds(self, start: Any = None, end: Any = None, closed: str = "left") -> tuple[int, int]:
+        """Buffer positions [lo, hi) of the timestamps between start and end (None = unbounded)."""
+        if closed not in CLOSED_OPTIONS:
+            raise ValueError(f"closed must be one of {CLOSED_OPTIONS}")
+        timestamps = self.timestamps
+        start = self.normalize(start)
+        end = self.normalize(end)
+        if start is None:
+            lo = 0
+        elif closed in ("both", "left"):
+            lo = bisect_left(timestamps, start)
+        else:
+            lo = bisect_right(timestamps, start)
+        if end is None:
+            hi = len(timestamps)
+        elif closed in ("both", "right"):
+            hi = bisect_right(timestamps, end)
+        else:
+            hi = bisect_left(timestamps, end)
+        return lo, max(lo, hi)
+
+    def asof(self, ts: Any) -> int:
+        """Position of the latest timestamp <= ts, or -1 when there is none."""
+        return bisect_right(self.timestamps, self.normalize(ts)) - 1
+
+
+class RecordSlice(Sequence):
+    """
+    Read-only view of buffer[lo:hi] that does not copy the records. It stays
+    valid while records are only appended; once buffered records move
+    (max_buffer trimming, an out-of-order insert, reset) access raises
+    RuntimeError.
+    """
+
+    def __init__(self, view: Any, lo: int, hi: int) -> None:
+        self._view = view
+        self._buffer = view.buffer
+        self._version = view.buffer_version
+        self.start = lo
+        self.stop = hi
+
+    def _check(self) -> None:
+        if self._view.buffer_version != self._version:
+            raise RuntimeError("the timeframe buffer changed since this slice was taken")
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index):  # type: ignore[override]
+        self._check()
+        n = self.stop - self.start
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(n)
+            if step == 1:
+                return self._sub(self.start + lo, self.start + max(lo, hi))
+            return [self._buffer[self.start + i] for i in range(lo, hi, step)]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("slice index out of range")
+        return self._buffer[self.start + index]
+
+    def _sub(self, lo: int, hi: int) -> RecordSlice:
+        sub = RecordSlice.__new__(RecordSlice)
+        sub._view = self._view
+        sub._buffer = self._buffer
+        sub._version = self._version
+        sub.start = lo
+        sub.stop = hi
+        return sub
+
+    def __iter__(self) -> Iterator[Any]:
+        self._check()
+        buffer = self._buffer
+        for pos in range(self.start, self.stop):
+            yield buffer[pos]
+
+    def timestamps(self) -> list[Any]:
+        """Timestamps of the records in this slice (requires a timestamp index)."""
+        self._check()
+        return self._view.time_index.timestamps[self.start : self.stop]
+
+    def __repr__(self) -> str:
+        return f"RecordSlice(start={self.start}, stop={self.stop})"
@@ -2,16 +2,25 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Mapping, MutableSequence, Sequence
 from dataclasses import dataclass, field
 from typing import Any, Callable
 
+from .schema import RecordSchema, SchemaStats
+from .time_index import OUT_OF_ORDER_POLICIES, RecordSlice, TimestampIndex, to_epoch_ns
+
 Record = Mapping[str, Any]
 MutableRecord = dict[str, Any]
 FeatureDict = dict[str, Any]
 FeatureFunction = Callable[[Sequence[Record]], FeatureDict]
 SignalFunction = Callable[[FeatureDict], Any]
 
+# Catch-up of records buffered while a view's hierarchy gate was closed
+# (HTFFramework gated_compute), declared by a signal as its catch_up
+# attribute: "skip" resumes from the newest record without evaluating them,
+# "replay" (the default) feeds them to the signal before the newest record.
+CATCH_UP_POLICIES = ("skip", "replay")
+
 _TIME_COLUMN_DEFAULTS: dict[str, list[str]] = {
     "year": ["year", "Year", "YEAR", "yyyy", "YYYY"],
     "month": ["month", "Month", "MONTH", "mm", "MM"],
@@ -45,6 +54,10 @@ _INT_PARAMS = {
 }
 _FLOAT_PARAMS = {"percentile"}
 _BOOL_PARAMS = {"include_current"}
+# Constructor arguments without a counterpart in the console's signals.js
+# (e.g. approximate, the Python-only quantile sketch mode): signal graphs and
+# templates must evaluate the same in both runtimes, so graph parsing drops them.
+_PYTHON_ONLY_PARAMS = {"approximate"}
 
 _SIGNAL_VALUE_ATTRS: dict[str, list[str]] = {
     "ValueVsRollingPercentile": ["last_threshold"],
@@ -132,6 +145,11 @@ def _coerce_param(name: str, value: Any) -> Any:
     return value
 
 
+def _graph_options(params: Mapping[str, Any]) -> dict[str, Any]:
+    """Constructor options of a signal graph node's params (Python-only parameters dropped)."""
+    return {str(k): _coerce_param(str(k), v) for k, v in params.items() if str(k) not in _PYTHON_ONLY_PARAMS}
+
+
 def _build_signal_defs_map(
     signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None,
 ) -> dict[str, Mapping[str, Any]]:
@@ -316,7 +334,11 @@ def _build_timestamp_columns(
     except ImportError as exc:  # pragma: no cover - optional dependency path
         raise RuntimeError("pandas is required for timestamp parsing") from exc
 
-    dt = pd.to_datetime(list(timestamps), errors="coerce")
+    if all(type(ts) is int for ts in timestamps):
+        # epoch nanoseconds (TimeframeConfig.timestamp_ns): no per-value parsing
+        dt = pd.Series(pd.to_datetime(list(timestamps), unit="ns", errors="coerce"))
+    else:
+        dt = pd.to_datetime(pd.Series(list(timestamps), dtype=object), errors="coerce")
     computed: dict[str, list[Any]] = {}
     col_order = list(existing_time_cols)
     for unit, label in _TIME_UNITS:
@@ -329,6 +351,421 @@ def _build_timestamp_columns(
     return col_order, computed
 
 
+def _export_time_columns(
+    records: Sequence[Mapping[str, Any]], timestamp_key: str | None
+) -> tuple[dict[str, list[Any]], list[Any]]:
+    """
+    Time columns of an export (record time fields plus the year..second
+    columns parsed from the timestamps) and the record timestamps.
+    """
+    time_cols = _detect_time_columns(records)
+    ts_key_candidates = [timestamp_key] if timestamp_key else []
+    ts_key_candidates.extend(["timestamp", "ts"])
+    ts_key = next(
+        (key for key in ts_key_candidates if any(key in rec for rec in records)),
+        None,
+    )
+    timestamps = [rec.get(ts_key) for rec in records] if ts_key else []
+    computed_time_cols: dict[str, list[Any]] = {}
+    if timestamps:
+        time_cols, computed_time_cols = _build_timestamp_columns(timestamps, time_cols)
+    time_data: dict[str, list[Any]] = {}
+    for col in time_cols:
+        if col in computed_time_cols:
+            time_data[col] = computed_time_cols[col]
+        else:
+            time_data[col] = [rec.get(col) for rec in records]
+    return time_data, timestamps
+
+
+def _node_alias(node: Mapping[str, Any]) -> str:
+    alias = node.get("alias")
+    if isinstance(alias, str) and alias.strip():
+        return alias.strip()
+    return str(node.get("type"))
+
+
+def _signal_class_map() -> dict[str, Any]:
+    from .signals import (  # local import to avoid heavy dependency at module load
+        SignalEMADiffVsHistoryPercentile,
+        SignalEMAFastSlowComparison,
+        SignalExternalFlag,
+        SignalIntersection,
+        SignalIntervalBetweenMarkers,
+        SignalNthTargetWithinWindowAfterTrigger,
+        SignalRunInterrupted,
+        SignalRunLengthReached,
+        SignalRunLengthReachedHistoryPercentile,
+        SignalRunLengthVsHistoryPercentile,
+        SignalValueVsLastSignalRunStatistic,
+        SignalValueVsLastTargetForBase,
+        SignalValueVsLastTrueReference,
+        SignalValueVsPrevious,
+        ValueVsRollingPercentile,
+        ValueVsRollingPercentileWithThreshold,
+    )
+
+    return {
+        "ValueVsRollingPercentile": ValueVsRollingPercentile,
+        "ValueVsRollingPercentileWithThreshold": ValueVsRollingPercentileWithThreshold,
+        "SignalEMADiffVsHistoryPercentile": SignalEMADiffVsHistoryPercentile,
+        "SignalRunLengthReached": SignalRunLengthReached,
+        "SignalRunLengthReachedHistoryPercentile": SignalRunLengthReachedHistoryPercentile,
+        "SignalRunInterrupted": SignalRunInterrupted,
+        "SignalRunLengthVsHistoryPercentile": SignalRunLengthVsHistoryPercentile,
+        "SignalValueVsLastTrueReference": SignalValueVsLastTrueReference,
+        "SignalValueVsLastTargetForBase": SignalValueVsLastTargetForBase,
+        "SignalValueVsPrevious": SignalValueVsPrevious,
+        "SignalValueVsLastSignalRunStatistic": SignalValueVsLastSignalRunStatistic,
+        "SignalEMAFastSlowComparison": SignalEMAFastSlowComparison,
+        "SignalIntervalBetweenMarkers": SignalIntervalBetweenMarkers,
+        "SignalNthTargetWithinWindowAfterTrigger": SignalNthTargetWithinWindowAfterTrigger,
+        "SignalIntersection": SignalIntersection,
+        "SignalExternalFlag": SignalExternalFlag,
+    }
+
+
+def _node_signature(
+    node_type: str,
+    options: Mapping[str, Any],
+    deps: tuple[dict[str, str | None], dict[str, list[str]]],
+    signatures: Mapping[str, Any],
+) -> Any:
+    """
+    Structural identity of a node: type, plain parameters and the signatures of
+    its dependencies (not their ids), so equal sub-graphs compare equal.
+    """
+    dep_names = set(deps[0]) | set(deps[1])
+    params = tuple(sorted((name, repr(value)) for name, value in options.items() if name not in dep_names))
+    singles = tuple(sorted((name, signatures.get(dep_id) if dep_id else None) for name, dep_id in deps[0].items()))
+    lists = tuple(
+        sorted((name, tuple(signatures.get(dep_id) for dep_id in dep_ids)) for name, dep_ids in deps[1].items())
+    )
+    return (node_type, params, singles, lists)
+
+
+def _resolve_graph_roots(
+    graph: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None,
+) -> list[Mapping[str, Any]]:
+    if not graph:
+        return []
+    if isinstance(graph, Mapping):
+        roots = graph.get("items") or graph.get("roots") or graph.get("signals") or []
+    else:
+        roots = graph
+    return [root for root in roots if isinstance(root, Mapping)]
+
+
+def _find_target_node(
+    roots: Sequence[Mapping[str, Any]], signal_type: str, signal_alias: str
+) -> Mapping[str, Any] | None:
+    """The node of roots (or their dependencies) with signal_type and signal_alias; None without roots."""
+    if not roots:
+        return None
+    target_node: Mapping[str, Any] | None = None
+    for node in _collect_signal_nodes(roots):
+        if str(node.get("type")) != signal_type:
+            continue
+        if _node_alias(node) == signal_alias:
+            if target_node is not None:
+                raise ValueError("signal_type and signal_alias must identify a unique signal")
+            target_node = node
+    if target_node is None:
+        raise ValueError("signal_type and signal_alias did not match any signal in signal_graph")
+    return target_node
+
+
+class _GraphRunner:
+    """
+    Resumable evaluation of a signal graph: run(recs) continues from the
+    state left by the previous call, so evaluating records in batches gives
+    the same outputs as one call over all of them.
+
+    With share_computations, structurally identical nodes share one instance
+    (evaluated once per record) and signals that support bind_shared read
+    their EMAs/histories from one SharedComputations registry.
+    """
+
+    def __init__(
+        self,
+        roots_in: Sequence[Mapping[str, Any]],
+        signal_defs_map: Mapping[str, Any],
+        *,
+        include_values: bool = False,
+        share_computations: bool = True,
+    ) -> None:
+        from .signals import SharedComputations
+
+        signal_class_map = _signal_class_map()
+        self.include_values = include_values
+        self.shared = SharedComputations() if share_computations else None
+        self.ordered = _build_evaluation_order(roots_in)
+        self.records = 0
+        runners: dict[str, dict[str, Any]] = {}
+        signatures: dict[str, Any] = {}
+        canonical: dict[Any, str] = {}
+        for node in self.ordered:
+            node_id = str(node.get("id"))
+            node_type = str(node.get("type"))
+            deps = _build_node_dependencies(node, signal_defs_map)
+            params = node.get("params") or {}
+            options = _graph_options(params)
+            for name, dep_id in deps[0].items():
+                if dep_id:
+                    options[name] = dep_id
+            for name, dep_ids in deps[1].items():
+                options[name] = dep_ids
+
+            if self.shared is not None:
+                signature = _node_signature(node_type, options, deps, signatures)
+                signatures[node_id] = signature
+                source_id = canonical.get(signature)
+                if source_id is not None:
+                    runners[node_id] = {**runners[source_id], "node": node, "same_as": source_id}
+                    continue
+                canonical[signature] = node_id
+
+            instance = None
+            SignalClass = signal_class_map.get(node_type)
+            if SignalClass:
+                try:
+                    instance = SignalClass(**options)
+                except Exception:
+                    instance = None
+            if self.shared is not None and instance is not None and hasattr(instance, "bind_shared"):
+                instance.bind_shared(self.shared)
+            runners[node_id] = {"instance": instance, "deps": deps, "type": node_type, "node": node, "same_as": None}
+        self.runners = runners
+
+        self.value_order: list[str] = []
+        if include_values:
+            for runner in runners.values():
+                base_name = _node_alias(runner["node"])
+                for attr in _SIGNAL_VALUE_ATTRS.get(runner["type"], []):
+                    col_name = f"{base_name}_{attr}"
+                    if col_name not in self.value_order:
+                        self.value_order.append(col_name)
+
+    def run(self, recs: Sequence[Mapping[str, Any]]) -> tuple[dict[str, list[int]], dict[str, list[Any]]]:
+        """Evaluate recs and return (outputs per node id, value column data) for them."""
+        runners = self.runners
+        shared = self.shared
+        include_values = self.include_values
+        outputs: dict[str, list[int]] = {node_id: [] for node_id in runners}
+        value_data: dict[str, list[Any]] = {col: [] for col in self.value_order}
+
+        for rec in recs:
+            if shared is not None:
+                shared.next_step()
+            step_outputs: dict[str, int] = {}
+            base_features: dict[str, Any] = {}
+            if isinstance(rec, Mapping):
+                values = rec.get("values")
+                if isinstance(values, Mapping):
+                    base_features.update(values)
+                if "value" in rec:
+                    base_features["value"] = rec.get("value")
+            for node in self.ordered:
+                node_id = str(node.get("id"))
+                runner = runners[node_id]
+                instance = runner["instance"]
+                if runner["same_as"] is not None:
+                    normalized = step_outputs[runner["same_as"]]
+                else:
+                    deps = runner["deps"]
+                    features = dict(base_features)
+                    for dep_id in deps[0].values():
+                        if dep_id:
+                            features[dep_id] = step_outputs.get(dep_id, 0)
+                    for dep_ids in deps[1].values():
+                        for dep_id in dep_ids:
+                            features[dep_id] = step_outputs.get(dep_id, 0)
+                    value = instance(features) if instance is not None else 0
+                    normalized = 1 if value else 0
+                step_outputs[node_id] = normalized
+                outputs[node_id].append(normalized)
+
+                if include_values:
+                    base_name = _node_alias(runner["node"])
+                    for attr in _SIGNAL_VALUE_ATTRS.get(runner["type"], []):
+                        val = getattr(instance, attr, None) if instance is not None else None
+                        if isinstance(val, bool):
+                            val = int(val)
+                        value_data[f"{base_name}_{attr}"].append(val)
+        self.records += len(recs)
+        return outputs, value_data
+
+    def report(self) -> dict[str, Any]:
+        n_nodes = len(self.runners)
+        n_unique = sum(1 for runner in self.runners.values() if runner["same_as"] is None)
+        report: dict[str, Any] = {
+            "nodes": n_nodes,
+            "evaluated_nodes": n_unique,
+            "deduplicated_nodes": n_nodes - n_unique,
+            "records": self.records,
+            "node_evaluations_saved": (n_nodes - n_unique) * self.records,
+        }
+        if self.shared is not None:
+            report["shared"] = self.shared.report()
+        return report
+
+
+def _compute_graph_outputs(
+    recs: Sequence[Mapping[str, Any]],
+    roots_in: Sequence[Mapping[str, Any]],
+    signal_defs_map: Mapping[str, Any],
+    *,
+    include_values: bool = False,
+    share_computations: bool = True,
+) -> tuple[dict[str, list[int]], list[str], dict[str, list[Any]], dict[str, Any]]:
+    """
+    Evaluate a signal graph over records and return (outputs per node id,
+    value column order, value column data, deduplication report); see
+    _GraphRunner.
+    """
+    runner = _GraphRunner(
+        roots_in, signal_defs_map, include_values=include_values, share_computations=share_computations
+    )
+    outputs, value_data = runner.run(recs)
+    return outputs, runner.value_order, value_data, runner.report()
+
+
+def _find_series_index(series_list: Sequence[Mapping[str, Any]], series_id: str) -> int:
+    for idx, series in enumerate(series_list):
+        sid = series.get("id") or series.get("name") or f"series-{idx}"
+        if sid == series_id or series.get("name") == series_id:
+            return idx
+    return max(0, len(series_list) - 1)
+
+
+def _series_timestamps(series: Mapping[str, Any], epoch_ns: bool) -> list[Any]:
+    ts = _extract_series_timestamps(series)
+    if not epoch_ns or any(t is None for t in ts):
+        return ts
+    return [to_epoch_ns(t) for t in ts]
+
+
+def _build_hierar_constraint_columns(
+    current_id: str,
+    current_timestamps: Sequence[Any],
+    hierar_constraint_series: Sequence[Mapping[str, Any]] | None,
+    timeframe_series: Sequence[Mapping[str, Any]] | None,
+    signal_defs_map: Mapping[str, Any],
+    *,
+    share_computations: bool = True,
+    epoch_ns: bool = False,
+) -> tuple[list[str], dict[str, list[int]], list[bool] | None]:
+    """
+    Hierarchy constraint columns of the series current_id at current_timestamps
+    from the coarser series before it: (column order, column data, combined
+    hierar_constraint_all mask or None when no constraint applies). With
+    epoch_ns the coarser series timestamps are converted to epoch
+    nanoseconds to match current_timestamps.
+    """
+    ext_masks: dict[str, list[bool]] = {}
+    calc_masks: dict[str, list[bool]] = {}
+    hierar_constraint_order: list[str] = []
+    hierar_constraint_cols: dict[str, list[int]] = {}
+
+    higher_series_order: list[str] = []
+    if current_timestamps:
+        if hierar_constraint_series:
+            ext_list = list(hierar_constraint_series)
+            ext_idx = _find_series_index(ext_list, current_id)
+            higher_ext = ext_list[:ext_idx] if ext_idx > 0 else []
+            higher_series_order = [
+                str(series.get("name") or series.get("id") or f"series-{idx}") for idx, series in enumerate(higher_ext)
+            ]
+            for idx, series in enumerate(higher_ext):
+                series_name = str(series.get("name") or series.get("id") or f"series-{idx}")
+                flags = series.get("downward_flags")
+                ts = _series_timestamps(series, epoch_ns)
+                if not ts or any(t is None for t in ts) or flags is None:
+                    mask = [True for _ in range(len(current_timestamps))]
+                else:
+                    windows = _truthy_windows(_normalize_flags(flags, len(ts), False), ts)
+                    mask = _map_windows_to_mask(windows, current_timestamps)
+                ext_masks[series_name] = mask
+
+        if timeframe_series:
+            calc_list = list(timeframe_series)
+            calc_idx = _find_series_index(calc_list, current_id)
+            higher_calc = calc_list[:calc_idx] if calc_idx > 0 else []
+            if not higher_series_order:
+                higher_series_order = [
+                    str(series.get("name") or series.get("id") or f"series-{idx}")
+                    for idx, series in enumerate(higher_calc)
+                ]
+            for idx, series in enumerate(higher_calc):
+                series_name = str(series.get("name") or series.get("id") or f"series-{idx}")
+                signals = series.get("signals") or {}
+                down_id = signals.get("downwardSignalId") if isinstance(signals, Mapping) else None
+                ts = _series_timestamps(series, epoch_ns)
+                if not ts or any(t is None for t in ts) or not down_id:
+                    mask = [True for _ in range(len(current_timestamps))]
+                else:
+                    items = signals.get("items") if isinstance(signals, Mapping) else None
+                    graph_roots = _resolve_graph_roots(items)
+                    series_outputs = _compute_graph_outputs(
+                        series.get("data") or [],
+                        graph_roots,
+                        signal_defs_map,
+                        share_computations=share_computations,
+                    )[0]
+                    flags = series_outputs.get(str(down_id), [])
+                    if not flags:
+                        mask = [True for _ in range(len(current_timestamps))]
+                    else:
+                        windows = _truthy_windows(_normalize_flags(flags, len(ts), False), ts)
+                        mask = _map_windows_to_mask(windows, current_timestamps)
+                calc_masks[series_name] = mask
+
+    for series_name in higher_series_order:
+        if series_name in ext_masks:
+            col_name = f"hierar_constraint_ext_{series_name}"
+            hierar_constraint_order.append(col_name)
+            hierar_constraint_cols[col_name] = [1 if v else 0 for v in ext_masks[series_name]]
+        if series_name in calc_masks:
+            col_name = f"hierar_constraint_calc_{series_name}"
+            hierar_constraint_order.append(col_name)
+            hierar_constraint_cols[col_name] = [1 if v else 0 for v in calc_masks[series_name]]
+        if series_name in ext_masks and series_name in calc_masks:
+            col_name = f"hierar_constraint_mismatch_{series_name}"
+            hierar_constraint_order.append(col_name)
+            mismatch = [
+                1 if ext_masks[series_name][i] != calc_masks[series_name][i] else 0
+                for i in range(len(current_timestamps))
+            ]
+            hierar_constraint_cols[col_name] = mismatch
+
+    hierar_constraint_all: list[bool] | None = None
+    if current_timestamps and higher_series_order:
+        effective_masks: list[list[bool]] = []
+        for series_name in higher_series_order:
+            if series_name in ext_masks and series_name in calc_masks:
+                effective = [
+                    ext_masks[series_name][i] and calc_masks[series_name][i] for i in range(len(current_timestamps))
+                ]
+                effective_masks.append(effective)
+            elif series_name in ext_masks:
+                effective_masks.append(ext_masks[series_name])
+            elif series_name in calc_masks:
+                effective_masks.append(calc_masks[series_name])
+        if effective_masks:
+            hierar_constraint_all = [all(mask[i] for mask in effective_masks) for i in range(len(current_timestamps))]
+        else:
+            hierar_constraint_all = [True for _ in range(len(current_timestamps))]
+
+    if hierar_constraint_all is not None:
+        hierar_constraint_cols["hierar_constraint_all"] = [1 if v else 0 for v in hierar_constraint_all]
+        hierar_constraint_order.append("hierar_constraint_all")
+    elif current_timestamps and (hierar_constraint_series or timeframe_series):
+        hierar_constraint_all = [True for _ in range(len(current_timestamps))]
+        hierar_constraint_cols["hierar_constraint_all"] = [1 for _ in range(len(current_timestamps))]
+        hierar_constraint_order.append("hierar_constraint_all")
+    return hierar_constraint_order, hierar_constraint_cols, hierar_constraint_all
+
+
 @dataclass
 class TimeframeConfig:
     """
@@ -339,12 +776,19 @@ class TimeframeConfig:
     window_size: int  # how many recent records used for features
     max_buffer: int = 1024  # max history stored in memory
     role: str = "LTF"  # "HTF" or "LTF"
+    timestamp_key: str | None = None  # record field indexed for slice/asof queries
+    out_of_order: str = "raise"  # older timestamps: "raise", "drop" or "insert"
+    timestamp_ns: bool = False  # store timestamp_key values as int epoch nanoseconds
 
     def __post_init__(self) -> None:
         if self.window_size <= 0:
             raise ValueError("window_size must be > 0")
         if self.max_buffer <= 0:
             raise ValueError("max_buffer must be > 0")
+        if self.out_of_order not in OUT_OF_ORDER_POLICIES:
+            raise ValueError(f"out_of_order must be one of {OUT_OF_ORDER_POLICIES}")
+        if self.timestamp_ns and self.timestamp_key is None:
+            raise ValueError("timestamp_ns needs timestamp_key")
         self.role = self.role.upper()
 
 
@@ -371,17 +815,51 @@ class TimeframeView:
     feature_module: FeatureModule | None = None
     feature_fn: FeatureFunction | None = None
     signal_fn: SignalFunction | None = None
+    schema: RecordSchema | None = None
+    buffer_backend: MutableSequence[MutableRecord] | None = None
 
     buffer: list[MutableRecord] = field(default_factory=list, init=False)
     features: FeatureDict = field(default_factory=dict, init=False)
     signal: Any = None
+    records_seen: int = field(default=0, init=False)
+    time_index: TimestampIndex | None = field(default=None, init=False)
+    buffer_version: int = field(default=0, init=False)  # bumped when buffered records move
+    reset_count: int = field(default=0, init=False)  # bumped by reset()
+    suspended_records: int = field(default=0, init=False)  # buffered while gated, not yet caught up
+    gated_records: int = field(default=0, init=False)
+    replayed_records: int = field(default=0, init=False)
+    skipped_records: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        # A buffer_backend (e.g. htf.mapped_buffer.MappedRecordBuffer) replaces
+        # the in-memory list; records it already holds count as seen.
+        if self.buffer_backend is not None:
+            self.buffer = self.buffer_backend  # type: ignore[assignment]
+            self.records_seen = getattr(self.buffer_backend, "first_position", 0) + len(self.buffer_backend)
+        key = self.config.timestamp_key
+        if key is not None:
+            if self.config.out_of_order == "insert" and not hasattr(self.buffer, "insert"):
+                raise ValueError("out_of_order='insert' needs a buffer that supports insert")
+            self.time_index = TimestampIndex(key, self.config.out_of_order, epoch_ns=self.config.timestamp_ns)
+            self.time_index.timestamps.extend(self.time_index.normalize(rec.get(key)) for rec in self.buffer)
 
     def reset(self) -> None:
         self.buffer.clear()
+        self.records_seen = 0
+        self.buffer_version += 1
+        self.reset_count += 1
+        if self.time_index is not None:
+            self.time_index.clear()
         self.features = {}
         self.signal = None
+        self.suspended_records = 0
+        self.gated_records = 0
+        self.replayed_records = 0
+        self.skipped_records = 0
         if self.feature_module is not None and hasattr(self.feature_module, "last_features"):
             self.feature_module.last_features = {}
+        if self.schema is not None:
+            self.schema.reset()
 
     @property
     def name(self) -> str:
@@ -400,15 +878,47 @@ class TimeframeView:
         """True if buffer has at least window_size records."""
         return len(self.buffer) >= self.config.window_size
 
-    def _update_buffer(self, record: Mapping[str, Any]) -> None:
+    @property
+    def ingest_stats(self) -> SchemaStats | None:
+        """Malformed-record counters of schema (None without a schema)."""
+        return self.schema.stats if self.schema is not None else None
+
+    def _update_buffer(self, record: Mapping[str, Any], *, copy: bool = True) -> bool:
         """
         Append a new record to buffer; trim to max_buffer.
-        Store a shallow-copied dict so later modifications do not affect original.
+        Store a shallow-copied dict so later modifications do not affect original
+        (records coerced by the schema are already fresh dicts).
+        With a timestamp index, an out-of-order record is placed per
+        config.out_of_order; returns False when it is dropped. With
+        config.timestamp_ns the buffered record holds its timestamp as epoch
+        nanoseconds.
         """
-        self.buffer.append(dict(record))
+        rec = dict(record) if copy else record
+        index = self.time_index
+        if index is None:
+            self.buffer.append(rec)
+        else:
+            ts = rec.get(index.key)
+            if index.epoch_ns and ts is not None and type(ts) is not int:
+                ts = rec[index.key] = to_epoch_ns(ts)
+            pos = index.placement(ts)
+            if pos is None:
+                return False
+            if pos == len(index.timestamps):
+                self.buffer.append(rec)
+                index.timestamps.append(ts)
+            else:
+                self.buffer.insert(pos, rec)
+                index.timestamps.insert(pos, ts)
+                self.buffer_version += 1
+        self.records_seen += 1
         excess = len(self.buffer) - self.config.max_buffer
         if excess > 0:
             del self.buffer[0:excess]
+            if index is not None:
+                del index.timestamps[0:excess]
+            self.buffer_version += 1
+        return True
 
     def _get_window(self) -> list[Record]:
         """
@@ -419,6 +929,13 @@ class TimeframeView:
             return list(self.buffer)
         return list(self.buffer[-self.config.window_size :])
 
+    def _compute_features(self, window: Sequence[Record]) -> FeatureDict:
+        if self.feature_module is not None:
+            return self.feature_module.update(window)
+        if self.feature_fn is not None:
+            return self.feature_fn(window)
+        return dict(window[-1]) if window else {}
+
     def _update_features_and_signal(self) -> None:
         """
         Use feature_module OR feature_fn to compute features from current window.
@@ -426,18 +943,7 @@ class TimeframeView:
         If neither feature_module nor feature_fn is given and window is non-empty,
         default features = dict(window[-1]).
         """
-        window = self._get_window()
-        feats: FeatureDict
-        if self.feature_module is not None:
-            feats = self.feature_module.update(window)
-        elif self.feature_fn is not None:
-            feats = self.feature_fn(window)
-        elif window:
-            feats = dict(window[-1])
-        else:
-            feats = {}
-
-        self.features = feats
+        self.features = self._compute_features(self._get_window())
 
         if self.signal_fn is not None:
             self.signal = self.signal_fn(self.features)
@@ -448,11 +954,100 @@ class TimeframeView:
         """
         Push a new record into the timeframe, update buffer, features, and signal.
         Return the current signal.
+
+        With a schema, the record is coerced first; a record dropped by the
+        schema (on_error="drop") or by the timestamp index (out_of_order="drop")
+        leaves the view unchanged. Records buffered by on_gated_record are
+        caught up first.
         """
-        self._update_buffer(record)
+        if not self._buffer_record(record):
+            return self.signal
+        if self.suspended_records:
+            self._catch_up()
         self._update_features_and_signal()
         return self.signal
 
+    def on_gated_record(self, record: Mapping[str, Any]) -> Any:
+        """
+        Buffer record without computing features or signal, for a view whose
+        hierarchy gate is closed (HTFFramework gated_compute). The next
+        on_new_record catches these records up according to the signal's
+        catch_up policy. Return the last evaluated signal.
+        """
+        if self._buffer_record(record):
+            self.suspended_records += 1
+            self.gated_records += 1
+        return self.signal
+
+    def _buffer_record(self, record: Mapping[str, Any]) -> bool:
+        if self.schema is None:
+            return self._update_buffer(record)
+        coerced = self.schema.coerce(record)
+        if coerced is None:
+            return False
+        return self._update_buffer(coerced, copy=False)
+
+    def _catch_up(self) -> None:
+        """
+        Evaluate the suspended records (all buffered records but the newest)
+        per signal_fn.catch_up (see CATCH_UP_POLICIES). When the signal has an
+        exact state_horizon() h shorter than the suspended span, it is reset
+        and only the last h records are replayed, which gives the same state
+        as replaying them all. Suspended records already trimmed from the
+        buffer (max_buffer) cannot be replayed and count as skipped.
+        """
+        pending = self.suspended_records
+        self.suspended_records = 0
+        signal_fn = self.signal_fn
+        policy = getattr(signal_fn, "catch_up", "replay")
+        if policy not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}")
+        if signal_fn is None or policy == "skip":
+            self.skipped_records += pending
+            return
+        count = pending
+        horizon_fn = getattr(signal_fn, "state_horizon", None)
+        reset = getattr(signal_fn, "reset", None)
+        if horizon_fn is not None and callable(reset) and getattr(signal_fn, "exact_partition", True):
+            horizon = horizon_fn()
+            if horizon is not None and horizon < pending:
+                reset()
+                count = horizon
+        end = len(self.buffer) - 1
+        start = max(0, end - count)
+        self.replayed_records += end - start
+        self.skipped_records += pending - (end - start)
+        window_size = self.config.window_size
+        for pos in range(start, end):
+            signal_fn(self._compute_features(list(self.buffer[max(0, pos - window_size + 1) : pos + 1])))
+
+    def _require_index(self) -> TimestampIndex:
+        if self.time_index is None:
+            raise ValueError("timestamp queries need TimeframeConfig.timestamp_key")
+        return self.time_index
+
+    def slice(self, start: Any = None, end: Any = None) -> RecordSlice:
+        """
+        Buffered records with start <= timestamp < end (None = unbounded), as
+        a RecordSlice view. O(log n); needs config.timestamp_key.
+        """
+        lo, hi = self._require_index().bounds(start, end, "left")
+        return RecordSlice(self, lo, hi)
+
+    def window_between(self, start: Any, end: Any, *, closed: str = "both") -> RecordSlice:
+        """
+        Buffered records whose timestamp lies between start and end; closed
+        ("both", "left", "right", "neither") selects which bounds are
+        included. O(log n); needs config.timestamp_key.
+        """
+        lo, hi = self._require_index().bounds(start, end, closed)
+        return RecordSlice(self, lo, hi)
+
+    def asof(self, ts: Any) -> Record | None:
+        """Latest buffered record with timestamp <= ts, or None. O(log n); needs config.timestamp_key."""
+        pos = self._require_index().asof(ts)
+        return self.buffer[pos] if pos >= 0 else None
+
     def export_signal_dataframe(
         self,
         signal_type: str,
@@ -466,9 +1061,15 @@ class TimeframeView:
         signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
         timestamp_key: str = "timestamp",
         current_series_id: str | None = None,
+        share_computations: bool = True,
     ):
         """
         Build a DataFrame for the selected signal and optional dependencies/values/hierarchy constraint signals.
+
+        With share_computations (default), identical signal nodes are evaluated
+        once and EMAs/rolling histories common to several nodes are computed
+        once per record; outputs are unchanged. The deduplication summary is in
+        frame.attrs["signal_graph_report"].
         """
         try:
             import pandas as pd
@@ -479,181 +1080,30 @@ class TimeframeView:
         if not records:
             return pd.DataFrame()
 
-        time_cols = _detect_time_columns(records)
-        ts_key_candidates = [timestamp_key] if timestamp_key else []
-        ts_key_candidates.extend(["timestamp", "ts"])
-        ts_key = next(
-            (key for key in ts_key_candidates if any(key in rec for rec in records)),
-            None,
-        )
-        timestamps = [rec.get(ts_key) for rec in records] if ts_key else []
-        computed_time_cols: dict[str, list[Any]] = {}
-        if timestamps:
-            time_cols, computed_time_cols = _build_timestamp_columns(timestamps, time_cols)
+        time_data, timestamps = _export_time_columns(records, timestamp_key)
 
         if (include_dependencies or include_values) and not signal_graph:
             raise ValueError("signal_graph is required when include_dependencies or include_values is True")
 
         signal_defs_map = _build_signal_defs_map(signal_defs)
 
-        def _resolve_roots(
-            graph: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None,
-        ) -> list[Mapping[str, Any]]:
-            if not graph:
-                return []
-            if isinstance(graph, Mapping):
-                roots = graph.get("items") or graph.get("roots") or graph.get("signals") or []
-            else:
-                roots = graph
-            return [root for root in roots if isinstance(root, Mapping)]
-
-        def _node_alias(node: Mapping[str, Any]) -> str:
-            alias = node.get("alias")
-            if isinstance(alias, str) and alias.strip():
-                return alias.strip()
-            return str(node.get("type"))
-
-        roots = _resolve_roots(signal_graph)
-        nodes = _collect_signal_nodes(roots)
-        target_node: Mapping[str, Any] | None = None
-        if roots:
-            for node in nodes:
-                if str(node.get("type")) != signal_type:
-                    continue
-                if _node_alias(node) == signal_alias:
-                    if target_node is not None:
-                        raise ValueError("signal_type and signal_alias must identify a unique signal")
-                    target_node = node
-        if roots and target_node is None:
-            raise ValueError("signal_type and signal_alias did not match any signal in signal_graph")
-
-        from .signals import (  # local import to avoid heavy dependency at module load
-            SignalEMADiffVsHistoryPercentile,
-            SignalEMAFastSlowComparison,
-            SignalExternalFlag,
-            SignalIntersection,
-            SignalIntervalBetweenMarkers,
-            SignalNthTargetWithinWindowAfterTrigger,
-            SignalRunInterrupted,
-            SignalRunLengthReached,
-            SignalRunLengthReachedHistoryPercentile,
-            SignalRunLengthVsHistoryPercentile,
-            SignalValueVsLastSignalRunStatistic,
-            SignalValueVsLastTargetForBase,
-            SignalValueVsLastTrueReference,
-            SignalValueVsPrevious,
-            ValueVsRollingPercentile,
-            ValueVsRollingPercentileWithThreshold,
-        )
-
-        signal_class_map: dict[str, Any] = {
-            "ValueVsRollingPercentile": ValueVsRollingPercentile,
-            "ValueVsRollingPercentileWithThreshold": ValueVsRollingPercentileWithThreshold,
-            "SignalEMADiffVsHistoryPercentile": SignalEMADiffVsHistoryPercentile,
-            "SignalRunLengthReached": SignalRunLengthReached,
-            "SignalRunLengthReachedHistoryPercentile": SignalRunLengthReachedHistoryPercentile,
-            "SignalRunInterrupted": SignalRunInterrupted,
-            "SignalRunLengthVsHistoryPercentile": SignalRunLengthVsHistoryPercentile,
-            "SignalValueVsLastTrueReference": SignalValueVsLastTrueReference,
-            "SignalValueVsLastTargetForBase": SignalValueVsLastTargetForBase,
-            "SignalValueVsPrevious": SignalValueVsPrevious,
-            "SignalValueVsLastSignalRunStatistic": SignalValueVsLastSignalRunStatistic,
-            "SignalEMAFastSlowComparison": SignalEMAFastSlowComparison,
-            "SignalIntervalBetweenMarkers": SignalIntervalBetweenMarkers,
-            "SignalNthTargetWithinWindowAfterTrigger": SignalNthTargetWithinWindowAfterTrigger,
-            "SignalIntersection": SignalIntersection,
-            "SignalExternalFlag": SignalExternalFlag,
-        }
-
-        def _compute_outputs(
-            recs: Sequence[Mapping[str, Any]], roots_in: Sequence[Mapping[str, Any]]
-        ) -> dict[str, list[int]]:
-            ordered = _build_evaluation_order(roots_in)
-            runners: dict[str, dict[str, Any]] = {}
-            for node in ordered:
-                node_id = str(node.get("id"))
-                node_type = str(node.get("type"))
-                deps = _build_node_dependencies(node, signal_defs_map)
-                params = node.get("params") or {}
-                options = {str(k): _coerce_param(str(k), v) for k, v in params.items()}
-                for name, dep_id in deps[0].items():
-                    if dep_id:
-                        options[name] = dep_id
-                for name, dep_ids in deps[1].items():
-                    options[name] = dep_ids
-                instance = None
-                SignalClass = signal_class_map.get(node_type)
-                if SignalClass:
-                    try:
-                        instance = SignalClass(**options)
-                    except Exception:
-                        instance = None
-                runners[node_id] = {"instance": instance, "deps": deps, "type": node_type, "node": node}
-
-            outputs: dict[str, list[int]] = {node_id: [] for node_id in runners}
-
-            value_data: dict[str, list[Any]] = {}
-            value_order: list[str] = []
-            if include_values:
-                for runner in runners.values():
-                    node_type = runner["type"]
-                    base_name = _node_alias(runner["node"])
-                    for attr in _SIGNAL_VALUE_ATTRS.get(node_type, []):
-                        col_name = f"{base_name}_{attr}"
-                        if col_name not in value_data:
-                            value_data[col_name] = []
-                            value_order.append(col_name)
-
-            for rec in recs:
-                step_outputs: dict[str, int] = {}
-                base_features: dict[str, Any] = {}
-                if isinstance(rec, Mapping):
-                    values = rec.get("values")
-                    if isinstance(values, Mapping):
-                        base_features.update(values)
-                    if "value" in rec:
-                        base_features["value"] = rec.get("value")
-                for node in ordered:
-                    node_id = str(node.get("id"))
-                    runner = runners[node_id]
-                    instance = runner["instance"]
-                    deps = runner["deps"]
-                    features = dict(base_features)
-                    for dep_id in deps[0].values():
-                        if dep_id:
-                            features[dep_id] = step_outputs.get(dep_id, 0)
-                    for dep_ids in deps[1].values():
-                        for dep_id in dep_ids:
-                            features[dep_id] = step_outputs.get(dep_id, 0)
-                    value = instance(features) if instance is not None else 0
-                    normalized = 1 if value else 0
-                    step_outputs[node_id] = normalized
-                    outputs[node_id].append(normalized)
-
-                    if include_values:
-                        node_type = runner["type"]
-                        base_name = _node_alias(runner["node"])
-                        for attr in _SIGNAL_VALUE_ATTRS.get(node_type, []):
-                            col_name = f"{base_name}_{attr}"
-                            val = getattr(instance, attr, None) if instance is not None else None
-                            if isinstance(val, bool):
-                                val = int(val)
-                            value_data[col_name].append(val)
-
-            outputs["_value_columns"] = value_order
-            outputs["_value_data"] = value_data
-            return outputs
+        target_node = _find_target_node(_resolve_graph_roots(signal_graph), signal_type, signal_alias)
 
         outputs: dict[str, list[int]] = {}
         value_col_order: list[str] = []
         value_data: dict[str, list[Any]] = {}
         dep_nodes: list[Mapping[str, Any]] = []
         target_outputs: list[int] = []
+        graph_report: dict[str, Any] | None = None
 
         if target_node is not None:
-            outputs = _compute_outputs(records, [target_node])
-            value_col_order = outputs.pop("_value_columns", [])
-            value_data = outputs.pop("_value_data", {})
+            outputs, value_col_order, value_data, graph_report = _compute_graph_outputs(
+                records,
+                [target_node],
+                signal_defs_map,
+                include_values=include_values,
+                share_computations=share_computations,
+            )
             ordered_nodes = _build_evaluation_order([target_node])
             dep_nodes = ordered_nodes[:-1]
             target_id = str(target_node.get("id"))
@@ -664,122 +1114,18 @@ class TimeframeView:
             type_key = signal_type
             target_outputs = [1 if bool(rec.get(alias_key, rec.get(type_key, 0))) else 0 for rec in records]
 
-        current_id = current_series_id or self.name
         current_timestamps = timestamps if timestamps and all(ts is not None for ts in timestamps) else []
+        hierar_constraint_order, hierar_constraint_cols, hierar_constraint_all = _build_hierar_constraint_columns(
+            current_series_id or self.name,
+            current_timestamps,
+            hierar_constraint_series,
+            timeframe_series,
+            signal_defs_map,
+            share_computations=share_computations,
+            epoch_ns=self.time_index is not None and self.time_index.epoch_ns,
+        )
 
-        ext_masks: dict[str, list[bool]] = {}
-        calc_masks: dict[str, list[bool]] = {}
-        hierar_constraint_order: list[str] = []
-        hierar_constraint_cols: dict[str, list[int]] = {}
-
-        def _find_series_index(series_list: Sequence[Mapping[str, Any]], series_id: str) -> int:
-            for idx, series in enumerate(series_list):
-                sid = series.get("id") or series.get("name") or f"series-{idx}"
-                if sid == series_id or series.get("name") == series_id:
-                    return idx
-            return max(0, len(series_list) - 1)
-
-        higher_series_order: list[str] = []
-        if current_timestamps:
-            if hierar_constraint_series:
-                ext_list = list(hierar_constraint_series)
-                ext_idx = _find_series_index(ext_list, current_id)
-                higher_ext = ext_list[:ext_idx] if ext_idx > 0 else []
-                higher_series_order = [
-                    str(series.get("name") or series.get("id") or f"series-{idx}")
-                    for idx, series in enumerate(higher_ext)
-                ]
-                for idx, series in enumerate(higher_ext):
-                    series_name = str(series.get("name") or series.get("id") or f"series-{idx}")
-                    flags = series.get("downward_flags")
-                    ts = _extract_series_timestamps(series)
-                    if not ts or any(t is None for t in ts) or flags is None:
-                        mask = [True for _ in range(len(current_timestamps))]
-                    else:
-                        windows = _truthy_windows(_normalize_flags(flags, len(ts), False), ts)
-                        mask = _map_windows_to_mask(windows, current_timestamps)
-                    ext_masks[series_name] = mask
-
-            if timeframe_series:
-                calc_list = list(timeframe_series)
-                calc_idx = _find_series_index(calc_list, current_id)
-                higher_calc = calc_list[:calc_idx] if calc_idx > 0 else []
-                if not higher_series_order:
-                    higher_series_order = [
-                        str(series.get("name") or series.get("id") or f"series-{idx}")
-                        for idx, series in enumerate(higher_calc)
-                    ]
-                for idx, series in enumerate(higher_calc):
-                    series_name = str(series.get("name") or series.get("id") or f"series-{idx}")
-                    signals = series.get("signals") or {}
-                    down_id = signals.get("downwardSignalId") if isinstance(signals, Mapping) else None
-                    ts = _extract_series_timestamps(series)
-                    if not ts or any(t is None for t in ts) or not down_id:
-                        mask = [True for _ in range(len(current_timestamps))]
-                    else:
-                        graph_roots = _resolve_roots(signals.get("items") if isinstance(signals, Mapping) else None)
-                        series_outputs = _compute_outputs(series.get("data") or [], graph_roots)
-                        flags = series_outputs.get(str(down_id), [])
-                        if not flags:
-                            mask = [True for _ in range(len(current_timestamps))]
-                        else:
-                            windows = _truthy_windows(_normalize_flags(flags, len(ts), False), ts)
-                            mask = _map_windows_to_mask(windows, current_timestamps)
-                    calc_masks[series_name] = mask
-
-        for series_name in higher_series_order:
-            if series_name in ext_masks:
-                col_name = f"hierar_constraint_ext_{series_name}"
-                hierar_constraint_order.append(col_name)
-                hierar_constraint_cols[col_name] = [1 if v else 0 for v in ext_masks[series_name]]
-            if series_name in calc_masks:
-                col_name = f"hierar_constraint_calc_{series_name}"
-                hierar_constraint_order.append(col_name)
-                hierar_constraint_cols[col_name] = [1 if v else 0 for v in calc_masks[series_name]]
-            if series_name in ext_masks and series_name in calc_masks:
-                col_name = f"hierar_constraint_mismatch_{series_name}"
-                hierar_constraint_order.append(col_name)
-                mismatch = [
-                    1 if ext_masks[series_name][i] != calc_masks[series_name][i] else 0
-                    for i in range(len(current_timestamps))
-                ]
-                hierar_constraint_cols[col_name] = mismatch
-
-        hierar_constraint_all: list[bool] | None = None
-        if current_timestamps and higher_series_order:
-            effective_masks: list[list[bool]] = []
-            for series_name in higher_series_order:
-                if series_name in ext_masks and series_name in calc_masks:
-                    effective = [
-                        ext_masks[series_name][i] and calc_masks[series_name][i] for i in range(len(current_timestamps))
-                    ]
-                    effective_masks.append(effective)
-                elif series_name in ext_masks:
-                    effective_masks.append(ext_masks[series_name])
-                elif series_name in calc_masks:
-                    effective_masks.append(calc_masks[series_name])
-            if effective_masks:
-                hierar_constraint_all = [
-                    all(mask[i] for mask in effective_masks) for i in range(len(current_timestamps))
-                ]
-            else:
-                hierar_constraint_all = [True for _ in range(len(current_timestamps))]
-
-        if hierar_constraint_all is not None:
-            hierar_constraint_cols["hierar_constraint_all"] = [1 if v else 0 for v in hierar_constraint_all]
-            hierar_constraint_order.append("hierar_constraint_all")
-        elif current_timestamps and (hierar_constraint_series or timeframe_series):
-            hierar_constraint_all = [True for _ in range(len(current_timestamps))]
-            hierar_constraint_cols["hierar_constraint_all"] = [1 for _ in range(len(current_timestamps))]
-            hierar_constraint_order.append("hierar_constraint_all")
-
-        column_data: dict[str, list[Any]] = {}
-        for col in time_cols:
-            if col in computed_time_cols:
-                column_data[col] = computed_time_cols[col]
-            else:
-                column_data[col] = [rec.get(col) for rec in records]
-
+        column_data: dict[str, list[Any]] = dict(time_data)
         for col in hierar_constraint_order:
             column_data[col] = hierar_constraint_cols[col]
 
@@ -800,16 +1146,184 @@ class TimeframeView:
         for col in value_col_order:
             column_data[col] = value_data.get(col, [None for _ in range(len(records))])
 
-        return pd.DataFrame(column_data)
+        frame = pd.DataFrame(column_data)
+        if graph_report is not None:
+            frame.attrs["signal_graph_report"] = graph_report
+        return frame
+
+    def export_signals_dataframe(
+        self,
+        targets: Sequence[tuple[str, str]] | None = None,
+        *,
+        signal_graph: Mapping[str, Any] | Sequence[Mapping[str, Any]],
+        include_dependencies: bool = False,
+        include_values: bool = False,
+        hierar_constraint_series: Sequence[Mapping[str, Any]] | None = None,
+        timeframe_series: Sequence[Mapping[str, Any]] | None = None,
+        signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
+        timestamp_key: str = "timestamp",
+        current_series_id: str | None = None,
+        share_computations: bool = True,
+    ):
+        """
+        Export several signals of signal_graph in one pass: targets is a list
+        of (signal_type, signal_alias) pairs, None for every root. The union
+        graph is evaluated once over the buffer and the time columns and
+        hierarchy constraint masks are built once, giving one wide DataFrame
+        with the columns of export_signal_dataframe for each target, named
+        by alias ("<alias>_raw"/"<alias>_gated" under hierarchy constraints,
+        else "<alias>").
+        """
+        try:
+            import pandas as pd
+        except ImportError as exc:  # pragma: no cover - optional dependency path
+            raise RuntimeError("pandas is required for export_signals_dataframe") from exc
+
+        roots = _resolve_graph_roots(signal_graph)
+        if not roots:
+            raise ValueError("signal_graph must contain at least one signal")
+        if targets is None:
+            target_nodes = list(roots)
+        else:
+            target_nodes = [_find_target_node(roots, signal_type, alias) for signal_type, alias in targets]
+        unique_targets: list[Mapping[str, Any]] = []
+        target_names: dict[str, str] = {}
+        for node in target_nodes:
+            node_id = str(node.get("id"))
+            if node_id in target_names:
+                continue
+            name = _node_alias(node)
+            if name in target_names.values():
+                raise ValueError(f"signal alias {name!r} is shared by several targets")
+            unique_targets.append(node)
+            target_names[node_id] = name
+
+        records = list(self.buffer)
+        if not records:
+            return pd.DataFrame()
+
+        time_data, timestamps = _export_time_columns(records, timestamp_key)
+        signal_defs_map = _build_signal_defs_map(signal_defs)
+        outputs, value_col_order, value_data, graph_report = _compute_graph_outputs(
+            records,
+            unique_targets,
+            signal_defs_map,
+            include_values=include_values,
+            share_computations=share_computations,
+        )
+
+        current_timestamps = timestamps if timestamps and all(ts is not None for ts in timestamps) else []
+        hierar_constraint_order, hierar_constraint_cols, hierar_constraint_all = _build_hierar_constraint_columns(
+            current_series_id or self.name,
+            current_timestamps,
+            hierar_constraint_series,
+            timeframe_series,
+            signal_defs_map,
+            share_computations=share_computations,
+            epoch_ns=self.time_index is not None and self.time_index.epoch_ns,
+        )
+
+        missing = [0 for _ in range(len(records))]
+        column_data: dict[str, list[Any]] = dict(time_data)
+        for col in hierar_constraint_order:
+            column_data[col] = hierar_constraint_cols[col]
+
+        if include_dependencies:
+            for node in _build_evaluation_order(unique_targets):
+                node_id = str(node.get("id"))
+                if node_id not in target_names:
+                    column_data[_node_alias(node)] = outputs.get(node_id, missing)
+
+        for node_id, name in target_names.items():
+            target_outputs = outputs.get(node_id, missing)
+            if hierar_constraint_all is not None:
+                column_data[f"{name}_raw"] = target_outputs
+                column_data[f"{name}_gated"] = [
+                    target_outputs[i] if hierar_constraint_all[i] else 0 for i in range(len(target_outputs))
+                ]
+            else:
+                column_data[name] = target_outputs
+
+        for col in value_col_order:
+            column_data[col] = value_data.get(col, [None for _ in range(len(records))])
+
+        frame = pd.DataFrame(column_data)
+        frame.attrs["signal_graph_report"] = graph_report
+        return frame
+
+    def export_cursor(
+        self,
+        signal_type: str,
+        signal_alias: str,
+        *,
+        include_dependencies: bool = False,
+        include_values: bool = False,
+        signal_graph: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
+        signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
+        timestamp_key: str = "timestamp",
+        share_computations: bool = True,
+        skip_existing: bool = False,
+    ):
+        """
+        Return an ExportCursor whose export() yields the export_signal_dataframe
+        columns for the records appended since its previous export only,
+        keeping the signal state in between; see htf.export_cursor.
+        """
+        from .export_cursor import ExportCursor
+
+        return ExportCursor(
+            self,
+            signal_type,
+            signal_alias,
+            include_dependencies=include_dependencies,
+            include_values=include_values,
+            signal_graph=signal_graph,
+            signal_defs=signal_defs,
+            timestamp_key=timestamp_key,
+            share_computations=share_computations,
+            skip_existing=skip_existing,
+        )
+
+    def export_fanout_dataframe(
+        self,
+        signal_graph: Mapping[str, Any] | Sequence[Mapping[str, Any]],
+        columns: Sequence[str],
+        *,
+        signal_defs: Mapping[str, Any] | Sequence[Mapping[str, Any]] | None = None,
+        fan_key: str = "value",
+        include_dependencies: bool = False,
+        timestamp_key: str | None = "timestamp",
+    ):
+        """
+        Apply signal_graph to every value column of the buffer in one pass and
+        return a wide DataFrame with "<column>:<alias>" outputs; see
+        htf.fanout.fanout_signal_graph.
+        """
+        from .fanout import fanout_signal_graph
+
+        return fanout_signal_graph(
+            list(self.buffer),
+            signal_graph,
+            columns,
+            signal_defs=signal_defs,
+            fan_key=fan_key,
+            include_dependencies=include_dependencies,
+            timestamp_key=timestamp_key,
+        )
 
     def export_buffer_as_dataframe(self):
         """
         Return the buffer as a pandas.DataFrame.
         Import pandas inside the method; if ImportError, raise a RuntimeError.
+        A buffer_backend with to_dataframe() (one column per stored field)
+        is exported from its columns directly.
         """
         try:
             import pandas as pd
         except ImportError as exc:  # pragma: no cover - optional dependency path
             raise RuntimeError("pandas is required for export_buffer_as_dataframe") from exc
 
+        if hasattr(self.buffer, "to_dataframe"):
+            # columnar backends export straight from their column storage
+            return self.buffer.to_dataframe().reset_index(drop=True)
         return pd.DataFrame(self.buffer)
@@ -2,6 +2,8 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
+from .downsample import downsample_indices, lttb_indices, minmax_indices, point_budget
+from .live import LiveTimeframePlot
 from .multi_timeframe_plot import (
     check_multi_tfs_single_time_serie_vs_coordinator,
     plot_multi_tfs_only_ltf_time_serie,
@@ -10,8 +12,13 @@ from .multi_timeframe_plot import (
 )
 
 __all__ = [
+    "LiveTimeframePlot",
     "plot_multi_tfs_parallel_time_series",
     "plot_multi_tfs_single_time_serie",
     "plot_multi_tfs_only_ltf_time_serie",
     "check_multi_tfs_single_time_serie_vs_coordinator",
+    "downsample_indices",
+    "lttb_indices",
+    "minmax_indices",
+    "point_budget",
 ]
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+# default number of points kept per horizontal pixel of the figure
+POINTS_PER_PIXEL = 2
+
+
+def point_budget(width_px: int, max_points: int | None = None) -> int:
+    """
+    Resolve the number of points to send to the browser for one series.
+    An explicit max_points wins; otherwise the budget is derived from the
+    figure width in pixels.
+    """
+    if max_points is not None:
+        return max(3, int(max_points))
+    return max(3, int(width_px) * POINTS_PER_PIXEL)
+
+
+def _numeric_x(xs: Sequence[Any]) -> np.ndarray:
+    """
+    Map x values (numbers, datetimes, numpy/pandas timestamps) to float64.
+    Values that cannot be converted fall back to their positional index.
+    """
+    n = len(xs)
+    try:
+        arr = np.asarray(xs, dtype="float64")
+        if arr.shape == (n,):
+            return arr
+    except (TypeError, ValueError):
+        pass
+    try:
+        arr = np.asarray(xs, dtype="datetime64[ns]").astype("int64").astype("float64")
+        if arr.shape == (n,):
+            return arr
+    except (TypeError, ValueError):
+        pass
+    return np.arange(n, dtype="float64")
+
+
+def _numeric_y(ys: Sequence[Any]) -> np.ndarray:
+    return np.asarray([np.nan if v is None else v for v in ys], dtype="float64")
+
+
+def lttb_indices(xs: Sequence[Any], ys: Sequence[Any], n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: return sorted indices of n_out points that
+    preserve the visual shape of the series. First and last points are kept.
+    """
+    n = len(xs)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    n_out = max(3, int(n_out))
+    x = _numeric_x(xs)
+    y = _numeric_y(ys)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if hi <= lo:
+            hi = lo + 1
+        nxt_lo, nxt_hi = edges[b + 1], edges[b + 2] if b + 2 < len(edges) else n
+        if nxt_hi <= nxt_lo:
+            nxt_hi = nxt_lo + 1
+        avg_x = np.nanmean(x[nxt_lo:nxt_hi])
+        nxt_y = y[nxt_lo:nxt_hi]
+        avg_y = np.nanmean(nxt_y) if not np.all(np.isnan(nxt_y)) else 0.0
+        px, py = x[prev], y[prev]
+        if np.isnan(py):
+            py = 0.0
+        area = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y - py))
+        area = np.where(np.isnan(area), -1.0, area)
+        prev = lo + int(np.argmax(area))
+        out[b + 1] = prev
+    return np.unique(out)
+
+
+def minmax_indices(xs: Sequence[Any], ys: Sequence[Any], n_buckets: int) -> np.ndarray:
+    """
+    Min-max per pixel bucket: split the x extent into n_buckets equal-width
+    buckets and keep the lowest and highest point of each. First and last
+    points are kept; NaN values are never selected.
+    """
+    n = len(xs)
+    if 2 * n_buckets >= n or n <= 2:
+        return np.arange(n)
+    x = _numeric_x(xs)
+    y = _numeric_y(ys)
+    span = x[-1] - x[0]
+    if not np.isfinite(span) or span <= 0:
+        bucket = (np.arange(n) * n_buckets) // n
+    else:
+        bucket = np.clip(((x - x[0]) / span * n_buckets).astype(np.int64), 0, n_buckets - 1)
+
+    valid = np.flatnonzero(~np.isnan(y))
+    keep = [np.array([0, n - 1], dtype=np.int64)]
+    if len(valid):
+        order = valid[np.lexsort((y[valid], bucket[valid]))]
+        b_sorted = bucket[order]
+        starts = np.flatnonzero(np.r_[True, b_sorted[1:] != b_sorted[:-1]])
+        ends = np.r_[starts[1:], len(order)] - 1
+        keep.append(order[starts])
+        keep.append(order[ends])
+    return np.unique(np.concatenate(keep))
+
+
+def mask_edges(mask: Sequence[bool]) -> np.ndarray:
+    """
+    Return indices on either side of every change in a boolean mask, so window
+    starts and ends survive downsampling.
+    """
+    arr = np.asarray(mask, dtype=bool)
+    if len(arr) < 2:
+        return np.arange(len(arr))
+    change = np.flatnonzero(arr[1:] != arr[:-1])
+    return np.unique(np.concatenate([change, change + 1]))
+
+
+def downsample_indices(
+    xs: Sequence[Any],
+    ys: Sequence[Any],
+    budget: int,
+    *,
+    method: str | None = "lttb",
+    keep_masks: Sequence[Sequence[bool]] = (),
+    keep_edges: Sequence[Sequence[bool]] = (),
+) -> list[int]:
+    """
+    Pick the indices of a series to plot.
+
+    - method: "lttb", "minmax", or None (no downsampling).
+    - budget: target number of shape points (signal and boundary points come on top).
+    - keep_masks: points where any mask is True are always kept (e.g. signals).
+    - keep_edges: transitions of these masks are always kept (e.g. window boundaries).
+    """
+    if method is not None and method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample must be one of {DOWNSAMPLE_METHODS} or None")
+    n = len(xs)
+    if method is None or n <= budget:
+        return list(range(n))
+
+    base = lttb_indices(xs, ys, budget) if method == "lttb" else minmax_indices(xs, ys, max(1, budget // 2))
+
+    parts = [base]
+    for mask in keep_masks:
+        parts.append(np.flatnonzero(np.asarray(mask, dtype=bool)[:n]))
+    for mask in keep_edges:
+        parts.append(mask_edges(list(mask)[:n]))
+    return np.unique(np.concatenate(parts)).tolist()
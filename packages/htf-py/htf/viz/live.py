@@ -0,0 +1,270 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from bokeh.layouts import column
+from bokeh.models import ColumnDataSource, LayoutDOM
+from bokeh.plotting import figure
+
+from .multi_timeframe_plot import _figsize_to_pixels, _make_color_cycle, _resolve_key
+
+
+@dataclass
+class _LiveSession:
+    """Models and stream cursor owned by one Bokeh document."""
+
+    doc: Any
+    layout: LayoutDOM
+    line_sources: dict[str, ColumnDataSource]
+    signal_sources: dict[str, ColumnDataSource]
+    window_sources: dict[str, ColumnDataSource]
+    window_open: dict[str, bool] = field(default_factory=dict)
+    last_seq: int = 0
+
+
+class LiveTimeframePlot:
+    """
+    Live dashboard for an HTFFramework: one stacked figure per timeframe with
+    its value line, signal markers and shaded signal windows.
+
+    The plot subscribes to framework.on_new_record outputs and only queues the
+    new points; a periodic document callback (fps per second) pushes them with
+    ColumnDataSource.stream(..., rollover) and extends the open window with
+    ColumnDataSource.patch, so nothing is re-rendered as history grows.
+    Records may be pushed from any thread.
+
+    Pass x_axis_type="datetime" when the x_key holds datetimes.
+
+    Usage with a local Bokeh server (BokehJS is served by the server itself, no
+    network access needed):
+
+        live = LiveTimeframePlot(framework, value_key_map={"1h": "TEMP"})
+        server = live.serve(port=5006)
+        threading.Thread(target=feed, daemon=True).start()  # calls framework.on_new_record
+        server.io_loop.start()
+    """
+
+    def __init__(
+        self,
+        framework: Any,
+        *,
+        value_key_map: Mapping[Any, str] | str | None = None,
+        y_key: str = "value",
+        x_key: str = "timestamp",
+        timeframes: Sequence[str] | None = None,
+        rollover: int = 10_000,
+        fps: float = 10.0,
+        x_axis_type: str = "linear",
+        figsize: tuple[int, int] = (10, 6),
+        colors: Sequence[str] | None = None,
+    ) -> None:
+        if rollover <= 0:
+            raise ValueError("rollover must be > 0")
+        if fps <= 0:
+            raise ValueError("fps must be > 0")
+        self.framework = framework
+        self.value_key_map = value_key_map
+        self.y_key = y_key
+        self.x_key = x_key
+        self.timeframes = list(timeframes) if timeframes else list(framework.timeframes.keys())
+        self.rollover = int(rollover)
+        self.fps = float(fps)
+        self.x_axis_type = x_axis_type
+        self.figsize = figsize
+        self.colors = colors
+
+        self._lock = threading.Lock()
+        self._points: deque[tuple[int, Any, dict[str, tuple[Any, bool]]]] = deque(maxlen=self.rollover)
+        self._seq = 0
+        self._sessions: list[_LiveSession] = []
+        framework.subscribe(self.on_output)
+
+    def close(self) -> None:
+        """Stop listening to the framework."""
+        self.framework.unsubscribe(self.on_output)
+
+    def _value_key(self, name: str) -> str:
+        tf = self.framework.timeframes.get(name, name)
+        return _resolve_key(self.value_key_map, tf) or self.y_key
+
+    def on_output(self, record: Mapping[str, Any], output: Mapping[str, Any]) -> None:
+        """Framework listener: queue one point per timeframe."""
+        x = record.get(self.x_key)
+        if x is None:
+            return
+        states = output.get("states") or {}
+        per_tf: dict[str, tuple[Any, bool]] = {}
+        for name in self.timeframes:
+            state = states.get(name)
+            if state is None:
+                continue
+            key = self._value_key(name)
+            value = (state.features or {}).get(key, record.get(key))
+            per_tf[name] = (value, bool(state.signal))
+        with self._lock:
+            self._seq += 1
+            self._points.append((self._seq, x, per_tf))
+
+    def build(self, doc: Any = None) -> LayoutDOM:
+        """
+        Create the figures for one document and register it for flushes.
+        Points already queued (up to rollover) are replayed on the next flush.
+        """
+        width, height_total = _figsize_to_pixels(self.figsize)
+        height_each = max(180, int(height_total / max(1, len(self.timeframes))))
+        color_cycle = _make_color_cycle(len(self.timeframes), self.colors)
+        line_sources: dict[str, ColumnDataSource] = {}
+        signal_sources: dict[str, ColumnDataSource] = {}
+        window_sources: dict[str, ColumnDataSource] = {}
+        figs = []
+        shared_x_range = None
+        for idx, name in enumerate(self.timeframes):
+            p = figure(
+                width=width,
+                height=height_each,
+                x_axis_type=self.x_axis_type,
+                title=f"Timeframe: {name} (live)",
+                tools="pan,xwheel_zoom,box_zoom,reset,save",
+                active_drag="pan",
+                active_scroll="xwheel_zoom",
+            )
+            if shared_x_range is None:
+                shared_x_range = p.x_range
+            else:
+                p.x_range = shared_x_range
+            color = color_cycle[idx]
+            window_sources[name] = ColumnDataSource({"left": [], "right": []})
+            p.vstrip(
+                x0="left",
+                x1="right",
+                source=window_sources[name],
+                fill_color=color,
+                fill_alpha=0.08,
+                line_alpha=0.0,
+                level="underlay",
+            )
+            line_sources[name] = ColumnDataSource({"x": [], "y": []})
+            p.line("x", "y", source=line_sources[name], line_width=2, color=color)
+            signal_sources[name] = ColumnDataSource({"x": [], "y": []})
+            p.scatter("x", "y", source=signal_sources[name], size=7, color="red", marker="circle")
+            p.yaxis.axis_label = self._value_key(name)
+            figs.append(p)
+
+        layout = column(*figs, sizing_mode="stretch_width")
+        session = _LiveSession(
+            doc=doc,
+            layout=layout,
+            line_sources=line_sources,
+            signal_sources=signal_sources,
+            window_sources=window_sources,
+            window_open={name: False for name in self.timeframes},
+        )
+        with self._lock:
+            # replay only what is still retained
+            session.last_seq = self._points[0][0] - 1 if self._points else self._seq
+        self._sessions.append(session)
+        return layout
+
+    def make_document(self, doc: Any) -> None:
+        """Bokeh server application entry point."""
+        doc.add_root(self.build(doc))
+        doc.add_periodic_callback(lambda: self._flush_session(self._session_for(doc)), 1000.0 / self.fps)
+        doc.on_session_destroyed(lambda _ctx: self._drop_session(doc))
+
+    def _session_for(self, doc: Any) -> _LiveSession | None:
+        for session in self._sessions:
+            if session.doc is doc:
+                return session
+        return None
+
+    def _drop_session(self, doc: Any) -> None:
+        self._sessions = [s for s in self._sessions if s.doc is not doc]
+
+    def flush(self) -> int:
+        """
+        Push queued points into every session built without a server document
+        (e.g. tests or notebooks). Returns the number of new points pushed.
+        """
+        pushed = 0
+        for session in list(self._sessions):
+            if session.doc is None:
+                pushed = max(pushed, self._flush_session(session))
+        return pushed
+
+    def _flush_session(self, session: _LiveSession | None) -> int:
+        if session is None:
+            return 0
+        with self._lock:
+            n_new = min(self._seq - session.last_seq, len(self._points))
+            if n_new <= 0:
+                return 0
+            batch = [self._points[-n_new + i] for i in range(n_new)]
+            session.last_seq = self._seq
+
+        for name in self.timeframes:
+            xs: list[Any] = []
+            ys: list[Any] = []
+            sig_x: list[Any] = []
+            sig_y: list[Any] = []
+            new_left: list[Any] = []
+            new_right: list[Any] = []
+            extend_to: Any = None
+            is_open = session.window_open.get(name, False)
+            for _, x, per_tf in batch:
+                if name not in per_tf:
+                    continue
+                value, signal = per_tf[name]
+                xs.append(x)
+                ys.append(value)
+                if signal:
+                    sig_x.append(x)
+                    sig_y.append(value)
+                    if is_open:
+                        if new_right:
+                            new_right[-1] = x
+                        else:
+                            extend_to = x
+                    else:
+                        new_left.append(x)
+                        new_right.append(x)
+                        is_open = True
+                else:
+                    is_open = False
+            session.window_open[name] = is_open
+
+            if xs:
+                session.line_sources[name].stream({"x": xs, "y": ys}, rollover=self.rollover)
+            if sig_x:
+                session.signal_sources[name].stream({"x": sig_x, "y": sig_y}, rollover=self.rollover)
+            win_src = session.window_sources[name]
+            if extend_to is not None and win_src.data["right"]:
+                win_src.patch({"right": [(len(win_src.data["right"]) - 1, extend_to)]})
+            if new_left:
+                win_src.stream({"left": new_left, "right": new_right}, rollover=self.rollover)
+        return len(batch)
+
+    def serve(self, port: int = 5006, address: str = "127.0.0.1", **server_kwargs: Any) -> Any:
+        """
+        Start a local Bokeh server for this dashboard and return it. The caller
+        runs server.io_loop.start() (or an existing Tornado loop).
+        """
+        from bokeh.application import Application
+        from bokeh.application.handlers.function import FunctionHandler
+        from bokeh.server.server import Server
+
+        origins = server_kwargs.pop("allow_websocket_origin", [f"localhost:{port}", f"127.0.0.1:{port}"])
+        server = Server(
+            {"/": Application(FunctionHandler(self.make_document))},
+            port=port,
+            address=address,
+            allow_websocket_origin=origins,
+            **server_kwargs,
+        )
+        server.start()
+        return server
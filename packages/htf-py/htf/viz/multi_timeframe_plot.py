@@ -2,16 +2,19 @@
 # Copyright 2025-2026 ZHU Shengling
 from __future__ import annotations
 
-from bisect import bisect_right
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 from bokeh.layouts import Spacer, column, row
-from bokeh.models import BoxAnnotation, ColumnDataSource, LayoutDOM
+from bokeh.models import ColumnDataSource, LayoutDOM
 from bokeh.palettes import Category10
 from bokeh.plotting import figure
 
+from ..intervals import all_windows_mask, asof_indices, asof_values, truthy_windows
+from .downsample import downsample_indices, point_budget
+
 
 @dataclass
 class _TimeframeSeries:
@@ -107,50 +110,6 @@ def _extract_timeframe_series(
     )
 
 
-def _truthy_windows(flags: Sequence[bool], xs: Sequence[Any]) -> list[tuple[Any, Any]]:
-    """
-    Collapse consecutive True values into (start, end) windows.
-    """
-    windows: list[tuple[Any, Any]] = []
-    start = None
-    for idx, flag in enumerate(flags):
-        if bool(flag):
-            if start is None:
-                start = xs[idx]
-        else:
-            if start is not None:
-                end_val = xs[idx - 1] if idx > 0 else start
-                windows.append((start, end_val))
-                start = None
-    if start is not None and xs:
-        windows.append((start, xs[-1]))
-    return windows
-
-
-def _latest_bool_before(ts_list: Sequence[Any], flags: Sequence[bool], ts: Any) -> bool:
-    """
-    Return the most recent flag whose timestamp <= ts.
-    """
-    if not ts_list:
-        return False
-    pos = bisect_right(ts_list, ts) - 1
-    if pos < 0 or pos >= len(flags):
-        return False
-    return bool(flags[pos])
-
-
-def _latest_value_before(ts_list: Sequence[Any], vals: Sequence[Any], ts: Any) -> Any | None:
-    """
-    Return the most recent value whose timestamp <= ts.
-    """
-    if not ts_list:
-        return None
-    pos = bisect_right(ts_list, ts) - 1
-    if pos < 0 or pos >= len(vals):
-        return None
-    return vals[pos]
-
-
 def _build_tf_series(
     timeframes: Sequence[Any],
     scale_change_signal_map: Mapping[Any, str],
@@ -188,6 +147,118 @@ def _build_tf_series(
     return tf_series, ltf_series, htf_series
 
 
+def _take(seq: Sequence[Any], indices: Sequence[int]) -> list[Any]:
+    return [seq[i] for i in indices]
+
+
+def _downsample_series(
+    series: _TimeframeSeries,
+    budget: int,
+    method: str | None,
+    *,
+    keep_masks: Sequence[Sequence[bool]] = (),
+    keep_edges: Sequence[Sequence[bool]] = (),
+) -> tuple[_TimeframeSeries, list[int]]:
+    """
+    Reduce a series to the plotted subset; returns the reduced series and the
+    kept indices so callers can subset aligned masks.
+    """
+    indices = downsample_indices(
+        series.timestamps,
+        series.values,
+        budget,
+        method=method,
+        keep_masks=keep_masks,
+        keep_edges=keep_edges,
+    )
+    if len(indices) == len(series.timestamps):
+        return series, indices
+    reduced = _TimeframeSeries(
+        name=series.name,
+        timestamps=_take(series.timestamps, indices),
+        values=_take(series.values, indices),
+        scale_signal=_take(series.scale_signal, indices),
+        base_signal=_take(series.base_signal, indices),
+    )
+    return reduced, indices
+
+
+def _mask_to_segments(mask: Sequence[bool], xs: Sequence[Any], ys: Sequence[Any]) -> list[tuple[list[Any], list[Any]]]:
+    segs: list[tuple[list[Any], list[Any]]] = []
+    start_idx = None
+    for idx, flag in enumerate(mask):
+        if flag and start_idx is None:
+            start_idx = idx
+        elif not flag and start_idx is not None:
+            segs.append((list(xs[start_idx:idx]), list(ys[start_idx:idx])))
+            start_idx = None
+    if start_idx is not None:
+        segs.append((list(xs[start_idx:]), list(ys[start_idx:])))
+    return segs
+
+
+def _add_segments(
+    p: Any,
+    segments: Sequence[tuple[list[Any], list[Any]]],
+    *,
+    color: str,
+    size: int,
+    label: str | None = None,
+) -> bool:
+    """
+    Draw all segments with one multi_line renderer and one scatter renderer so
+    the number of Bokeh models does not grow with the number of segments.
+    Returns True when anything was drawn.
+    """
+    segments = [(xs, ys) for xs, ys in segments if xs]
+    if not segments:
+        return False
+    line_src = ColumnDataSource({"xs": [xs for xs, _ in segments], "ys": [ys for _, ys in segments]})
+    line_kwargs: dict[str, Any] = {"xs": "xs", "ys": "ys", "source": line_src, "line_width": 2, "color": color}
+    if label:
+        line_kwargs["legend_label"] = label
+    p.multi_line(**line_kwargs)
+    point_src = ColumnDataSource(
+        {
+            "x": [x for xs, _ in segments for x in xs],
+            "y": [y for _, ys in segments for y in ys],
+        }
+    )
+    p.scatter("x", "y", source=point_src, size=size, alpha=0.9, color=color, marker="circle")
+    return True
+
+
+def _add_window_shading(
+    p: Any,
+    windows: Sequence[tuple[Any, Any]],
+    *,
+    color: str,
+    alpha: float,
+    label: str | None = None,
+) -> bool:
+    """
+    Shade all windows with a single full-height vstrip glyph (one data source
+    for every window) instead of one BoxAnnotation per window.
+    Returns True when anything was drawn.
+    """
+    if not windows:
+        return False
+    src = ColumnDataSource({"left": [start for start, _ in windows], "right": [end for _, end in windows]})
+    strip_kwargs: dict[str, Any] = {
+        "x0": "left",
+        "x1": "right",
+        "source": src,
+        "fill_color": color,
+        "fill_alpha": alpha,
+        "line_alpha": 0.0,
+        "level": "underlay",
+    }
+    if label:
+        strip_kwargs["legend_label"] = label
+    p.vstrip(**strip_kwargs)
+    return True
+
+
 def _make_color_cycle(n: int, colors: Sequence[str] | None = None) -> list[str]:
     if colors:
         cycle = list(colors)
@@ -213,16 +284,18 @@ def _build_stitched_path(tf_series: list[_TimeframeSeries]) -> dict[str, Any]:
     if not ltf_series.timestamps:
         raise ValueError("No data found in the lowest timeframe to plot.")
 
-    def htf_allow(ts: Any) -> bool:
-        if not htf_series:
-            return True
-        return all(_latest_bool_before(s.timestamps, s.scale_signal, ts) for s in htf_series)
-
-    def htf_value(ts: Any) -> Any | None:
-        for s in htf_series:
-            val = _latest_value_before(s.timestamps, s.values, ts)
-            if val is not None:
-                return val
+    # as-of lookups: one merge walk per HTF instead of a bisect per LTF timestamp
+    ltf_ts = ltf_series.timestamps
+    allow_flags = [True] * len(ltf_ts)
+    for s in htf_series:
+        flags = asof_values(s.timestamps, s.scale_signal, ltf_ts, False)
+        allow_flags = [a and bool(f) for a, f in zip(allow_flags, flags)]
+    htf_value_cols = [asof_values(s.timestamps, s.values, ltf_ts) for s in htf_series]
+
+    def htf_value(i: int) -> Any | None:
+        for col in htf_value_cols:
+            if col[i] is not None:
+                return col[i]
         return None
 
     x_idx: list[int] = []
@@ -235,14 +308,14 @@ def _build_stitched_path(tf_series: list[_TimeframeSeries]) -> dict[str, Any]:
 
     prev_name: str | None = None
     for i, ts in enumerate(ltf_series.timestamps):
-        allow = htf_allow(ts)
+        allow = allow_flags[i]
         if allow or not htf_series:
             name = ltf_series.name
             value = ltf_series.values[i] if i < len(ltf_series.values) else None
             base = bool(ltf_series.base_signal[i]) if i < len(ltf_series.base_signal) else False
         else:
             name = htf_series[0].name
-            value = htf_value(ts)
+            value = htf_value(i)
             if value is None:
                 # fallback to ltf value so the plot stays continuous
                 value = ltf_series.values[i] if i < len(ltf_series.values) else None
@@ -280,9 +353,14 @@ def plot_multi_tfs_parallel_time_series(
     signal_key: str | None = None,
     signal_style: dict[str, Any] | None = None,
     figsize: tuple[int, int] = (10, 6),
+    downsample: str | None = "lttb",
+    max_points: int | None = None,
 ) -> LayoutDOM:
     """
     Bokeh: plot multiple timeframes stacked vertically with linked x-range and pan/zoom.
+    Series longer than the point budget (max_points, or derived from the figure
+    width) are reduced with downsample="lttb" or "minmax"; signal points are
+    always kept. Pass downsample=None to send every point.
     """
     if not series_by_tf:
         raise ValueError("series_by_tf must contain at least one timeframe")
@@ -292,6 +370,8 @@ def plot_multi_tfs_parallel_time_series(
     width, height_total = _figsize_to_pixels(figsize)
     height_each = max(220, int(height_total / max(1, n)))
 
+    budget = point_budget(width, max_points)
+
     figs: list[LayoutDOM] = []
     shared_x_range = None
     shared_y_range = None
@@ -329,7 +409,15 @@ def plot_multi_tfs_parallel_time_series(
             else:
                 p.y_range = shared_y_range
 
-        src = ColumnDataSource({x_key: x, y_key: y})
+        signal_mask: list[bool] = []
+        if signal_key and signal_key in data:
+            signal_mask = [bool(v) for v in data.get(signal_key, [])]
+        keep_masks = [signal_mask] if len(signal_mask) == len(x) else []
+        kept = downsample_indices(x, y, budget, method=downsample, keep_masks=keep_masks)
+        if len(kept) == len(x):
+            src = ColumnDataSource({x_key: x, y_key: y})
+        else:
+            src = ColumnDataSource({x_key: _take(x, kept), y_key: _take(y, kept)})
         p.line(x=x_key, y=y_key, source=src, line_width=2)
         p.scatter(x=x_key, y=y_key, source=src, size=4, alpha=0.9, marker="circle")
 
@@ -390,11 +478,15 @@ def plot_multi_tfs_single_time_serie(
     figsize: tuple[int, int] = (12, 5),
     title: str | None = None,
     colors: Sequence[str] | None = None,
+    downsample: str | None = "lttb",
+    max_points: int | None = None,
 ) -> LayoutDOM:
     """
     Bokeh: stitched single path. LTF points are drawn only when all HTFs allow;
     otherwise HTF samples are drawn on their own (coarser) timeline. Allowed LTF
     spans are shown with a light background; base signals use the LTF line color.
+    Long series are downsampled as in plot_multi_tfs_parallel_time_series; base
+    signals and window boundaries are always kept.
     """
     tf_series, ltf_series, htf_series = _build_tf_series(
         timeframes, scale_change_signal_map, base_signal_ltf, value_key_map, x_key, y_key
@@ -427,75 +519,40 @@ def plot_multi_tfs_single_time_serie(
     # compute HTF windows and LTF allowed mask (all HTFs active and covering ts)
     htf_windows: dict[str, list[tuple[Any, Any]]] = {}
     for series in htf_series:
-        htf_windows[series.name] = _truthy_windows(series.scale_signal, series.timestamps)
-
-    all_active_mask: list[bool] = []
-    if htf_windows:
-        for ts in ltf_series.timestamps:
-            active = True
-            for windows in htf_windows.values():
-                if not windows or not any(start <= ts <= end for start, end in windows):
-                    active = False
-                    break
-            all_active_mask.append(active)
-    else:
-        all_active_mask = [True] * len(ltf_series.timestamps)
-
-    def _mask_to_segments(
-        mask: Sequence[bool], xs: Sequence[Any], ys: Sequence[Any]
-    ) -> list[tuple[list[Any], list[Any]]]:
-        segs: list[tuple[list[Any], list[Any]]] = []
-        start_idx = None
-        for idx, flag in enumerate(mask):
-            if flag and start_idx is None:
-                start_idx = idx
-            elif not flag and start_idx is not None:
-                segs.append((list(xs[start_idx:idx]), list(ys[start_idx:idx])))
-                start_idx = None
-        if start_idx is not None:
-            segs.append((list(xs[start_idx:]), list(ys[start_idx:])))
-        return segs
+        htf_windows[series.name] = truthy_windows(series.scale_signal, series.timestamps)
+
+    all_active_mask = all_windows_mask(list(htf_windows.values()), ltf_series.timestamps)
 
     # shade allowed LTF windows with light background
-    ltf_windows = _truthy_windows(all_active_mask, ltf_series.timestamps)
-    for start_ts, end_ts in ltf_windows:
-        box = BoxAnnotation(left=start_ts, right=end_ts, fill_color="#e6f2ff", fill_alpha=0.3, line_alpha=0.0)
-        p.add_layout(box)
+    ltf_windows = truthy_windows(all_active_mask, ltf_series.timestamps)
+    _add_window_shading(p, ltf_windows, color="#e6f2ff", alpha=0.3)
 
     seen_labels: set[str] = set()
+    budget = point_budget(p.width, max_points)
 
     # plot HTF segments (when not all active)
     if htf_series:
-        primary_htf = htf_series[0]
+        primary_htf, _ = _downsample_series(htf_series[0], budget, downsample, keep_edges=[htf_series[0].scale_signal])
         inactive_mask = [not bool(f) for f in primary_htf.scale_signal]
         htf_segments = _mask_to_segments(inactive_mask, primary_htf.timestamps, primary_htf.values)
-        for xs, ys in htf_segments:
-            if not xs:
-                continue
-            label = primary_htf.name if primary_htf.name not in seen_labels else None
-            if label:
-                seen_labels.add(label)
-            src = ColumnDataSource({"x": xs, "y": ys})
-            line_kwargs = {"x": "x", "y": "y", "source": src, "line_width": 2, "color": htf_color}
-            if label:
-                line_kwargs["legend_label"] = label
-            p.line(**line_kwargs)
-            p.scatter("x", "y", source=src, size=5, alpha=0.9, color=htf_color, marker="circle")
+        if _add_segments(p, htf_segments, color=htf_color, size=5, label=primary_htf.name):
+            seen_labels.add(primary_htf.name)
+
+    ltf_series, kept = _downsample_series(
+        ltf_series,
+        budget,
+        downsample,
+        keep_masks=[ltf_series.base_signal],
+        keep_edges=[all_active_mask],
+    )
+    if len(kept) != len(all_active_mask):
+        all_active_mask = _take(all_active_mask, kept)
 
     # plot allowed LTF segments
     ltf_segments = _mask_to_segments(all_active_mask, ltf_series.timestamps, ltf_series.values)
-    for xs, ys in ltf_segments:
-        if not xs:
-            continue
-        label = ltf_series.name if ltf_series.name not in seen_labels else None
-        if label:
-            seen_labels.add(label)
-        src = ColumnDataSource({"x": xs, "y": ys})
-        line_kwargs = {"x": "x", "y": "y", "source": src, "line_width": 2, "color": ltf_color}
-        if label:
-            line_kwargs["legend_label"] = label
-        p.line(**line_kwargs)
-        p.scatter("x", "y", source=src, size=4, alpha=0.9, color=ltf_color, marker="circle")
+    ltf_label = ltf_series.name if ltf_series.name not in seen_labels else None
+    if _add_segments(p, ltf_segments, color=ltf_color, size=4, label=ltf_label) and ltf_label:
+        seen_labels.add(ltf_label)
 
     # base signals: use the LTF line color
     base_flags = ltf_series.base_signal or [False] * len(ltf_series.timestamps)
@@ -536,9 +593,13 @@ def plot_multi_tfs_only_ltf_time_serie(
     title: str | None = None,
     colors: Sequence[str] | None = None,
     ltf_color: str | None = None,
+    downsample: str | None = "lttb",
+    max_points: int | None = None,
 ) -> LayoutDOM:
     """
     Bokeh: plot only LTF series while showing HTF scale-change windows and gating.
+    Long LTF series are downsampled as in plot_multi_tfs_parallel_time_series;
+    base signals and gating boundaries are always kept.
     """
     tf_series, ltf_series, htf_series = _build_tf_series(
         timeframes, scale_change_signal_map, base_signal_ltf, value_key_map, x_key, y_key
@@ -570,19 +631,26 @@ def plot_multi_tfs_only_ltf_time_serie(
     # HTF windows
     htf_windows: dict[str, list[tuple[Any, Any]]] = {}
     for series in htf_series:
-        windows = _truthy_windows(series.scale_signal, series.timestamps)
+        windows = truthy_windows(series.scale_signal, series.timestamps)
         htf_windows[series.name] = windows
         shade_color = htf_color_map.get(series.name, "gray")
-        for start, end in windows:
-            box = BoxAnnotation(left=start, right=end, fill_color=shade_color, fill_alpha=0.08, line_alpha=0.0)
-            p.add_layout(box)
-        if windows:
-            label = f"{series.name} scale-change"
-            if label not in seen_labels:
-                # legend entries attach to renderers; add dummy line once
-                dummy = p.line([], [], line_color=shade_color, line_dash="dashed", legend_label=label)
-                seen_labels.add(label)
-                dummy.visible = False
+        label = f"{series.name} scale-change"
+        shade_label = label if label not in seen_labels else None
+        if _add_window_shading(p, windows, color=shade_color, alpha=0.08, label=shade_label) and shade_label:
+            seen_labels.add(label)
+
+    # Determine whether all HTF windows active at each LTF timestamp
+    all_active_mask = all_windows_mask(list(htf_windows.values()), ltf_series.timestamps)
+
+    ltf_series, kept = _downsample_series(
+        ltf_series,
+        point_budget(p.width, max_points),
+        downsample,
+        keep_masks=[ltf_series.base_signal],
+        keep_edges=[all_active_mask],
+    )
+    if len(kept) != len(all_active_mask):
+        all_active_mask = _take(all_active_mask, kept)
 
     ltf_src = ColumnDataSource({"x": ltf_series.timestamps, "y": ltf_series.values})
     ltf_label = ltf_series.name if ltf_series.name not in seen_labels else None
@@ -591,16 +659,6 @@ def plot_multi_tfs_only_ltf_time_serie(
     p.line("x", "y", source=ltf_src, line_width=2, color=ltf_line_color, legend_label=ltf_label)
     p.scatter("x", "y", source=ltf_src, size=4, color=ltf_line_color, alpha=0.9, marker="circle")
 
-    # Determine whether all HTF windows active at each LTF timestamp
-    all_active_mask: list[bool] = []
-    for ts in ltf_series.timestamps:
-        active = True if htf_windows else True
-        for windows in htf_windows.values():
-            if not windows or not any(start <= ts <= end for start, end in windows):
-                active = False
-                break
-        all_active_mask.append(active)
-
     base_flags = ltf_series.base_signal or [False] * len(ltf_series.timestamps)
     inside_x: list[Any] = []
     inside_y: list[Any] = []
@@ -640,6 +698,13 @@ def plot_multi_tfs_only_ltf_time_serie(
     return row(Spacer(width=left_pad), p, Spacer(width=left_pad), sizing_mode="scale_both")
 
 
+CHECK_TIMELINE_FORMATS = ("records", "columns", "frame")
+
+
+def _mismatch_entries(indices: np.ndarray, timestamps: Sequence[Any]) -> list[dict[str, Any]]:
+    return [{"index": int(idx), "timestamp": timestamps[idx]} for idx in indices]
+
+
 def check_multi_tfs_single_time_serie_vs_coordinator(
     timeframes: Sequence[Any],
     *,
@@ -649,51 +714,100 @@ def check_multi_tfs_single_time_serie_vs_coordinator(
     x_key: str = "timestamp",
     y_key: str = "value",
     coordinator_outputs: Sequence[Mapping[str, Any]] | None = None,
+    timeline: str = "records",
 ) -> dict[str, Any]:
     """
     Compare plot-derived gating (all HTF signals must be true) against optional
     coordinator outputs. Returns a timeline plus mismatch diagnostics.
+
+    HTF flags are carried onto the LTF timestamps with one as-of merge pass per
+    HTF and mismatches are found with boolean array operations. The timeline
+    format is chosen with timeline=:
+    - "records": one dict per LTF step (default, builds per-step dicts).
+    - "columns": dict of arrays; "htf_active" maps each HTF name to a bool array.
+    - "frame": pandas DataFrame with one "htf_active:<name>" column per HTF.
+    In the columnar formats "mismatch_indices" holds the raw index arrays.
     """
+    if timeline not in CHECK_TIMELINE_FORMATS:
+        raise ValueError(f"timeline must be one of {CHECK_TIMELINE_FORMATS}")
     tf_series, ltf_series, htf_series = _build_tf_series(
         timeframes, scale_change_signal_map, base_signal_ltf, value_key_map, x_key, y_key
     )
 
-    timeline: list[dict[str, Any]] = []
-    mismatches: dict[str, list[dict[str, Any]]] = {
-        "plot_not_allowed": [],
+    timestamps = ltf_series.timestamps
+    n = len(timestamps)
+    base = np.zeros(n, dtype=bool)
+    base[: len(ltf_series.base_signal)] = np.asarray(ltf_series.base_signal[:n], dtype=bool)
+
+    htf_active: dict[str, np.ndarray] = {}
+    htf_allow = np.ones(n, dtype=bool)
+    for series in htf_series:
+        flags = np.asarray(series.scale_signal, dtype=bool)
+        pos = np.asarray(asof_indices(series.timestamps, timestamps), dtype=np.int64)
+        known = (pos >= 0) & (pos < len(flags))
+        active = np.zeros(n, dtype=bool)
+        active[known] = flags[pos[known]]
+        htf_active[series.name] = active
+        htf_allow &= active
+
+    mismatch_idx: dict[str, list[np.ndarray]] = {
+        "plot_not_allowed": [np.flatnonzero(base & ~htf_allow)],
         "coordinator_unused": [],
     }
+    if coordinator_outputs:
+        limit = min(n, len(coordinator_outputs))
+        coord_allowed = np.fromiter(
+            (bool(coordinator_outputs[i].get("ltf_gated", {}).get(ltf_series.name, 0)) for i in range(limit)),
+            dtype=bool,
+            count=limit,
+        )
+        head = base[:limit]
+        mismatch_idx["plot_not_allowed"].append(np.flatnonzero(head & ~coord_allowed))
+        mismatch_idx["coordinator_unused"].append(np.flatnonzero(coord_allowed & ~head))
 
-    for idx, ts in enumerate(ltf_series.timestamps):
-        htf_active = {
-            series.name: _latest_bool_before(series.timestamps, series.scale_signal, ts) for series in htf_series
-        }
-        htf_allow = all(htf_active.values()) if htf_series else True
-        base_flag = bool(ltf_series.base_signal[idx]) if idx < len(ltf_series.base_signal) else False
+    flat_idx = {
+        key: np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64) for key, parts in mismatch_idx.items()
+    }
+    result: dict[str, Any] = {
+        "mismatches": {key: _mismatch_entries(idx, timestamps) for key, idx in flat_idx.items()},
+    }
 
-        entry = {
-            "timestamp": ts,
-            "value": ltf_series.values[idx] if idx < len(ltf_series.values) else None,
-            "base_signal": base_flag,
+    values = list(ltf_series.values[:n]) + [None] * (n - len(ltf_series.values))
+    if timeline == "records":
+        names = list(htf_active)
+        active_cols = [htf_active[name].tolist() for name in names]
+        allow_list = htf_allow.tolist()
+        base_list = base.tolist()
+        result["timeline"] = [
+            {
+                "timestamp": timestamps[idx],
+                "value": values[idx],
+                "base_signal": base_list[idx],
+                "htf_allow": allow_list[idx],
+                "htf_active": {name: col[idx] for name, col in zip(names, active_cols)},
+                "allowed_timeframes": [ltf_series.name] if allow_list[idx] else [],
+            }
+            for idx in range(n)
+        ]
+        return result
+
+    result["mismatch_indices"] = flat_idx
+    if timeline == "columns":
+        result["timeline"] = {
+            "timestamp": timestamps,
+            "value": values,
+            "base_signal": base,
             "htf_allow": htf_allow,
             "htf_active": htf_active,
-            "allowed_timeframes": [ltf_series.name] if htf_allow else [],
         }
-        timeline.append(entry)
-
-        if base_flag and not htf_allow:
-            mismatches["plot_not_allowed"].append({"index": idx, "timestamp": ts})
+        return result
 
-    if coordinator_outputs:
-        limit = min(len(timeline), len(coordinator_outputs))
-        for idx in range(limit):
-            coord = coordinator_outputs[idx]
-            coord_allowed = bool(coord.get("ltf_gated", {}).get(ltf_series.name, 0))
-            base_flag = timeline[idx]["base_signal"]
-
-            if base_flag and not coord_allowed:
-                mismatches["plot_not_allowed"].append({"index": idx, "timestamp": timeline[idx]["timestamp"]})
-            if coord_allowed and not base_flag:
-                mismatches["coordinator_unused"].append({"index": idx, "timestamp": timeline[idx]["timestamp"]})
-
-    return {"timeline": timeline, "mismatches": mismatches}
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency path
+        raise RuntimeError("pandas is required for timeline='frame'") from exc
+    frame = pd.DataFrame({"timestamp": timestamps, "value": values, "base_signal": base, "htf_allow": htf_allow})
+    for name, active in htf_active.items():
+        frame[f"htf_active:{name}"] = active
+    result["timeline"] = frame
+    return result
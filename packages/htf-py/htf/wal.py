@@ -0,0 +1,373 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025-2026 ZHU Shengling
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+import time
+import zlib
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .framework import HTFFramework
+
+# Crash recovery for HTFFramework: every ingested record is first appended to
+# a write-ahead log, and the whole framework (buffers, signal states,
+# coordinator) is periodically pickled to a checkpoint. Recovery loads the
+# newest checkpoint and replays only the log records written after it,
+# through HTFFramework.replay (no listeners, no logging).
+#
+# Log records are numbered by LSN (0, 1, 2, ...). The log is a directory of
+# segment files named after the LSN of their first record; each record is a
+# frame [length uint32][crc32 uint32][pickle payload]. A torn frame at the
+# end of the last segment (crash during a write) is detected by its length
+# or CRC and truncated when the log is reopened.
+#
+# Group commit: appended frames are buffered and written with one write()
+# per group_records records; the file is fsynced every fsync_groups group
+# writes and/or when fsync_interval seconds have passed since the last
+# fsync. Records still buffered are lost if the process dies; records
+# written but not fsynced survive a process crash but not an OS crash.
+# A checkpoint always writes and fsyncs the log first.
+
+_FRAME_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".wal"
+_CHECKPOINT_PREFIX = "checkpoint-"
+_CHECKPOINT_SUFFIX = ".pkl"
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory fds
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    Append-only, segmented log of records with group commit.
+
+    - group_records: records buffered per write() (1 writes every record).
+    - fsync_groups: fsync after this many group writes (0 = only on sync()
+      and close()).
+    - fsync_interval: also fsync when this many seconds have passed since
+      the last fsync, checked at each group write.
+    - segment_bytes: start a new segment file once the current one is at
+      least this large; whole segments are removed by truncate_before.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        group_records: int = 64,
+        fsync_groups: int = 1,
+        fsync_interval: float | None = None,
+        segment_bytes: int = 64 << 20,
+    ) -> None:
+        if group_records <= 0:
+            raise ValueError("group_records must be > 0")
+        if fsync_groups < 0:
+            raise ValueError("fsync_groups must be >= 0")
+        if fsync_interval is not None and fsync_interval < 0:
+            raise ValueError("fsync_interval must be >= 0")
+        if segment_bytes <= 0:
+            raise ValueError("segment_bytes must be > 0")
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.group_records = group_records
+        self.fsync_groups = fsync_groups
+        self.fsync_interval = fsync_interval
+        self.segment_bytes = segment_bytes
+
+        self._pending: list[bytes] = []
+        self._groups_since_fsync = 0
+        self._last_fsync = time.monotonic()
+        self.truncated_bytes = 0
+        self.stats = {"records": 0, "writes": 0, "fsyncs": 0, "bytes": 0}
+
+        segments = self._segments()
+        if segments:
+            first_lsn = segments[-1]
+            count, valid_bytes, size = self._scan(self._segment_path(first_lsn))
+            if valid_bytes < size:
+                with open(self._segment_path(first_lsn), "r+b") as fh:
+                    fh.truncate(valid_bytes)
+                self.truncated_bytes = size - valid_bytes
+            self._segment_lsn = first_lsn
+            self.next_lsn = first_lsn + count
+        else:
+            self._segment_lsn = 0
+            self.next_lsn = 0
+        self._file = open(self._segment_path(self._segment_lsn), "ab")  # noqa: SIM115 - kept open for appends
+
+    def _segment_path(self, first_lsn: int) -> str:
+        return os.path.join(self.directory, f"{first_lsn:020d}{_SEGMENT_SUFFIX}")
+
+    def _segments(self) -> list[int]:
+        names = [name for name in os.listdir(self.directory) if name.endswith(_SEGMENT_SUFFIX)]
+        return sorted(int(name[: -len(_SEGMENT_SUFFIX)]) for name in names)
+
+    @staticmethod
+    def _frames(data: bytes) -> Iterator[tuple[int, bytes]]:
+        """(end offset, payload) of every intact frame of a segment, in order."""
+        pos = 0
+        size = len(data)
+        header = _FRAME_HEADER.size
+        while pos + header <= size:
+            length, crc = _FRAME_HEADER.unpack_from(data, pos)
+            end = pos + header + length
+            if end > size:
+                return
+            payload = data[pos + header : end]
+            if zlib.crc32(payload) != crc:
+                return
+            yield end, payload
+            pos = end
+
+    def _scan(self, path: str) -> tuple[int, int, int]:
+        """(intact frames, bytes they cover, file size) of a segment."""
+        with open(path, "rb") as fh:
+            data = fh.read()
+        count = 0
+        valid = 0
+        for end, _ in self._frames(data):
+            count += 1
+            valid = end
+        return count, valid, len(data)
+
+    @property
+    def pending(self) -> int:
+        """Records appended but not yet written to the file."""
+        return len(self._pending)
+
+    def append(self, record: Mapping[str, Any]) -> int:
+        """Log record and return its LSN."""
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self._pending.append(_FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        lsn = self.next_lsn
+        self.next_lsn = lsn + 1
+        self.stats["records"] += 1
+        if len(self._pending) >= self.group_records:
+            self._write_group()
+        return lsn
+
+    def _write_group(self, force_fsync: bool = False) -> None:
+        if self._pending:
+            data = b"".join(self._pending)
+            self._file.write(data)
+            self._file.flush()
+            self._pending.clear()
+            self.stats["writes"] += 1
+            self.stats["bytes"] += len(data)
+            self._groups_since_fsync += 1
+        now = time.monotonic()
+        due = force_fsync and self._groups_since_fsync > 0
+        if self.fsync_groups and self._groups_since_fsync >= self.fsync_groups:
+            due = True
+        interval = self.fsync_interval
+        if interval is not None and self._groups_since_fsync and now - self._last_fsync >= interval:
+            due = True
+        if due:
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+            self._groups_since_fsync = 0
+            self._last_fsync = now
+        if self._file.tell() >= self.segment_bytes:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._segment_lsn = self.next_lsn
+            self._file = open(self._segment_path(self._segment_lsn), "ab")  # noqa: SIM115
+            _fsync_directory(self.directory)
+
+    def sync(self) -> None:
+        """Write buffered records and fsync the log."""
+        self._write_group(force_fsync=True)
+
+    def read(self, from_lsn: int = 0) -> Iterator[tuple[int, Any]]:
+        """Yield (lsn, record) for every written record with lsn >= from_lsn."""
+        segments = self._segments()
+        start = 0
+        for i, first_lsn in enumerate(segments):
+            if first_lsn <= from_lsn:
+                start = i
+        for first_lsn in segments[start:]:
+            with open(self._segment_path(first_lsn), "rb") as fh:
+                data = fh.read()
+            lsn = first_lsn
+            for _, payload in self._frames(data):
+                if lsn >= from_lsn:
+                    yield lsn, pickle.loads(payload)
+                lsn += 1
+
+    def truncate_before(self, lsn: int) -> int:
+        """Remove segments whose records all have an LSN below lsn; return how many."""
+        segments = self._segments()
+        removed = 0
+        for first_lsn, next_first in zip(segments, segments[1:]):
+            if next_first <= lsn and first_lsn != self._segment_lsn:
+                os.remove(self._segment_path(first_lsn))
+                removed += 1
+        return removed
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> WriteAheadLog:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+@dataclass
+class RecoveryReport:
+    """What DurableFramework.recover restored: checkpoint LSN, replayed log records and timings."""
+
+    checkpoint_lsn: int | None
+    replayed_records: int
+    load_seconds: float
+    replay_seconds: float
+    truncated_bytes: int
+
+
+@dataclass
+class DurableFramework:
+    """
+    HTFFramework whose ingested records are logged to a WriteAheadLog in
+    directory before being processed, with checkpoints of the framework
+    state every checkpoint_every records (None: only on checkpoint()).
+
+    The framework must be picklable for checkpoints (signal and feature
+    callables defined at module level, no memory-mapped buffer backends);
+    listeners are not saved. Use DurableFramework.recover to restart after
+    a crash.
+    """
+
+    framework: HTFFramework
+    directory: str
+    checkpoint_every: int | None = None
+    wal_options: dict[str, Any] = field(default_factory=dict)
+
+    wal: WriteAheadLog = field(init=False)
+    records_since_checkpoint: int = field(default=0, init=False)
+    checkpoint_lsn: int | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        if self.checkpoint_every is not None and self.checkpoint_every <= 0:
+            raise ValueError("checkpoint_every must be > 0")
+        self.directory = os.fspath(self.directory)
+        self.wal = WriteAheadLog(os.path.join(self.directory, "wal"), **self.wal_options)
+        self.checkpoint_lsn = _latest_checkpoint(self.directory)
+
+    def on_new_record(self, record: Mapping[str, Any]) -> dict[str, Any]:
+        self.wal.append(record)
+        output = self.framework.on_new_record(record)
+        self.records_since_checkpoint += 1
+        if self.checkpoint_every is not None and self.records_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        return output
+
+    def checkpoint(self) -> int:
+        """
+        Sync the log, atomically save the framework state as of the next LSN,
+        then remove older checkpoints and log segments they cover. Returns
+        the checkpoint LSN.
+        """
+        self.wal.sync()
+        lsn = self.wal.next_lsn
+        framework = self.framework
+        listeners = framework.listeners
+        framework.listeners = []
+        try:
+            payload = pickle.dumps(framework, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            framework.listeners = listeners
+        path = os.path.join(self.directory, f"{_CHECKPOINT_PREFIX}{lsn:020d}{_CHECKPOINT_SUFFIX}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(self.directory)
+        for old_lsn in _checkpoint_lsns(self.directory):
+            if old_lsn < lsn:
+                os.remove(os.path.join(self.directory, f"{_CHECKPOINT_PREFIX}{old_lsn:020d}{_CHECKPOINT_SUFFIX}"))
+        self.wal.truncate_before(lsn)
+        self.checkpoint_lsn = lsn
+        self.records_since_checkpoint = 0
+        return lsn
+
+    def close(self) -> None:
+        self.wal.close()
+
+    def __enter__(self) -> DurableFramework:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @classmethod
+    def recover(
+        cls,
+        directory: str | os.PathLike[str],
+        framework: HTFFramework,
+        *,
+        checkpoint_every: int | None = None,
+        wal_options: Mapping[str, Any] | None = None,
+    ) -> tuple[DurableFramework, RecoveryReport]:
+        """
+        Rebuild the framework saved in directory: load the newest checkpoint
+        (or start from framework, which must be fresh, when there is none)
+        and replay the log records written after it. Returns the durable
+        framework, ready for new records, and a RecoveryReport.
+        """
+        directory = os.fspath(directory)
+        t0 = time.perf_counter()
+        checkpoint_lsn = _latest_checkpoint(directory) if os.path.isdir(directory) else None
+        if checkpoint_lsn is not None:
+            path = os.path.join(directory, f"{_CHECKPOINT_PREFIX}{checkpoint_lsn:020d}{_CHECKPOINT_SUFFIX}")
+            with open(path, "rb") as fh:
+                framework = pickle.load(fh)
+        t1 = time.perf_counter()
+        durable = cls(framework, directory, checkpoint_every=checkpoint_every, wal_options=dict(wal_options or {}))
+        replayed = 0
+
+        def tail() -> Iterator[Any]:
+            nonlocal replayed
+            for _, record in durable.wal.read(checkpoint_lsn or 0):
+                replayed += 1
+                yield record
+
+        framework.replay(tail())
+        durable.records_since_checkpoint = replayed
+        report = RecoveryReport(
+            checkpoint_lsn=checkpoint_lsn,
+            replayed_records=replayed,
+            load_seconds=t1 - t0,
+            replay_seconds=time.perf_counter() - t1,
+            truncated_bytes=durable.wal.truncated_bytes,
+        )
+        return durable, report
+
+
+def _checkpoint_lsns(directory: str) -> list[int]:
+    lsns = []
+    for name in os.listdir(directory):
+        if name.startswith(_CHECKPOINT_PREFIX) and name.endswith(_CHECKPOINT_SUFFIX):
+            lsns.append(int(name[len(_CHECKPOINT_PREFIX) : -len(_CHECKPOINT_SUFFIX)]))
+    return sorted(lsns)
+
+
+def _latest_checkpoint(directory: str) -> int | None:
+    lsns = _checkpoint_lsns(directory) if os.path.isdir(directory) else []
+    return lsns[-1] if lsns else None
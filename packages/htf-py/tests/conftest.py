@@ -14,6 +14,26 @@ from htf.features import SingleFieldStatsFeature
 from htf.timeframe import FeatureModule, TimeframeConfig
 
 
+def signal_node(
+    node_id: str, node_type: str, params: dict[str, Any] | None = None, **children: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Signal graph node aliased by its id; children maps dependency params to child nodes."""
+    return {"id": node_id, "type": node_type, "alias": node_id, "params": params or {}, "children": children}
+
+
+def percentile_diff_nodes(diff_value_key: str = "value") -> tuple[dict[str, Any], dict[str, Any]]:
+    """The "pct" (rolling percentile of value) and "diff" (EMA diff percentile) nodes of graph tests."""
+    pct = signal_node(
+        "pct", "ValueVsRollingPercentile", {"value_key": "value", "window_size": "20", "percentile": "70"}
+    )
+    diff = signal_node(
+        "diff",
+        "SignalEMADiffVsHistoryPercentile",
+        {"value_key": diff_value_key, "ema_period_1": "3", "ema_period_2": "10", "history_window": "30"},
+    )
+    return pct, diff
+
+
 @pytest.fixture
 def basic_config() -> TimeframeConfig:
     """Basic TimeframeConfig for testing."""
@@ -0,0 +1,235 @@
+"""
+Tests for htf.aggregation module.
+"""
+
+from __future__ import annotations
+
+import calendar
+import math
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from htf.aggregation import (  # noqa: E402
+    aggregate_columns,
+    aggregate_frame,
+    aggregate_records,
+    aggregate_scales,
+    bucket_start_ms,
+    scales_nest,
+    to_epoch_ms,
+)
+
+_STEP_MS = {"second": 1000, "minute": 60_000, "hour": 3_600_000, "day": 86_400_000}
+
+
+def _console_bucket(ts_ms, scale_value, scale_unit):
+    """Port of getBucketTimestamp from apps/ui-static/app.js."""
+    if scale_unit in _STEP_MS:
+        step = scale_value * _STEP_MS[scale_unit]
+        return math.floor(ts_ms / step) * step
+    dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+    if scale_unit == "month":
+        start = math.floor((dt.year * 12 + dt.month - 1) / scale_value) * scale_value
+        return calendar.timegm((start // 12, start % 12 + 1, 1, 0, 0, 0)) * 1000
+    start_year = math.floor(dt.year / scale_value) * scale_value
+    return calendar.timegm((start_year, 1, 1, 0, 0, 0)) * 1000
+
+
+def _console_percentile(values, q):
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * (q / 100)
+    lower, upper = math.floor(pos), math.ceil(pos)
+    if lower == upper:
+        return ordered[lower]
+    weight = pos - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+def _console_aggregate(rows, scale_value, scale_unit, method, percentile, value_key):
+    """Port of aggregateData/aggregateValues (rows already filtered like buildBaseData)."""
+    buckets = {}
+    for ts, values in rows:
+        if not math.isfinite(values[value_key]):
+            continue
+        stored = buckets.setdefault(_console_bucket(ts, scale_value, scale_unit), {})
+        for col, val in values.items():
+            if math.isfinite(val):
+                stored.setdefault(col, []).append(val)
+
+    def agg(vals):
+        if method == "min":
+            return min(vals)
+        if method == "max":
+            return max(vals)
+        if method in ("median", "percentile"):
+            return _console_percentile(vals, 50 if method == "median" else percentile)
+        total = 0.0
+        for v in vals:
+            total += v
+        return total / len(vals)
+
+    out = []
+    for key in sorted(buckets):
+        cols = {col: agg(vals) for col, vals in buckets[key].items()}
+        if value_key in cols and math.isfinite(cols[value_key]):
+            out.append((key, cols))
+    return out
+
+
+def _random_rows(n, seed=7):
+    rng = random.Random(seed)
+    ts = 1_500_000_000_000
+    rows = []
+    for _ in range(n):
+        ts += rng.randint(0, 40_000_000)
+        rows.append(
+            (
+                ts,
+                {
+                    "a": rng.choice([rng.uniform(-1e6, 1e6), rng.random() * 0.1, math.nan]),
+                    "b": rng.choice([rng.gauss(0, 1), math.nan, 3.3]),
+                },
+            )
+        )
+    rng.shuffle(rows)
+    return rows
+
+
+class TestBucketing:
+    """Tests for bucket_start_ms and timestamp conversion."""
+
+    @pytest.mark.parametrize(
+        "scale",
+        [(1, "second"), (7, "minute"), (5, "hour"), (2, "day"), (1, "month"), (5, "month"), (1, "year"), (3, "year")],
+    )
+    def test_matches_console_buckets(self, scale):
+        """Test vectorized bucket starts equal the console's getBucketTimestamp."""
+        ts = [ts for ts, _ in _random_rows(500)]
+        got = bucket_start_ms(ts, *scale).tolist()
+        assert got == [_console_bucket(t, *scale) for t in ts]
+
+    def test_naive_datetimes_are_utc(self):
+        """Test naive datetimes and strings convert as UTC epoch milliseconds."""
+        out = to_epoch_ms([datetime(2024, 1, 1, 0, 0, 1), "2024-01-01T00:00:02Z", "bad"])
+        assert out[0] == 1704067201000
+        assert out[1] == 1704067202000
+        assert out[2] < 0
+
+    def test_sub_millisecond_floor(self):
+        """Test sub-millisecond parts floor toward the past, before 1970 and with offsets."""
+        out = to_epoch_ms(["1969-12-31T23:59:59.9995Z", "2024-01-01T02:00:00.0019+02:00", None])
+        assert out.tolist()[:2] == [-1, 1704067200001]
+        assert out[2] == -(2**63)
+
+    def test_invalid_scale(self):
+        """Test unknown units and non-positive multipliers are rejected."""
+        with pytest.raises(ValueError):
+            bucket_start_ms([0], 1, "week")
+        with pytest.raises(ValueError):
+            bucket_start_ms([0], 0, "hour")
+
+
+class TestAggregateFrame:
+    """Tests for aggregate_frame and aggregate_records."""
+
+    @pytest.mark.parametrize(
+        "method,percentile", [("mean", 50), ("min", 50), ("max", 50), ("median", 50), ("percentile", 37.3)]
+    )
+    @pytest.mark.parametrize("scale", [(3, "hour"), (1, "day"), (5, "month")])
+    def test_identical_to_console(self, method, percentile, scale):
+        """Test every bucket is bit-for-bit equal to the console aggregation."""
+        rows = _random_rows(3000)
+        frame = aggregate_frame(
+            [{"ts": ts, **values} for ts, values in rows],
+            scale_value=scale[0],
+            scale_unit=scale[1],
+            method=method,
+            percentile=percentile,
+            value_key="a",
+        )
+        expected = _console_aggregate(rows, scale[0], scale[1], method, percentile, "a")
+        got_ts = [int(ts.timestamp() * 1000) for ts in frame["ts"]]
+        assert got_ts == [key for key, _ in expected]
+        assert frame["value"].tolist() == [cols["a"] for _, cols in expected]
+        got_b = frame["b"].tolist()
+        for (_, cols), value in zip(expected, got_b):
+            if "b" in cols:
+                assert value == cols["b"]
+            else:
+                assert math.isnan(value)
+
+    @pytest.mark.parametrize("scale", [(1, "month"), (1, "year")])
+    def test_large_buckets_identical_to_console(self, scale):
+        """Test means over buckets of thousands of rows keep the console's rounding."""
+        rng = random.Random(11)
+        rows = []
+        ts = 1_700_000_000_000
+        for _ in range(6000):
+            ts += rng.randint(0, 20_000_000)
+            rows.append((ts, {"a": rng.uniform(-1e6, 1e6) * rng.choice([1e-6, 1.0, 1e6])}))
+        frame = aggregate_frame(
+            [{"ts": ts, **values} for ts, values in rows],
+            scale_value=scale[0],
+            scale_unit=scale[1],
+            method="mean",
+            value_key="a",
+        )
+        expected = _console_aggregate(rows, scale[0], scale[1], "mean", 50, "a")
+        assert frame["value"].tolist() == [cols["a"] for _, cols in expected]
+
+    def test_records_shape(self):
+        """Test console-shaped records only list columns with data."""
+        data = [
+            {"ts": datetime(2024, 1, 1, 0, 10), "TEMP": 1.0, "HUM": None},
+            {"ts": datetime(2024, 1, 1, 0, 50), "TEMP": 3.0, "HUM": None},
+            {"ts": datetime(2024, 1, 1, 1, 5), "TEMP": 5.0, "HUM": 40.0},
+            {"ts": datetime(2024, 1, 1, 2, 0), "TEMP": None, "HUM": 50.0},
+        ]
+        out = aggregate_records(data, scale_value=1, scale_unit="hour", value_key="TEMP")
+        assert [r["value"] for r in out] == [2.0, 5.0]
+        assert out[0]["values"] == {"TEMP": 2.0}
+        assert out[1]["values"] == {"TEMP": 5.0, "HUM": 40.0}
+        assert out[0]["ts"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_nested_values_records(self):
+        """Test records with a nested values mapping are flattened."""
+        data = [{"ts": 0, "values": {"v": 1.0}}, {"ts": 500, "values": {"v": 2.0}}]
+        frame = aggregate_frame(data, scale_value=1, scale_unit="second", value_key="v", method="max")
+        assert frame["value"].tolist() == [2.0]
+
+    def test_invalid_method_and_percentile(self):
+        """Test unknown methods and out-of-range percentiles are rejected."""
+        with pytest.raises(ValueError):
+            aggregate_columns([0], {"v": [1.0]}, scale_value=1, scale_unit="hour", method="sum", value_key="v")
+        with pytest.raises(ValueError):
+            aggregate_columns(
+                [0], {"v": [1.0]}, scale_value=1, scale_unit="hour", method="percentile", percentile=120, value_key="v"
+            )
+
+
+class TestAggregateScales:
+    """Tests for aggregate_scales cascading."""
+
+    def test_nesting_rules(self):
+        """Test which scales nest inside coarser ones."""
+        assert scales_nest((15, "minute"), (1, "hour"))
+        assert not scales_nest((7, "minute"), (1, "hour"))
+        assert scales_nest((6, "hour"), (1, "month"))
+        assert not scales_nest((7, "hour"), (1, "month"))
+        assert scales_nest((3, "month"), (1, "year"))
+        assert not scales_nest((5, "month"), (1, "year"))
+        assert not scales_nest((1, "month"), (30, "day"))
+
+    @pytest.mark.parametrize("method", ["min", "max", "mean", "median"])
+    def test_cascade_matches_direct(self, method):
+        """Test cascaded scales are identical to aggregating raw rows."""
+        rows = [{"ts": ts, **values} for ts, values in _random_rows(3000, seed=3)]
+        scales = [(1, "year"), (1, "hour"), (6, "hour"), (1, "day"), (1, "month"), (3, "month"), (7, "minute")]
+        cascaded = aggregate_scales(rows, scales, method=method, value_key="a")
+        for scale in scales:
+            direct = aggregate_frame(rows, scale_value=scale[0], scale_unit=scale[1], method=method, value_key="a")
+            pd.testing.assert_frame_equal(cascaded[scale], direct)
@@ -0,0 +1,183 @@
+"""
+Tests for htf.batch module and the python -m htf command line.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from htf.__main__ import main  # noqa: E402
+from htf.aggregation import aggregate_records  # noqa: E402
+from htf.batch import expand_inputs, load_templates, run_batch, template_graph  # noqa: E402
+from htf.timeframe import _compute_graph_outputs  # noqa: E402
+
+_TEMPLATES = {
+    "version": 1,
+    "templates": [
+        {
+            "name": "diff & slow",
+            "root": {
+                "type": "SignalIntersection",
+                "alias": "both",
+                "params": {},
+                "children": {
+                    "signal_keys": [
+                        {
+                            "type": "SignalEMADiffVsHistoryPercentile",
+                            "alias": "diff",
+                            "params": {"ema_period_1": "5", "ema_period_2": "10", "history_window": 50},
+                            "children": {},
+                        },
+                        {
+                            "type": "SignalEMAFastSlowComparison",
+                            "alias": "slow",
+                            "params": {"ema_period_1": "5", "ema_period_2": "10", "prefer": "slow"},
+                            "children": {},
+                        },
+                    ]
+                },
+            },
+        },
+        {
+            "name": "pct",
+            "root": {
+                "type": "ValueVsRollingPercentile",
+                "alias": "pct",
+                "params": {"window_size": "20", "percentile": "80"},
+                "children": {},
+            },
+        },
+    ],
+}
+
+
+def _write_inputs(tmp_path, n_files=3, rows=2000):
+    rng = random.Random(0)
+    paths = []
+    for k in range(n_files):
+        level = 100.0
+        lines = ["timestamp,price,other"]
+        for i in range(rows):
+            level += rng.gauss(0, 1)
+            price = "" if i % 50 == 7 else f"{level:.4f}"
+            lines.append(f"2024-01-{k + 1:02d}T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d},{price},x")
+        path = tmp_path / "in" / f"series{k}.csv"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("\n".join(lines) + "\n")
+        paths.append(path)
+    template_path = tmp_path / "templates.json"
+    template_path.write_text(json.dumps(_TEMPLATES))
+    return paths, template_path
+
+
+class TestTemplates:
+    """Tests for template loading."""
+
+    def test_template_graph_assigns_ids_and_columns(self, tmp_path):
+        """Test ids are assigned depth-first and value_key is filled in."""
+        _, template_path = _write_inputs(tmp_path, n_files=0)
+        templates = load_templates([template_path])
+        assert [t["name"] for t in templates] == ["diff & slow", "pct"]
+        root = template_graph(templates[0], "price")[0]
+        children = root["children"]["signal_keys"]
+        assert [root["id"], children[0]["id"], children[1]["id"]] == ["n0", "n1", "n2"]
+        assert children[0]["params"]["value_key"] == "price"
+        with pytest.raises(ValueError):
+            load_templates([template_path, template_path])
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    def test_outputs_match_direct_evaluation(self, tmp_path):
+        """Test written outputs equal aggregating and evaluating each file directly."""
+        paths, template_path = _write_inputs(tmp_path, n_files=1)
+        templates = load_templates([template_path])
+        report = run_batch(
+            templates,
+            [str(tmp_path / "in" / "*.csv")],
+            tmp_path / "out",
+            scale_value=1,
+            scale_unit="minute",
+            value_key="price",
+            timestamp_key="timestamp",
+            processes=1,
+            chunk_rows=300,
+        )
+        assert not report.failed
+        result = report.files[0]
+        assert result.rows == 2000 and result.buckets == 34
+        assert [p.rsplit("/", 1)[-1] for p in result.outputs] == ["series0.diff_slow.csv", "series0.pct.csv"]
+
+        frame = pd.read_csv(result.outputs[0])
+        assert list(frame.columns) == ["ts", "value", "diff", "slow", "both"]
+        records = aggregate_records(
+            pd.read_csv(paths[0]), scale_value=1, scale_unit="minute", value_key="price", timestamp_key="timestamp"
+        )
+        for rec in records:
+            rec["values"] = {"price": rec["value"]}
+        graph = template_graph(templates[0], "price")
+        outputs, _, _, _ = _compute_graph_outputs(records, graph, {})
+        assert frame["both"].tolist() == outputs["n0"]
+        assert frame["diff"].tolist() == outputs["n1"]
+        assert frame["value"].tolist() == pytest.approx([rec["value"] for rec in records])
+
+    def test_processes_and_errors(self, tmp_path):
+        """Test a process pool gives the same outputs and a bad file does not stop the batch."""
+        _, template_path = _write_inputs(tmp_path)
+        (tmp_path / "in" / "broken.csv").write_text("when,price\n1,2\n")
+        templates = load_templates([template_path])
+        kwargs = {"scale_value": 5, "scale_unit": "minute", "value_key": "price", "timestamp_key": "timestamp"}
+        pattern = [str(tmp_path / "in" / "*.csv")]
+        serial = run_batch(templates, pattern, tmp_path / "a", processes=1, **kwargs)
+        pooled = run_batch(templates, pattern, tmp_path / "b", processes=2, **kwargs)
+        assert pooled.processes == 2
+        assert [r.path for r in serial.failed] == [str(tmp_path / "in" / "broken.csv")]
+        assert "timestamp" in serial.failed[0].error
+        for a, b in zip(serial.files, pooled.files):
+            for pa, pb in zip(a.outputs, b.outputs):
+                assert Path(pa).read_text() == Path(pb).read_text()
+        assert serial.signal_totals()["pct"]["files"] == 3
+        with pytest.raises(ValueError):
+            expand_inputs([str(tmp_path / "nothing*.csv")])
+
+    def test_same_names_in_different_directories(self, tmp_path):
+        """Test inputs sharing a basename keep their relative directories and true collisions are rejected."""
+        paths, template_path = _write_inputs(tmp_path, n_files=1, rows=300)
+        for sub in ("a", "b/c"):
+            (tmp_path / "in" / sub).mkdir(parents=True)
+            (tmp_path / "in" / sub / "x.csv").write_text(paths[0].read_text())
+        templates = load_templates([template_path])
+        kwargs = {"scale_value": 1, "scale_unit": "minute", "value_key": "price", "timestamp_key": "timestamp"}
+        report = run_batch(templates, [str(tmp_path / "in" / "**" / "x.csv")], tmp_path / "out", processes=1, **kwargs)
+        assert not report.failed
+        outputs = sorted(str(Path(p).relative_to(tmp_path / "out")) for r in report.files for p in r.outputs)
+        assert outputs == ["a/x.diff_slow.csv", "a/x.pct.csv", "b/c/x.diff_slow.csv", "b/c/x.pct.csv"]
+
+        (tmp_path / "in" / "a" / "x.xlsx").write_bytes(b"")
+        with pytest.raises(ValueError, match="same outputs"):
+            run_batch(templates, [str(tmp_path / "in" / "a" / "x.*")], tmp_path / "out2", processes=1, **kwargs)
+        with pytest.raises(ValueError, match="same outputs"):
+            run_batch([*templates, {**templates[1], "name": "pct!"}], [str(paths[0])], tmp_path / "out2", **kwargs)
+        assert not (tmp_path / "out2").exists()
+
+
+class TestCommandLine:
+    """Tests for python -m htf run."""
+
+    def test_run_prints_summary(self, tmp_path, capsys):
+        """Test the run command writes outputs and prints per-file and per-signal lines."""
+        _, template_path = _write_inputs(tmp_path, n_files=2, rows=300)
+        argv = ["run", "-t", str(template_path), "-i", str(tmp_path / "in" / "*.csv"), "-o", str(tmp_path / "out")]
+        argv += ["--scale", "1", "minute", "--value-column", "price", "--timestamp-column", "timestamp"]
+        assert main([*argv, "--processes", "1"]) == 0
+        out = capsys.readouterr().out
+        assert "series1.csv" in out and "diff & slow" in out and "2/2 files" in out
+        assert len(list((tmp_path / "out").iterdir())) == 4
+        assert main([*argv, "--scale", "1", "fortnight"]) == 2
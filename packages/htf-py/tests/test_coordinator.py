@@ -4,9 +4,12 @@ Tests for htf.coordinator module.
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from htf.coordinator import (
+    GateMaskStream,
     HierarConstraintCoordinator,
     MultiScaleCoordinator,
     SimpleHTFCoordinator,
@@ -313,3 +316,61 @@ class TestHierarConstraintCoordinatorBuildMasks:
         assert result["fine"][2] is False
         # Timestamp 20 is in window [20,20] which is True
         assert result["fine"][4] is True
+
+
+class TestGateMaskStream:
+    """Tests for the incremental GateMaskStream."""
+
+    def test_matches_batch_masks(self):
+        """Test streamed entries, appended in random chunks, equal the batch masks."""
+        rng = random.Random(7)
+        ids = ["d", "h", "m"]
+        series = []
+        for series_id in ids:
+            ts = sorted(rng.sample(range(2000), 150))
+            flags = [rng.random() < 0.6 for _ in ts] if series_id != "m" else None
+            series.append({"id": series_id, "timestamps": ts, "downward_flags": flags})
+        coord = HierarConstraintCoordinator(ids)
+        expected = coord.build_gate_masks_from_series(series)
+
+        stream = coord.gate_mask_stream()
+        got: dict[str, list[bool]] = {series_id: [] for series_id in ids}
+        sent = dict.fromkeys(ids, 0)
+        while any(sent[s["id"]] < len(s["timestamps"]) for s in series):
+            entry = rng.choice([s for s in series if sent[s["id"]] < len(s["timestamps"])])
+            lo = sent[entry["id"]]
+            hi = lo + rng.randint(1, 12)
+            flags = entry["downward_flags"]
+            new = stream.append(entry["id"], entry["timestamps"][lo:hi], None if flags is None else flags[lo:hi])
+            sent[entry["id"]] = min(hi, len(entry["timestamps"]))
+            for series_id, entries in new.items():
+                got[series_id].extend(entries)
+        for series_id, entries in stream.flush().items():
+            got[series_id].extend(entries)
+
+        assert got == expected
+
+    def test_entries_wait_for_coarser_series(self):
+        """Test child entries stay pending until the coarser series reaches them."""
+        stream = GateMaskStream(["coarse", "fine"])
+        assert stream.append("fine", [0, 5, 10, 15]) == {}
+        assert stream.pending("fine") == 4
+        new = stream.append("coarse", [0, 10], [True, True])
+        assert new == {"coarse": [True, True], "fine": [True, True, True]}
+        assert stream.append("coarse", [20], [False]) == {"coarse": [True], "fine": [False]}
+        assert stream.pending("fine") == 0
+
+    def test_validation(self):
+        """Test unknown series, unordered timestamps and mixed flags are rejected."""
+        stream = GateMaskStream(["coarse", "fine"])
+        with pytest.raises(ValueError):
+            stream.append("other", [1])
+        stream.append("coarse", [1, 2], [True, False])
+        with pytest.raises(ValueError):
+            stream.append("coarse", [2], [True])
+        with pytest.raises(ValueError):
+            stream.append("coarse", [3])
+        with pytest.raises(ValueError):
+            stream.append("coarse", [3], [True, False])
+        with pytest.raises(ValueError):
+            GateMaskStream(["a", "a"])
@@ -0,0 +1,121 @@
+"""
+Tests for htf.export_cursor module.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from htf.timeframe import TimeframeConfig, TimeframeView  # noqa: E402
+from tests.conftest import percentile_diff_nodes, signal_node  # noqa: E402
+
+
+def _graph():
+    pct, diff = percentile_diff_nodes()
+    reached = signal_node("reached", "SignalRunLengthReached", {"min_run_length": "2"}, signal_key=[pct])
+    return [signal_node("root", "SignalIntersection", signal_keys=[reached, diff])]
+
+
+def _records(n, seed=0, start=0):
+    rng = random.Random(seed)
+    level = 0.0
+    out = []
+    for i in range(start, start + n):
+        level += rng.gauss(0, 1)
+        out.append({"timestamp": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}", "value": level})
+    return out
+
+
+def _view(max_buffer=1024):
+    return TimeframeView(config=TimeframeConfig(name="tf", window_size=5, max_buffer=max_buffer))
+
+
+_KWARGS = {"include_dependencies": True, "include_values": True, "signal_graph": _graph()}
+
+
+class TestExportCursor:
+    """Tests for TimeframeView.export_cursor."""
+
+    def test_batches_match_full_export(self):
+        """Test concatenated incremental exports equal one full export."""
+        view = _view()
+        cursor = view.export_cursor("SignalIntersection", "root", **_KWARGS)
+        records = _records(500)
+        frames = []
+        for lo, hi in ((0, 120), (120, 121), (121, 121), (121, 380), (380, 500)):
+            for rec in records[lo:hi]:
+                view.on_new_record(rec)
+            assert cursor.pending == hi - lo
+            frames.append(cursor.export())
+            assert cursor.pending == 0
+        incremental = pd.concat([frame for frame in frames if len(frame.columns)])
+        full = view.export_signal_dataframe("SignalIntersection", "root", **_KWARGS)
+        assert list(incremental.columns) == list(full.columns)
+        pd.testing.assert_frame_equal(incremental, full, check_dtype=False)
+        assert frames[2].empty and frames[2].attrs["export_cursor"]["rows"] == 0
+        assert frames[-1].index[0] == 380
+
+    def test_without_graph_and_skip_existing(self):
+        """Test record-field exports and starting after the buffered records."""
+        view = _view()
+        for i, rec in enumerate(_records(10)):
+            view.on_new_record({**rec, "flag": i % 3 == 0})
+        cursor = view.export_cursor("flag", "flag", skip_existing=True)
+        assert cursor.export().empty
+        view.on_new_record({"timestamp": "2024-01-01T01:00:00", "flag": True})
+        frame = cursor.export()
+        assert frame["flag"].tolist() == [1]
+        assert frame.index.tolist() == [10]
+        assert frame["Hour"].tolist() == [1]
+
+    def test_skip_existing_warms_signal_state(self):
+        """Test skip_existing keeps the signal state of the buffered records."""
+        records = _records(300, seed=1)
+        view = _view()
+        for rec in records[:200]:
+            view.on_new_record(rec)
+        cursor = view.export_cursor("SignalIntersection", "root", skip_existing=True, **_KWARGS)
+        for rec in records[200:]:
+            view.on_new_record(rec)
+        tail = cursor.export()
+        full = view.export_signal_dataframe("SignalIntersection", "root", **_KWARGS)
+        pd.testing.assert_frame_equal(tail, full.iloc[200:], check_dtype=False)
+
+    def test_trimmed_rows_are_counted(self):
+        """Test rows trimmed by max_buffer before export are reported as missed."""
+        view = _view(max_buffer=50)
+        cursor = view.export_cursor("SignalIntersection", "root", signal_graph=_graph())
+        for rec in _records(40):
+            view.on_new_record(rec)
+        assert len(cursor.export()) == 40
+        for rec in _records(80, start=40):
+            view.on_new_record(rec)
+        frame = cursor.export()
+        assert frame.attrs["export_cursor"] == {"start": 70, "rows": 50, "missed_rows": 30}
+        view.reset()
+        view.on_new_record(_records(1)[0])
+        assert cursor.export().index.tolist() == [0]
+
+    def test_reset_then_refill_past_position(self):
+        """Test a view reset is noticed after the view is refilled past the cursor position."""
+        view = _view()
+        cursor = view.export_cursor("SignalIntersection", "root", **_KWARGS)
+        for rec in _records(100):
+            view.on_new_record(rec)
+        assert len(cursor.export()) == 100
+        view.reset()
+        for rec in _records(150, seed=2):
+            view.on_new_record(rec)
+        frame = cursor.export()
+        assert frame.attrs["export_cursor"] == {"start": 0, "rows": 150, "missed_rows": 0}
+        full = view.export_signal_dataframe("SignalIntersection", "root", **_KWARGS)
+        pd.testing.assert_frame_equal(frame, full, check_dtype=False)
+
+    def test_requires_graph_for_dependencies(self):
+        """Test include_dependencies without a signal graph is rejected."""
+        with pytest.raises(ValueError):
+            _view().export_cursor("SignalIntersection", "root", include_dependencies=True)
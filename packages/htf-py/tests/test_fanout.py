@@ -0,0 +1,123 @@
+"""
+Tests for htf.fanout module.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from htf.fanout import fanout_signal_graph  # noqa: E402
+from htf.timeframe import TimeframeConfig, TimeframeView, _compute_graph_outputs  # noqa: E402
+from tests.conftest import signal_node  # noqa: E402
+
+_COLUMNS = ["c0", "c1", "c2", "c3", "c4"]
+
+
+def _records(n, seed=0):
+    rng = random.Random(seed)
+    levels = [0.0] * len(_COLUMNS)
+    out = []
+    for t in range(n):
+        values = {}
+        for i, col in enumerate(_COLUMNS):
+            levels[i] += rng.gauss(0, 1)
+            r = rng.random()
+            values[col] = None if r < 0.05 else (round(levels[i]) if r < 0.3 else levels[i])
+        values["flag"] = int(rng.random() < 0.5)
+        out.append({"timestamp": t, "values": values})
+    return out
+
+
+def _graph():
+    pct = signal_node(
+        "pct",
+        "ValueVsRollingPercentile",
+        {"value_key": "value", "window_size": "15", "percentile": "80", "include_current": "true", "min_history": "3"},
+    )
+    low = signal_node("low", "ValueVsRollingPercentile", {"value_key": "value", "window_size": "7", "comparison": "lt"})
+    fast_slow = signal_node(
+        "fs", "SignalEMAFastSlowComparison", {"value_key": "value", "ema_period_1": "10", "ema_period_2": "3"}
+    )
+    diff = signal_node(
+        "diff",
+        "SignalEMADiffVsHistoryPercentile",
+        {"value_key": "value", "ema_period_1": "3", "ema_period_2": "10", "history_window": "20", "min_history": "4"},
+    )
+    prev = signal_node("prev", "SignalValueVsPrevious", {"value_key": "value"})
+    flag = signal_node("flag_on", "SignalExternalFlag", {"signal_key": "flag"})
+    reached = signal_node(
+        "reached", "SignalRunLengthReached", {"min_run_length": "2", "post_run_extension": "2"}, signal_key=[pct]
+    )
+    interrupted = signal_node(
+        "interrupted",
+        "SignalRunInterrupted",
+        {"min_run_length": "2", "post_run_extension": "1"},
+        signal_key=[fast_slow],
+    )
+    runs = signal_node(
+        "runs",
+        "SignalRunLengthVsHistoryPercentile",
+        {"history_window": "10", "min_history_runs": "2"},
+        signal_key=[low],
+    )
+    both = signal_node("both", "SignalIntersection", signal_keys=[prev, diff, flag])
+    return [reached, interrupted, runs, both]
+
+
+class TestFanoutSignalGraph:
+    """Tests for fanout_signal_graph."""
+
+    def test_matches_per_column_runs(self):
+        """Test every node output equals running the graph on each column separately."""
+        records = _records(400)
+        graph = _graph()
+        frame = fanout_signal_graph(records, graph, _COLUMNS, include_dependencies=True)
+        report = frame.attrs["fanout_report"]
+        assert report["per_column_nodes"] == ["runs"]
+        assert len(report["vectorized_nodes"]) == 9
+        for col in _COLUMNS:
+            single = [{"values": {**rec["values"], "value": rec["values"][col]}} for rec in records]
+            outputs = _compute_graph_outputs(single, graph, {})[0]
+            for node_id, expected in outputs.items():
+                assert frame[f"{col}:{node_id}"].tolist() == expected, (col, node_id)
+
+    def test_roots_only_and_timestamp(self):
+        """Test the default layout keeps the timestamp and root outputs only."""
+        records = _records(50, seed=1)
+        frame = fanout_signal_graph(records, _graph(), _COLUMNS[:2])
+        assert list(frame.columns) == [
+            "timestamp",
+            "c0:reached",
+            "c0:interrupted",
+            "c0:runs",
+            "c0:both",
+            "c1:reached",
+            "c1:interrupted",
+            "c1:runs",
+            "c1:both",
+        ]
+        assert frame["timestamp"].tolist() == list(range(50))
+
+    def test_view_export(self):
+        """Test TimeframeView.export_fanout_dataframe runs on the buffer."""
+        view = TimeframeView(config=TimeframeConfig(name="tf", window_size=1, max_buffer=100))
+        for rec in _records(60, seed=2):
+            view.on_new_record(rec)
+        graph = [signal_node("prev", "SignalValueVsPrevious", {"value_key": "value", "comparison": "lt"})]
+        frame = view.export_fanout_dataframe(graph, ["c0", "c3"], timestamp_key=None)
+        expected = fanout_signal_graph(list(view.buffer), graph, ["c0", "c3"], timestamp_key=None)
+        assert frame.equals(expected)
+        assert list(frame.columns) == ["c0:prev", "c3:prev"]
+
+    def test_invalid_arguments(self):
+        """Test empty or duplicate columns and empty graphs are rejected."""
+        with pytest.raises(ValueError):
+            fanout_signal_graph([], _graph(), [])
+        with pytest.raises(ValueError):
+            fanout_signal_graph([], _graph(), ["a", "a"])
+        with pytest.raises(ValueError):
+            fanout_signal_graph([], [], ["a"])
@@ -4,9 +4,14 @@ Tests for htf.framework module.
 
 from __future__ import annotations
 
-from htf.coordinator import SimpleHTFCoordinator, TimeframeState
+import random
+
+import pytest
+
+from htf.coordinator import HierarConstraintCoordinator, SimpleHTFCoordinator, TimeframeState
 from htf.features import SingleFieldStatsFeature
 from htf.framework import HTFFramework
+from htf.signals import SignalEMADiffVsHistoryPercentile, SignalValueVsPrevious, ValueVsRollingPercentile
 from htf.timeframe import TimeframeConfig, TimeframeView
 
 
@@ -236,3 +241,150 @@ class TestHTFFrameworkIntegration:
                 # When HTF allows, gated should equal raw
                 for name in coord_result["ltf_raw"]:
                     assert coord_result["ltf_gated"][name] == coord_result["ltf_raw"][name]
+
+    def test_subscribe_receives_outputs(self):
+        """Test listeners receive each record and output until unsubscribed."""
+        view = TimeframeView(config=TimeframeConfig(name="tf", window_size=2))
+        framework = HTFFramework(timeframes={"tf": view}, coordinator=SimpleHTFCoordinator())
+        seen = []
+        listener = framework.subscribe(lambda record, output: seen.append((record, output)))
+
+        out = framework.on_new_record({"val": 1})
+        framework.unsubscribe(listener)
+        framework.on_new_record({"val": 2})
+
+        assert len(seen) == 1
+        assert seen[0][0] == {"val": 1}
+        assert seen[0][1] is out
+
+    def test_replay_skips_listeners(self):
+        """Test replay ingests records like on_new_record without notifying listeners."""
+        records = [{"val": v} for v in (3, 1, 4, 1, 5)]
+        replayed = HTFFramework(
+            timeframes={"tf": TimeframeView(config=TimeframeConfig(name="tf", window_size=2))},
+            coordinator=SimpleHTFCoordinator(),
+        )
+        seen = []
+        replayed.subscribe(lambda record, output: seen.append(record))
+        out = replayed.replay(records)
+
+        direct = HTFFramework(
+            timeframes={"tf": TimeframeView(config=TimeframeConfig(name="tf", window_size=2))},
+            coordinator=SimpleHTFCoordinator(),
+        )
+        for rec in records:
+            expected = direct.on_new_record(rec)
+
+        assert seen == []
+        assert out is replayed.last_output
+        assert out["coordination"] == expected["coordination"]
+        assert replayed.timeframes["tf"].buffer == direct.timeframes["tf"].buffer
+
+
+def _gated_framework(gated, ltf_catch_up="replay", max_buffer=1000):
+    htf = TimeframeView(
+        config=TimeframeConfig(name="htf", window_size=5, role="HTF"),
+        feature_module=SingleFieldStatsFeature("x", "x"),
+        signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=50, percentile=75),
+    )
+    mtf = TimeframeView(
+        config=TimeframeConfig(name="mtf", window_size=5, max_buffer=max_buffer),
+        feature_module=SingleFieldStatsFeature("x", "x"),
+        signal_fn=SignalValueVsPrevious(value_key="x_max"),
+    )
+    ltf_signal = SignalEMADiffVsHistoryPercentile(value_key="x_mean", ema_period_1=3, ema_period_2=8, history_window=30)
+    ltf_signal.catch_up = ltf_catch_up
+    ltf = TimeframeView(
+        config=TimeframeConfig(name="ltf", window_size=3, max_buffer=max_buffer),
+        feature_module=SingleFieldStatsFeature("x", "x"),
+        signal_fn=ltf_signal,
+    )
+    return HTFFramework(
+        timeframes={"htf": htf, "mtf": mtf, "ltf": ltf},
+        coordinator=HierarConstraintCoordinator(["htf", "mtf", "ltf"]),
+        gated_compute=gated,
+    )
+
+
+def _walk(n, seed=0):
+    rng = random.Random(seed)
+    level = 0.0
+    out = []
+    for _ in range(n):
+        level += rng.gauss(0, 1)
+        out.append({"x": level})
+    return out
+
+
+class TestGatedCompute:
+    """Tests for HTFFramework gated_compute."""
+
+    def test_replay_matches_ungated(self):
+        """Test gated outputs equal the ungated run while gated views skip work."""
+        records = _walk(3000)
+        plain = _gated_framework(False)
+        gated = _gated_framework(True)
+        for rec in records:
+            expected = plain.on_new_record(rec)["coordination"]["gated_map"]
+            assert gated.on_new_record(rec)["coordination"]["gated_map"] == expected
+        mtf = gated.timeframes["mtf"]
+        assert mtf.gated_records > 0
+        # exact horizon: each catch-up replays at most state_horizon() records
+        assert mtf.skipped_records > 0
+        assert mtf.replayed_records + mtf.skipped_records + mtf.suspended_records == mtf.gated_records
+        # approximate horizon (EMA): every suspended record is replayed
+        ltf = gated.timeframes["ltf"]
+        assert ltf.skipped_records == 0
+
+    def test_replay_matches_ungated_with_missing_values(self):
+        """Test gated percentile views match the ungated run when values are missing."""
+
+        def framework(gated):
+            views = {
+                name: TimeframeView(
+                    config=TimeframeConfig(name=name, window_size=3, role=role),
+                    feature_module=SingleFieldStatsFeature("x", "x"),
+                    signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=5, percentile=50),
+                )
+                for name, role in (("htf", "HTF"), ("ltf", "LTF"))
+            }
+            coordinator = HierarConstraintCoordinator(["htf", "ltf"])
+            return HTFFramework(timeframes=views, coordinator=coordinator, gated_compute=gated)
+
+        rng = random.Random(5)
+        records = [{"x": rec["x"] if rng.random() < 0.5 else None} for rec in _walk(1500, seed=5)]
+        plain = framework(False)
+        gated = framework(True)
+        for rec in records:
+            expected = plain.on_new_record(rec)["coordination"]["gated_map"]
+            assert gated.on_new_record(rec)["coordination"]["gated_map"] == expected
+        ltf = gated.timeframes["ltf"]
+        assert ltf.gated_records > 0
+        assert ltf.skipped_records == 0
+
+    def test_skip_policy(self):
+        """Test catch_up="skip" leaves suspended records unevaluated."""
+        framework = _gated_framework(True, ltf_catch_up="skip")
+        for rec in _walk(2000):
+            framework.on_new_record(rec)
+        ltf = framework.timeframes["ltf"]
+        assert ltf.replayed_records == 0
+        assert ltf.skipped_records + ltf.suspended_records == ltf.gated_records > 0
+        assert ltf.buffer_size == 1000
+        framework.reset()
+        assert ltf.gated_records == 0 and ltf.suspended_records == 0
+
+    def test_trimmed_records_are_skipped(self):
+        """Test suspended records trimmed from the buffer count as skipped."""
+        framework = _gated_framework(True, max_buffer=10)
+        for rec in _walk(3000):
+            framework.on_new_record(rec)
+        ltf = framework.timeframes["ltf"]
+        assert ltf.skipped_records > 0
+        assert ltf.replayed_records + ltf.skipped_records + ltf.suspended_records == ltf.gated_records
+
+    def test_requires_hierarchical_coordinator(self):
+        """Test gated_compute is rejected without HierarConstraintCoordinator."""
+        view = TimeframeView(config=TimeframeConfig(name="test", window_size=5))
+        with pytest.raises(ValueError):
+            HTFFramework(timeframes={"test": view}, coordinator=SimpleHTFCoordinator(), gated_compute=True)
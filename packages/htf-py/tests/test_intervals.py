@@ -0,0 +1,87 @@
+"""
+Tests for htf.intervals module.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+
+from htf.intervals import all_windows_mask, asof_indices, asof_values, truthy_windows, windows_to_mask
+
+
+def _naive_mask(windows, timestamps):
+    return [any(start <= ts <= end for start, end in windows) for ts in timestamps]
+
+
+class TestTruthyWindows:
+    """Tests for truthy_windows."""
+
+    def test_collapse_runs(self):
+        """Test consecutive truthy flags collapse into inclusive windows."""
+        assert truthy_windows([0, 1, 1, 0, 1], [10, 20, 30, 40, 50]) == [(20, 30), (50, 50)]
+
+    def test_empty(self):
+        """Test empty input yields no windows."""
+        assert truthy_windows([], []) == []
+
+
+class TestWindowsToMask:
+    """Tests for windows_to_mask and all_windows_mask."""
+
+    def test_inclusive_bounds(self):
+        """Test window bounds are inclusive."""
+        assert windows_to_mask([(2, 4), (7, 7)], [1, 2, 3, 4, 5, 7, 8]) == [
+            False,
+            True,
+            True,
+            True,
+            False,
+            True,
+            False,
+        ]
+
+    def test_no_windows(self):
+        """Test no windows masks everything out."""
+        assert windows_to_mask([], [1, 2]) == [False, False]
+        assert windows_to_mask([(1, 2)], []) == []
+
+    def test_matches_naive_on_random_input(self):
+        """Test merge walk agrees with the quadratic scan, including unsorted queries."""
+        rng = random.Random(7)
+        for _ in range(50):
+            flags = [rng.random() < 0.4 for _ in range(60)]
+            windows = truthy_windows(flags, list(range(0, 120, 2)))
+            sorted_ts = sorted(rng.randrange(-5, 125) for _ in range(80))
+            shuffled = list(sorted_ts)
+            rng.shuffle(shuffled)
+            assert windows_to_mask(windows, sorted_ts) == _naive_mask(windows, sorted_ts)
+            assert windows_to_mask(windows, shuffled) == _naive_mask(windows, shuffled)
+
+    def test_all_windows_mask(self):
+        """Test intersection semantics across window lists."""
+        ts = [1, 2, 3, 4, 5]
+        assert all_windows_mask([], ts) == [True] * 5
+        assert all_windows_mask([[(1, 3)], []], ts) == [False] * 5
+        assert all_windows_mask([[(1, 3)], [(3, 5)]], ts) == [False, False, True, False, False]
+
+
+class TestAsOf:
+    """Tests for asof_indices and asof_values."""
+
+    def test_asof_indices(self):
+        """Test latest index at or before each query."""
+        assert asof_indices([10, 20, 30], [5, 10, 25, 30, 99]) == [-1, 0, 1, 2, 2]
+
+    def test_asof_matches_bisect(self):
+        """Test merge walk agrees with bisect for sorted and unsorted queries."""
+        rng = random.Random(3)
+        ref = sorted(rng.sample(range(1000), 100))
+        queries = [rng.randrange(-10, 1010) for _ in range(300)]
+        expected = [bisect_right(ref, q) - 1 for q in queries]
+        assert asof_indices(ref, queries) == expected
+        assert asof_indices(ref, sorted(queries)) == sorted(expected)
+
+    def test_asof_values_default(self):
+        """Test default is used before the first reference timestamp."""
+        assert asof_values([2, 4], ["a", "b"], [1, 2, 3, 5], default="-") == ["-", "a", "a", "b"]
@@ -0,0 +1,124 @@
+"""
+Tests for htf.mapped_buffer module.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+
+import pytest
+
+from htf.features import SingleFieldStatsFeature
+from htf.mapped_buffer import MappedRecordBuffer
+from htf.signals import ValueVsRollingPercentile
+from htf.timeframe import TimeframeConfig, TimeframeView
+
+_FIELDS = {"ts": "int", "x": "float", "on": "bool"}
+
+
+def _records(n, start=0):
+    out = []
+    for i in range(start, start + n):
+        out.append({"ts": i, "x": math.sin(i / 7.0) * 10 if i % 11 else None, "on": i % 3 == 0})
+    return out
+
+
+class TestMappedRecordBuffer:
+    """Tests for MappedRecordBuffer."""
+
+    def test_append_and_read_across_segments(self, tmp_path):
+        """Test rows read back identically from the hot tail and from disk."""
+        records = _records(50)
+        with MappedRecordBuffer(tmp_path, _FIELDS, segment_rows=8, hot_rows=5, max_open_segments=2) as buf:
+            for rec in records:
+                buf.append({**rec, "extra": "dropped"})
+            assert len(buf) == 50
+            assert list(buf) == records
+            assert buf[3] == records[3]
+            assert buf[-1] == records[-1]
+            assert buf[10:30] == records[10:30]
+            assert buf[-4:] == records[-4:]
+            assert buf[::10] == records[::10]
+            with pytest.raises(IndexError):
+                buf[50]
+
+    def test_reopen_and_trim(self, tmp_path):
+        """Test the data survives reopening and leading deletes drop segment files."""
+        with MappedRecordBuffer(tmp_path, _FIELDS, segment_rows=10) as buf:
+            for rec in _records(35):
+                buf.append(rec)
+            del buf[0:22]
+            assert buf.first_position == 22
+        assert not os.path.exists(tmp_path / "0000000000.c0.col")
+        assert os.path.exists(tmp_path / "0000000002.c0.col")
+        with MappedRecordBuffer(tmp_path, _FIELDS) as buf:
+            assert buf.segment_rows == 10
+            assert list(buf) == _records(13, start=22)
+            with pytest.raises(TypeError):
+                del buf[3:5]
+            buf.clear()
+            assert len(buf) == 0
+        with pytest.raises(ValueError):
+            MappedRecordBuffer(tmp_path, {"x": "float"})
+
+    def test_nested_fields_and_validation(self, tmp_path):
+        """Test dotted names map to nested records and unsupported kinds are rejected."""
+        with MappedRecordBuffer(tmp_path, {"values.a": "float", "values.b": "int"}) as buf:
+            buf.append({"values": {"a": 1, "b": 2.0}})
+            buf.append({"values": {"a": "x", "b": 2.5}})
+            assert list(buf) == [{"values": {"a": 1.0, "b": 2}}, {"values": {"a": None, "b": None}}]
+        with pytest.raises(ValueError):
+            MappedRecordBuffer(tmp_path / "other", {"name": "str"})
+
+    def test_columnar_export(self, tmp_path):
+        """Test columns and DataFrames are read from the mapped segments."""
+        pd = pytest.importorskip("pandas")
+        records = _records(30)
+        with MappedRecordBuffer(tmp_path, _FIELDS, segment_rows=7) as buf:
+            for rec in records:
+                buf.append(rec)
+            assert buf.column("ts", 5, 20).tolist() == list(range(5, 20))
+            frame = buf.to_dataframe()
+            expected = pd.DataFrame(records)
+            assert frame["ts"].tolist() == expected["ts"].tolist()
+            assert frame["on"].tolist() == expected["on"].tolist()
+            pd.testing.assert_series_equal(frame["x"], expected["x"], check_names=False)
+
+
+class TestTimeframeViewBackend:
+    """Tests for TimeframeView(buffer_backend=...)."""
+
+    def _view(self, backend=None, max_buffer=1024):
+        return TimeframeView(
+            config=TimeframeConfig(name="tf", window_size=6, max_buffer=max_buffer),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=20, percentile=60),
+            buffer_backend=backend,
+        )
+
+    def test_same_signals_as_in_memory_buffer(self, tmp_path):
+        """Test a mapped backend gives the same features, signals and trimming."""
+        records = _records(200)
+        memory = self._view(max_buffer=50)
+        mapped = self._view(MappedRecordBuffer(tmp_path, _FIELDS, segment_rows=16, hot_rows=8), max_buffer=50)
+        for rec in records:
+            assert memory.on_new_record(rec) == mapped.on_new_record(rec)
+            assert memory.features == mapped.features
+        assert list(mapped.buffer) == memory.buffer
+        assert mapped.records_seen == 200
+        assert mapped.export_buffer_as_dataframe()["ts"].tolist() == list(range(150, 200))
+        mapped.reset()
+        assert len(mapped.buffer) == 0
+        mapped.buffer.close()
+
+    def test_reopened_backend_counts_as_seen(self, tmp_path):
+        """Test a view over an existing directory resumes its positions."""
+        with MappedRecordBuffer(tmp_path, _FIELDS) as buf:
+            for rec in _records(12):
+                buf.append(rec)
+        view = self._view(MappedRecordBuffer(tmp_path, _FIELDS))
+        assert view.records_seen == 12
+        view.on_new_record(_records(1, start=12)[0])
+        assert view.buffer[-1]["ts"] == 12
+        view.buffer.close()
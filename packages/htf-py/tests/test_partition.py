@@ -0,0 +1,194 @@
+"""
+Tests for htf.partition module.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+
+import pytest
+
+from htf.coordinator import HierarConstraintCoordinator
+from htf.features import SingleFieldStatsFeature
+from htf.framework import HTFFramework
+from htf.partition import framework_state_horizon, run_partitioned
+from htf.signals import (
+    SignalEMAFastSlowComparison,
+    SignalRunLengthVsHistoryPercentile,
+    SignalValueVsPrevious,
+    ValueVsRollingPercentile,
+)
+from htf.timeframe import TimeframeConfig, TimeframeView
+
+
+def _records(n, seed=0):
+    rng = random.Random(seed)
+    level = 0.0
+    out = []
+    for i in range(n):
+        level += rng.gauss(0, 1)
+        out.append({"ts": i, "x": level})
+    return out
+
+
+def _gappy_records(n, seed):
+    """Random walk with runs of missing x values (whole feature windows without data)."""
+    rng = random.Random(seed)
+    level = 0.0
+    gap = 0
+    out = []
+    for i in range(n):
+        level += rng.gauss(0, 1)
+        if gap == 0 and rng.random() < 0.1:
+            gap = rng.randint(1, 40)
+        out.append({"ts": i, "x": None if gap else level})
+        gap = max(0, gap - 1)
+    return out
+
+
+def _framework(ltf_signal=None, htf_signal=None):
+    htf = TimeframeView(
+        config=TimeframeConfig(name="htf", window_size=12, role="HTF"),
+        feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+        signal_fn=htf_signal or ValueVsRollingPercentile(value_key="x_mean", window_size=30, percentile=40),
+    )
+    ltf = TimeframeView(
+        config=TimeframeConfig(name="ltf", window_size=3),
+        feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+        signal_fn=ltf_signal or ValueVsRollingPercentile(value_key="x_max", window_size=10, percentile=70),
+    )
+    return HTFFramework(timeframes={"htf": htf, "ltf": ltf}, coordinator=HierarConstraintCoordinator(["htf", "ltf"]))
+
+
+def _sequential(framework, records, collect):
+    return [collect(rec, framework.on_new_record(rec)) for rec in records]
+
+
+def _gated(record, output):
+    return output["coordination"]["gated_map"]
+
+
+class TestStateHorizon:
+    """Tests for framework_state_horizon."""
+
+    def test_declared_horizon(self):
+        """Test the horizon combines window sizes and signal horizons."""
+        horizon, exact, unbounded = framework_state_horizon(_framework())
+        assert horizon == max(12 - 1 + 30, 3 - 1 + 10)
+        # percentile histories skip missing values, so window_size steps may not be enough
+        assert not exact
+        assert unbounded == []
+        previous = SignalValueVsPrevious(value_key="x_max")
+        assert framework_state_horizon(_framework(previous, previous)) == (12 - 1 + 1, True, [])
+
+    def test_undeclared_and_approximate(self):
+        """Test plain functions are unbounded and EMA horizons are approximate."""
+        assert framework_state_horizon(_framework(lambda feats: 1))[2] == ["ltf"]
+        ema = SignalEMAFastSlowComparison(value_key="x_mean", ema_period_1=3, ema_period_2=8)
+        horizon, exact, _ = framework_state_horizon(_framework(ema))
+        assert horizon >= ema.state_horizon() + 2
+        assert not exact
+
+
+class TestRunPartitioned:
+    """Tests for run_partitioned."""
+
+    def test_matches_sequential_in_process(self):
+        """Test stitched chunk outputs equal a sequential run."""
+        records = _records(900)
+        expected = _sequential(_framework(), records, _gated)
+        template = _framework()
+        result = run_partitioned(template, records, processes=1, chunks=5, collect=_gated)
+        assert result.mode == "partitioned"
+        assert result.outputs == expected
+        assert len(result.chunks) == 5
+        assert result.verified is True
+        assert template.timeframes["htf"].buffer_size == 0
+
+    def test_process_pool(self):
+        """Test worker processes give the same full outputs."""
+        records = _records(400, seed=1)
+        expected = _sequential(_framework(), records, lambda rec, out: out)
+        result = run_partitioned(_framework(), records, processes=2, chunks=3)
+        assert result.mode == "partitioned"
+        assert result.outputs == expected
+
+    def test_approximate_horizon_is_verified(self):
+        """Test EMA signals are checked against a sequential replay."""
+        records = _records(600, seed=2)
+
+        def ema():
+            return SignalEMAFastSlowComparison(value_key="x_mean", ema_period_1=3, ema_period_2=8)
+
+        expected = _sequential(_framework(ema()), records, _gated)
+        result = run_partitioned(_framework(ema()), records, processes=1, chunks=3, collect=_gated)
+        assert result.verified is True
+        assert result.outputs == expected
+
+    def test_exact_horizon_is_not_verified(self):
+        """Test exact horizons partition without a verification pass."""
+        records = _records(500, seed=5)
+
+        def framework():
+            return _framework(SignalValueVsPrevious(value_key="x_max"), SignalValueVsPrevious(value_key="x_mean"))
+
+        result = run_partitioned(framework(), records, processes=1, chunks=4, collect=_gated)
+        assert result.mode == "partitioned"
+        assert result.verified is None
+        assert result.outputs == _sequential(framework(), records, _gated)
+
+    def test_missing_values(self):
+        """Test histories that skip missing values never give wrong stitched outputs."""
+        for seed in range(6):
+            records = _gappy_records(900, seed)
+            expected = _sequential(_framework(), records, _gated)
+            result = run_partitioned(_framework(), records, processes=1, chunks=5, collect=_gated)
+            assert result.verified is not None
+            assert result.outputs == expected
+
+    def test_unbounded_falls_back(self):
+        """Test signals with unbounded state run sequentially."""
+        records = _records(200, seed=3)
+        signal = SignalRunLengthVsHistoryPercentile(signal_key="x_count")
+        result = run_partitioned(_framework(signal), records, processes=1, chunks=4, collect=_gated)
+        assert result.mode == "sequential"
+        assert "ltf" in result.reason
+        assert result.outputs == _sequential(_framework(signal), records, _gated)
+
+    def test_short_warmup_mismatch_falls_back(self):
+        """Test a too-short explicit warmup is caught by verification."""
+        records = _records(500, seed=4)
+        result = run_partitioned(_framework(), records, processes=1, chunks=2, warmup=0, collect=_gated)
+        assert result.mode == "sequential"
+        assert result.verified is False
+        assert result.reason.startswith("verification mismatch")
+        assert result.outputs == _sequential(_framework(), records, _gated)
+
+    def test_subscribed_listener(self):
+        """Test listeners holding locks are neither copied nor called."""
+
+        class Dashboard:
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.calls = 0
+
+            def on_output(self, record, output):
+                with self.lock:
+                    self.calls += 1
+
+        records = _records(300, seed=6)
+        template = _framework()
+        dashboard = Dashboard()
+        template.subscribe(dashboard.on_output)
+        result = run_partitioned(template, records, processes=1, chunks=3, collect=_gated)
+        assert result.outputs == _sequential(_framework(), records, _gated)
+        assert template.listeners == [dashboard.on_output]
+        assert dashboard.calls == 0
+
+    def test_invalid_arguments(self):
+        """Test negative warmup and empty verification are rejected."""
+        with pytest.raises(ValueError):
+            run_partitioned(_framework(), [], warmup=-1)
+        with pytest.raises(ValueError):
+            run_partitioned(_framework(), [], verify_steps=0)
@@ -0,0 +1,139 @@
+"""
+Tests for htf.quantiles module.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from htf.quantiles import WindowedQuantileSketch
+from htf.signals import (
+    RollingOrderStatistics,
+    SignalEMADiffVsHistoryPercentile,
+    SignalRunLengthReachedHistoryPercentile,
+    SignalRunLengthVsHistoryPercentile,
+    ValueVsRollingPercentile,
+    compute_percentile,
+)
+
+
+def _rank_error(sorted_values, value, q):
+    target = (len(sorted_values) - 1) * q / 100.0
+    lo = bisect_left(sorted_values, value)
+    hi = bisect_right(sorted_values, value)
+    return 0.0 if lo <= target <= hi else min(abs(lo - target), abs(hi - target))
+
+
+def _window_covered(sketch):
+    return sketch.window <= len(sketch) < sketch.window + sketch.block_size
+
+
+class TestWindowedQuantileSketch:
+    """Tests for WindowedQuantileSketch."""
+
+    def test_exact_before_first_block(self):
+        """Test results equal compute_percentile while the open block holds everything."""
+        rng = random.Random(1)
+        sketch = WindowedQuantileSketch(1000, buckets=10, points=16)
+        values = []
+        for _ in range(99):
+            value = rng.random()
+            sketch.add(value)
+            values.append(value)
+            for q in (0, 25, 50, 90, 100):
+                assert sketch.quantile(q) == compute_percentile(values, q)
+            assert sketch.quantile(60, extra=0.5) == compute_percentile(values + [0.5], 60)
+
+    def test_error_within_bound(self):
+        """Test rank error stays within the documented bound on a drifting stream."""
+        window, buckets, points = 5000, 20, 32
+        sketch = WindowedQuantileSketch(window, buckets, points)
+        exact = RollingOrderStatistics(window)
+        bound = window / (2 * points) + buckets + sketch.block_size
+        rng = random.Random(3)
+        for i in range(30000):
+            value = rng.gauss(0, 1) + i / 3000.0
+            sketch.add(value)
+            exact.push(value)
+            if i > window and i % 500 == 0:
+                for q in (10, 50, 90):
+                    assert _rank_error(exact.sorted_values, sketch.quantile(q), q) <= bound
+
+    def test_memory_is_bounded(self):
+        """Test stored points stay near window / buckets + buckets * points."""
+        sketch = WindowedQuantileSketch(100_000, buckets=50, points=20)
+        for i in range(250_000):
+            sketch.add(float(i % 977))
+        assert _window_covered(sketch)
+        assert sketch.stored_points <= sketch.block_size + 50 * 20
+
+    def test_invalid_arguments(self):
+        """Test window, buckets and points must be positive."""
+        with pytest.raises(ValueError):
+            WindowedQuantileSketch(0)
+        with pytest.raises(ValueError):
+            WindowedQuantileSketch(10, buckets=0)
+
+    def test_clear_and_empty(self):
+        """Test an empty or cleared sketch returns None."""
+        sketch = WindowedQuantileSketch(10)
+        assert sketch.quantile(50) is None
+        sketch.add(1.0)
+        sketch.clear()
+        assert len(sketch) == 0
+        assert sketch.quantile(50) is None
+
+
+class TestApproximateSignals:
+    """Tests for approximate=True on percentile signals."""
+
+    def test_matches_exact_on_short_history(self):
+        """Test approximate mode is exact while the history fits the open block."""
+        rng = random.Random(5)
+        pairs = [
+            (
+                ValueVsRollingPercentile(value_key="v", window_size=5000, percentile=80),
+                ValueVsRollingPercentile(value_key="v", window_size=5000, percentile=80, approximate=True),
+            ),
+            (
+                SignalEMADiffVsHistoryPercentile(value_key="v", ema_period_1=3, ema_period_2=9, history_window=5000),
+                SignalEMADiffVsHistoryPercentile(
+                    value_key="v", ema_period_1=3, ema_period_2=9, history_window=5000, approximate=True
+                ),
+            ),
+        ]
+        for _ in range(30):
+            features = {"v": rng.random()}
+            for exact, approx in pairs:
+                assert approx(features) == exact(features)
+                assert approx.last_threshold == exact.last_threshold
+        assert len(pairs[0][1].history) == 0
+        assert len(pairs[1][1].abs_diff_history) == 0
+
+    def test_run_length_signals(self):
+        """Test approximate run-length signals agree with exact ones on short histories."""
+        rng = random.Random(9)
+        stream = [{"s": int(rng.random() < 0.6)} for _ in range(400)]
+        for cls in (SignalRunLengthReachedHistoryPercentile, SignalRunLengthVsHistoryPercentile):
+            exact = cls(signal_key="s", history_window=10_000, min_history_runs=2)
+            approx = cls(signal_key="s", history_window=10_000, min_history_runs=2, approximate=True)
+            assert [approx(f) for f in stream] == [exact(f) for f in stream]
+            approx.reset()
+            assert len(approx.sketch) == 0
+
+    def test_long_window_is_close(self):
+        """Test thresholds on a long window stay within the sketch rank bound."""
+        window = 20_000
+        sig = ValueVsRollingPercentile(value_key="v", window_size=window, percentile=90, approximate=True)
+        exact = RollingOrderStatistics(window)
+        bound = window / (2 * 128) + 128 + sig.sketch.block_size
+        rng = random.Random(2)
+        for _ in range(50_000):
+            value = rng.random()
+            sig({"v": value})
+            exact.push(value)
+        threshold = sig.sketch.quantile(90)
+        assert _rank_error(exact.sorted_values, threshold, 90) <= bound
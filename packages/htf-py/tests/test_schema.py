@@ -0,0 +1,113 @@
+"""
+Tests for htf.schema module.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from htf.coordinator import SimpleHTFCoordinator
+from htf.features import SingleFieldStatsFeature
+from htf.framework import HTFFramework
+from htf.schema import RecordSchema
+from htf.signals import ValueVsRollingPercentile
+from htf.timeframe import TimeframeConfig, TimeframeView
+
+
+class TestRecordSchema:
+    """Tests for RecordSchema coercion and counters."""
+
+    def test_coerces_declared_fields(self):
+        """Test each field type is coerced once into a typed value."""
+        schema = RecordSchema({"x": "float", "n": "int", "flag": "bool", "tag": "str"})
+        out = schema.coerce({"x": "1.5", "n": 3.0, "flag": "true", "tag": 7, "other": [1]})
+        assert out == {"x": 1.5, "n": 3, "flag": True, "tag": "7", "other": [1]}
+        assert type(schema.coerce({"x": 2})["x"]) is float
+        assert schema.stats.malformed_records == 0
+        assert schema.stats.missing == {"n": 1, "flag": 1, "tag": 1}
+
+    def test_timestamp_field(self):
+        """Test the timestamp type stores int epoch nanoseconds."""
+        schema = RecordSchema({"ts": "timestamp"})
+        assert schema.coerce({"ts": "1970-01-01T00:00:01Z"}) == {"ts": 1_000_000_000}
+        assert schema.coerce({"ts": 5}) == {"ts": 5}
+        assert schema.coerce({"ts": "soon"}) == {"ts": None}
+        assert schema.stats.invalid == {"ts": 1}
+
+    def test_invalid_values_are_counted(self):
+        """Test invalid values become None and mark the record malformed."""
+        schema = RecordSchema({"x": "float", "n": "int"}, keep_extra=False)
+        assert schema.coerce({"x": True, "n": 2.5}) == {"x": None, "n": None}
+        assert schema.coerce({"x": "abc", "n": "4"}) == {"x": None, "n": 4}
+        assert schema.stats.as_dict() == {
+            "records": 2,
+            "malformed_records": 2,
+            "dropped_records": 0,
+            "invalid": {"x": 2, "n": 1},
+            "missing": {},
+        }
+
+    def test_required_and_on_error(self):
+        """Test missing required fields and the drop/raise policies."""
+        drop = RecordSchema({"x": "float"}, required=["x"], on_error="drop")
+        assert drop.coerce({"y": 1}) is None
+        assert drop.coerce({"x": "nan?"}) is None
+        assert drop.stats.dropped_records == 2
+        strict = RecordSchema({"x": "float"}, on_error="raise")
+        with pytest.raises(ValueError, match="'x'"):
+            strict.coerce({"x": object()})
+        assert strict.stats.malformed_records == 1
+
+    def test_validation(self):
+        """Test unknown types, undeclared required fields and policies are rejected."""
+        with pytest.raises(ValueError):
+            RecordSchema({"x": "decimal"})
+        with pytest.raises(ValueError):
+            RecordSchema({"x": "float"}, required=["y"])
+        with pytest.raises(ValueError):
+            RecordSchema({"x": "float"}, on_error="ignore")
+
+
+class TestSchemaIngestion:
+    """Tests for schemas on TimeframeView and HTFFramework."""
+
+    def _view(self, schema=None):
+        return TimeframeView(
+            config=TimeframeConfig(name="tf", window_size=3),
+            feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+            signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=5, percentile=50, min_history=1),
+            schema=schema,
+        )
+
+    def test_view_coerces_before_buffering(self):
+        """Test the buffered record holds coerced values and drops are skipped."""
+        view = self._view(RecordSchema({"x": "float"}, required=["x"], on_error="drop"))
+        view.on_new_record({"x": "2"})
+        view.on_new_record({"x": "bad"})
+        assert view.buffer == [{"x": 2.0}]
+        assert view.features["x_mean"] == 2.0
+        assert view.ingest_stats.dropped_records == 1
+        view.reset()
+        assert view.ingest_stats.records == 0
+
+    def test_framework_outputs_unchanged_for_clean_records(self):
+        """Test a schema does not change outputs for numeric records."""
+        records = [{"x": float(i % 7), "ts": i} for i in range(40)]
+        outputs = []
+        for schema in (None, RecordSchema({"x": "float"})):
+            framework = HTFFramework(timeframes={"tf": self._view()}, coordinator=SimpleHTFCoordinator(), schema=schema)
+            outputs.append([framework.on_new_record(rec)["states"]["tf"].signal for rec in records])
+        assert outputs[0] == outputs[1]
+
+    def test_framework_counts_and_drops(self):
+        """Test the framework coerces once and exposes its counters."""
+        schema = RecordSchema({"x": "float"}, required=["x"], on_error="drop")
+        framework = HTFFramework(timeframes={"tf": self._view()}, coordinator=SimpleHTFCoordinator(), schema=schema)
+        seen = []
+        framework.subscribe(lambda rec, out: seen.append(rec))
+        first = framework.on_new_record({"x": "1"})
+        assert framework.on_new_record({"x": None}) is first
+        assert seen == [{"x": 1.0}]
+        assert framework.timeframes["tf"].buffer_size == 1
+        assert framework.ingest_stats.as_dict()["missing"] == {"x": 1}
+        assert HTFFramework(timeframes={}, coordinator=SimpleHTFCoordinator()).ingest_stats is None
@@ -0,0 +1,191 @@
+"""
+Tests for htf.service module.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+from htf.aggregation import aggregate_frame, aggregate_records  # noqa: E402
+from htf.service import ComputeServer, ComputeService, decode_columns, encode_columns  # noqa: E402
+from htf.timeframe import _build_signal_defs_map, _compute_graph_outputs  # noqa: E402
+from tests.conftest import percentile_diff_nodes, signal_node  # noqa: E402
+
+
+def _graph():
+    pct, diff = percentile_diff_nodes(diff_value_key="price")
+    return [signal_node("root", "SignalIntersection", signal_keys=[pct, diff])]
+
+
+def _frame(n=3000, seed=0):
+    rng = random.Random(seed)
+    level = 100.0
+    rows = []
+    for i in range(n):
+        level += rng.gauss(0, 1)
+        price = float("nan") if i % 97 == 0 else round(level, 4)
+        rows.append({"ts": f"2024-01-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}", "price": price, "n": i})
+    return pd.DataFrame(rows)
+
+
+_AGG = {"scale_value": 1, "scale_unit": "minute", "method": "mean", "value_key": "price"}
+
+
+class TestEncoding:
+    """Tests for the binary columnar frame."""
+
+    def test_round_trip_alignment(self):
+        """Test columns decode unchanged and start at 8-byte offsets."""
+        data = encode_columns({"ts": [1.0, 2.0, 3.0], "flag": np.array([1, 0, 1], dtype=np.uint8)}, {"kind": "x"})
+        header, cols = decode_columns(data)
+        assert header["kind"] == "x" and header["rows"] == 3
+        assert cols["ts"].tolist() == [1.0, 2.0, 3.0]
+        assert cols["flag"].dtype == np.uint8 and cols["flag"].tolist() == [1, 0, 1]
+        base = 8 + int.from_bytes(data[4:8], "little")
+        assert base % 8 == 0
+        assert all((base + col["offset"]) % 8 == 0 for col in header["columns"])
+        with pytest.raises(ValueError):
+            encode_columns({"a": [1.0], "b": [1.0, 2.0]})
+
+
+class TestComputeService:
+    """Tests for ComputeService without HTTP."""
+
+    def test_aggregate_matches_aggregate_frame(self):
+        """Test server-side aggregation equals htf.aggregation."""
+        frame = _frame()
+        service = ComputeService()
+        info = service.upload(frame.to_csv(index=False).encode(), "text/csv")
+        assert info["rows"] == len(frame) and not info["cached"]
+        header, cols = decode_columns(service.aggregate({"dataset": info["dataset"], **_AGG}))
+        expected = aggregate_frame(frame, scale_value=1, scale_unit="minute", value_key="price")
+        assert header["rows"] == len(expected)
+        ts_ms = expected["ts"].astype("datetime64[ms, UTC]").dt.tz_localize(None).astype("int64").to_numpy()
+        assert cols["ts"].tolist() == ts_ms.tolist()
+        assert np.allclose(cols["value"], expected["value"].to_numpy(), equal_nan=True)
+        assert np.allclose(cols["n"], expected["n"].to_numpy(), equal_nan=True)
+
+    def test_signals_match_graph_outputs(self):
+        """Test signal outputs equal evaluating the graph over aggregate_records."""
+        frame = _frame()
+        service = ComputeService()
+        dataset = service.upload(frame.to_csv(index=False).encode())["dataset"]
+        request = {"dataset": dataset, **_AGG, "signal_graph": _graph(), "include_values": True}
+        header, cols = decode_columns(service.signals(request))
+        records = aggregate_records(frame, scale_value=1, scale_unit="minute", value_key="price")
+        outputs, value_order, value_data, _ = _compute_graph_outputs(
+            records, _graph(), _build_signal_defs_map(None), include_values=True
+        )
+        assert header["nodes"] == {"pct": "pct", "diff": "diff", "root": "root"}
+        for node_id, flags in outputs.items():
+            assert cols[node_id].tolist() == flags
+        for col in value_order:
+            expected = [np.nan if v is None else v for v in value_data[col]]
+            assert np.allclose(cols[col], expected, equal_nan=True)
+
+    def test_cache_and_dataset_lifecycle(self):
+        """Test repeated requests hit the cache and uploads are deduplicated."""
+        body = _frame(600).to_csv(index=False).encode()
+        service = ComputeService(max_datasets=1)
+        dataset = service.upload(body)["dataset"]
+        assert service.upload(body)["cached"]
+        request = {"dataset": dataset, **_AGG}
+        first, hit = service.aggregate_cached(request)
+        assert not hit
+        second, hit = service.aggregate_cached(dict(reversed(list(request.items()))))
+        assert hit and second is first
+        assert service.stats()["cache_entries"] == 1
+        service.upload(b"ts,price\n2024-01-01,1\n")  # evicts the first dataset and its results
+        assert service.stats() == {"datasets": 1, "cache_entries": 0, "cache_hits": 1, "cache_misses": 1}
+        with pytest.raises(KeyError):
+            service.aggregate(request)
+        with pytest.raises(ValueError):
+            service.aggregate({"dataset": service.datasets()[0]["dataset"], "value_key": "price"})
+
+
+class TestComputeServer:
+    """Tests for the HTTP routes."""
+
+    def test_http_round_trip(self):
+        """Test upload, aggregate, cache header, errors and CORS over HTTP."""
+        server = ComputeServer(ComputeService(), port=0, allow_file_origin=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+
+            def call(method, path, body=None, content_type="application/json", origin=None):
+                req = urllib.request.Request(server.url + path, data=body, method=method)
+                req.add_header("Content-Type", content_type)
+                if origin:
+                    req.add_header("Origin", origin)
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    return resp.status, dict(resp.headers), resp.read()
+
+            records = [{"ts": f"2024-01-01T00:00:{i:02d}", "price": float(i)} for i in range(60)]
+            _, _, body = call("POST", "/datasets", json.dumps(records).encode())
+            dataset = json.loads(body)["dataset"]
+            request = json.dumps({"dataset": dataset, "scale_value": 10, "scale_unit": "second", "value_key": "price"})
+            _, headers, body = call("POST", "/aggregate", request.encode(), origin="null")
+            assert headers["X-HTF-Cache"] == "miss"
+            assert headers["Access-Control-Allow-Origin"] == "null"
+            _, cols = decode_columns(body)
+            assert cols["value"].tolist() == [4.5, 14.5, 24.5, 34.5, 44.5, 54.5]
+            _, headers, _ = call("POST", "/aggregate", request.encode(), origin="https://example.com")
+            assert headers["X-HTF-Cache"] == "hit"
+            assert "Access-Control-Allow-Origin" not in headers
+            _, _, body = call("GET", "/health")
+            assert json.loads(body)["cache_hits"] == 1
+
+            with pytest.raises(urllib.error.HTTPError) as err:
+                call("POST", "/aggregate", json.dumps({"dataset": "missing", **_AGG}).encode())
+            assert err.value.code == 404
+            with pytest.raises(urllib.error.HTTPError) as err:
+                call("POST", "/signals", json.dumps({"dataset": dataset, **_AGG}).encode())
+            assert err.value.code == 400
+            assert "signal_graph" in json.loads(err.value.read())["error"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_host_and_origin_checks(self):
+        """Test non-local Host headers are refused and Origin "null" needs opting in."""
+        server = ComputeServer(ComputeService(), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.server_address[1]
+        try:
+
+            def call(path, host=None, origin=None):
+                req = urllib.request.Request(server.url + path)
+                if host:
+                    req.add_header("Host", host)
+                if origin:
+                    req.add_header("Origin", origin)
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    return resp.status, dict(resp.headers)
+
+            status, headers = call("/datasets", origin="null")
+            assert status == 200
+            assert "Access-Control-Allow-Origin" not in headers
+            _, headers = call("/datasets", host=f"localhost:{port}", origin=f"http://localhost:{port}")
+            assert headers["Access-Control-Allow-Origin"] == f"http://localhost:{port}"
+            for host in ("evil.example", f"evil.example:{port}", "127.0.0.1:1", f"[::2]:{port}"):
+                with pytest.raises(urllib.error.HTTPError) as err:
+                    call("/datasets", host=host, origin="null")
+                assert err.value.code == 403
+                assert "Access-Control-Allow-Origin" not in err.value.headers
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert server.host_allowed(f"[::1]:{port}")
+        assert not server.host_allowed(None)
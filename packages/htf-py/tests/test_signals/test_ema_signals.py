@@ -4,9 +4,12 @@ Tests for EMA-based signals.
 
 from __future__ import annotations
 
+import math
+
 import pytest
 
 from htf.signals import (
+    SharedComputations,
     SignalEMADiffVsHistoryPercentile,
     SignalEMAFastSlowComparison,
 )
@@ -292,3 +295,56 @@ class TestSignalEMADiffVsHistoryPercentile:
         assert sig.last_threshold is None
         assert len(sig.abs_diff_history) == 0
         assert len(sig.trace) == 0
+
+
+class TestSharedComputations:
+    """Tests for EMA/history sharing through SharedComputations."""
+
+    @staticmethod
+    def _build():
+        return [
+            SignalEMADiffVsHistoryPercentile(value_key="val", ema_period_1=3, ema_period_2=8, history_window=20),
+            SignalEMADiffVsHistoryPercentile(
+                value_key="val", ema_period_1=8, ema_period_2=3, history_window=20, percentile=10, comparison="lt"
+            ),
+            SignalEMAFastSlowComparison(value_key="val", ema_period_1=3, ema_period_2=8, prefer="slow"),
+        ]
+
+    def test_outputs_unchanged(self):
+        """Test bound signals emit the same outputs and values as private ones."""
+        private = self._build()
+        bound = self._build()
+        registry = SharedComputations()
+        for sig in bound:
+            sig.bind_shared(registry)
+
+        for i in range(200):
+            features = {"val": math.sin(i / 7.0) * 10 + (i % 5)} if i % 13 else {"val": None}
+            registry.next_step()
+            for ref, sig in zip(private, bound):
+                assert sig(features) == ref(features)
+                assert sig.ema_1 == ref.ema_1
+                assert sig.ema_2 == ref.ema_2
+            assert bound[0].last_threshold == private[0].last_threshold
+            assert bound[1].last_threshold == private[1].last_threshold
+
+    def test_report_counts_deduplicated_work(self):
+        """Test the report shows shared EMAs and histories."""
+        registry = SharedComputations()
+        for sig in self._build():
+            sig.bind_shared(registry)
+
+        report = registry.report()
+        assert report["ema"] == {"requested": 6, "unique": 2, "shared": 4}
+        assert report["history"] == {"requested": 2, "unique": 1, "shared": 1}
+
+    def test_updates_once_per_step(self):
+        """Test a shared EMA advances only on the first update of a step."""
+        registry = SharedComputations()
+        ema = registry.ema("val", 3)
+        registry.next_step()
+        assert ema.update(10.0) == 10.0
+        assert ema.update(99.0) == 10.0
+        registry.next_step()
+        assert ema.update(20.0) == pytest.approx(15.0)
+        assert registry.report()["updates"]["ema"] == {"computed": 2, "reused": 1}
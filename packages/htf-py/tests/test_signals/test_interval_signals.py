@@ -4,6 +4,8 @@ Tests for interval and window-based signals.
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from htf.signals import (
@@ -245,6 +247,60 @@ class TestSignalNthTargetWithinWindowAfterTrigger:
 
         assert result == 0
 
+    def test_matches_window_scan_reference(self):
+        """Test outputs and last_search_success match a per-window scan."""
+
+        def reference(stream, window_length, target_index):
+            windows, success, out = [], None, []
+            for features in stream:
+                signal, kept = 0, []
+                for window in windows:
+                    if features["target"]:
+                        window[1] += 1
+                        if window[1] == target_index:
+                            signal, success = 1, True
+                            continue
+                    window[0] -= 1
+                    if window[0] <= 0:
+                        success = False
+                        continue
+                    kept.append(window)
+                windows = kept
+                if features["trigger"]:
+                    windows.append([window_length, 0])
+                out.append((signal, success, len(windows)))
+            return out
+
+        for seed in range(30):
+            rng = random.Random(seed)
+            window_length, target_index = rng.randint(1, 8), rng.randint(1, 4)
+            stream = [{"trigger": rng.random() < 0.6, "target": rng.random() < 0.4} for _ in range(200)]
+            sig = SignalNthTargetWithinWindowAfterTrigger(
+                trigger_signal_key="trigger",
+                target_signal_key="target",
+                window_length=window_length,
+                target_index=target_index,
+            )
+            got = []
+            for features in stream:
+                got.append((sig(features), sig.last_search_success, len(sig.windows)))
+            assert got == reference(stream, window_length, target_index)
+
+    def test_active_windows_view(self):
+        """Test active_windows reports remaining steps and seen targets."""
+        sig = SignalNthTargetWithinWindowAfterTrigger(
+            trigger_signal_key="trigger", target_signal_key="target", window_length=5, target_index=3
+        )
+
+        sig({"trigger": 1, "target": 0})
+        sig({"trigger": 1, "target": 1})
+        sig({"trigger": 0, "target": 0})
+
+        assert sig.active_windows == [
+            {"remaining_steps": 3, "seen_targets": 1, "start_step": 0},
+            {"remaining_steps": 4, "seen_targets": 0, "start_step": 1},
+        ]
+
     def test_reset(self):
         """Test reset clears all state."""
         sig = SignalNthTargetWithinWindowAfterTrigger(
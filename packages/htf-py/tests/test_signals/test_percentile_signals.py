@@ -4,9 +4,13 @@ Tests for percentile-based signals.
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from htf.signals import (
+    RollingOrderStatistics,
+    SharedComputations,
     ValueVsRollingPercentile,
     ValueVsRollingPercentileWithThreshold,
     compute_percentile,
@@ -252,3 +256,70 @@ class TestValueVsRollingPercentileWithThreshold:
         sig({"val": 2})
 
         assert sig.last_threshold is None
+
+
+class TestRollingOrderStatistics:
+    """Tests for the sorted rolling window behind shared percentile histories."""
+
+    def test_matches_compute_percentile(self):
+        """Test window percentiles equal compute_percentile on the same values."""
+        rng = random.Random(5)
+        stats = RollingOrderStatistics(25)
+        window = []
+        for _ in range(500):
+            value = float(rng.randint(-20, 20))
+            stats.push(value)
+            window = (window + [value])[-25:]
+            for q in (0, 10, 37.5, 50, 90, 100):
+                assert stats.percentile(q) == compute_percentile(window, q)
+            assert stats.percentile(75, extra=3.0) == compute_percentile(window + [3.0], 75)
+
+    def test_empty_and_invalid(self):
+        """Test empty windows return None and length must be positive."""
+        assert RollingOrderStatistics(3).percentile(50) is None
+        with pytest.raises(ValueError):
+            RollingOrderStatistics(0)
+
+
+class TestSharedRollingHistory:
+    """Tests for band signals sharing one rolling history."""
+
+    @staticmethod
+    def _bands():
+        return [
+            ValueVsRollingPercentile(value_key="val", window_size=30, percentile=10, comparison="lt"),
+            ValueVsRollingPercentileWithThreshold(value_key="val", window_size=30, percentile=90),
+            ValueVsRollingPercentile(
+                value_key="val", window_size=30, percentile=50, include_current=True, min_history=5
+            ),
+        ]
+
+    def test_bands_unchanged(self):
+        """Test bound band signals emit the same signals and thresholds."""
+        private = self._bands()
+        bound = self._bands()
+        registry = SharedComputations()
+        for sig in bound:
+            sig.bind_shared(registry)
+
+        rng = random.Random(11)
+        for i in range(400):
+            features = {"val": rng.gauss(0, 1)} if i % 17 else {"val": "n/a"}
+            registry.next_step()
+            for ref, sig in zip(private, bound):
+                assert sig(features) == ref(features)
+                assert sig.last_threshold == ref.last_threshold
+
+    def test_one_history_per_key_and_window(self):
+        """Test bands on the same key/window share a single history."""
+        registry = SharedComputations()
+        for sig in self._bands():
+            sig.bind_shared(registry)
+        ValueVsRollingPercentile(value_key="val", window_size=10).bind_shared(registry)
+
+        assert registry.report()["history"] == {"requested": 4, "unique": 2, "shared": 2}
+        for step in range(5):
+            registry.next_step()
+            registry.history(("value", "val"), 30).append(float(step))
+        registry.next_step()
+        assert registry.history(("value", "val"), 30).previous() == [0.0, 1.0, 2.0, 3.0, 4.0]
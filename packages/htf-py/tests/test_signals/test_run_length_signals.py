@@ -4,9 +4,12 @@ Tests for run-length based signals.
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from htf.signals import (
+    SharedComputations,
     SignalRunInterrupted,
     SignalRunLengthReached,
     SignalRunLengthReachedHistoryPercentile,
@@ -382,3 +385,36 @@ class TestSignalRunLengthVsHistoryPercentile:
         assert sig.current_run == 0
         assert len(sig.history_runs) == 0
         assert sig.active is False
+
+
+class TestSharedRunDetection:
+    """Tests for run signals bound to a SharedComputations registry."""
+
+    @staticmethod
+    def _signals():
+        return [
+            SignalRunLengthReached(signal_key="s", min_run_length=3, post_run_extension=2),
+            SignalRunInterrupted(signal_key="s", min_run_length=2, post_run_extension=1),
+            SignalRunLengthReachedHistoryPercentile(signal_key="s", history_window=20, percentile=80.0),
+            SignalRunLengthReachedHistoryPercentile(signal_key="s", history_window=20, percentile=30.0),
+            SignalRunLengthVsHistoryPercentile(signal_key="s", history_window=20, percentile=60.0, min_history_runs=2),
+        ]
+
+    def test_bound_matches_unbound(self):
+        """Test shared run detection and run-length history give identical outputs."""
+        rng = random.Random(11)
+        stream = [{"s": int(rng.random() < 0.65)} for _ in range(3000)]
+        plain = self._signals()
+        bound = self._signals()
+        registry = SharedComputations()
+        for sig in bound:
+            sig.bind_shared(registry)
+        for features in stream:
+            registry.next_step()
+            for a, b in zip(plain, bound):
+                assert b(features) == a(features)
+                assert b.current_run == a.current_run
+        assert [t["run_length"] for t in bound[2].run_trace] == [t["run_length"] for t in plain[2].run_trace]
+        report = registry.report()
+        assert report["run"] == {"requested": 5, "unique": 1, "shared": 4}
+        assert report["history"] == {"requested": 3, "unique": 1, "shared": 2}
@@ -0,0 +1,141 @@
+"""
+Tests for the columnar TraceBuffer used by signal traces.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from htf.signals import (
+    SignalEMADiffVsHistoryPercentile,
+    SignalIntervalBetweenMarkers,
+    SignalRunLengthReachedHistoryPercentile,
+    TraceBuffer,
+)
+
+
+class TestTraceBuffer:
+    """Tests for TraceBuffer storage and views."""
+
+    def test_row_view_matches_appended_dicts(self):
+        """Test rows come back as dicts with None preserved for float columns."""
+        buf = TraceBuffer({"a": "int", "b": "float", "c": "bool", "d": "object"})
+        buf.append({"a": 1, "b": None, "c": True, "d": "x"})
+        buf.push(2, 2.5, False, None)
+
+        assert len(buf) == 2
+        assert buf[0] == {"a": 1, "b": None, "c": True, "d": "x"}
+        assert buf[-1] == {"a": 2, "b": 2.5, "c": False, "d": None}
+        assert buf == [buf[0], buf[1]]
+
+    def test_unsupported_kind(self):
+        """Test unknown column kinds are rejected."""
+        with pytest.raises(ValueError, match="unsupported trace column kind"):
+            TraceBuffer({"a": "str"})
+
+    def test_index_out_of_range(self):
+        """Test indexing past the live rows raises IndexError."""
+        buf = TraceBuffer({"a": "int"}, limit=2)
+        buf.push(1)
+        with pytest.raises(IndexError):
+            _ = buf[1]
+
+    def test_limit_keeps_most_recent_rows(self):
+        """Test the bounded buffer drops oldest rows across compactions."""
+        buf = TraceBuffer({"a": "int"}, limit=3)
+        for i in range(10):
+            buf.push(i)
+            assert len(buf) == min(i + 1, 3)
+
+        assert [row["a"] for row in buf] == [7, 8, 9]
+        assert [row["a"] for row in buf[1:]] == [8, 9]
+
+    def test_unbounded_growth(self):
+        """Test the unbounded buffer keeps every row."""
+        buf = TraceBuffer({"a": "int"})
+        for i in range(500):
+            buf.push(i)
+
+        assert len(buf) == 500
+        assert list(buf.column("a")) == list(range(500))
+
+    def test_clear(self):
+        """Test clear drops all rows."""
+        buf = TraceBuffer({"a": "float"}, limit=4)
+        buf.push(1.0)
+        buf.clear()
+
+        assert len(buf) == 0
+        assert list(buf) == []
+
+    def test_to_numpy_is_zero_copy_snapshot(self):
+        """Test numpy export views the live rows and survives later appends."""
+        np = pytest.importorskip("numpy")
+
+        buf = TraceBuffer({"a": "int", "b": "float", "c": "bool"}, limit=4)
+        for i in range(6):
+            buf.push(i, None if i == 5 else i / 2, i % 2 == 0)
+
+        arrays = buf.to_numpy()
+        assert arrays["a"].tolist() == [2, 3, 4, 5]
+        assert arrays["c"].dtype == np.bool_
+        assert np.isnan(arrays["b"][-1])
+        assert not arrays["a"].flags.owndata
+
+        for i in range(6, 20):
+            buf.push(i, float(i), False)
+        assert arrays["a"].tolist() == [2, 3, 4, 5]
+
+    def test_to_dataframe(self):
+        """Test DataFrame export keeps column order."""
+        pytest.importorskip("pandas")
+
+        buf = TraceBuffer({"start": "int", "reason": "object"})
+        buf.push(0, "end_signal")
+        df = buf.to_dataframe()
+
+        assert list(df.columns) == ["start", "reason"]
+        assert df["reason"].tolist() == ["end_signal"]
+
+
+class TestSignalTraces:
+    """Tests for signal traces backed by TraceBuffer."""
+
+    def test_ema_trace_limit(self):
+        """Test the EMA trace keeps trace_limit rows."""
+        sig = SignalEMADiffVsHistoryPercentile(
+            value_key="val", ema_period_1=2, ema_period_2=5, history_window=10, trace_limit=5
+        )
+        for i in range(50):
+            sig({"val": float(i)})
+
+        assert isinstance(sig.trace, TraceBuffer)
+        assert len(sig.trace) == 5
+        assert sig.trace[-1]["abs_diff"] == pytest.approx(sig.last_abs_diff)
+
+    def test_ema_trace_missing_value(self):
+        """Test non-numeric steps are recorded with None values."""
+        sig = SignalEMADiffVsHistoryPercentile(value_key="val", ema_period_1=2, ema_period_2=5, history_window=10)
+        sig({"val": None})
+
+        assert sig.trace[0] == {"ema_1": None, "ema_2": None, "abs_diff": None, "threshold": None}
+
+    def test_run_trace_limit(self):
+        """Test the run trace keeps run_trace_limit runs."""
+        sig = SignalRunLengthReachedHistoryPercentile(signal_key="sig", run_trace_limit=2)
+        for length in (1, 2, 3, 4):
+            for _ in range(length):
+                sig({"sig": 1})
+            sig({"sig": 0})
+
+        assert [row["run_length"] for row in sig.run_trace] == [3, 4]
+        assert isinstance(sig.run_trace[0]["activated"], bool)
+
+    def test_intervals_unbounded(self):
+        """Test intervals_limit=None keeps every interval."""
+        sig = SignalIntervalBetweenMarkers(start_signal_key="s", end_signal_key="e", intervals_limit=None)
+        for _ in range(1500):
+            sig({"s": 1, "e": 1})
+
+        assert len(sig.intervals) == 1500
+        assert sig.intervals[-1]["closed_by"] == "end_signal"
@@ -0,0 +1,129 @@
+"""
+Tests for htf.sweep module.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from htf.signals import (  # noqa: E402
+    SignalEMADiffVsHistoryPercentile,
+    SignalRunLengthVsHistoryPercentile,
+    ValueVsRollingPercentile,
+)
+from htf.sweep import parameter_grid, sweep  # noqa: E402
+
+
+def _stream(n, seed=0):
+    rng = random.Random(seed)
+    level = 0.0
+    out = []
+    for _ in range(n):
+        level += rng.gauss(0, 1)
+        out.append({"value": level, "flag": int(rng.random() < 0.6)})
+    return out
+
+
+def _separate_runs(cls, records, combos):
+    outputs = []
+    for combo in combos:
+        signal = cls(**combo)
+        outputs.append([1 if signal(rec) else 0 for rec in records])
+    return outputs
+
+
+class TestParameterGrid:
+    """Tests for parameter_grid."""
+
+    def test_product_order(self):
+        """Test the last parameter varies fastest and scalars are single choices."""
+        combos = parameter_grid({"a": [1, 2], "b": [3, 4], "c": "x"})
+        assert combos == [
+            {"a": 1, "b": 3, "c": "x"},
+            {"a": 1, "b": 4, "c": "x"},
+            {"a": 2, "b": 3, "c": "x"},
+            {"a": 2, "b": 4, "c": "x"},
+        ]
+
+    def test_empty_choice(self):
+        """Test a parameter without values is rejected."""
+        with pytest.raises(ValueError):
+            parameter_grid({"a": []})
+
+
+class TestSweep:
+    """Tests for sweep."""
+
+    def test_signals_match_separate_runs(self):
+        """Test every combination equals a separate run of the signal."""
+        records = _stream(600)
+        grid = {"window_size": [20, 50], "percentile": [10.0, 50.0, 90.0]}
+        frame = sweep(ValueVsRollingPercentile, records, grid, params={"value_key": "value"}, output="signals")
+        combos = [{"value_key": "value", **combo} for combo in parameter_grid(grid)]
+        expected = _separate_runs(ValueVsRollingPercentile, records, combos)
+        assert frame[["window_size", "percentile"]].to_dict("records") == parameter_grid(grid)
+        assert [sig.tolist() for sig in frame["signal"]] == expected
+        report = frame.attrs["sweep_report"]["shared"][0]
+        assert report["history"] == {"requested": 6, "unique": 2, "shared": 4}
+
+    def test_ema_periods_are_shared(self):
+        """Test EMA nodes are shared across period combinations."""
+        records = _stream(400, seed=1)
+        grid = {"ema_period_1": [3, 5], "ema_period_2": [20, 40], "percentile": [70.0, 90.0]}
+        frame = sweep(
+            SignalEMADiffVsHistoryPercentile,
+            records,
+            grid,
+            params={"value_key": "value", "history_window": 50},
+            output="signals",
+        )
+        combos = [{"value_key": "value", "history_window": 50, **combo} for combo in parameter_grid(grid)]
+        assert [sig.tolist() for sig in frame["signal"]] == _separate_runs(
+            SignalEMADiffVsHistoryPercentile, records, combos
+        )
+        report = frame.attrs["sweep_report"]["shared"][0]
+        assert report["ema"] == {"requested": 16, "unique": 4, "shared": 12}
+
+    def test_run_detection_is_shared(self):
+        """Test run-length signals share one run detector and run-length history."""
+        records = _stream(800, seed=2)
+        grid = {"percentile": [50.0, 75.0, 90.0], "min_history_runs": [1, 5]}
+        frame = sweep(SignalRunLengthVsHistoryPercentile, records, grid, params={"signal_key": "flag"})
+        report = frame.attrs["sweep_report"]["shared"][0]
+        assert report["run"] == {"requested": 6, "unique": 1, "shared": 5}
+        assert report["history"]["unique"] == 1
+        combos = [{"signal_key": "flag", **combo} for combo in parameter_grid(grid)]
+        expected = _separate_runs(SignalRunLengthVsHistoryPercentile, records, combos)
+        assert frame["active_steps"].tolist() == [sum(out) for out in expected]
+
+    def test_summary_columns(self):
+        """Test summary statistics of a known output."""
+        records = [{"flag": v} for v in [0, 1, 1, 1, 0, 1, 1, 1, 1, 0]]
+        frame = sweep("SignalRunLengthReached", records, {"min_run_length": ["2", "4"]}, params={"signal_key": "flag"})
+        assert frame["min_run_length"].tolist() == [2, 4]
+        assert frame["active_steps"].tolist() == [5, 1]
+        assert frame["activations"].tolist() == [2, 1]
+        assert frame["max_active_run"].tolist() == [3, 1]
+        assert frame["first_active"].tolist() == [2, 8]
+
+    def test_processes_match_single_pass(self):
+        """Test the process pool returns the same table as one pass."""
+        records = _stream(300, seed=3)
+        grid = {"window_size": [10, 30], "percentile": [25.0, 75.0]}
+        single = sweep(ValueVsRollingPercentile, records, grid, params={"value_key": "value"})
+        pooled = sweep(ValueVsRollingPercentile, records, grid, params={"value_key": "value"}, processes=2)
+        assert pooled.equals(single)
+        assert pooled.attrs["sweep_report"]["chunks"] == 2
+
+    def test_invalid_arguments(self):
+        """Test unknown outputs, signal names and overlapping params are rejected."""
+        with pytest.raises(ValueError):
+            sweep(ValueVsRollingPercentile, [], {"window_size": [5]}, output="wide")
+        with pytest.raises(ValueError):
+            sweep("NoSuchSignal", [], {"window_size": [5]})
+        with pytest.raises(ValueError):
+            sweep(ValueVsRollingPercentile, [], {"window_size": [5]}, params={"window_size": 3})
@@ -0,0 +1,204 @@
+"""
+Tests for htf.time_index module.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from htf.features import SingleFieldStatsFeature
+from htf.time_index import TimestampIndex, from_epoch_ns, to_epoch_ns
+from htf.timeframe import TimeframeConfig, TimeframeView
+
+
+def _view(out_of_order: str = "raise", max_buffer: int = 100) -> TimeframeView:
+    cfg = TimeframeConfig(
+        name="ltf", window_size=5, max_buffer=max_buffer, timestamp_key="ts", out_of_order=out_of_order
+    )
+    return TimeframeView(config=cfg, feature_module=SingleFieldStatsFeature("x", "x"))
+
+
+class TestTimestampIndex:
+    """Tests for TimestampIndex bounds and placement."""
+
+    def test_bounds_closed_options(self):
+        """Test each closed option selects the expected positions."""
+        index = TimestampIndex("ts")
+        index.timestamps.extend([1, 2, 2, 3, 5])
+        assert index.bounds(2, 3, "left") == (1, 3)
+        assert index.bounds(2, 3, "right") == (3, 4)
+        assert index.bounds(2, 3, "both") == (1, 4)
+        assert index.bounds(2, 3, "neither") == (3, 3)
+        assert index.bounds(None, 4) == (0, 4)
+        assert index.bounds(5, 1, "both") == (4, 4)
+        with pytest.raises(ValueError):
+            index.bounds(1, 2, "open")
+
+    def test_asof_position(self):
+        """Test asof returns the last position at or before the timestamp."""
+        index = TimestampIndex("ts")
+        index.timestamps.extend([10, 20, 20, 30])
+        assert index.asof(5) == -1
+        assert index.asof(20) == 2
+        assert index.asof(25) == 2
+        assert index.asof(99) == 3
+
+    def test_invalid_policy(self):
+        """Test an unknown out_of_order policy is rejected."""
+        with pytest.raises(ValueError):
+            TimestampIndex("ts", "sort")
+        with pytest.raises(ValueError):
+            TimeframeConfig(name="ltf", window_size=5, timestamp_key="ts", out_of_order="sort")
+
+
+class TestTimeframeViewQueries:
+    """Tests for slice / window_between / asof on TimeframeView."""
+
+    def test_queries_match_scan(self):
+        """Test query results equal a linear scan over the buffer."""
+        view = _view()
+        for i in range(50):
+            view.on_new_record({"ts": i * 10, "x": float(i)})
+        got = view.slice(100, 200)
+        assert list(got) == [rec for rec in view.buffer if 100 <= rec["ts"] < 200]
+        assert got.timestamps() == list(range(100, 200, 10))
+        between = view.window_between(100, 200, closed="both")
+        assert [rec["ts"] for rec in between] == list(range(100, 210, 10))
+        assert view.asof(105)["ts"] == 100
+        assert view.asof(-1) is None
+        assert len(view.slice()) == 50
+
+    def test_slices_are_views(self):
+        """Test slices share records and are invalidated when records move."""
+        view = _view(max_buffer=10)
+        for i in range(5):
+            view.on_new_record({"ts": i, "x": 1.0})
+        got = view.slice(1, 4)
+        assert got[0] is view.buffer[1]
+        assert [rec["ts"] for rec in got[1:]] == [2, 3]
+        view.on_new_record({"ts": 5, "x": 1.0})  # append only: still valid
+        assert got[-1]["ts"] == 3
+        for i in range(6, 12):
+            view.on_new_record({"ts": i, "x": 1.0})
+        with pytest.raises(RuntimeError):
+            list(got)
+        assert view.slice(0, 100).timestamps() == list(range(2, 12))
+
+    def test_out_of_order_policies(self):
+        """Test raise / drop / insert handling of older timestamps."""
+        view = _view("raise")
+        view.on_new_record({"ts": 2, "x": 1.0})
+        with pytest.raises(ValueError):
+            view.on_new_record({"ts": 1, "x": 1.0})
+        assert len(view.buffer) == 1
+
+        view = _view("drop")
+        for ts in (1, 3, 2, None, 4):
+            view.on_new_record({"ts": ts, "x": 1.0})
+        assert [rec["ts"] for rec in view.buffer] == [1, 3, 4]
+        assert view.time_index.dropped_records == 2
+        assert view.features["x_count"] == 3
+
+        view = _view("insert")
+        for ts in (1, 3, 2, 3, 0):
+            view.on_new_record({"ts": ts, "x": float(ts)})
+        assert view.time_index.timestamps == [0, 1, 2, 3, 3]
+        assert [rec["ts"] for rec in view.buffer] == [0, 1, 2, 3, 3]
+        assert view.time_index.out_of_order_records == 2
+
+    def test_requires_timestamp_key(self):
+        """Test queries without a timestamp_key raise ValueError."""
+        view = TimeframeView(config=TimeframeConfig(name="ltf", window_size=5))
+        view.on_new_record({"ts": 1})
+        with pytest.raises(ValueError):
+            view.asof(1)
+
+    def test_reset_clears_index(self):
+        """Test reset empties the index and invalidates slices."""
+        view = _view()
+        view.on_new_record({"ts": 1, "x": 1.0})
+        got = view.slice()
+        view.reset()
+        assert len(view.time_index) == 0
+        with pytest.raises(RuntimeError):
+            got[0]
+        view.on_new_record({"ts": 0, "x": 1.0})
+        assert view.asof(0)["ts"] == 0
+
+
+class TestEpochNanoseconds:
+    """Tests for int epoch-ns timestamps (timestamp_ns)."""
+
+    def test_conversion_matches_pandas(self):
+        """Test to_epoch_ns agrees with pandas datetime64[ns] values."""
+        pd = pytest.importorskip("pandas")
+        values = [
+            datetime(2024, 1, 2, 3, 4, 5, 123456),
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+            date(2024, 1, 2),
+            "2024-01-02T03:04:05.123456789Z",
+            "2024-01-02 03:04:05",
+            pd.Timestamp("2024-01-02 03:04:05.000000007"),
+            pd.Timestamp("2024-01-02").to_datetime64(),
+        ]
+        for value in values:
+            assert to_epoch_ns(value) == pd.Timestamp(value).value, value
+        assert to_epoch_ns(17) == 17
+        assert from_epoch_ns(to_epoch_ns("2024-01-02T03:04:05Z")) == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        with pytest.raises(ValueError):
+            to_epoch_ns("yesterday")
+        with pytest.raises(ValueError):
+            to_epoch_ns(True)
+
+    def test_non_iso_strings_fall_back_to_pandas(self):
+        """Test strings fromisoformat rejects are parsed like pd.Timestamp."""
+        pd = pytest.importorskip("pandas")
+        for value in ("2024/01/02 10:01:00", "01/02/2024 10:00", "2024-01-02T03:04:05+0200", "2 Jan 2024 10:00Z"):
+            assert to_epoch_ns(value) == pd.Timestamp(value).value, value
+        cfg = TimeframeConfig(name="ltf", window_size=2, timestamp_key="ts", timestamp_ns=True)
+        view = TimeframeView(config=cfg)
+        view.on_new_record({"ts": "2024/01/02 10:01:00", "x": 1})
+        assert view.buffer[0]["ts"] == pd.Timestamp("2024-01-02 10:01").value
+
+    def test_view_stores_ints_and_converts_queries(self):
+        """Test buffered timestamps become ints while queries accept datetimes."""
+        cfg = TimeframeConfig(name="ltf", window_size=5, timestamp_key="ts", timestamp_ns=True)
+        view = TimeframeView(config=cfg, feature_module=SingleFieldStatsFeature("x", "x"))
+        start = datetime(2024, 1, 1)
+        for i in range(10):
+            ts = start + timedelta(minutes=i)
+            view.on_new_record({"ts": ts if i % 2 else ts.isoformat(), "x": float(i)})
+
+        assert all(type(rec["ts"]) is int for rec in view.buffer)
+        assert view.time_index.timestamps == [rec["ts"] for rec in view.buffer]
+        got = view.window_between(start + timedelta(minutes=2), "2024-01-01T00:05:00")
+        assert [rec["x"] for rec in got] == [2.0, 3.0, 4.0, 5.0]
+        assert view.asof(start + timedelta(minutes=3, seconds=30))["x"] == 3.0
+        with pytest.raises(ValueError):
+            view.on_new_record({"ts": start, "x": 0.0})
+        with pytest.raises(ValueError):
+            TimeframeConfig(name="ltf", window_size=5, timestamp_ns=True)
+
+    def test_export_matches_object_timestamps(self):
+        """Test exports of ns timestamps equal exports of the original datetimes."""
+        pytest.importorskip("pandas")
+        flags = [i % 3 != 0 for i in range(6)]
+        htf_ts = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(6)]
+        hierarchy = [{"name": "htf", "timestamps": htf_ts, "downward_flags": flags}, {"name": "ltf"}]
+        graph = [{"id": "up", "type": "SignalValueVsPrevious", "alias": "up", "params": {"value_key": "v"}}]
+        frames = []
+        for timestamp_ns in (False, True):
+            cfg = TimeframeConfig(name="ltf", window_size=1, timestamp_key="timestamp", timestamp_ns=timestamp_ns)
+            view = TimeframeView(config=cfg)
+            for i in range(60):
+                ts = datetime(2024, 1, 1) + timedelta(minutes=7 * i)
+                view.on_new_record({"timestamp": ts, "values": {"v": float(i * 37 % 11)}})
+            frames.append(
+                view.export_signal_dataframe(
+                    "SignalValueVsPrevious", "up", signal_graph=graph, hierar_constraint_series=hierarchy
+                )
+            )
+        assert frames[0].equals(frames[1])
+        assert frames[0]["hierar_constraint_all"].sum() > 0
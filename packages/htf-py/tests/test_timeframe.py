@@ -9,7 +9,7 @@ from typing import Any
 
 import pytest
 
-from htf.timeframe import FeatureModule, TimeframeConfig, TimeframeView
+from htf.timeframe import FeatureModule, TimeframeConfig, TimeframeView, _graph_options
 
 
 class TestTimeframeConfig:
@@ -271,3 +271,128 @@ class TestTimeframeViewExport:
 
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 0
+
+
+class TestSignalGraphSharing:
+    """Tests for shared sub-computations in export_signal_dataframe."""
+
+    @staticmethod
+    def _graph():
+        def ema_diff(node_id, percentile=90, comparison="gt"):
+            params = {
+                "value_key": "v",
+                "ema_period_1": "5",
+                "ema_period_2": "10",
+                "history_window": 50,
+                "percentile": percentile,
+                "comparison": comparison,
+            }
+            return {"id": node_id, "type": "SignalEMADiffVsHistoryPercentile", "alias": node_id, "params": params}
+
+        fast_slow = {
+            "id": "fs",
+            "type": "SignalEMAFastSlowComparison",
+            "alias": "fs",
+            "params": {"value_key": "v", "ema_period_1": "5", "ema_period_2": "10", "prefer": "slow"},
+        }
+        children = [ema_diff("a"), fast_slow, ema_diff("b", 10, "lt"), ema_diff("a_copy")]
+        return [{"id": "root", "type": "SignalIntersection", "alias": "root", "children": {"signal_keys": children}}]
+
+    def test_shared_outputs_match_and_report(self):
+        """Test sharing leaves outputs unchanged and reports deduplicated work."""
+        pytest.importorskip("pandas")
+        view = TimeframeView(config=TimeframeConfig(name="tf", window_size=1, max_buffer=500))
+        for i in range(300):
+            view.on_new_record({"timestamp": i, "values": {"v": (i * 37 % 101) / 10.0}})
+        kwargs = {"include_dependencies": True, "include_values": True, "signal_graph": self._graph()}
+
+        shared = view.export_signal_dataframe("SignalIntersection", "root", **kwargs)
+        private = view.export_signal_dataframe("SignalIntersection", "root", share_computations=False, **kwargs)
+
+        assert shared.equals(private)
+        report = shared.attrs["signal_graph_report"]
+        assert report["nodes"] == 5
+        assert report["deduplicated_nodes"] == 1
+        assert report["shared"]["ema"]["unique"] == 2
+        assert report["shared"]["history"] == {"requested": 2, "unique": 1, "shared": 1}
+
+    def test_python_only_params_are_ignored(self):
+        """Test graph nodes drop approximate, which the console does not implement."""
+        pytest.importorskip("pandas")
+        view = TimeframeView(config=TimeframeConfig(name="tf", window_size=1, max_buffer=500))
+        for i in range(300):
+            view.on_new_record({"timestamp": i, "values": {"v": (i * 37 % 101) / 10.0}})
+        graph = self._graph()
+        for child in graph[0]["children"]["signal_keys"]:
+            child["params"] = {**child["params"], "approximate": "true"}
+        kwargs = {"include_values": True, "signal_graph": graph}
+        with_param = view.export_signal_dataframe("SignalIntersection", "root", **kwargs)
+        without = view.export_signal_dataframe(
+            "SignalIntersection", "root", include_values=True, signal_graph=self._graph()
+        )
+        assert with_param.equals(without)
+        assert _graph_options({"approximate": True, "history_window": "50"}) == {"history_window": 50}
+
+
+class TestMultiSignalExport:
+    """Tests for TimeframeView.export_signals_dataframe."""
+
+    @staticmethod
+    def _view():
+        view = TimeframeView(config=TimeframeConfig(name="ltf", window_size=1, max_buffer=500))
+        for i in range(200):
+            view.on_new_record({"timestamp": 1_700_000_000 + 60 * i, "values": {"v": (i * 37 % 101) / 10.0}})
+        return view
+
+    @staticmethod
+    def _graph():
+        def previous(node_id, comparison):
+            params = {"value_key": "v", "comparison": comparison}
+            return {"id": node_id, "type": "SignalValueVsPrevious", "alias": node_id, "params": params}
+
+        graph = TestSignalGraphSharing._graph()
+        return [*graph, previous("up", "gt"), previous("down", "lt")]
+
+    def test_matches_per_target_exports(self):
+        """Test the wide frame holds the same columns as one export per target."""
+        pytest.importorskip("pandas")
+        view = self._view()
+        graph = self._graph()
+        ts = [1_700_000_000 + 600 * i for i in range(20)]
+        hierarchy = [
+            {"name": "htf", "timestamps": ts, "downward_flags": [i % 3 != 0 for i in range(20)]},
+            {"name": "ltf"},
+        ]
+        kwargs = {"include_values": True, "signal_graph": graph, "hierar_constraint_series": hierarchy}
+
+        wide = view.export_signals_dataframe(include_dependencies=True, **kwargs)
+
+        for signal_type, alias in [
+            ("SignalIntersection", "root"),
+            ("SignalValueVsPrevious", "up"),
+            ("SignalValueVsPrevious", "down"),
+        ]:
+            single = view.export_signal_dataframe(signal_type, alias, **kwargs)
+            assert single[f"{signal_type}_raw"].tolist() == wide[f"{alias}_raw"].tolist()
+            assert single[f"{signal_type}_gated"].tolist() == wide[f"{alias}_gated"].tolist()
+            for col in single.columns:
+                if not col.startswith(signal_type):
+                    assert single[col].equals(wide[col]), col
+        assert {"a", "fs", "b", "a_copy"} <= set(wide.columns)
+        assert wide.attrs["signal_graph_report"]["records"] == 200
+
+    def test_selected_targets_and_alias_clash(self):
+        """Test explicit targets select columns and clashing aliases are rejected."""
+        pytest.importorskip("pandas")
+        view = self._view()
+        graph = self._graph()
+
+        frame = view.export_signals_dataframe(
+            [("SignalValueVsPrevious", "down"), ("SignalEMADiffVsHistoryPercentile", "a")], signal_graph=graph
+        )
+
+        assert list(frame.columns[-2:]) == ["down", "a"]
+        assert "root" not in frame.columns
+        clash = [{**graph[1], "id": "up2"}, graph[1]]
+        with pytest.raises(ValueError, match="shared by several targets"):
+            view.export_signals_dataframe(signal_graph=clash)
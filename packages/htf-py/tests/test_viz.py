@@ -0,0 +1,280 @@
+"""
+Tests for htf.viz helpers (requires the optional viz dependencies).
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("bokeh")
+
+from htf import HTFFramework, SimpleHTFCoordinator, TimeframeConfig, TimeframeView  # noqa: E402
+from htf.viz import (  # noqa: E402
+    LiveTimeframePlot,
+    check_multi_tfs_single_time_serie_vs_coordinator,
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+    plot_multi_tfs_only_ltf_time_serie,
+    plot_multi_tfs_parallel_time_series,
+    plot_multi_tfs_single_time_serie,
+    point_budget,
+)
+
+
+def _make_views(n_ltf: int, htf_every: int) -> tuple[TimeframeView, TimeframeView]:
+    htf = TimeframeView(config=TimeframeConfig(name="htf", window_size=1, max_buffer=n_ltf, role="HTF"))
+    ltf = TimeframeView(config=TimeframeConfig(name="ltf", window_size=1, max_buffer=n_ltf, role="LTF"))
+    for i in range(n_ltf):
+        if i % htf_every == 0:
+            htf.on_new_record({"timestamp": i, "value": math.cos(i / 50.0), "gate": int((i // 500) % 2 == 0)})
+        ltf.on_new_record({"timestamp": i, "value": math.sin(i / 10.0), "base": int(i % 997 == 0)})
+    return htf, ltf
+
+
+class TestDownsample:
+    """Tests for LTTB / min-max downsampling."""
+
+    def test_point_budget(self):
+        """Test budget derives from width unless max_points is given."""
+        assert point_budget(800) == 1600
+        assert point_budget(800, max_points=100) == 100
+
+    def test_short_series_untouched(self):
+        """Test series within budget keep every index."""
+        assert downsample_indices([1, 2, 3], [1, 2, 3], 10) == [0, 1, 2]
+
+    def test_invalid_method(self):
+        """Test unknown methods are rejected."""
+        with pytest.raises(ValueError, match="downsample must be one of"):
+            downsample_indices(list(range(10)), list(range(10)), 3, method="mean")
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        """Test LTTB keeps first/last points and a sharp spike."""
+        ys = [0.0] * 1000
+        ys[421] = 50.0
+        idx = lttb_indices(list(range(1000)), ys, 20)
+
+        assert len(idx) <= 20
+        assert idx[0] == 0 and idx[-1] == 999
+        assert 421 in idx.tolist()
+
+    def test_minmax_keeps_extremes_per_bucket(self):
+        """Test min-max keeps bucket extremes and skips NaN values."""
+        xs = list(range(100))
+        ys = [float(i % 10) for i in xs]
+        ys[55] = None
+        idx = minmax_indices(xs, ys, 10).tolist()
+
+        assert 55 not in idx
+        for bucket in range(10):
+            assert bucket * 10 in idx
+            assert bucket * 10 + 9 in idx
+
+    def test_datetime_x(self):
+        """Test datetime x values are supported."""
+        start = datetime(2024, 1, 1)
+        xs = [start + timedelta(seconds=i) for i in range(500)]
+        ys = [math.sin(i / 7.0) for i in range(500)]
+
+        assert len(downsample_indices(xs, ys, 50, method="minmax")) <= 52
+        assert len(downsample_indices(xs, ys, 50, method="lttb")) <= 50
+
+    def test_keep_masks_and_edges(self):
+        """Test signal points and mask transitions are always kept."""
+        n = 2000
+        signals = [i == 1234 for i in range(n)]
+        gate = [300 <= i < 700 for i in range(n)]
+        idx = downsample_indices(list(range(n)), [0.0] * n, 10, keep_masks=[signals], keep_edges=[gate])
+
+        assert {1234, 299, 300, 699, 700}.issubset(idx)
+        assert idx == sorted(idx)
+
+
+class TestPlotDownsampling:
+    """Tests for downsampling inside the plotting helpers."""
+
+    def test_parallel_respects_max_points(self):
+        """Test the line source is reduced while signal points are kept."""
+        n = 5000
+        data = {
+            "ltf": {
+                "timestamp": list(range(n)),
+                "value": [math.sin(i / 10.0) for i in range(n)],
+                "sig": [1 if i == 4321 else 0 for i in range(n)],
+            }
+        }
+        layout = plot_multi_tfs_parallel_time_series(data, signal_key="sig", max_points=200)
+        fig = layout.children[1].children[0]
+        src = fig.renderers[0].data_source
+
+        assert len(src.data["timestamp"]) <= 201
+        assert 4321 in src.data["timestamp"]
+
+    def test_parallel_downsample_disabled(self):
+        """Test downsample=None sends every point."""
+        n = 5000
+        data = {"ltf": {"timestamp": list(range(n)), "value": [0.0] * n}}
+        layout = plot_multi_tfs_parallel_time_series(data, downsample=None, max_points=100)
+        src = layout.children[1].children[0].renderers[0].data_source
+
+        assert len(src.data["timestamp"]) == n
+
+    def test_single_and_only_ltf_reduce_points(self):
+        """Test stitched and LTF-only plots stay within budget plus kept points."""
+        htf, ltf = _make_views(20000, 10)
+        kwargs = {"scale_change_signal_map": {"htf": "gate"}, "base_signal_ltf": "base", "max_points": 300}
+
+        for plot in (plot_multi_tfs_single_time_serie, plot_multi_tfs_only_ltf_time_serie):
+            fig = plot([htf, ltf], **kwargs).children[1]
+            total = sum(
+                len(r.data_source.data.get("x", []))
+                for r in fig.renderers
+                if type(r.glyph).__name__ == "Scatter" and r.visible
+            )
+            assert total < 2000
+
+
+class TestCheckVsCoordinator:
+    """Tests for the columnar coordinator check."""
+
+    def _check(self, **kwargs):
+        htf, ltf = _make_views(3000, 10)
+        outputs = [{"ltf_gated": {"ltf": int(i % 997 == 0 and (i // 500) % 2 == 0)}} for i in range(2990)]
+        return check_multi_tfs_single_time_serie_vs_coordinator(
+            [htf, ltf],
+            scale_change_signal_map={"htf": "gate"},
+            base_signal_ltf="base",
+            coordinator_outputs=outputs,
+            **kwargs,
+        )
+
+    def test_columns_match_records(self):
+        """Test the columnar timeline carries the same flags and mismatches as records."""
+        records = self._check()
+        columns = self._check(timeline="columns")
+        cols = columns["timeline"]
+
+        assert columns["mismatches"] == records["mismatches"]
+        assert cols["htf_allow"].tolist() == [e["htf_allow"] for e in records["timeline"]]
+        assert cols["htf_active"]["htf"].tolist() == [e["htf_active"]["htf"] for e in records["timeline"]]
+        assert cols["base_signal"].tolist() == [e["base_signal"] for e in records["timeline"]]
+        assert columns["mismatch_indices"]["plot_not_allowed"].tolist() == [
+            m["index"] for m in records["mismatches"]["plot_not_allowed"]
+        ]
+
+    def test_frame_timeline(self):
+        """Test timeline='frame' returns a DataFrame with one column per HTF."""
+        pytest.importorskip("pandas")
+        out = self._check(timeline="frame")
+        frame = out["timeline"]
+
+        assert list(frame.columns) == ["timestamp", "value", "base_signal", "htf_allow", "htf_active:htf"]
+        assert len(frame) == 3000
+        assert out["mismatches"]["plot_not_allowed"][0] == {"index": 997, "timestamp": 997}
+
+    def test_invalid_timeline(self):
+        """Test unknown timeline formats are rejected."""
+        with pytest.raises(ValueError):
+            self._check(timeline="dicts")
+
+
+class TestBatchedRendering:
+    """Tests for batched window and segment rendering."""
+
+    def test_model_count_independent_of_window_count(self):
+        """Test renderer count does not grow with the number of windows."""
+        counts = []
+        for htf_every in (50, 5):
+            htf = TimeframeView(config=TimeframeConfig(name="htf", window_size=1, max_buffer=5000, role="HTF"))
+            ltf = TimeframeView(config=TimeframeConfig(name="ltf", window_size=1, max_buffer=5000, role="LTF"))
+            for i in range(5000):
+                if i % htf_every == 0:
+                    htf.on_new_record({"timestamp": i, "value": 1.0, "gate": (i // htf_every) % 2})
+                ltf.on_new_record({"timestamp": i, "value": float(i), "base": int(i % 100 == 0)})
+            for plot in (plot_multi_tfs_single_time_serie, plot_multi_tfs_only_ltf_time_serie):
+                fig = plot(
+                    [htf, ltf], scale_change_signal_map={"htf": "gate"}, base_signal_ltf="base", downsample=None
+                ).children[1]
+                counts.append((plot.__name__, len(fig.renderers), len(fig.center)))
+
+        assert counts[0] == counts[2]
+        assert counts[1] == counts[3]
+
+    def test_windows_share_one_strip_source(self):
+        """Test all HTF windows land in a single vstrip data source."""
+        htf, ltf = _make_views(4000, 10)
+        fig = plot_multi_tfs_only_ltf_time_serie(
+            [htf, ltf], scale_change_signal_map={"htf": "gate"}, base_signal_ltf="base"
+        ).children[1]
+        strips = [r for r in fig.renderers if type(r.glyph).__name__ == "VStrip"]
+
+        assert len(strips) == 1
+        assert len(strips[0].data_source.data["left"]) == 4
+
+
+class TestLiveTimeframePlot:
+    """Tests for the streaming dashboard."""
+
+    @staticmethod
+    def _framework() -> HTFFramework:
+        view = TimeframeView(
+            config=TimeframeConfig(name="ltf", window_size=1),
+            signal_fn=lambda feats: int(feats.get("value", 0) > 5),
+        )
+        return HTFFramework(timeframes={"ltf": view}, coordinator=SimpleHTFCoordinator())
+
+    def test_invalid_arguments(self):
+        """Test rollover and fps must be positive."""
+        with pytest.raises(ValueError, match="rollover must be > 0"):
+            LiveTimeframePlot(self._framework(), rollover=0)
+        with pytest.raises(ValueError, match="fps must be > 0"):
+            LiveTimeframePlot(self._framework(), fps=0)
+
+    def test_stream_and_patch_windows(self):
+        """Test flushes stream new points and extend the open window in place."""
+        framework = self._framework()
+        live = LiveTimeframePlot(framework, rollover=100)
+        live.build()
+
+        for ts, value in enumerate([1, 7, 8]):
+            framework.on_new_record({"timestamp": ts, "value": value})
+        assert live.flush() == 3
+        assert live.flush() == 0
+
+        session = live._sessions[0]
+        assert session.line_sources["ltf"].data["x"] == [0, 1, 2]
+        assert session.signal_sources["ltf"].data["x"] == [1, 2]
+        assert session.window_sources["ltf"].data == {"left": [1], "right": [2]}
+
+        for ts, value in [(3, 9), (4, 0), (5, 6)]:
+            framework.on_new_record({"timestamp": ts, "value": value})
+        live.flush()
+
+        assert session.window_sources["ltf"].data == {"left": [1, 5], "right": [3, 5]}
+
+    def test_rollover_caps_sources(self):
+        """Test sources never exceed the rollover length."""
+        framework = self._framework()
+        live = LiveTimeframePlot(framework, rollover=10)
+        live.build()
+        for ts in range(50):
+            framework.on_new_record({"timestamp": ts, "value": ts % 10})
+            if ts % 7 == 0:
+                live.flush()
+        live.flush()
+
+        session = live._sessions[0]
+        assert session.line_sources["ltf"].data["x"] == list(range(40, 50))
+        assert len(session.window_sources["ltf"].data["left"]) <= 10
+
+    def test_close_unsubscribes(self):
+        """Test close detaches the listener from the framework."""
+        framework = self._framework()
+        live = LiveTimeframePlot(framework)
+        live.close()
+
+        assert framework.listeners == []
@@ -0,0 +1,146 @@
+"""
+Tests for htf.wal module.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+
+import pytest
+
+from htf.coordinator import HierarConstraintCoordinator
+from htf.features import SingleFieldStatsFeature
+from htf.framework import HTFFramework
+from htf.signals import SignalEMAFastSlowComparison, ValueVsRollingPercentile
+from htf.timeframe import TimeframeConfig, TimeframeView
+from htf.wal import DurableFramework, WriteAheadLog
+
+
+def _records(n, seed=0):
+    rng = random.Random(seed)
+    level = 0.0
+    out = []
+    for i in range(n):
+        level += rng.gauss(0, 1)
+        out.append({"ts": i, "x": level})
+    return out
+
+
+def _framework():
+    htf = TimeframeView(
+        config=TimeframeConfig(name="htf", window_size=10, role="HTF"),
+        feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+        signal_fn=ValueVsRollingPercentile(value_key="x_mean", window_size=25, percentile=40),
+    )
+    ltf = TimeframeView(
+        config=TimeframeConfig(name="ltf", window_size=3, max_buffer=50),
+        feature_module=SingleFieldStatsFeature(field_name="x", prefix="x"),
+        signal_fn=SignalEMAFastSlowComparison(value_key="x_max", ema_period_1=3, ema_period_2=9),
+    )
+    return HTFFramework(timeframes={"htf": htf, "ltf": ltf}, coordinator=HierarConstraintCoordinator(["htf", "ltf"]))
+
+
+def _gated(output):
+    return output["coordination"]["gated_map"]
+
+
+class TestWriteAheadLog:
+    """Tests for WriteAheadLog."""
+
+    def test_group_commit_and_read(self, tmp_path):
+        """Test records are written per group and read back in LSN order."""
+        records = _records(10)
+        with WriteAheadLog(tmp_path, group_records=4, fsync_groups=2) as wal:
+            lsns = [wal.append(rec) for rec in records]
+            assert lsns == list(range(10))
+            assert wal.pending == 2
+            assert wal.stats["writes"] == 2
+            assert wal.stats["fsyncs"] == 1
+            assert [rec for _, rec in wal.read()] == records[:8]
+        with WriteAheadLog(tmp_path) as wal:
+            assert wal.next_lsn == 10
+            assert list(wal.read(7)) == [(i, records[i]) for i in range(7, 10)]
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        """Test a partial frame at the end of the log is dropped on reopen."""
+        with WriteAheadLog(tmp_path, group_records=1) as wal:
+            for rec in _records(3):
+                wal.append(rec)
+        (segment,) = [name for name in os.listdir(tmp_path) if name.endswith(".wal")]
+        with open(tmp_path / segment, "ab") as fh:
+            fh.write(b"\x10\x00\x00\x00garbage")
+        with WriteAheadLog(tmp_path) as wal:
+            assert wal.truncated_bytes == 11
+            assert wal.next_lsn == 3
+            assert wal.append({"ts": 3}) == 3
+            wal.sync()
+            assert [lsn for lsn, _ in wal.read()] == [0, 1, 2, 3]
+
+    def test_segments_rotate_and_truncate(self, tmp_path):
+        """Test segment rotation and removal of segments before an LSN."""
+        with WriteAheadLog(tmp_path, group_records=5, segment_bytes=200) as wal:
+            for rec in _records(40):
+                wal.append(rec)
+            wal.sync()
+            assert len([n for n in os.listdir(tmp_path) if n.endswith(".wal")]) > 2
+            wal.truncate_before(30)
+            assert [lsn for lsn, _ in wal.read()][-1] == 39
+            assert min(lsn for lsn, _ in wal.read()) <= 30
+
+    def test_invalid_options(self, tmp_path):
+        """Test invalid group and fsync settings are rejected."""
+        with pytest.raises(ValueError):
+            WriteAheadLog(tmp_path, group_records=0)
+        with pytest.raises(ValueError):
+            WriteAheadLog(tmp_path, fsync_groups=-1)
+
+
+class TestDurableFramework:
+    """Tests for DurableFramework checkpoints and recovery."""
+
+    def test_recover_from_checkpoint_and_tail(self, tmp_path):
+        """Test recovery restores the same state as an uninterrupted run."""
+        records = _records(300)
+        reference = _framework()
+        expected = [_gated(reference.on_new_record(rec)) for rec in records]
+
+        durable = DurableFramework(_framework(), tmp_path, checkpoint_every=100, wal_options={"group_records": 8})
+        for rec in records[:250]:
+            durable.on_new_record(rec)
+        durable.wal.sync()  # records still buffered at a crash are lost
+        del durable
+
+        recovered, report = DurableFramework.recover(tmp_path, _framework(), checkpoint_every=100)
+        assert report.checkpoint_lsn == 200
+        assert report.replayed_records == 50
+        outputs = [_gated(recovered.on_new_record(rec)) for rec in records[250:]]
+        assert outputs == expected[250:]
+        assert recovered.framework.timeframes["ltf"].buffer == reference.timeframes["ltf"].buffer
+        assert len([n for n in os.listdir(tmp_path) if n.startswith("checkpoint-")]) == 1
+        recovered.close()
+
+    def test_recover_without_checkpoint(self, tmp_path):
+        """Test a log without checkpoint is replayed into the given framework."""
+        records = _records(40, seed=1)
+        with DurableFramework(_framework(), tmp_path) as durable:
+            outputs = [_gated(durable.on_new_record(rec)) for rec in records]
+        recovered, report = DurableFramework.recover(tmp_path, _framework())
+        assert report.checkpoint_lsn is None
+        assert report.replayed_records == 40
+        assert _gated(recovered.framework.last_output) == outputs[-1]
+        recovered.close()
+
+    def test_listeners_are_not_checkpointed(self, tmp_path):
+        """Test listeners survive a checkpoint but are not saved with it."""
+        framework = _framework()
+        seen = []
+        framework.subscribe(lambda rec, out: seen.append(rec["ts"]))
+        with DurableFramework(framework, tmp_path, checkpoint_every=5) as durable:
+            for rec in _records(7):
+                durable.on_new_record(rec)
+        assert seen == list(range(7))
+        recovered, report = DurableFramework.recover(tmp_path, _framework())
+        assert report.checkpoint_lsn == 5
+        assert recovered.framework.listeners == []
+        recovered.close()